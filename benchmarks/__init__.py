@@ -0,0 +1,3 @@
+"""
+Benchmarks for job application automation (run against local stub servers)
+"""
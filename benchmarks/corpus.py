@@ -0,0 +1,235 @@
+"""HTML corpus for parser benchmarks.
+
+``load_corpus(directory)`` reads saved job pages (``*.html``) from a
+directory; without one it generates pages at roughly the size and node
+count of real ones:
+
+- Stepstone: a JSON-LD ``JobPosting``, the ``data-at`` header fields, an
+  apply link, many "similar jobs" cards, navigation/footer chrome and large
+  inline scripts (app state and tracking)
+- LinkedIn (guest view): the "<company> hiring <title> in <location>" title,
+  the description markup, the job criteria list, similar jobs and
+  ``<code>`` blocks of embedded JSON
+
+Each generated page comes with its golden fields: the values the page
+states (dotted keys for nested ones, e.g. ``contact_person.email``).
+``save_corpus`` writes generated pages, and with ``golden=True`` a
+``<page>.json`` of golden fields next to each, to a directory for reuse;
+``load_cases`` reads pages with their golden files (``None`` if missing).
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+Page = Tuple[str, bytes]
+Golden = Dict[str, Any]
+# (name, html_bytes, golden fields or None)
+Case = Tuple[str, bytes, Optional[Golden]]
+
+CITIES = ['Berlin', 'Hamburg', 'München', 'Köln', 'Frankfurt am Main', 'Stuttgart', 'Leipzig']
+TITLES = ['Data Engineer', 'Backend Developer', 'Produktmanager', 'UX Designer', 'DevOps Engineer']
+# Stepstone work type -> work_mode the scraper derives from it
+WORK_TYPES = {'Feste Anstellung, Vollzeit': 'office', 'Homeoffice möglich, Hybrid': 'hybrid',
+              'Remote, Vollzeit': 'remote/homeoffice'}
+LINKEDIN_WORK_MODES = {'Hybrid': 'hybrid', 'Remote': 'remote', 'On-site': 'onsite'}
+
+
+def stepstone_job(seed: int, cards: int = 80) -> Tuple[bytes, Golden]:
+    """Generate one deterministic Stepstone-like job page and its golden fields."""
+    rnd = random.Random(seed)
+    title = f"{rnd.choice(TITLES)} (m/w/d)"
+    company = f"Beispiel {rnd.choice(['Analytics', 'Software', 'Logistik', 'Energie'])} GmbH"
+    city = rnd.choice(CITIES)
+    job_id = 10_000_000 + seed
+    work_type = rnd.choice(sorted(WORK_TYPES))
+    phone = f"+49 30 {rnd.randint(1000000, 9999999)}"
+    street, postal = f"Musterstraße {seed % 90 + 1}", f"1{seed % 9000 + 1000:04d}"
+    description = (
+        f"<p><strong>{company}</strong> sucht Verstärkung in {city}.</p><h2>Ihre Aufgaben</h2><ul>"
+        + ''.join(f"<li>Aufgabe {i}: Weiterentwicklung unserer Plattform &amp; Prozesse</li>" for i in range(10))
+        + "</ul><h2>Ihr Profil</h2><ul>"
+        + ''.join(f"<li>Erfahrung mit Thema {i}</li>" for i in range(8))
+        + f"</ul><p>Referenznummer: REF-{seed:04d}</p><h2>Weitere Informationen</h2>"
+        f"<p>{company}<br>{street}<br>{postal} {city}</p>"
+        f"<p>Kontakt: jobs{seed}@firma{seed}.de, Tel. {phone}</p>"
+    )
+    posting = {
+        '@context': 'https://schema.org',
+        '@type': 'JobPosting',
+        'title': title,
+        'description': description,
+        'datePosted': f"2026-0{seed % 9 + 1}-1{seed % 10}",
+        'industry': 'IT & Internet',
+        'hiringOrganization': {'@type': 'Organization', 'name': company, 'url': 'https://www.stepstone.de/cmp/de/x'},
+        'jobLocation': {'@type': 'Place', 'address': {
+            'streetAddress': street, 'postalCode': postal,
+            'addressLocality': city, 'addressCountry': 'DE'}},
+    }
+    nav = '<nav class="header-nav"><ul>' + ''.join(
+        f'<li class="nav-item"><a class="nav-link" href="/nav/{i}"><span class="icon"></span><span>Menü {i}</span></a></li>'
+        for i in range(40)) + '</ul></nav>'
+    header = (
+        f'<div class="job-ad-display"><h1 class="title" data-at="header-job-title">{title}</h1>'
+        f'<ul class="meta"><li><span data-at="metadata-company-name">{company}</span></li>'
+        f'<li><span data-at="metadata-location">{city}</span></li>'
+        f'<li><span data-at="metadata-work-type">{work_type}</span></li></ul>'
+        f'<a class="apply" data-at="apply-button" href="https://www.stepstone.de/go/{job_id}">'
+        f'<span>Jetzt bewerben</span></a></div>'
+    )
+    body = f'<article class="listing-content"><div class="description">{description}</div></article>'
+    similar = '<section class="similar-jobs">' + ''.join(
+        f'<article class="card"><div class="card-head"><a href="/stellenangebote--Job-{i}--{job_id + i}-inline.html">'
+        f'<h3>{rnd.choice(TITLES)} (m/w/d)</h3></a><div class="company"><span>Firma {i} AG</span></div></div>'
+        f'<ul class="card-meta"><li><span class="icon"></span><span>{rnd.choice(CITIES)}</span></li>'
+        f'<li><span class="icon"></span><span>{rnd.choice(sorted(WORK_TYPES))}</span></li>'
+        f'<li><time datetime="2026-01-01">vor {i} Tagen</time></li></ul>'
+        f'<p class="snippet">Kurzbeschreibung der Stelle {i} mit einigen Details zu Aufgaben und Profil.</p>'
+        f'<button class="save" type="button"><span>Merken</span></button></article>'
+        for i in range(cards)) + '</section>'
+    footer = '<footer><div class="links">' + ''.join(
+        f'<div class="col"><h4>Bereich {c}</h4><ul>'
+        + ''.join(f'<li><a href="/footer/{c}/{i}">Link {c}.{i}</a></li>' for i in range(15)) + '</ul></div>'
+        for c in range(6)) + '</div><p>Fragen? support@stepstone.de</p></footer>'
+    state = json.dumps({'props': {'jobs': [
+        {'id': job_id + i, 'title': rnd.choice(TITLES), 'teaser': description[:1500], 'apply': '<a>Jetzt bewerben</a>'}
+        for i in range(cards)]}})
+    html = (
+        '<!DOCTYPE html><html lang="de"><head><meta charset="utf-8">'
+        f'<title>{title} - {company} - StepStone</title>'
+        '<style>' + '.c{color:#333;margin:0 auto}' * 400 + '</style>'
+        f'<script type="application/ld+json">{json.dumps(posting)}</script>'
+        '</head><body>'
+        + nav + '<main>' + header + body + similar + '</main>' + footer
+        + f'<script id="__PRELOADED_STATE__">window.__STATE__ = {state};</script>'
+        + '<script>' + 'window.dataLayer.push({"event": "view"});' * 500 + '</script>'
+        + '</body></html>'
+    )
+    golden = {
+        'job_title': title,
+        'job_title_clean': title.replace(' (m/w/d)', ''),
+        'company_name': company,
+        'location': city,
+        'work_mode': WORK_TYPES[work_type],
+        'publication_date': posting['datePosted'],
+        'industry': posting['industry'],
+        'company_job_reference': f"REF-{seed:04d}",
+        'company_address': f"{street}, {postal}, {city}, DE",
+        'direct_apply_link': f"https://www.stepstone.de/go/{job_id}",
+        'contact_person.email': f"jobs{seed}@firma{seed}.de",
+        'contact_person.phone': phone,
+    }
+    return html.encode('utf-8'), golden
+
+
+def stepstone_page(seed: int, cards: int = 80) -> bytes:
+    """Generate one deterministic Stepstone-like job page."""
+    return stepstone_job(seed, cards)[0]
+
+
+def linkedin_job(seed: int, cards: int = 60) -> Tuple[bytes, Golden]:
+    """Generate one deterministic LinkedIn-like (guest view) job page and its golden fields."""
+    rnd = random.Random(seed)
+    title = rnd.choice(TITLES)
+    company = f"Example {rnd.choice(['Analytics', 'Software', 'Logistics', 'Energy'])} GmbH"
+    city = rnd.choice(CITIES)
+    work = rnd.choice(sorted(LINKEDIN_WORK_MODES))
+    description = (
+        f"<strong>About {company}</strong><br><br>We are growing our team in {city}.<br><ul>"
+        + ''.join(f"<li>Responsibility {i}: build and run data products</li>" for i in range(10))
+        + f"</ul><p>Work model: {work}. Apply now!</p>"
+    )
+    criteria = [('Seniority level', 'Mid-Senior level'), ('Employment type', 'Full-time'),
+                ('Job function', 'Engineering'), ('Industries', 'Software Development')]
+    top = (
+        f'<section class="top-card-layout"><h1 class="top-card-layout__title">{title}</h1>'
+        f'<span class="topcard__flavor">{company}</span><span class="topcard__flavor--bullet">{city}</span>'
+        f'<span class="posted-time-ago__text">Posted {seed % 6 + 1} days ago</span></section>'
+    )
+    body = (
+        '<section class="description"><div class="description__text description__text--rich">'
+        f'<section class="show-more-less-html"><div class="show-more-less-html__markup">{description}</div></section>'
+        '</div><ul class="description__job-criteria-list">'
+        + ''.join(f'<li class="description__job-criteria-item"><h3 class="description__job-criteria-subheader">{k}</h3>'
+                  f'<span class="description__job-criteria-text description__job-criteria-text--criteria">{v}</span></li>'
+                  for k, v in criteria)
+        + '</ul></section>'
+    )
+    similar = '<section class="similar-jobs"><ul>' + ''.join(
+        f'<li><div class="base-card"><a class="base-card__full-link" href="/jobs/view/{4_000_000_000 + i}">'
+        f'<span class="sr-only">{rnd.choice(TITLES)}</span></a><div class="base-search-card__info">'
+        f'<h3 class="base-search-card__title">{rnd.choice(TITLES)}</h3><h4 class="base-search-card__subtitle">'
+        f'<a class="hidden-nested-link" href="/company/{i}">Company {i}</a></h4>'
+        f'<div class="base-search-card__metadata"><span class="job-search-card__location">{rnd.choice(CITIES)}</span>'
+        f'<time class="job-search-card__listdate" datetime="2026-01-01">{i} days ago</time></div></div></div></li>'
+        for i in range(cards)) + '</ul></section>'
+    codes = ''.join(
+        f'<code id="datalet-{i}" style="display: none"><!--{json.dumps({"request": f"/voyager/{i}", "body": "x" * 400})}--></code>'
+        for i in range(40))
+    html = (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        f'<title>{company} hiring {title} in {city}, Germany | LinkedIn</title>'
+        '<style>' + '.t{font:14px sans-serif}' * 300 + '</style></head><body>'
+        '<header class="nav">' + ''.join(f'<a class="nav__link" href="/n/{i}">Nav {i}</a>' for i in range(30)) + '</header>'
+        '<main>' + top + body + similar + '</main>' + codes
+        + '<script>' + 'window.lix && window.lix.track("view");' * 600 + '</script></body></html>'
+    )
+    golden = {
+        'job_title': title,
+        'job_title_clean': title,
+        'company_name': company,
+        'location': f"{city}, Germany",
+        'work_mode': LINKEDIN_WORK_MODES[work],
+        'industry': 'Software Development',
+    }
+    return html.encode('utf-8'), golden
+
+
+def linkedin_page(seed: int, cards: int = 60) -> bytes:
+    """Generate one deterministic LinkedIn-like (guest view) job page."""
+    return linkedin_job(seed, cards)[0]
+
+
+GENERATORS = {'stepstone': stepstone_job, 'linkedin': linkedin_job}
+
+
+def load_corpus(directory: Optional[str] = None, pages: int = 20, site: str = 'stepstone') -> List[Page]:
+    """Return ``(name, html_bytes)`` for saved pages in ``directory`` or generated ``site`` pages."""
+    if directory:
+        paths = sorted(Path(directory).glob('*.html'))
+        if not paths:
+            raise SystemExit(f"No *.html files in {directory}")
+        return [(p.name, p.read_bytes()) for p in paths]
+    return [(name, content) for name, content, _ in load_cases(None, pages, site)]
+
+
+def load_cases(directory: Optional[str] = None, pages: int = 20, site: str = 'stepstone') -> List[Case]:
+    """Like ``load_corpus``, with each page's golden fields (``<page>.json`` in ``directory``)."""
+    if directory:
+        paths = sorted(Path(directory).glob('*.html'))
+        if not paths:
+            raise SystemExit(f"No *.html files in {directory}")
+        cases = []
+        for path in paths:
+            golden_path = path.with_suffix('.json')
+            golden = json.loads(golden_path.read_text(encoding='utf-8')) if golden_path.exists() else None
+            cases.append((path.name, path.read_bytes(), golden))
+        return cases
+    return [(f"{site}-{i:03d}.html", *GENERATORS[site](i)) for i in range(pages)]
+
+
+def save_corpus(directory: str, pages: int = 20, site: str = 'stepstone', golden: bool = False) -> List[Path]:
+    """Write generated ``site`` pages (and with ``golden`` their golden files) to ``directory``."""
+    target = Path(directory)
+    target.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, content, fields in load_cases(None, pages, site):
+        path = target / name
+        path.write_bytes(content)
+        if golden:
+            path.with_suffix('.json').write_text(json.dumps(fields, indent=2, ensure_ascii=False), encoding='utf-8')
+        paths.append(path)
+    return paths
@@ -0,0 +1,158 @@
+"""Compare HTTP transports of the HTTP core against a local stub server.
+
+Measures bytes on the wire (as counted by the stub server) and latency for
+the traffic patterns the app produces:
+
+- ``trello-seq``: many small JSON requests, one after another
+- ``trello-par``: the same requests from parallel worker threads
+- ``job-pages``: full job pages (large, compressible HTML)
+
+Transports:
+
+- ``requests``: the pooled ``requests.Session`` the HTTP core uses by default
+- ``requests-identity``: the same without compression (the old baseline
+  for scrapers that override ``Accept-Encoding``)
+- ``httpx-h1``: httpx over HTTP/1.1
+- ``httpx-h2``: httpx over HTTP/2, as used for ``HTTP_HTTP2_HOSTS``
+  (skipped without the ``h2`` package)
+
+Usage:
+  python -m benchmarks.http_transport
+  python -m benchmarks.http_transport --requests 500 --workers 16 --delay-ms 20 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+from benchmarks.stub_server import H2StubServer, Routes, StubServer
+from src.utils.http_pool import ACCEPT_ENCODING, HTTP2_AVAILABLE, SessionPool
+from src.utils.timing import percentile
+
+
+def make_routes() -> Routes:
+    """Trello-like JSON card and a ~250 KB job page."""
+    card = json.dumps({
+        'id': '5f1c0c0e8e1b2a3c4d5e6f70',
+        'name': 'Senior Data Engineer - Example GmbH',
+        'desc': 'Berlin · Hybrid · Full-time ' * 20,
+        'idList': '5f1c0c0e8e1b2a3c4d5e6f71',
+        'labels': [{'id': f'label{i}', 'name': f'Label {i}', 'color': 'green'} for i in range(5)],
+        'customFieldItems': [{'idCustomField': f'cf{i}', 'value': {'text': 'value'}} for i in range(6)],
+    }).encode('utf-8')
+    block = (
+        '<div class="listing-content" data-at="job-ad-content"><h2>Ihre Aufgaben</h2><ul>'
+        + ''.join(f'<li>Verantwortung für Datenpipelines und Reporting, Punkt {i}</li>' for i in range(12))
+        + '</ul></div><script>window.__TRACKING__ = {"page": "listing", "version": 3};</script>'
+    )
+    page = ('<html><head><title>Job</title></head><body>' + block * 120 + '</body></html>').encode('utf-8')
+    return {'/1/cards/card': ('application/json', card), '/job': ('text/html; charset=utf-8', page)}
+
+
+def _clients(url: str, h2_url: str) -> Dict[str, Callable[[str], httpx.Response]]:
+    """Return a fetch function per transport (each keeps its own pooled connections)."""
+    session = SessionPool(http2_hosts=()).get(url)
+    h1 = httpx.Client(headers={'Accept-Encoding': ACCEPT_ENCODING})
+    clients: Dict[str, Callable[[str], Any]] = {
+        'requests': lambda path: session.get(url + path, timeout=30),
+        'requests-identity': lambda path: session.get(url + path, headers={'Accept-Encoding': 'identity'}, timeout=30),
+        'httpx-h1': lambda path: h1.get(url + path, timeout=30),
+    }
+    if h2_url:
+        h2 = httpx.Client(http1=False, http2=True, headers={'Accept-Encoding': ACCEPT_ENCODING})
+        clients['httpx-h2'] = lambda path: h2.get(h2_url + path, timeout=30)
+    return clients
+
+
+def _run(fetch: Callable[[str], Any], path: str, count: int, workers: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+
+    def one(_: int) -> None:
+        started = time.perf_counter()
+        resp = fetch(path)
+        assert resp.status_code == 200 and resp.content
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    fetch(path)  # warm up: open the connection outside the measurement
+    started = time.perf_counter()
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(one, range(count)))
+    else:
+        for i in range(count):
+            one(i)
+    wall = time.perf_counter() - started
+    return {
+        'requests': count,
+        'wall_s': round(wall, 3),
+        'req_per_s': round(count / wall, 1),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+    }
+
+
+def run(count: int = 200, workers: int = 8, pages: int = 20, delay_ms: float = 0.0) -> List[Dict[str, Any]]:
+    routes = make_routes()
+    scenarios = [('trello-seq', '/1/cards/card', count, 1),
+                 ('trello-par', '/1/cards/card', count, workers),
+                 ('job-pages', '/job', pages, 1)]
+    results = []
+    with StubServer(routes, delay=delay_ms / 1000) as h1_server:
+        h2_server = H2StubServer(routes, delay=delay_ms / 1000) if HTTP2_AVAILABLE else None
+        if h2_server is not None:
+            h2_server.start()
+        try:
+            clients = _clients(h1_server.url, h2_server.url if h2_server else '')
+            for scenario, path, n, n_workers in scenarios:
+                for transport, fetch in clients.items():
+                    server = h2_server if transport == 'httpx-h2' else h1_server
+                    fetch(path)  # connection set-up is excluded from byte counts too
+                    server.reset()
+                    result = _run(fetch, path, n, n_workers)
+                    # _run's warm-up request is included in the counters
+                    done = max(1, server.requests)
+                    result.update({
+                        'scenario': scenario,
+                        'transport': transport,
+                        'bytes_in_per_req': server.bytes_sent // done,
+                        'bytes_out_per_req': server.bytes_received // done,
+                    })
+                    results.append(result)
+        finally:
+            if h2_server is not None:
+                h2_server.stop()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark HTTP transports against a local stub server")
+    parser.add_argument('--requests', type=int, default=200, help="Small JSON requests per scenario")
+    parser.add_argument('--workers', type=int, default=8, help="Threads for the parallel scenario")
+    parser.add_argument('--pages', type=int, default=20, help="Job page requests")
+    parser.add_argument('--delay-ms', type=float, default=0.0, help="Server-side delay per response")
+    parser.add_argument('--json', action='store_true', help="Print raw results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.requests, args.workers, args.pages, args.delay_ms)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    if not HTTP2_AVAILABLE:
+        print("(h2 not installed: skipping httpx-h2)\n")
+    header = f"{'scenario':<12} {'transport':<18} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'bytes in':>10} {'bytes out':>10}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['scenario']:<12} {r['transport']:<18} {r['req_per_s']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} "
+              f"{r['bytes_in_per_req']:>10} {r['bytes_out_per_req']:>10}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
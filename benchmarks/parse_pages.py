@@ -0,0 +1,138 @@
+"""Per-page extraction cost of the scrapers' parse modes.
+
+Runs ``StepstoneScraper.parse`` / ``LinkedInScraper.parse`` over a corpus
+(saved pages via ``--corpus DIR`` or generated ones) once per parse mode
+and reports wall time, CPU time and peak Python memory (``tracemalloc``)
+per page. Every mode must produce the same job data as ``full``; fields
+that differ are reported.
+
+Modes (``SCRAPER_PARSE_MODE``):
+
+- ``full``: BeautifulSoup tree of the whole page
+- ``targeted``: lxml tree of the ``PARSE_ONLY`` subtrees only
+- ``scan``: JSON-LD and text straight from the markup, partial DOM for the
+  rest (Stepstone only)
+
+Usage:
+  python -m benchmarks.parse_pages
+  python -m benchmarks.parse_pages --site linkedin --repeat 5 --json
+  python -m benchmarks.parse_pages --save corpus/stepstone   # write the generated pages
+  python -m benchmarks.parse_pages --corpus corpus/stepstone
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from benchmarks.corpus import Page, load_corpus, save_corpus
+from src.linkedin_scraper import LinkedInScraper
+from src.scraper import BaseJobScraper, StepstoneScraper
+from src.utils.timing import percentile
+
+SCRAPERS = {
+    'stepstone': (StepstoneScraper, 'https://www.stepstone.de/stellenangebote--Job--{}-inline.html'),
+    'linkedin': (LinkedInScraper, 'https://www.linkedin.com/jobs/view/{}/'),
+}
+
+
+def _scraper(site: str, mode: str) -> BaseJobScraper:
+    scraper = SCRAPERS[site][0]()
+    scraper.parse_mode = mode
+    scraper.logger.setLevel(logging.WARNING)
+    return scraper
+
+
+def _comparable(job: Dict[str, Any]) -> Dict[str, Any]:
+    job = {k: v for k, v in (job or {}).items() if k != 'scraped_at'}
+    if job.get('publication_date'):
+        job['publication_date'] = job['publication_date'][:10]  # relative dates ("2 days ago") use now()
+    return job
+
+
+def _measure(scraper: BaseJobScraper, pages: List[Page], url: str, repeat: int) -> Dict[str, Any]:
+    wall: List[float] = []
+    cpu: List[float] = []
+    for i, (_, content) in enumerate(pages):
+        for _ in range(repeat):
+            started, started_cpu = time.perf_counter(), time.process_time()
+            scraper.parse(content, url.format(i))
+            wall.append((time.perf_counter() - started) * 1000)
+            cpu.append((time.process_time() - started_cpu) * 1000)
+    peaks: List[int] = []
+    for i, (_, content) in enumerate(pages):
+        tracemalloc.start()
+        scraper.parse(content, url.format(i))
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {
+        'mean_ms': round(sum(wall) / len(wall), 2),
+        'p50_ms': round(percentile(wall, 50), 2),
+        'p95_ms': round(percentile(wall, 95), 2),
+        'cpu_ms': round(sum(cpu) / len(cpu), 2),
+        'peak_kb': round(sum(peaks) / len(peaks) / 1024, 1),
+        'pages_per_s': round(1000 * len(wall) / sum(wall), 1),
+    }
+
+
+def run(pages: List[Page], site: str = 'stepstone', repeat: int = 3) -> Dict[str, Any]:
+    cls, url = SCRAPERS[site]
+    results: Dict[str, Any] = {
+        'site': site,
+        'pages': len(pages),
+        'bytes_per_page': sum(len(b) for _, b in pages) // len(pages),
+        'modes': {},
+        'mismatches': [],
+    }
+    reference = [_comparable(_scraper(site, 'full').parse(content, url.format(i)))
+                 for i, (_, content) in enumerate(pages)]
+    for mode in cls.PARSE_MODES:
+        scraper = _scraper(site, mode)
+        results['modes'][mode] = _measure(scraper, pages, url, repeat)
+        for i, (name, content) in enumerate(pages):
+            job = _comparable(scraper.parse(content, url.format(i)))
+            results['mismatches'].extend(
+                {'page': name, 'mode': mode, 'field': field, 'full': reference[i][field], mode: job.get(field)}
+                for field in reference[i] if reference[i][field] != job.get(field)
+            )
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers' parse modes on an HTML corpus")
+    parser.add_argument('--site', choices=sorted(SCRAPERS), default='stepstone')
+    parser.add_argument('--corpus', help="Directory of saved *.html pages (default: generated pages)")
+    parser.add_argument('--save', metavar='DIR', help="Write the generated pages to DIR and exit")
+    parser.add_argument('--pages', type=int, default=20, help="Generated pages when no corpus is given")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per page and mode")
+    parser.add_argument('--json', action='store_true', help="Print raw results as JSON")
+    args = parser.parse_args()
+
+    if args.save:
+        paths = save_corpus(args.save, args.pages, args.site)
+        print(f"Wrote {len(paths)} pages to {args.save}")
+        return 0
+
+    results = run(load_corpus(args.corpus, args.pages, args.site), args.site, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"{results['site']}: {results['pages']} pages, {results['bytes_per_page'] // 1024} KB each on average\n")
+    header = f"{'mode':<9} {'mean_ms':>8} {'p50_ms':>8} {'p95_ms':>8} {'cpu_ms':>8} {'peak_kb':>9} {'pages/s':>9}"
+    print(header)
+    print('-' * len(header))
+    for mode, r in results['modes'].items():
+        print(f"{mode:<9} {r['mean_ms']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['cpu_ms']:>8} "
+              f"{r['peak_kb']:>9} {r['pages_per_s']:>9}")
+    for m in results['mismatches']:
+        print(f"MISMATCH {m['page']} [{m['mode']}] {m['field']}: full={m['full']!r} {m['mode']}={m[m['mode']]!r}")
+    return 1 if results['mismatches'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
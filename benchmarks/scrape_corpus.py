@@ -0,0 +1,240 @@
+"""Offline scraper benchmark over a recorded HTML corpus.
+
+Serves a corpus (saved pages via ``--corpus DIR`` or generated ones) from
+``StubServer`` and runs every page through the scrapers' static path: the
+page is fetched with ``arequest_with_retries`` (the scraper's fetch options,
+no response cache) and handed to ``StepstoneScraper.parse`` /
+``LinkedInScraper.parse`` (no Playwright). For each parse mode it reports:
+
+- pages/s and time per page, split into fetch and parse
+- peak Python memory per page (``tracemalloc``)
+- time per extracted field (the scrapers' ``field.*`` spans)
+- field accuracy against golden JSON: ``<page>.json`` next to each saved
+  page (dotted keys for nested fields); generated pages carry their own
+
+Recorded pages without golden files are still timed. ``--write-golden``
+writes golden files for them from the current ``full`` mode output, to be
+checked by hand before they are trusted.
+
+Usage:
+  python -m benchmarks.scrape_corpus
+  python -m benchmarks.scrape_corpus --site linkedin --repeat 5 --json
+  python -m benchmarks.scrape_corpus --save corpus/stepstone   # pages plus golden JSON
+  python -m benchmarks.scrape_corpus --corpus corpus/stepstone [--write-golden]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.corpus import Case, Golden, load_cases, save_corpus
+from benchmarks.parse_pages import SCRAPERS, _scraper
+from benchmarks.stub_server import StubServer
+from src.scraper import BaseJobScraper, JobData
+from src.utils.http_utils import arequest_with_retries
+from src.utils.timing import JobTimer, percentile, use_timer
+
+# Fields written by --write-golden (LinkedIn dates are relative to now())
+GOLDEN_FIELDS = {
+    'stepstone': ('job_title', 'job_title_clean', 'company_name', 'location', 'work_mode', 'publication_date',
+                  'industry', 'company_job_reference', 'company_address', 'direct_apply_link',
+                  'contact_person.email', 'contact_person.phone'),
+    'linkedin': ('job_title', 'job_title_clean', 'company_name', 'location', 'work_mode', 'industry',
+                 'company_job_reference', 'company_address'),
+}
+
+
+class SpanTotals(JobTimer):
+    """Timer that sums span durations per name, unrounded (``JobTimer`` rounds to 0.1 ms)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.totals: Dict[str, float] = {}
+
+    def record(self, name: str, started: float, duration: float, **attrs: Any) -> None:
+        key = 'fetch' if name.startswith('http.') else name
+        with self._lock:
+            self.totals[key] = self.totals.get(key, 0.0) + duration * 1000
+
+
+def field_value(job: Optional[JobData], key: str) -> Any:
+    """Value of a dotted golden key (``contact_person.email``) in scraped job data."""
+    value: Any = job
+    for part in key.split('.'):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+async def _scrape(scraper: BaseJobScraper, base_url: str, name: str, url: str) -> JobData:
+    response = await arequest_with_retries(
+        'GET', f"{base_url}/{name}", timeout=10, cache=None, **scraper._fetch_options()
+    )
+    return scraper.parse(response.content, url)
+
+
+async def _measure(scraper: BaseJobScraper, cases: List[Case], base_url: str, url: str,
+                   repeat: int) -> Tuple[Dict[str, Any], List[JobData]]:
+    wall: List[float] = []
+    timer = SpanTotals()
+    jobs: List[JobData] = []
+    started_run = time.perf_counter()
+    with use_timer(timer):
+        for _ in range(repeat):
+            jobs = []
+            for i, (name, _, _) in enumerate(cases):
+                started = time.perf_counter()
+                jobs.append(await _scrape(scraper, base_url, name, url.format(i)))
+                wall.append((time.perf_counter() - started) * 1000)
+    elapsed = time.perf_counter() - started_run
+    stages = timer.totals
+
+    peaks: List[int] = []
+    for i, (name, _, _) in enumerate(cases):
+        tracemalloc.start()
+        await _scrape(scraper, base_url, name, url.format(i))
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    runs = len(wall)
+    fields = {key[len('field.'):]: round(ms / runs, 3) for key, ms in sorted(stages.items()) if key.startswith('field.')}
+    return {
+        'pages_per_s': round(runs / elapsed, 1),
+        'mean_ms': round(sum(wall) / runs, 2),
+        'p95_ms': round(percentile(wall, 95), 2),
+        'fetch_ms': round(stages.get('fetch', 0.0) / runs, 2),
+        'parse_ms': round(stages.get('html.parse', 0.0) / runs, 2),
+        'fields_ms': round(sum(fields.values()), 2),
+        'peak_kb': round(max(peaks) / 1024, 1),
+        'field_ms': fields,
+    }, jobs
+
+
+def _accuracy(cases: List[Case], jobs: List[JobData], mode: str,
+              misses: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    """Share of golden pages per field where the scraped value equals the golden one."""
+    hits: Dict[str, int] = {}
+    totals: Dict[str, int] = {}
+    for (name, _, golden), job in zip(cases, jobs):
+        for key, expected in (golden or {}).items():
+            totals[key] = totals.get(key, 0) + 1
+            actual = field_value(job, key)
+            if actual == expected:
+                hits[key] = hits.get(key, 0) + 1
+            else:
+                misses.append({'page': name, 'mode': mode, 'field': key, 'expected': expected, 'actual': actual})
+    accuracy: Dict[str, Optional[float]] = {key: round(hits.get(key, 0) / totals[key], 3) for key in sorted(totals)}
+    accuracy['overall'] = round(sum(hits.values()) / sum(totals.values()), 3) if totals else None
+    return accuracy
+
+
+async def _run(cases: List[Case], site: str, repeat: int, modes: List[str]) -> Dict[str, Any]:
+    url = SCRAPERS[site][1]
+    routes = {f"/{name}": ('text/html; charset=utf-8', content) for name, content, _ in cases}
+    results: Dict[str, Any] = {
+        'site': site,
+        'pages': len(cases),
+        'golden_pages': sum(1 for case in cases if case[2] is not None),
+        'bytes_per_page': sum(len(content) for _, content, _ in cases) // len(cases),
+        'modes': {},
+        'misses': [],
+    }
+    with StubServer(routes) as server:
+        for mode in modes:
+            scraper = _scraper(site, mode)
+            await _scrape(scraper, server.url, cases[0][0], url.format(0))  # warm up connection and caches
+            stats, jobs = await _measure(scraper, cases, server.url, url, repeat)
+            stats['accuracy'] = _accuracy(cases, jobs, mode, results['misses'])
+            results['modes'][mode] = stats
+    return results
+
+
+def run(cases: List[Case], site: str = 'stepstone', repeat: int = 3, modes: Optional[List[str]] = None) -> Dict[str, Any]:
+    return asyncio.run(_run(cases, site, repeat, modes or list(SCRAPERS[site][0].PARSE_MODES)))
+
+
+def write_golden(directory: str, site: str) -> List[Path]:
+    """Write ``<page>.json`` for saved pages without one, from the ``full`` mode output."""
+    scraper = _scraper(site, 'full')
+    written = []
+    for i, (name, content, golden) in enumerate(load_cases(directory, site=site)):
+        if golden is not None:
+            continue
+        job = scraper.parse(content, SCRAPERS[site][1].format(i))
+        fields: Golden = {key: field_value(job, key) for key in GOLDEN_FIELDS[site]}
+        path = (Path(directory) / name).with_suffix('.json')
+        path.write_text(json.dumps(fields, indent=2, ensure_ascii=False), encoding='utf-8')
+        written.append(path)
+    return written
+
+
+def _pct(value: Optional[float]) -> str:
+    return '-' if value is None else f"{value * 100:.0f}%"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers offline on a recorded HTML corpus")
+    parser.add_argument('--site', choices=sorted(SCRAPERS), default='stepstone')
+    parser.add_argument('--corpus', help="Directory of saved *.html pages and golden *.json (default: generated)")
+    parser.add_argument('--save', metavar='DIR', help="Write generated pages and golden JSON to DIR and exit")
+    parser.add_argument('--write-golden', action='store_true',
+                        help="Write golden JSON for --corpus pages without one (from the full mode) and exit")
+    parser.add_argument('--pages', type=int, default=20, help="Generated pages when no corpus is given")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed passes over the corpus per mode")
+    parser.add_argument('--mode', action='append', help="Parse mode to run (repeatable; default: all)")
+    parser.add_argument('--json', action='store_true', help="Print raw results as JSON")
+    args = parser.parse_args()
+
+    if args.save:
+        paths = save_corpus(args.save, args.pages, args.site, golden=True)
+        print(f"Wrote {len(paths)} pages with golden JSON to {args.save}")
+        return 0
+    if args.write_golden:
+        if not args.corpus:
+            parser.error('--write-golden needs --corpus')
+        paths = write_golden(args.corpus, args.site)
+        print(f"Wrote {len(paths)} golden files to {args.corpus}; check them before relying on them")
+        return 0
+
+    modes = args.mode or list(SCRAPERS[args.site][0].PARSE_MODES)
+    unknown = set(modes) - set(SCRAPERS[args.site][0].PARSE_MODES)
+    if unknown:
+        parser.error(f"unsupported mode(s) for {args.site}: {', '.join(sorted(unknown))}")
+    results = run(load_cases(args.corpus, args.pages, args.site), args.site, args.repeat, modes)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return 1 if results['misses'] else 0
+
+    print(f"{results['site']}: {results['pages']} pages ({results['golden_pages']} with golden JSON), "
+          f"{results['bytes_per_page'] // 1024} KB each on average\n")
+    header = (f"{'mode':<9} {'pages/s':>8} {'mean_ms':>8} {'p95_ms':>8} {'fetch_ms':>9} {'parse_ms':>9} "
+              f"{'fields_ms':>10} {'peak_kb':>9} {'accuracy':>9}")
+    print(header)
+    print('-' * len(header))
+    for mode, r in results['modes'].items():
+        print(f"{mode:<9} {r['pages_per_s']:>8} {r['mean_ms']:>8} {r['p95_ms']:>8} {r['fetch_ms']:>9} "
+              f"{r['parse_ms']:>9} {r['fields_ms']:>10} {r['peak_kb']:>9} {_pct(r['accuracy']['overall']):>9}")
+
+    modes = list(results['modes'])
+    fields = sorted({f for r in results['modes'].values() for f in r['field_ms']}
+                    | {f for r in results['modes'].values() for f in r['accuracy'] if f != 'overall'})
+    print(f"\n{'field (ms per page, accuracy)':<32}" + ''.join(f"{mode:>18}" for mode in modes))
+    for field in fields:
+        cells = []
+        for mode in modes:
+            r = results['modes'][mode]
+            ms = r['field_ms'].get(field)
+            cells.append(f"{'-' if ms is None else ms:>10} {_pct(r['accuracy'].get(field)):>7}")
+        print(f"{field:<32}" + ''.join(cells))
+    for m in results['misses']:
+        print(f"MISS {m['page']} [{m['mode']}] {m['field']}: expected={m['expected']!r} got={m['actual']!r}")
+    return 1 if results['misses'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,285 @@
+"""Local stub HTTP servers for the benchmarks.
+
+``StubServer`` serves a fixed set of routes over HTTP/1.1 with keep-alive;
+``H2StubServer`` serves the same routes over cleartext HTTP/2 (prior
+knowledge, needs the optional ``h2`` package). Both gzip bodies for clients
+that accept it, can delay every response to emulate network latency, and
+count the bytes they send and receive so clients can be compared by bytes
+on the wire.
+
+    routes = {'/job': ('text/html', html_bytes)}
+    with StubServer(routes) as server:
+        requests.get(f"{server.url}/job")
+        print(server.bytes_sent)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+# path -> (content type, body)
+Routes = Dict[str, Tuple[str, bytes]]
+
+# Bodies smaller than this are sent uncompressed, like most servers do
+MIN_GZIP_SIZE = 256
+
+
+def encode_body(body: bytes, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+    """Return the body to send and its content coding for an ``Accept-Encoding`` value."""
+    accepted = {part.split(';')[0].strip().lower() for part in accept_encoding.split(',')}
+    if 'gzip' in accepted and len(body) >= MIN_GZIP_SIZE:
+        return gzip.compress(body, compresslevel=6), 'gzip'
+    return body, None
+
+
+class _Counter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.received = 0
+        self.requests = 0
+
+    def add(self, sent: int = 0, received: int = 0, requests: int = 0) -> None:
+        with self._lock:
+            self.sent += sent
+            self.received += received
+            self.requests += requests
+
+    def reset(self) -> None:
+        with self._lock:
+            self.sent = self.received = self.requests = 0
+
+
+class _StubBase:
+    """Shared counters and context manager protocol."""
+
+    def __init__(self, routes: Routes, delay: float = 0.0) -> None:
+        self.routes = routes
+        self.delay = delay
+        self.counter = _Counter()
+        self.url = ''
+
+    @property
+    def bytes_sent(self) -> int:
+        return self.counter.sent
+
+    @property
+    def bytes_received(self) -> int:
+        return self.counter.received
+
+    @property
+    def requests(self) -> int:
+        return self.counter.requests
+
+    def reset(self) -> None:
+        self.counter.reset()
+
+    def respond(self, path: str, accept_encoding: str) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """Build status, headers and body for a request path."""
+        self.counter.add(requests=1)
+        route = self.routes.get(path.split('?')[0])
+        if route is None:
+            return 404, [('content-type', 'text/plain'), ('content-length', '9')], b'not found'
+        content_type, body = route
+        body, coding = encode_body(body, accept_encoding)
+        headers = [('content-type', content_type), ('content-length', str(len(body)))]
+        if coding:
+            headers.append(('content-encoding', coding))
+        return 200, headers, body
+
+    def __enter__(self) -> '_StubBase':
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        raise NotImplementedError
+
+
+class _CountingReader:
+    def __init__(self, raw: Any, counter: _Counter) -> None:
+        self._raw = raw
+        self._counter = counter
+
+    def readline(self, limit: int = -1) -> bytes:
+        line = self._raw.readline(limit)
+        self._counter.add(received=len(line))
+        return line
+
+    def read(self, n: int = -1) -> bytes:
+        data = self._raw.read(n)
+        self._counter.add(received=len(data))
+        return data
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+
+class _CountingWriter:
+    def __init__(self, raw: Any, counter: _Counter) -> None:
+        self._raw = raw
+        self._counter = counter
+
+    def write(self, data: bytes) -> int:
+        self._counter.add(sent=len(data))
+        return self._raw.write(data)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+
+class StubServer(_StubBase):
+    """HTTP/1.1 keep-alive stub on ``127.0.0.1`` (random port)."""
+
+    def start(self) -> None:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # One write per response (flushed by the base class), no Nagle delay
+            wbufsize = 64 * 1024
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                self.rfile = _CountingReader(self.rfile, stub.counter)
+                self.wfile = _CountingWriter(self.wfile, stub.counter)
+
+            def handle(self) -> None:
+                try:
+                    super().handle()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client went away mid-response
+
+            def _serve(self) -> None:
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                if stub.delay:
+                    time.sleep(stub.delay)
+                status, headers, body = stub.respond(self.path, self.headers.get('Accept-Encoding', ''))
+                self.send_response(status)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = _serve
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class H2StubServer(_StubBase):
+    """Cleartext HTTP/2 stub (clients must use prior knowledge, e.g.
+    ``httpx.Client(http1=False, http2=True)``). Requires ``h2``."""
+
+    def start(self) -> None:
+        import h2.config  # noqa: F401  (fail early without the optional dependency)
+
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._server = self._loop.run_until_complete(
+                self._loop.create_server(lambda: _H2Protocol(self), '127.0.0.1', 0)
+            )
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        self.url = f"http://127.0.0.1:{self._server.sockets[0].getsockname()[1]}"
+
+    def stop(self) -> None:
+        def shutdown() -> None:
+            self._server.close()
+            self._loop.stop()
+
+        self._loop.call_soon_threadsafe(shutdown)
+        self._thread.join(timeout=5)
+
+
+class _H2Protocol(asyncio.Protocol):
+    """One HTTP/2 connection: answers each stream once its request has ended."""
+
+    def __init__(self, stub: H2StubServer) -> None:
+        import h2.config
+        import h2.connection
+
+        self.stub = stub
+        self.conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding='utf-8'))
+        self.transport: Optional[asyncio.Transport] = None
+        self.requests: Dict[int, Dict[str, str]] = {}
+        self.windows: Dict[int, asyncio.Event] = {}
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+        self.conn.initiate_connection()
+        self._flush()
+
+    def _flush(self) -> None:
+        data = self.conn.data_to_send()
+        if data and self.transport is not None:
+            self.stub.counter.add(sent=len(data))
+            self.transport.write(data)
+
+    def data_received(self, data: bytes) -> None:
+        import h2.events
+
+        self.stub.counter.add(received=len(data))
+        for event in self.conn.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                self.requests[event.stream_id] = dict(event.headers)
+            elif isinstance(event, h2.events.DataReceived):
+                self.conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+            elif isinstance(event, h2.events.StreamEnded):
+                asyncio.ensure_future(self._respond(event.stream_id))
+            elif isinstance(event, h2.events.WindowUpdated):
+                for stream_id, waiter in self.windows.items():
+                    if event.stream_id in (0, stream_id):
+                        waiter.set()
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                if self.transport is not None:
+                    self.transport.close()
+        self._flush()
+
+    async def _respond(self, stream_id: int) -> None:
+        headers = self.requests.pop(stream_id, {})
+        if self.stub.delay:
+            await asyncio.sleep(self.stub.delay)
+        status, response_headers, body = self.stub.respond(headers.get(':path', '/'), headers.get('accept-encoding', ''))
+        self.conn.send_headers(stream_id, [(':status', str(status))] + response_headers)
+        while body:
+            window = min(self.conn.local_flow_control_window(stream_id), self.conn.max_outbound_frame_size)
+            if window <= 0:
+                waiter = self.windows[stream_id] = asyncio.Event()
+                self._flush()
+                await waiter.wait()
+                del self.windows[stream_id]
+                continue
+            chunk, body = body[:window], body[window:]
+            self.conn.send_data(stream_id, chunk)
+        self.conn.end_stream(stream_id)
+        self._flush()
@@ -3,20 +3,28 @@ Web Interface for Job Application Automation
 Simple Flask web app for easy job processing
 """
 
-from flask import Flask, render_template, request, jsonify, send_file, Response
+from flask import Flask, render_template, request, jsonify, send_file, Response, stream_with_context
 from werkzeug.exceptions import HTTPException
 import sys
 import os
 from pathlib import Path
 sys.path.append(os.path.dirname(__file__))
 
-from main import process_job_posting
+from main import process_job_posting, get_cached_duplicate_result
 from database import get_db
-from utils.env import load_env, get_str, validate_env
+from job_queue import get_job_queue
+from utils.env import load_env, get_str, get_int, get_bool, validate_env
 from utils.log_config import get_logger
 from utils.error_reporting import report_error
-import threading
+from utils.worker_pool import FairWorkerPool
+from utils.events import broker as event_broker, format_sse
+from utils.http_pool import session_pool
+from utils.http_metrics import http_metrics
+from utils.connection_cache import connection_stats
+from utils.throttle import get_rate_limiter
+from utils.circuit_breaker import get_breakers
 import json
+import uuid
 from datetime import datetime, timezone
 import time
 
@@ -52,9 +60,53 @@ data_dir_env = get_str('DATA_DIR', '').strip()
 OUTPUT_DIR = Path(output_dir_env) if output_dir_env else (APP_ROOT / 'output')
 DATA_DIR = Path(data_dir_env) if data_dir_env else (APP_ROOT / 'data')
 
-# Store processing status
+# Store processing status (in-memory view; durable state lives in the job queue)
 processing_status = {}
 
+# Bounded executor for background jobs (JOB_WORKERS concurrent, round-robin across batches)
+worker_pool = FairWorkerPool(max_workers=get_int('JOB_WORKERS', 3))
+
+
+def _new_job_id() -> str:
+    """Unique job ID (timestamp for readability, random suffix so concurrent submits don't collide)"""
+    return f"job_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+
+def _job_status_payload(job_id: str) -> dict:
+    """Current status of a job as served by /status and pushed over /events"""
+    status_data = processing_status[job_id]
+    if status_data.get('status') == 'queued':
+        status_data = dict(status_data, queue_position=worker_pool.position(job_id))
+    return status_data
+
+
+def _publish_job(job_id: str) -> None:
+    """Push the job's current status to /events subscribers"""
+    if job_id in processing_status:
+        event_broker.publish('job', dict(_job_status_payload(job_id), job_id=job_id))
+
+
+def _publish_files() -> None:
+    """Tell /events subscribers that the output files changed"""
+    event_broker.publish('files', {'timestamp': time.time()})
+
+
+def _job_queue_update(action: str, job_id: str, *args) -> None:
+    """Mirror a job state change into the persistent job queue (never fails the job)"""
+    try:
+        getattr(get_job_queue(), action)(job_id, *args)
+    except Exception as e:
+        logger.warning(f"[{job_id}] Could not update job queue ({action}): {e}")
+
+
+def _persisted_job(job_id: str) -> dict:
+    """The job's record in the persistent job queue (None if unknown or unreadable)"""
+    try:
+        return get_job_queue().get(job_id)
+    except Exception as e:
+        logger.warning(f"[{job_id}] Job queue lookup failed: {e}")
+        return None
+
 
 @app.errorhandler(Exception)
 def handle_exception(e: Exception):
@@ -138,6 +190,9 @@ def process() -> Response:
     generate_pdf = data.get('generate_pdf', False)
     target_language = data.get('target_language', 'auto')  # NEW: Target language (auto, de, en)
     debug_truncate = data.get('debug_truncate', False)  # NEW: Debug mode for testing retry
+    duplicate_fast_path = data.get('duplicate_fast_path')  # Return stored result for repeats
+    if duplicate_fast_path is None:
+        duplicate_fast_path = get_bool('DUPLICATE_FAST_PATH')
     
     # Validation: At least one option must be selected
     if not create_trello_card and not generate_documents:
@@ -150,12 +205,25 @@ def process() -> Response:
         generate_pdf = False  # Silently ignore orphaned PDF flag
     
     # Generate unique job ID
-    job_id = f"job_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    job_id = _new_job_id()
+    
+    # Duplicate fast path: answer repeats from the database without starting a worker
+    if duplicate_fast_path:
+        try:
+            cached = get_cached_duplicate_result(url)
+        except Exception as e:
+            logger.warning(f"[{job_id}] Duplicate fast path lookup failed: {e}")
+            cached = None
+        if cached:
+            logger.info(f"[{job_id}] Duplicate fast path hit for: {url}")
+            processing_status[job_id] = _completed_status(cached, url)
+            _publish_job(job_id)
+            return jsonify({'job_id': job_id, 'duplicate': True})
     
-    # Initialize status
+    # Initialize status (queued until a worker picks the job up)
     processing_status[job_id] = {
-        'status': 'processing',
-        'message': 'Starting automation...',
+        'status': 'queued',
+        'message': 'Queued',
         'url': url,
         'progress': 0,
         'job_title': '',  # Will be populated after early scrape
@@ -165,14 +233,64 @@ def process() -> Response:
         'paused': False  # Pause flag
     }
     
-    # Process in background thread with settings
-    thread = threading.Thread(
-        target=process_in_background,
-        args=(job_id, url, create_trello_card, generate_documents, generate_pdf, target_language, debug_truncate)
+    # Persist the job so a restart can resume it
+    _job_queue_update('enqueue', job_id, url, {
+        'create_trello_card': create_trello_card,
+        'generate_documents': generate_documents,
+        'generate_pdf': generate_pdf,
+        'target_language': target_language,
+        'debug_truncate': debug_truncate,
+        'duplicate_fast_path': duplicate_fast_path,
+    })
+    
+    # Process on the worker pool with settings; jobs of one batch are interleaved
+    # fairly with other batches instead of all starting at once
+    queue_position = worker_pool.submit(
+        job_id, process_in_background,
+        job_id, url, create_trello_card, generate_documents, generate_pdf, target_language, debug_truncate,
+        duplicate_fast_path=duplicate_fast_path,
+        batch_id=data.get('batch_id')
     )
-    thread.start()
+    _publish_job(job_id)
+    
+    return jsonify({'job_id': job_id, 'queue_position': queue_position})
+
+def _completed_status(result: dict, url: str) -> dict:
+    """Build the 'complete' processing_status entry for a success or duplicate result"""
+    def to_str(val):
+        return str(val) if isinstance(val, Path) else val
+    
+    trello_card_url = None
+    if result.get('trello_card'):
+        trello_card_url = result['trello_card']['shortUrl']
     
-    return jsonify({'job_id': job_id})
+    if result['status'] == 'duplicate':
+        message = 'Already processed (returned stored result)'
+    else:
+        message = 'Automation complete!'
+    
+    return {
+        'status': 'complete',
+        'message': message,
+        'progress': 100,
+        'url': url,
+        'result': {
+            'company': result['job_data'].get('company_name'),
+            'title': result['job_data'].get('job_title'),
+            'location': result['job_data'].get('location'),
+            'source_url': result['job_data'].get('source_url'),
+            'company_page_url': result['job_data'].get('company_page_url'),
+            'trello_card': trello_card_url,
+            'is_duplicate': result.get('is_duplicate', False),  # NEW: Flag indicating duplicate
+            'timings': (result.get('timings') or {}).get('breakdown'),  # ms per stage/span
+            'files': {
+                # 'json': to_str(result.get('data_file')),  # JSON file generation disabled
+                # 'txt': to_str(result.get('cover_letter_text_file')),  # TXT file generation disabled
+                'docx': to_str(result.get('cover_letter_docx_file')),
+                'pdf': to_str(result.get('cover_letter_pdf_file'))
+            }
+        }
+    }
 
 def process_in_background(
     job_id: str,
@@ -181,38 +299,57 @@ def process_in_background(
     generate_documents: bool = True,
     generate_pdf: bool = False,
     target_language: str = 'auto',  # NEW: Target language (auto, de, en)
-    debug_truncate: bool = False  # NEW: Debug mode - truncate to 120 words
+    debug_truncate: bool = False,  # NEW: Debug mode - truncate to 120 words
+    duplicate_fast_path: bool = False,  # Return stored result for exact duplicates
+    resume_from: dict = None  # Checkpoint of an interrupted run (see resume_pending_jobs)
 ) -> None:
     """Process job in background with real-time progress updates"""
+    # Cancelled while waiting in the queue
+    if job_id not in processing_status or processing_status[job_id].get('status') == 'cancelled':
+        logger.info(f"[{job_id}] Job was cancelled before it started")
+        return
+    
     try:
+        processing_status[job_id]['status'] = 'processing'
         logger.info(f"[{job_id}] Starting background processing for: {url}")
         logger.info(f"[{job_id}] Settings: create_trello_card={create_trello_card}, generate_pdf={generate_pdf}")
+        _job_queue_update('mark_running', job_id)
         
         # Initialize progress
         processing_status[job_id]['message'] = 'Gathering Information'
         processing_status[job_id]['progress'] = 5
+        _publish_job(job_id)
         
         # Step 1: Do quick scrape BEFORE starting the blocking process_job_posting call
         # This gives frontend time to grab the data during early aggressive polling
-        logger.info(f"[{job_id}] Quick scrape to extract job info...")
-        try:
-            from main import detect_job_source, scrape_job_posting
-            
-            source = detect_job_source(url)
-            job_data = scrape_job_posting(url)
-            
-            if job_data:
-                # Set the fields immediately - frontend will poll and catch them
-                processing_status[job_id]['job_title'] = job_data.get('job_title', 'Unknown')
-                processing_status[job_id]['company_name'] = job_data.get('company_name', 'Unknown')
-                processing_status[job_id]['source_url'] = job_data.get('source_url')
-                processing_status[job_id]['company_page_url'] = job_data.get('company_page_url')
-                logger.info(f"[{job_id}] Job info extracted: {processing_status[job_id]['company_name']} - {processing_status[job_id]['job_title']}")
-                logger.info(f"[{job_id}] URLs - JD: {processing_status[job_id]['source_url']}, Company: {processing_status[job_id]['company_page_url']}")
-            else:
-                logger.warning(f"[{job_id}] Quick scrape returned no data")
-        except Exception as e:
-            logger.warning(f"[{job_id}] Quick scrape failed: {e}")
+        job_data = None
+        if resume_from and resume_from.get('job_data'):
+            # Resumed job: scraped data comes from the checkpoint
+            job_data = resume_from['job_data']
+            processing_status[job_id]['job_title'] = job_data.get('job_title', 'Unknown')
+            processing_status[job_id]['company_name'] = job_data.get('company_name', 'Unknown')
+            processing_status[job_id]['source_url'] = job_data.get('source_url')
+            processing_status[job_id]['company_page_url'] = job_data.get('company_page_url')
+            logger.info(f"[{job_id}] Resuming after stages: {resume_from.get('completed_stages')}")
+        else:
+            logger.info(f"[{job_id}] Quick scrape to extract job info...")
+            try:
+                from main import scrape_job_posting
+                
+                job_data = scrape_job_posting(url)
+                
+                if job_data:
+                    # Set the fields immediately - frontend will poll and catch them
+                    processing_status[job_id]['job_title'] = job_data.get('job_title', 'Unknown')
+                    processing_status[job_id]['company_name'] = job_data.get('company_name', 'Unknown')
+                    processing_status[job_id]['source_url'] = job_data.get('source_url')
+                    processing_status[job_id]['company_page_url'] = job_data.get('company_page_url')
+                    logger.info(f"[{job_id}] Job info extracted: {processing_status[job_id]['company_name']} - {processing_status[job_id]['job_title']}")
+                    logger.info(f"[{job_id}] URLs - JD: {processing_status[job_id]['source_url']}, Company: {processing_status[job_id]['company_page_url']}")
+                else:
+                    logger.warning(f"[{job_id}] Quick scrape returned no data")
+            except Exception as e:
+                logger.warning(f"[{job_id}] Quick scrape failed: {e}")
         
         # Check if job was cancelled while we were scraping
         if job_id not in processing_status:
@@ -220,6 +357,7 @@ def process_in_background(
             return
         
         processing_status[job_id]['progress'] = 15
+        _publish_job(job_id)
         
         # Create progress callback that will POST updates to the frontend
         def progress_callback(progress=0, message='', job_title='', company_name=''):
@@ -238,10 +376,13 @@ def process_in_background(
                 if company_name:
                     processing_status[job_id]['company_name'] = company_name
                 logger.debug(f"[{job_id}] Progress: {progress}% - {message}")
+                _publish_job(job_id)
             except Exception as e:
                 logger.warning(f"[{job_id}] Error in progress callback: {e}")
         
-        # NOW process the job with the specified settings
+        # NOW process the job with the specified settings.
+        # Reuse the quick scrape so the URL is fetched only once per job
+        # (falls back to scraping inside process_job_posting if it failed).
         result = process_job_posting(
             url,
             generate_cover_letter=generate_documents,
@@ -249,49 +390,26 @@ def process_in_background(
             create_trello_card=create_trello_card,
             target_language=target_language,
             progress_callback=progress_callback,  # NEW: Pass callback
-            debug_truncate=debug_truncate  # NEW: Pass debug flag
+            debug_truncate=debug_truncate,  # NEW: Pass debug flag
+            job_data=job_data,
+            duplicate_fast_path=duplicate_fast_path,
+            checkpoint_callback=lambda checkpoint: _job_queue_update('save_checkpoint', job_id, checkpoint),
+            resume_from=resume_from
         )
         logger.info(f"[{job_id}] Process result status: {result.get('status')}")
         
         # Check if job was cancelled while processing
         if job_id not in processing_status or processing_status[job_id].get('status') == 'cancelled':
             logger.warning(f"[{job_id}] Job was cancelled during processing, not updating status")
+            _job_queue_update('cancel', job_id)
             return
         
-        if result['status'] == 'success':
-            
-            def to_str(val):
-                return str(val) if isinstance(val, Path) else val
-            
+        if result['status'] in ('success', 'duplicate'):
             docx_file = result.get('cover_letter_docx_file')
             logger.info(f"[{job_id}] DOCX file created: {docx_file}")
             
             # Step 5: Complete
-            trello_card_url = None
-            if result.get('trello_card'):
-                trello_card_url = result['trello_card']['shortUrl']
-            
-            processing_status[job_id] = {
-                'status': 'complete',
-                'message': 'Automation complete!',
-                'progress': 100,
-                'url': processing_status[job_id].get('url'),
-                'result': {
-                    'company': result['job_data'].get('company_name'),
-                    'title': result['job_data'].get('job_title'),
-                    'location': result['job_data'].get('location'),
-                    'source_url': result['job_data'].get('source_url'),
-                    'company_page_url': result['job_data'].get('company_page_url'),
-                    'trello_card': trello_card_url,
-                    'is_duplicate': result.get('is_duplicate', False),  # NEW: Flag indicating duplicate
-                    'files': {
-                        # 'json': to_str(result.get('data_file')),  # JSON file generation disabled
-                        # 'txt': to_str(result.get('cover_letter_text_file')),  # TXT file generation disabled
-                        'docx': to_str(docx_file),
-                        'pdf': to_str(result.get('cover_letter_pdf_file'))
-                    }
-                }
-            }
+            processing_status[job_id] = _completed_status(result, processing_status[job_id].get('url'))
             logger.info(f"[{job_id}] Processing complete successfully")
         elif result['status'] == 'cover_letter_failed':
             # NEW: Handle cover letter generation failure (allow retry)
@@ -327,6 +445,14 @@ def process_in_background(
                 'message': f"Error: {result.get('error', 'Unknown error')}",
                 'progress': 100
             }
+        
+        if processing_status[job_id]['status'] == 'error':
+            _job_queue_update('fail', job_id, result.get('error', 'Unknown error'), processing_status[job_id])
+        else:
+            _job_queue_update('complete', job_id, processing_status[job_id])
+        _publish_job(job_id)
+        if result.get('cover_letter_docx_file'):
+            _publish_files()
     
     except Exception as e:
         logger.exception(f"[{job_id}] Exception in background processing: {e}")
@@ -335,17 +461,130 @@ def process_in_background(
             'message': f'Error: {str(e)}',
             'progress': 100
         }
+        _job_queue_update('fail', job_id, str(e), processing_status[job_id])
+        _publish_job(job_id)
+
+
+def resume_pending_jobs() -> int:
+    """
+    Restart jobs that were pending or running when the server stopped.
+    
+    Each job resumes from its last checkpoint, so completed stages (scraping,
+    Trello card, cover letter text) are not repeated. An interrupted cover
+    letter retry is not rerun; the job goes back to 'cover_letter_failed' so
+    the retry can be started again.
+    
+    Returns:
+        Number of resumed jobs
+    """
+    try:
+        # CLI jobs ('cli_...') share the queue but are resumed by main.py
+        jobs = get_job_queue().get_resumable(prefix='job_')
+    except Exception as e:
+        logger.warning(f"Could not load pending jobs: {e}")
+        return 0
+    
+    resumed = 0
+    for job in jobs:
+        job_id = job['job_id']
+        if (job.get('result') or {}).get('status') == 'cover_letter_failed':
+            # A cover letter retry was interrupted: the pipeline already finished, so
+            # offer the retry again instead of rerunning the job
+            logger.info(f"[{job_id}] Cover letter retry interrupted by restart")
+            processing_status[job_id] = dict(
+                job['result'], url=job['url'], message='Cover letter retry interrupted by restart'
+            )
+            _job_queue_update('fail', job_id, 'Retry interrupted by restart', processing_status[job_id])
+            continue
+        
+        options = job['options']
+        checkpoint = job.get('checkpoint') or {}
+        job_data = checkpoint.get('job_data') or {}
+        logger.info(f"[{job_id}] Resuming job (attempt {job['attempts'] + 1}): {job['url']}")
+        
+        processing_status[job_id] = {
+            'status': 'queued',
+            'message': 'Queued (resuming)',
+            'url': job['url'],
+            'progress': 0,
+            'job_title': job_data.get('job_title', ''),
+            'company_name': job_data.get('company_name', ''),
+            'source_url': job_data.get('source_url'),
+            'company_page_url': job_data.get('company_page_url'),
+            'paused': False
+        }
+        worker_pool.submit(
+            job_id, process_in_background,
+            job_id, job['url'],
+            options.get('create_trello_card', True),
+            options.get('generate_documents', True),
+            options.get('generate_pdf', False),
+            options.get('target_language', 'auto'),
+            options.get('debug_truncate', False),
+            duplicate_fast_path=options.get('duplicate_fast_path', False),
+            resume_from=checkpoint or None,
+            batch_id='resumed'
+        )
+        resumed += 1
+    
+    return resumed
 
 @app.route('/status/<job_id>')
 def status(job_id: str) -> Response:
     """Get processing status"""
     if job_id not in processing_status:
+        # Finished before the last restart? Serve the persisted final status
+        job = _persisted_job(job_id)
+        if job and job.get('result'):
+            return jsonify(job['result'])
         return jsonify({'error': 'Job not found'}), 404
     
-    status_data = processing_status[job_id]
+    status_data = _job_status_payload(job_id)
     logger.debug(f"[{job_id}] Status response: source_url={status_data.get('source_url')}, company_page_url={status_data.get('company_page_url')}")
     return jsonify(status_data)
 
+@app.route('/events')
+def events() -> Response:
+    """Server-Sent Events stream of job status changes (replaces /status polling)
+    
+    Events:
+        - job:   full status payload of one job (same shape as /status) plus 'job_id'
+        - files: output files changed; clients reload /api/recent-files
+    
+    Query params:
+        - job_id (repeatable): only stream these jobs (default: all jobs)
+    
+    On connect, the current status of the requested jobs is sent first.
+    A comment line is sent every 15s to keep proxies from closing the stream.
+    """
+    job_filter = set(request.args.getlist('job_id'))
+    subscription = event_broker.subscribe()
+    
+    def stream():
+        try:
+            yield "retry: 3000\n\n"
+            # Initial snapshot so clients that connect late don't miss state
+            for job_id in list(processing_status):
+                if not job_filter or job_id in job_filter:
+                    snapshot = dict(_job_status_payload(job_id), job_id=job_id)
+                    yield format_sse({'id': 0, 'event': 'job', 'data': snapshot})
+            while True:
+                event = subscription.get(timeout=15)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                if job_filter and event['event'] == 'job' and event['data'].get('job_id') not in job_filter:
+                    continue
+                yield format_sse(event)
+        finally:
+            subscription.close()
+    
+    return Response(
+        stream_with_context(stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/update-progress/<job_id>', methods=['POST'])
 def update_progress(job_id: str) -> Response:
     """Update job progress from backend processing (main.py)"""
@@ -365,6 +604,7 @@ def update_progress(job_id: str) -> Response:
         processing_status[job_id]['company_name'] = str(data['company_name'])
     
     logger.debug(f"[{job_id}] Progress updated: {data}")
+    _publish_job(job_id)
     return jsonify({'success': True, 'status': processing_status[job_id]['status']})
 
 @app.route('/pause/<job_id>', methods=['POST'])
@@ -383,6 +623,7 @@ def pause_job(job_id: str) -> Response:
         processing_status[job_id]['message'] = 'Resuming...'
     
     logger.info(f"[{job_id}] Job {'paused' if is_paused else 'resumed'}")
+    _publish_job(job_id)
     return jsonify({'paused': is_paused})
 
 @app.route('/cancel', methods=['POST'])
@@ -396,6 +637,9 @@ def cancel_all() -> Response:
                 logger.info(f"[{job_id}] Marking job as cancelled")
                 processing_status[job_id]['status'] = 'cancelled'
                 processing_status[job_id]['message'] = 'Job cancelled by user'
+                worker_pool.cancel(job_id)
+                _job_queue_update('cancel', job_id)
+                _publish_job(job_id)
         
         logger.info("All jobs marked as cancelled")
         return jsonify({'success': True, 'message': 'All jobs cancelled'})
@@ -407,7 +651,13 @@ def cancel_all() -> Response:
 def retry_cover_letter(job_id: str) -> Response:
     """Retry cover letter generation for a failed job"""
     if job_id not in processing_status:
-        return jsonify({'error': 'Job not found'}), 404
+        # Failed before the last restart? Restore it from the job queue
+        job = _persisted_job(job_id)
+        if not job or not job.get('result'):
+            return jsonify({'error': 'Job not found'}), 404
+        if job['result'].get('status') != 'cover_letter_failed':
+            return jsonify({'error': 'Job must have cover_letter_failed status to retry'}), 400
+        processing_status[job_id] = dict(job['result'], url=job['url'])
     
     status_info = processing_status[job_id]
     if status_info['status'] != 'cover_letter_failed':
@@ -418,12 +668,19 @@ def retry_cover_letter(job_id: str) -> Response:
     if not job_data:
         return jsonify({'error': 'Job data not found for retry'}), 400
     
-    # Reset status and start retry in background
-    processing_status[job_id]['status'] = 'processing'
+    # Reset status and queue the retry on the worker pool
+    processing_status[job_id]['status'] = 'queued'
     processing_status[job_id]['progress'] = 60  # Start at AI phase
-    processing_status[job_id]['message'] = 'Generating Cover Letter with AI (Retry)'
+    processing_status[job_id]['message'] = 'Queued (Retry)'
     
     def retry_in_background():
+        if processing_status.get(job_id, {}).get('status') != 'queued':
+            logger.info(f"[{job_id}] Retry was cancelled before it started")
+            return
+        processing_status[job_id]['status'] = 'processing'
+        processing_status[job_id]['message'] = 'Generating Cover Letter with AI (Retry)'
+        _job_queue_update('mark_running', job_id)
+        _publish_job(job_id)
         try:
             from cover_letter import CoverLetterGenerator
             
@@ -437,6 +694,7 @@ def retry_cover_letter(job_id: str) -> Response:
                 processing_status[job_id]['status'] = 'cover_letter_failed'
                 processing_status[job_id]['message'] = 'Cover letter generation failed (still too short)'
                 logger.warning(f"[{job_id}] Retry failed: No cover letter generated")
+                _job_queue_update('fail', job_id, 'No cover letter generated', processing_status[job_id])
                 return
             
             # Store in job_data for document generation
@@ -490,18 +748,27 @@ def retry_cover_letter(job_id: str) -> Response:
                 }
             }
             logger.info(f"[{job_id}] Cover letter retry successful!")
+            _job_queue_update('complete', job_id, processing_status[job_id])
             
         except Exception as e:
             logger.exception(f"[{job_id}] Cover letter retry failed: {e}")
             processing_status[job_id]['status'] = 'cover_letter_failed'
             processing_status[job_id]['message'] = f'Retry failed: {str(e)}'
             processing_status[job_id]['progress'] = 100
+            _job_queue_update('fail', job_id, str(e), processing_status[job_id])
+    
+    def retry_and_publish():
+        try:
+            retry_in_background()
+        finally:
+            _publish_job(job_id)
+            if processing_status.get(job_id, {}).get('status') == 'complete':
+                _publish_files()
     
-    import threading
-    retry_thread = threading.Thread(target=retry_in_background, daemon=True)
-    retry_thread.start()
+    queue_position = worker_pool.submit(job_id, retry_and_publish)
+    _publish_job(job_id)
     
-    return jsonify({'success': True, 'message': 'Cover letter retry started'})
+    return jsonify({'success': True, 'message': 'Cover letter retry started', 'queue_position': queue_position})
 
 
 @app.route('/delete/<job_id>', methods=['POST'])
@@ -566,6 +833,8 @@ def delete_job(job_id: str) -> Response:
         
         logger.info(f"[{job_id}] Job deleted successfully. Trello: {deleted['trello_card']}, "
                    f"DOCX: {deleted['docx']}, PDF: {deleted['pdf']}, DB: {deleted['database']}")
+        if deleted['docx'] or deleted['pdf']:
+            _publish_files()
         
         return jsonify({
             'success': True,
@@ -801,6 +1070,34 @@ def api_recent_files() -> Response:
         logger.exception("Error getting recent files: %s", e)
         return jsonify({'files': []})
 
+@app.get('/api/timings')
+def api_timings() -> Response:
+    """API endpoint: p50/p95 duration per processing stage and span
+    
+    Query params:
+      - period: all | month | week | day (default all)
+      - limit: most recent samples per span (default 500, max 5000)
+    """
+    try:
+        period = request.args.get('period', 'all')
+        limit = max(1, min(5000, int(request.args.get('limit', 500))))
+        return jsonify({'period': period, 'spans': get_db().get_timing_stats(period=period, limit=limit)})
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    except Exception as e:
+        logger.exception("Error getting timing stats: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+@app.get('/api/http-metrics')
+def api_http_metrics() -> Response:
+    """API endpoint: outgoing HTTP requests per host since startup
+    
+    Per host: requests, errors, retries, bytes, status/method/cache counts and
+    latency percentiles (ms) over the most recent requests. ``connections``
+    reports DNS cache hits and TLS session resumptions with the time saved.
+    """
+    return jsonify({**http_metrics.snapshot(), 'connections': connection_stats()})
+
 @app.route('/health')
 def health() -> Response:
     """Health check endpoint for monitoring
@@ -818,7 +1115,11 @@ def health() -> Response:
                 'database': 'unknown',
                 'trello': 'unknown',
                 'openai': 'unknown',
-            }
+            },
+            'workers': worker_pool.stats(),
+            'http_pool': session_pool.stats(),
+            'rate_limits': get_rate_limiter().stats(),
+            'circuit_breakers': get_breakers().stats(),
         }
         
         # Check database connectivity
@@ -843,6 +1144,8 @@ def health() -> Response:
         except Exception as trello_error:
             logger.warning("Trello health check failed: %s", trello_error)
             health_status['services']['trello'] = 'error'
+        if health_status['circuit_breakers'].get('api.trello.com', {}).get('state') == 'open':
+            health_status['services']['trello'] = 'circuit_open'
         
         # Check OpenAI credentials
         try:
@@ -885,6 +1188,12 @@ if __name__ == '__main__':
     port = app.config['PORT']
     debug = app.config['DEBUG']
     
+    # Pick up jobs interrupted by the last shutdown (in the reloader child only when debugging)
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        resumed = resume_pending_jobs()
+        if resumed:
+            logger.info("Resumed %s interrupted job(s) from the job queue", resumed)
+    
     logger.info("Starting web server...")
     base_url = f"http://{host}:{port}"
     logger.info("Open your browser and go to:")
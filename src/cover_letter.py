@@ -4,9 +4,13 @@ Implements CoverLetterGenerator for AI-powered cover letter generation using Ope
 Loads CVs, builds prompts, detects language/seniority, and saves cover letters.
 """
 
+import asyncio
+import inspect
 import os
 import re
+import threading
 import time
+import weakref
 from functools import wraps
 from pathlib import Path
 from typing import Optional, Dict, Any, Callable, TypeVar
@@ -14,19 +18,29 @@ try:
     from .utils.env import get_str
     from .utils.log_config import get_logger
     from .utils.errors import AIGenerationError
+    from .utils.timing import span
+    from .utils.connection_cache import httpx_async_transport, httpx_transport
 except ImportError:
     import sys
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
     from utils.env import get_str
     from utils.log_config import get_logger
     from utils.errors import AIGenerationError
+    from utils.timing import span
+    from utils.connection_cache import httpx_async_transport, httpx_transport
 try:
-    from openai import OpenAI, RateLimitError, AuthenticationError, APIError
+    from openai import OpenAI, AsyncOpenAI, RateLimitError, AuthenticationError, APIError
 except ImportError:
     OpenAI = None
+    AsyncOpenAI = None
     RateLimitError = Exception
     AuthenticationError = Exception
     APIError = Exception
+try:
+    from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+except ImportError:
+    DefaultHttpxClient = None
+    DefaultAsyncHttpxClient = None
 try:
     import pypdf
 except ImportError:
@@ -35,10 +49,46 @@ except ImportError:
 # Type variable for retry decorator
 F = TypeVar('F', bound=Callable)
 
+# AsyncOpenAI clients per event loop and API key: all generators on a loop share one
+# client (and its connection pool) instead of each job leaving an unclosed one behind
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
+
+def _handle_failed_attempt(e: Exception, attempt: int, max_attempts: int, delay: float, logger) -> None:
+    """Log a failed API attempt; raise AIGenerationError if it must not (or can no longer) be retried."""
+    last_attempt = attempt == max_attempts - 1
+    if isinstance(e, RateLimitError):
+        if last_attempt:
+            logger.error("Rate limit exceeded after %d attempts", max_attempts)
+            raise AIGenerationError(f"Failed after {max_attempts} attempts: {e}") from e
+        logger.warning(
+            "Rate limit hit (attempt %d/%d). Waiting %.1f seconds before retry...",
+            attempt + 1, max_attempts, delay
+        )
+    elif isinstance(e, AuthenticationError):
+        logger.error("Authentication failed: %s. Check OPENAI_API_KEY", e)
+        raise AIGenerationError(f"OpenAI authentication failed: {e}") from e
+    elif isinstance(e, APIError):
+        if last_attempt:
+            logger.error("OpenAI API error after %d attempts: %s", max_attempts, e)
+            raise AIGenerationError(f"Failed after {max_attempts} attempts: {e}") from e
+        logger.warning(
+            "OpenAI API error (attempt %d/%d): %s. Waiting %.1f seconds before retry...",
+            attempt + 1, max_attempts, e, delay
+        )
+    else:
+        # For non-API exceptions, fail immediately without retry
+        logger.error("Unexpected error (no retry): %s", e)
+        raise AIGenerationError(f"Unexpected error: {e}") from e
+
+
 def exponential_backoff_retry(max_attempts: int = 3, initial_delay: float = 1.0, backoff_factor: float = 2.0):
     """
     Decorator for exponential backoff retry logic for API calls.
     
+    Works for both regular and async methods (async methods wait with asyncio.sleep).
+    
     Args:
         max_attempts: Maximum number of retry attempts (default: 3)
         initial_delay: Initial delay in seconds (default: 1.0)
@@ -48,48 +98,31 @@ def exponential_backoff_retry(max_attempts: int = 3, initial_delay: float = 1.0,
         Decorator function
     """
     def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                logger = get_logger(__name__)
+                delay = initial_delay
+                for attempt in range(max_attempts):
+                    try:
+                        return await func(self, *args, **kwargs)
+                    except Exception as e:
+                        _handle_failed_attempt(e, attempt, max_attempts, delay, logger)
+                    await asyncio.sleep(delay)
+                    delay *= backoff_factor
+            return async_wrapper
+        
         @wraps(func)
         def wrapper(self, *args, **kwargs):
             logger = get_logger(__name__)
             delay = initial_delay
-            last_exception = None
-            
             for attempt in range(max_attempts):
                 try:
                     return func(self, *args, **kwargs)
-                except RateLimitError as e:
-                    last_exception = e
-                    if attempt < max_attempts - 1:
-                        logger.warning(
-                            "Rate limit hit (attempt %d/%d). Waiting %.1f seconds before retry...",
-                            attempt + 1, max_attempts, delay
-                        )
-                        time.sleep(delay)
-                        delay *= backoff_factor
-                    else:
-                        logger.error("Rate limit exceeded after %d attempts", max_attempts)
-                except AuthenticationError as e:
-                    logger.error("Authentication failed: %s. Check OPENAI_API_KEY", e)
-                    raise AIGenerationError(f"OpenAI authentication failed: {e}") from e
-                except APIError as e:
-                    last_exception = e
-                    if attempt < max_attempts - 1:
-                        logger.warning(
-                            "OpenAI API error (attempt %d/%d): %s. Waiting %.1f seconds before retry...",
-                            attempt + 1, max_attempts, e, delay
-                        )
-                        time.sleep(delay)
-                        delay *= backoff_factor
-                    else:
-                        logger.error("OpenAI API error after %d attempts: %s", max_attempts, e)
                 except Exception as e:
-                    # For non-API exceptions, fail immediately without retry
-                    logger.error("Unexpected error (no retry): %s", e)
-                    raise AIGenerationError(f"Unexpected error: {e}") from e
-            
-            # All retries exhausted
-            if last_exception:
-                raise AIGenerationError(f"Failed after {max_attempts} attempts: {last_exception}") from last_exception
+                    _handle_failed_attempt(e, attempt, max_attempts, delay, logger)
+                time.sleep(delay)
+                delay *= backoff_factor
             
         return wrapper
         
@@ -102,7 +135,7 @@ class CoverLetterGenerator:
         if not self.api_key or self.api_key.strip() == '':
             raise ValueError("OPENAI_API_KEY not found in environment")
         self.model = get_str('OPENAI_MODEL', default='gpt-4o-mini')
-        self.client = OpenAI(api_key=self.api_key) if OpenAI else None
+        self.client = OpenAI(api_key=self.api_key, **self._http_client_kwargs()) if OpenAI else None
         
         # Use absolute paths for CV files to work regardless of current working directory
         project_root = Path(__file__).parent.parent  # Go up from src/ to project root
@@ -284,6 +317,74 @@ class CoverLetterGenerator:
             auto_trim: If True, attempt to fix too-short content via auto_trim
             debug_truncate: If True, artificially truncate to 120 words for testing retry flow
         """
+        request = self._prepare_generation(job_data, target_language, tone)
+        if not self.client:
+            self.logger.error("OpenAI client not available")
+            raise AIGenerationError("OpenAI client not available")
+        
+        # API call - retry logic handled by decorator
+        with span('openai.chat', model=self.model) as attrs:
+            response = self.client.chat.completions.create(**request['completion'])
+            self._record_usage(response, attrs)
+        
+        return self._finish_generation(job_data, response, request, auto_trim=auto_trim, debug_truncate=debug_truncate)
+
+    @exponential_backoff_retry(max_attempts=3, initial_delay=1.0, backoff_factor=2.0)
+    async def agenerate_cover_letter(self, job_data: Dict[str, Any], target_language: Optional[str] = None, *, tone: Optional[str] = None, auto_trim: bool = False, debug_truncate: bool = False) -> str:
+        """
+        Async variant of generate_cover_letter using the AsyncOpenAI client.
+        
+        Same arguments, result and job_data side effects; the OpenAI request
+        and the retry backoff don't block the event loop.
+        """
+        request = self._prepare_generation(job_data, target_language, tone)
+        client = self._get_async_client()
+        if not client:
+            self.logger.error("OpenAI async client not available")
+            raise AIGenerationError("OpenAI client not available")
+        
+        with span('openai.chat', model=self.model) as attrs:
+            response = await client.chat.completions.create(**request['completion'])
+            self._record_usage(response, attrs)
+        
+        return self._finish_generation(job_data, response, request, auto_trim=auto_trim, debug_truncate=debug_truncate)
+
+    def _get_async_client(self):
+        """Return the running event loop's shared AsyncOpenAI client (created on first use)."""
+        if not AsyncOpenAI:
+            return None
+        loop = asyncio.get_running_loop()
+        with _async_clients_lock:
+            clients = _async_clients.setdefault(loop, {})
+            client = clients.get(self.api_key)
+            if client is None or client.is_closed():
+                client = clients[self.api_key] = AsyncOpenAI(
+                    api_key=self.api_key, **self._http_client_kwargs(use_async=True)
+                )
+            return client
+
+    @staticmethod
+    def _http_client_kwargs(use_async: bool = False) -> Dict[str, Any]:
+        """OpenAI SDK HTTP client that reuses cached DNS answers and TLS sessions."""
+        if use_async and DefaultAsyncHttpxClient:
+            return {'http_client': DefaultAsyncHttpxClient(transport=httpx_async_transport())}
+        if not use_async and DefaultHttpxClient:
+            return {'http_client': DefaultHttpxClient(transport=httpx_transport())}
+        return {}
+
+    @staticmethod
+    def _record_usage(response: Any, attrs: Dict[str, Any]) -> None:
+        """Copy token usage of an OpenAI response into timing span attributes."""
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            attrs.update(
+                prompt_tokens=getattr(usage, 'prompt_tokens', None),
+                completion_tokens=getattr(usage, 'completion_tokens', None),
+                total_tokens=getattr(usage, 'total_tokens', None),
+            )
+
+    def _prepare_generation(self, job_data: Dict[str, Any], target_language: Optional[str], tone: Optional[str]) -> Dict[str, Any]:
+        """Detect language/seniority/formality, build the salutation and the OpenAI request."""
         job_description = job_data.get('job_description', '')
         if not target_language:
             target_language = self.detect_language(job_description)
@@ -306,22 +407,26 @@ class CoverLetterGenerator:
         
         # Generate main body text (AI-generated)
         prompt = self._build_prompt(job_data, cv_text, target_language, seniority, tone=tone, formality=formality)
-        if not self.client:
-            self.logger.error("OpenAI client not available")
-            raise AIGenerationError("OpenAI client not available")
-        
-        # API call - retry logic handled by decorator
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": self._get_system_prompt(target_language, seniority)},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=600
-        )
+        return {
+            'language': target_language,
+            'formality': formality,
+            'seniority': seniority,
+            'salutation': salutation,
+            'completion': {
+                'model': self.model,
+                'messages': [
+                    {"role": "system", "content": self._get_system_prompt(target_language, seniority)},
+                    {"role": "user", "content": prompt}
+                ],
+                'temperature': 0.7,
+                'max_tokens': 600,
+            },
+        }
 
+    def _finish_generation(self, job_data: Dict[str, Any], response: Any, request: Dict[str, Any], *, auto_trim: bool, debug_truncate: bool) -> str:
+        """Validate the generated body, add the valediction and store all parts in job_data."""
         cover_letter_body = response.choices[0].message.content.strip()
+        salutation = request['salutation']
 
         # DEBUG: If debug_truncate enabled, artificially truncate to 120 words for testing retry flow
         if debug_truncate:
@@ -349,7 +454,7 @@ class CoverLetterGenerator:
             self.logger.info("Cover letter word count %s is acceptable but not ideal (target: 180-240)", word_count)
         
         # Generate valediction
-        valediction = self.generate_valediction(target_language, formality, seniority)
+        valediction = self.generate_valediction(request['language'], request['formality'], request['seniority'])
         self.logger.debug("Generated valediction: %s", valediction)
         
         # Store all three parts in job_data for docx_generator
@@ -6,12 +6,14 @@ Lightweight SQLite database for duplicate detection and generation tracking.
 import sqlite3
 import hashlib
 import os
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from contextlib import contextmanager
 
 from utils.log_config import get_logger
+from utils.timing import percentile
 
 logger = get_logger(__name__)
 
@@ -44,6 +46,9 @@ class ApplicationDB:
             self._create_schema()
         else:
             logger.debug(f"Using existing database: {self.db_path}")
+        
+        # Added after the initial schema, so also created for existing databases
+        self._create_timing_schema()
     
     @contextmanager
     def _get_connection(self):
@@ -135,6 +140,27 @@ class ApplicationDB:
             conn.commit()
             logger.info("Database schema created successfully")
     
+    def _create_timing_schema(self):
+        """Create the job_timings table (per-job stage durations) if it doesn't exist."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS job_timings (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    source_url TEXT NOT NULL,
+                    status TEXT,
+                    span_name TEXT NOT NULL,
+                    duration_ms REAL NOT NULL,
+                    recorded_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_timings_span
+                ON job_timings(span_name, recorded_at DESC)
+            """)
+    
     @staticmethod
     def _calculate_job_id(source_url: str) -> str:
         """
@@ -333,6 +359,43 @@ class ApplicationDB:
             row = cursor.fetchone()
             return dict(row) if row else None
     
+    def get_cached_result(self, source_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a processed job together with its latest AI generation (single query).
+        
+        Used by the duplicate fast path to answer repeat URLs without scraping.
+        
+        Args:
+            source_url: Job posting URL
+            
+        Returns:
+            Dictionary with processed_jobs columns plus ai_model, language,
+            word_count, cover_letter_text and generated_at (None if never
+            generated), or None if the URL was never processed
+        """
+        job_id = self._calculate_job_id(source_url)
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT j.job_id, j.source_url, j.company_name, j.job_title,
+                       j.processed_at, j.trello_card_id, j.trello_card_url,
+                       j.docx_file_path,
+                       g.ai_model, g.language, g.word_count,
+                       g.cover_letter_text, g.generated_at
+                FROM processed_jobs j
+                LEFT JOIN generation_metadata g ON g.id = (
+                    SELECT id FROM generation_metadata
+                    WHERE job_id = j.job_id
+                    ORDER BY generated_at DESC, id DESC
+                    LIMIT 1
+                )
+                WHERE j.job_id = ?
+            """, (job_id,))
+            
+            row = cursor.fetchone()
+            return dict(row) if row else None
+    
     def get_generation_history(self, job_id: str) -> List[Dict[str, Any]]:
         """
         Get all AI generations for a specific job (if regenerated multiple times).
@@ -390,6 +453,81 @@ class ApplicationDB:
             row = cursor.fetchone()
             return dict(row) if row else {}
     
+    def save_job_timings(self, source_url: str, status: Optional[str], timings: Dict[str, Any]) -> None:
+        """
+        Store the timing breakdown of one processing run.
+        
+        One row per span name (summed over the run) plus a 'job.total' row.
+        
+        Args:
+            source_url: Job posting URL
+            status: Final job status (success, partial_success, failed, ...)
+            timings: Summary from utils.timing.JobTimer.summary()
+        """
+        job_id = self._calculate_job_id(source_url)
+        rows = [(job_id, source_url, status, 'job.total', timings['total_ms'])]
+        rows.extend(
+            (job_id, source_url, status, name, duration_ms)
+            for name, duration_ms in timings.get('breakdown', {}).items()
+        )
+        
+        with self._get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO job_timings (job_id, source_url, status, span_name, duration_ms)
+                VALUES (?, ?, ?, ?, ?)
+            """, rows)
+    
+    def get_timing_stats(self, period: str = 'all', limit: int = 500) -> Dict[str, Dict[str, Any]]:
+        """
+        Get timing aggregates per span name over recent runs.
+        
+        Args:
+            period: 'all', 'month', 'week', 'day'
+            limit: Maximum number of most recent samples per span name
+            
+        Returns:
+            Dictionary mapping span name to count, p50_ms, p95_ms, mean_ms and max_ms
+        """
+        # date() modifiers bound as parameters; None means no cutoff
+        date_modifiers = {
+            'day': 'start of day',
+            'week': '-7 days',
+            'month': 'start of month',
+            'all': None
+        }
+        modifier = date_modifiers.get(period)
+        
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT span_name, duration_ms
+                FROM (
+                    SELECT span_name, duration_ms, recorded_at, id,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY span_name
+                               ORDER BY recorded_at DESC, id DESC
+                           ) AS rn
+                    FROM job_timings
+                    WHERE ? IS NULL OR recorded_at >= date('now', ?)
+                )
+                WHERE rn <= ?
+                ORDER BY span_name, recorded_at DESC, id DESC
+            """, (modifier, modifier, limit))
+            samples: Dict[str, List[float]] = {}
+            for row in cursor.fetchall():
+                samples.setdefault(row['span_name'], []).append(row['duration_ms'])
+        
+        return {
+            name: {
+                'count': len(durations),
+                'p50_ms': percentile(durations, 50),
+                'p95_ms': percentile(durations, 95),
+                'mean_ms': round(sum(durations) / len(durations), 1),
+                'max_ms': max(durations),
+            }
+            for name, durations in sorted(samples.items())
+        }
+    
     def search_jobs(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
         """
         Search jobs by company name or job title.
@@ -533,6 +671,7 @@ class ApplicationDB:
 
 # Singleton instance
 _db_instance: Optional[ApplicationDB] = None
+_db_lock = threading.Lock()
 
 
 def get_db() -> ApplicationDB:
@@ -549,10 +688,13 @@ def get_db() -> ApplicationDB:
     """
     global _db_instance
     if _db_instance is None:
-        # Load environment-specific config if needed
-        from utils.env import get_str
-        db_path = get_str('DATABASE_FILE', default='db/applications_dev.db')
-        _db_instance = ApplicationDB(db_path=db_path)
+        # Lock so concurrent batch workers don't race to create the schema
+        with _db_lock:
+            if _db_instance is None:
+                # Load environment-specific config if needed
+                from utils.env import get_str
+                db_path = get_str('DATABASE_FILE', default='db/applications_dev.db')
+                _db_instance = ApplicationDB(db_path=db_path)
     return _db_instance
 
 
@@ -0,0 +1,210 @@
+"""
+Persistent Job Queue
+SQLite-backed queue for web UI and CLI jobs with checkpointed stage outputs.
+
+A job moves through the states pending → running → completed/failed/cancelled.
+After every completed processing stage the job's checkpoint (scraped data,
+Trello card, cover letter text, document paths) is written to the queue, so a
+restart can resume interrupted jobs from the last completed stage instead of
+redoing the scrape and the OpenAI call.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.log_config import get_logger
+
+logger = get_logger(__name__)
+
+# Job states
+PENDING = 'pending'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+# States that a restart should pick up again
+RESUMABLE_STATES = (PENDING, RUNNING)
+
+
+class JobQueue:
+    """
+    Durable queue of submitted jobs.
+
+    Stores per job: URL, processing options, state, attempt count, the latest
+    checkpoint and the final status payload shown in the UI.
+    """
+
+    def __init__(self, db_path: str = "data/applications.db"):
+        """
+        Initialize the queue (creates its table next to the application tables).
+
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._create_schema()
+
+    @contextmanager
+    def _get_connection(self):
+        """Context manager for database connections."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Job queue database error: {e}")
+            raise
+        finally:
+            conn.close()
+
+    def _create_schema(self):
+        """Create the job_queue table if it doesn't exist."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS job_queue (
+                    job_id TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    options TEXT NOT NULL DEFAULT '{}',
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    checkpoint TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_job_queue_state
+                ON job_queue(state, created_at)
+            """)
+
+    @staticmethod
+    def _to_json(value: Any) -> Optional[str]:
+        return None if value is None else json.dumps(value, default=str, ensure_ascii=False)
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        for key in ('options', 'checkpoint', 'result'):
+            job[key] = json.loads(job[key]) if job.get(key) else None
+        job['options'] = job['options'] or {}
+        return job
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._get_connection() as conn:
+            conn.execute(
+                f"UPDATE job_queue SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE job_id = ?",
+                (*fields.values(), job_id)
+            )
+
+    def enqueue(self, job_id: str, url: str, options: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Add a new pending job.
+
+        Args:
+            job_id: Unique job identifier
+            url: Job posting URL
+            options: Keyword options for process_job_posting (must be JSON serializable)
+        """
+        with self._lock, self._get_connection() as conn:
+            conn.execute(
+                "INSERT INTO job_queue (job_id, url, options, state) VALUES (?, ?, ?, ?)",
+                (job_id, url, self._to_json(options or {}), PENDING)
+            )
+        logger.debug(f"Queued job {job_id}: {url}")
+
+    def mark_running(self, job_id: str) -> None:
+        """Mark a job as running and count the attempt."""
+        with self._lock, self._get_connection() as conn:
+            conn.execute("""
+                UPDATE job_queue
+                SET state = ?, attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE job_id = ?
+            """, (RUNNING, job_id))
+
+    def save_checkpoint(self, job_id: str, checkpoint: Dict[str, Any]) -> None:
+        """Store the latest stage outputs of a job."""
+        self._update(job_id, checkpoint=self._to_json(checkpoint))
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Mark a job as completed and store its final status payload."""
+        self._update(job_id, state=COMPLETED, result=self._to_json(result), error=None)
+
+    def fail(self, job_id: str, error: str, result: Optional[Dict[str, Any]] = None) -> None:
+        """Mark a job as failed."""
+        self._update(job_id, state=FAILED, error=error, result=self._to_json(result))
+
+    def cancel(self, job_id: str) -> None:
+        """Mark a job as cancelled so it is not resumed."""
+        self._update(job_id, state=CANCELLED)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job by id.
+
+        Returns:
+            Job dictionary (options/checkpoint/result decoded) or None
+        """
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT * FROM job_queue WHERE job_id = ?", (job_id,)).fetchone()
+            return self._row_to_dict(row) if row else None
+
+    def get_resumable(self, prefix: str = '') -> List[Dict[str, Any]]:
+        """
+        Get jobs that were pending or running when the process stopped.
+
+        Args:
+            prefix: Only jobs whose id starts with this prefix (web and CLI
+                    jobs share the table but each resumes only its own)
+
+        Returns:
+            List of job dictionaries, oldest first
+        """
+        placeholders = ", ".join("?" for _ in RESUMABLE_STATES)
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM job_queue WHERE state IN ({placeholders}) AND substr(job_id, 1, ?) = ? "
+                "ORDER BY created_at, rowid",
+                (*RESUMABLE_STATES, len(prefix), prefix)
+            ).fetchall()
+            return [self._row_to_dict(row) for row in rows]
+
+    def count_by_state(self) -> Dict[str, int]:
+        """Return the number of jobs per state."""
+        with self._get_connection() as conn:
+            rows = conn.execute("SELECT state, COUNT(*) AS count FROM job_queue GROUP BY state").fetchall()
+            return {row['state']: row['count'] for row in rows}
+
+
+# Singleton instance
+_queue_instance: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Get singleton job queue instance (stored in the same file as ApplicationDB).
+
+    Returns:
+        JobQueue instance
+    """
+    global _queue_instance
+    if _queue_instance is None:
+        with _queue_lock:
+            if _queue_instance is None:
+                from utils.env import get_str
+                db_path = get_str('DATABASE_FILE', default='db/applications_dev.db')
+                _queue_instance = JobQueue(db_path=db_path)
+    return _queue_instance
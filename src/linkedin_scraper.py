@@ -4,27 +4,39 @@ Extracts full job descriptions from LinkedIn using Playwright for dynamic conten
 """
 
 import asyncio
+import functools
+import importlib.util
 import requests
 from bs4 import BeautifulSoup
 import re
 from urllib.parse import urlparse, parse_qs
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, Union
 from datetime import datetime
 
-try:
-    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
-
 try:
     from .scraper import BaseJobScraper, JobData
+    from .utils.http_cache import get_response_cache
+    from .utils.http_utils import arequest_with_retries
+    from .utils.html_scan import SoupPage, SubtreeFilter, class_pattern
     from .utils.log_config import get_logger
+    from .utils.text_patterns import EMOJI_RE, clean_job_title, find_reference
+    from .utils.timing import span
 except Exception:
     import os, sys
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
     from scraper import BaseJobScraper, JobData
+    from utils.http_cache import get_response_cache
+    from utils.http_utils import arequest_with_retries
+    from utils.html_scan import SoupPage, SubtreeFilter, class_pattern
     from utils.log_config import get_logger
+    from utils.text_patterns import EMOJI_RE, clean_job_title, find_reference
+    from utils.timing import span
+
+
+@functools.lru_cache(maxsize=1)
+def playwright_available() -> bool:
+    """Whether Playwright is installed (checked without importing it)."""
+    return importlib.util.find_spec('playwright') is not None
 
 
 class LinkedInScraper(BaseJobScraper):
@@ -34,10 +46,27 @@ class LinkedInScraper(BaseJobScraper):
     Falls back to static HTML parsing if Playwright is unavailable.
     """
     
+    # Title, then the description and its criteria list (which follows it)
+    STOP_MARKERS = (
+        '</title>',
+        ('description__job-criteria-list', '</ul>'),
+    )
+    
+    PARSE_MODES = ('targeted', 'full')
+    # <title>, the static description containers and the criteria list
+    PARSE_ONLY = SubtreeFilter(
+        ('title', {}),
+        (None, {'data-automation-id': 'jobDescription'}),
+        (None, {'data-test-id': 'job-description'}),
+        (None, {'class': class_pattern(
+            'jobs-description__content', 'jobs-box__content', 'description__text',
+            'jobs-description-content__text', 'jobs-description', 'jobs-section',
+            'description__job-criteria-item',
+        )}),
+    )
+    
     async def scrape(self, url: str) -> Optional[JobData]:
         """Scrape a LinkedIn job posting."""
-        job_data = self._create_empty_job_data(url)
-        
         try:
             self.logger.info("Scraping LinkedIn job: %s", url)
             
@@ -46,7 +75,6 @@ class LinkedInScraper(BaseJobScraper):
                 self.logger.error("Could not extract job ID from URL: %s", url)
                 return None
             
-            job_data['linkedin_job_id'] = job_id
             direct_url = f"https://www.linkedin.com/jobs/view/{job_id}/"
             
             headers = {
@@ -55,86 +83,127 @@ class LinkedInScraper(BaseJobScraper):
             }
             
             try:
-                response = requests.get(direct_url, headers=headers, timeout=10)
-                response.raise_for_status()
+                response = await arequest_with_retries(
+                    'GET', direct_url, headers=headers, timeout=10, cache=get_response_cache(), **self._fetch_options()
+                )
             except requests.RequestException as e:
                 self.logger.error("Network error fetching LinkedIn URL: %s", e)
                 return None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            page = self._page(response.content)
+            if not self._extract_title_text(page.soup):
+                self.logger.error("Could not extract title from page")
+                return None
+            
+            rendered = (None, None, None)
+            if playwright_available():
+                try:
+                    with span('linkedin.playwright'):
+                        rendered = await self._scrape_with_playwright(direct_url)
+                    self.logger.debug("Successfully extracted description with Playwright")
+                except Exception as e:
+                    self.logger.warning("Playwright failed, falling back: %s", e)
+            
+            job_data = self.parse(page, url, rendered)
+            self.logger.info("Scraping completed successfully")
+            return job_data
             
+        except Exception as e:
+            self.logger.exception("Error scraping LinkedIn job: %s", e)
+            return None
+    
+    def parse(
+        self,
+        content: Union[bytes, SoupPage],
+        url: str,
+        rendered: Tuple[Optional[str], Optional[str], Optional[str]] = (None, None, None),
+    ) -> Optional[JobData]:
+        """
+        Extract job data from a fetched LinkedIn page.
+        
+        Args:
+            content: Raw page HTML (or a page already built by ``_page``)
+            url: The job posting URL
+            rendered: Description, publication date and work mode from Playwright, if any
+            
+        Returns:
+            Dictionary containing extracted job information or None without a page title
+        """
+        job_data = self._create_empty_job_data(url)
+        job_data['linkedin_job_id'] = self._extract_job_id(url)
+        page = content if isinstance(content, SoupPage) else self._page(content)
+        soup = page.soup
+        
+        with span('field.job_title'):
             title_text = self._extract_title_text(soup)
             if not title_text:
-                self.logger.error("Could not extract title from page")
                 return None
             
             parsed = self._parse_title_text(title_text)
             job_data['company_name'] = parsed['company_name']
             job_data['job_title'] = parsed['job_title']
+            job_data['job_title_clean'] = clean_job_title(parsed['job_title'])
             job_data['location'] = parsed['location']
-            
-            self.logger.debug("Company: %s", job_data['company_name'])
-            self.logger.debug("Job Title: %s", job_data['job_title'])
-            self.logger.debug("Location: %s", job_data['location'])
-            
-            job_description = None
-            if PLAYWRIGHT_AVAILABLE:
-                try:
-                    job_description, publication_date, work_mode = await self._scrape_with_playwright(direct_url)
-                    job_data['publication_date'] = publication_date
-                    job_data['work_mode'] = work_mode
-                    self.logger.debug("Successfully extracted description with Playwright")
-                except Exception as e:
-                    self.logger.warning("Playwright failed, falling back: %s", e)
-            
+        
+        self.logger.debug("Company: %s", job_data['company_name'])
+        self.logger.debug("Job Title: %s", job_data['job_title'])
+        self.logger.debug("Location: %s", job_data['location'])
+        
+        job_description, job_data['publication_date'], job_data['work_mode'] = rendered
+        
+        with span('field.job_description'):
             if not job_description:
                 job_description = self._extract_from_static_html(soup)
                 self.logger.debug("Extracted description from static HTML")
             
             if job_description and '[Job description not accessible' not in job_description:
                 job_description = self._format_description(job_description)
-            
-            job_data['job_description'] = job_description
-            
-            # Extract work mode from job posting (if not already extracted by Playwright)
-            if not job_data.get('work_mode'):
-                job_data['work_mode'] = self._extract_work_mode(soup)
-            
-            if job_data.get('work_mode'):
-                self.logger.debug("Work Mode: %s", job_data['work_mode'])
-            
-            # Publication date already extracted from Playwright above (if available)
-            if not job_data.get('publication_date'):
-                job_data['publication_date'] = self._extract_publication_date_from_soup(soup)
-            
-            if job_data.get('publication_date'):
-                self.logger.debug("Publication Date: %s", job_data['publication_date'])
-            
-            # Extract industry from sidebar criteria
+        
+        job_data['job_description'] = job_description
+        
+        with span('field.company_job_reference'):
+            reference = find_reference(job_description)
+        if reference:
+            job_data['company_job_reference'] = reference
+            self.logger.debug("Company Reference Number: %s", reference)
+        
+        # Extract work mode from job posting (if not already extracted by Playwright)
+        if not job_data.get('work_mode'):
+            with span('field.work_mode'):
+                job_data['work_mode'] = self._extract_work_mode(page)
+        
+        if job_data.get('work_mode'):
+            self.logger.debug("Work Mode: %s", job_data['work_mode'])
+        
+        # Publication date already extracted from Playwright above (if available)
+        if not job_data.get('publication_date'):
+            with span('field.publication_date'):
+                job_data['publication_date'] = self._extract_publication_date_from_soup(page)
+        
+        if job_data.get('publication_date'):
+            self.logger.debug("Publication Date: %s", job_data['publication_date'])
+        
+        # Extract industry from sidebar criteria
+        with span('field.industry'):
             industry = self._extract_industry_from_soup(soup)
-            if industry:
-                job_data['industry'] = industry
-                self.logger.debug("Industry: %s", job_data['industry'])
-            
-            # Extract company address from description
-            # Pass location as fallback (e.g., "Düsseldorf")
-            if job_data['job_description']:
+        if industry:
+            job_data['industry'] = industry
+            self.logger.debug("Industry: %s", job_data['industry'])
+        
+        # Extract company address from description
+        # Pass location as fallback (e.g., "Düsseldorf")
+        if job_data['job_description']:
+            with span('field.company_address'):
                 job_data['company_address'] = self._extract_address(
                     job_data['job_description'],
                     fallback_location=job_data.get('location')
                 )
-                if job_data['company_address']:
-                    self.logger.debug("Company Address: %s", job_data['company_address'])
-                    self.logger.info("  Address: %s", job_data['company_address'])
-            
-            job_data['scraped_at'] = datetime.now().isoformat()
-            
-            self.logger.info("Scraping completed successfully")
-            return job_data
-            
-        except Exception as e:
-            self.logger.exception("Error scraping LinkedIn job: %s", e)
-            return None
+            if job_data['company_address']:
+                self.logger.debug("Company Address: %s", job_data['company_address'])
+                self.logger.info("  Address: %s", job_data['company_address'])
+        
+        job_data['scraped_at'] = datetime.now().isoformat()
+        return job_data
     
     def _extract_job_id(self, url: str) -> Optional[str]:
         """Extract job ID from LinkedIn URL."""
@@ -170,8 +239,8 @@ class LinkedInScraper(BaseJobScraper):
                 job_title = match.group(2).strip()
                 location = match.group(3).strip()
         
-        company_name = re.sub(r'[\U0001F300-\U0001F9FF]', '', company_name).strip()
-        job_title = re.sub(r'[\U0001F300-\U0001F9FF]', '', job_title).strip()
+        company_name = EMOJI_RE.sub('', company_name).strip()
+        job_title = EMOJI_RE.sub('', job_title).strip()
         
         return {
             'company_name': company_name,
@@ -184,6 +253,8 @@ class LinkedInScraper(BaseJobScraper):
         Extract full job description, publication date, and work mode using Playwright.
         Returns tuple: (description, publication_date, work_mode)
         """
+        from playwright.async_api import async_playwright  # heavy; imported on first use
+        
         try:
             async with async_playwright() as p:
                 browser = await p.chromium.launch(headless=True)
@@ -267,7 +338,7 @@ class LinkedInScraper(BaseJobScraper):
         
         text = re.sub(r'\s+', ' ', description).strip()
         text = re.sub(r'^(Description|Summary|About the role)\s*', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'[\U0001F300-\U0001F9FF]', '', text).strip()
+        text = EMOJI_RE.sub('', text).strip()
         
         section_headers = [
             'What Part Will You Play',
@@ -366,7 +437,7 @@ class LinkedInScraper(BaseJobScraper):
             self.logger.error("✗ Error extracting work mode from HTML: %s", e)
             return None
     
-    def _extract_work_mode(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_work_mode(self, page: SoupPage) -> Optional[str]:
         """
         Extract work mode (remote, hybrid, onsite) from LinkedIn page.
         First tries job criteria section, then falls back to job description text.
@@ -377,7 +448,7 @@ class LinkedInScraper(BaseJobScraper):
             found_modes = set()
             
             # Strategy 1: Look in job criteria section (if visible)
-            criteria_sections = soup.find_all('li', class_=re.compile(r'description__job-criteria-item'))
+            criteria_sections = page.soup.find_all('li', class_=re.compile(r'description__job-criteria-item'))
             
             for section in criteria_sections:
                 text = section.get_text(strip=True).lower()
@@ -400,7 +471,7 @@ class LinkedInScraper(BaseJobScraper):
                 return self._get_highest_priority_mode(found_modes)
             
             # Strategy 2: Fallback - search in job description text
-            desc_text = soup.get_text(separator=' ').lower()
+            desc_text = page.text(separator=' ').lower()
             
             if desc_text:
                 # Check for all patterns, collect all matches
@@ -498,7 +569,7 @@ class LinkedInScraper(BaseJobScraper):
             self.logger.debug("Error extracting date from HTML: %s", e)
             return None
 
-    def _extract_publication_date_from_soup(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_publication_date_from_soup(self, page: SoupPage) -> Optional[str]:
         """
         Extract job publication date from static soup content.
         Returns ISO 8601 format date.
@@ -515,7 +586,7 @@ class LinkedInScraper(BaseJobScraper):
             ]
             
             # Search in visible text
-            page_text = soup.get_text()
+            page_text = page.text()
             
             for pattern in date_patterns:
                 match = re.search(pattern, page_text, re.IGNORECASE)
@@ -649,7 +720,7 @@ class LinkedInScraper(BaseJobScraper):
         Looks for elements with class 'description__job-criteria-item' that contain 'Industries'.
         """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, 'lxml', parse_only=self.PARSE_ONLY)
             
             # Find all job criteria items
             criteria_items = soup.find_all(class_=lambda x: x and 'description__job-criteria-item' in (x if x else ''))
@@ -9,18 +9,27 @@ from pathlib import Path
 sys.path.append(os.path.dirname(__file__))
 
 from scraper import save_to_json, StepstoneScraper
-from linkedin_scraper import LinkedInScraper
+from scraper_registry import registry as scraper_registry
 from trello_connect import TrelloConnect
 from cover_letter import CoverLetterGenerator
 from docx_generator import WordCoverLetterGenerator
 from database import get_db
-from utils.env import load_env, get_str, validate_env
+from job_queue import get_job_queue
+from utils.env import load_env, get_str, get_int, get_float, get_bool, validate_env
 from utils.log_config import get_logger
 from utils.error_reporting import report_error
+from utils.throttle import HostThrottle
+from utils.timing import JobTimer, span, use_timer
+from utils.aio import run_sync, gather_limited
+from pipeline import JobPipeline, PipelineStage
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import time
 import asyncio
+import contextvars
+import threading
+import uuid
 
 # Validate environment at startup (allow skipping in tests)
 skip_env = os.getenv('SKIP_ENV_VALIDATION', '0') == '1'
@@ -43,28 +52,35 @@ OUTPUT_DIR = Path(get_str('OUTPUT_DIR', 'output'))
 
 from typing import Any, Dict, List, Optional
 
+# Default worker pool size per pipeline stage, sized to each stage's bottleneck:
+# I/O-bound scraping, rate-limited Trello, token-limited OpenAI, CPU-bound DOCX.
+PIPELINE_DEFAULT_WORKERS = {
+    'scrape': 4,
+    'trello': 2,
+    'cover_letter': 3,
+    'documents': 1,
+    'persist': 1,
+}
+
 
 def detect_job_source(url: str) -> str:
     """
-    Detect job source from URL.
+    Detect job source from URL (see scraper_registry).
     
     Args:
         url: Job posting URL
         
     Returns:
-        'stepstone', 'linkedin', or 'unknown'
+        Registered source name ('stepstone', 'linkedin', ...) or 'unknown'
     """
-    url_lower = url.lower()
-    if 'stepstone' in url_lower:
-        return 'stepstone'
-    elif 'linkedin' in url_lower:
-        return 'linkedin'
-    return 'unknown'
+    return scraper_registry.source(url) or 'unknown'
 
 
 async def scrape_job_posting_async(url: str) -> Optional[Dict[str, Any]]:
     """
-    Scrape a job posting using the appropriate scraper based on URL.
+    Scrape a job posting using the scraper registered for its URL.
+    
+    The scraper module is imported on first use (see scraper_registry).
     
     Args:
         url: Job posting URL
@@ -72,78 +88,214 @@ async def scrape_job_posting_async(url: str) -> Optional[Dict[str, Any]]:
     Returns:
         Job data dictionary or None if scraping failed
     """
-    source = detect_job_source(url)
-    logger = get_logger(__name__)
-    
-    if source == 'stepstone':
-        scraper = StepstoneScraper()
-        return await scraper.scrape(url)
-    elif source == 'linkedin':
-        scraper = LinkedInScraper()
-        return await scraper.scrape(url)
-    else:
-        logger.error("Unknown job source for URL: %s", url)
+    scraper = scraper_registry.for_url(url)
+    if scraper is None:
+        get_logger(__name__).error("Unknown job source for URL: %s", url)
         return None
+    return await scraper.scrape(url)
 
 
 def scrape_job_posting(url: str) -> Optional[Dict[str, Any]]:
     """
     Scrape a job posting (sync wrapper for backward compatibility).
     
+    Runs on the shared event loop (utils.aio) instead of creating a new loop per URL.
+    
     Args:
         url: Job posting URL
         
     Returns:
         Job data dictionary or None if scraping failed
     """
-    return asyncio.run(scrape_job_posting_async(url))
+    return run_sync(scrape_job_posting_async(url))
 
 
-def process_job_posting(
-    url: str,
-    generate_cover_letter: bool = True,
-    generate_pdf: bool = False,  # Disabled by default to save time for manual edits
-    create_trello_card: bool = True,  # NEW: Whether to create Trello card
-    target_language: str = 'auto',  # NEW: Target language (auto, de, en)
-    skip_duplicate_check: bool = False,  # Allow skipping duplicate check for testing
-    progress_callback: Optional[callable] = None,  # NEW: Callback to report progress
-    debug_truncate: bool = False  # NEW: Debug mode - truncate cover letters to 120 words to test retry
-) -> Dict[str, Any]:
+def get_cached_duplicate_result(url: str) -> Optional[Dict[str, Any]]:
     """
-    Complete workflow: Scrape job posting, create Trello card, generate cover letter and PDF
+    Duplicate fast path: return the stored result for an already processed URL.
+    
+    Looks up the URL hash in processed_jobs (plus the latest generation_metadata
+    row) and builds a result in the same shape as process_job_posting, without
+    scraping, calling Trello/OpenAI or rendering documents.
     
     Args:
-        url (str): Stepstone job posting URL
-        generate_cover_letter (bool): Whether to generate a cover letter and Word document
-        generate_pdf (bool): Whether to convert to PDF (default: False, as manual edits are needed)
-        create_trello_card (bool): Whether to create a Trello card (default: True)
-        target_language (str): Target language for cover letter (auto, de, en). Default: auto-detect
-        skip_duplicate_check (bool): Skip duplicate detection (for testing/re-processing)
-        progress_callback (callable): Optional callback function to report progress. Called as:
-                                     progress_callback(progress=0-100, message='...', job_title='...', company_name='...')
-        debug_truncate (bool): Debug mode - artificially truncate to 120 words to test retry flow
+        url (str): Job posting URL
         
     Returns:
-        dict: Result with status and data
+        dict: Result with status 'duplicate', or None if the URL is not in the database
     """
+    cached = get_db().get_cached_result(url)
+    if not cached:
+        return None
     
-    logger.info("%s", "=" * 80)
-    logger.info("JOB APPLICATION AUTOMATION")
-    logger.info("%s", "=" * 80)
-    logger.info("Processing: %s", url)
+    docx_file = cached.get('docx_file_path')
+    if docx_file and not Path(docx_file).exists():
+        logger.info("Cached DOCX no longer exists: %s", docx_file)
+        docx_file = None
     
-    # Step 0a: URL Hash Check (fast, before scraping)
-    db = None
-    is_duplicate = False
-    existing_job = None
-    duplicate_method = 'none'
+    trello_card = None
+    if cached.get('trello_card_url'):
+        trello_card = {'id': cached.get('trello_card_id'), 'shortUrl': cached['trello_card_url']}
+    
+    return {
+        'status': 'duplicate',
+        'job_data': {
+            'company_name': cached['company_name'],
+            'job_title': cached['job_title'],
+            'source_url': cached['source_url'],
+        },
+        'trello_card': trello_card,
+        'trello_error': None,
+        'cover_letter_error': None,
+        'cover_letter_text': cached.get('cover_letter_text'),
+        'cover_letter_text_file': None,
+        'cover_letter_docx_file': docx_file,
+        'cover_letter_pdf_file': None,
+        'is_duplicate': True,
+        'duplicate_method': 'url_hash',
+        'processed_at': cached.get('processed_at'),
+    }
+
+
+def _new_job_context(
+    url: str,
+    *,
+    generate_cover_letter: bool = True,
+    generate_pdf: bool = False,
+    create_trello_card: bool = True,
+    target_language: str = 'auto',
+    skip_duplicate_check: bool = False,
+    progress_callback: Optional[callable] = None,
+    debug_truncate: bool = False,
+    job_data: Optional[Dict[str, Any]] = None,
+    duplicate_fast_path: Optional[bool] = None,
+    checkpoint_callback: Optional[callable] = None
+) -> Dict[str, Any]:
+    """
+    Create the mutable state dict that is handed from stage to stage.
     
-    if not skip_duplicate_check:
+    Every stage function reads its inputs from and writes its outputs to this
+    dict. A stage that ends the job early (e.g. failed scrape) sets 'result'.
+    """
+    return {
+        'url': url,
+        'generate_cover_letter': generate_cover_letter,
+        'generate_pdf': generate_pdf,
+        'create_trello_card': create_trello_card,
+        'target_language': target_language,
+        'skip_duplicate_check': skip_duplicate_check,
+        'progress_callback': progress_callback,
+        # Highest progress reported so far; shared with the Trello branch's context copy
+        'progress_state': {'lock': threading.Lock(), 'high': 0},
+        'debug_truncate': debug_truncate,
+        'duplicate_fast_path': (
+            get_bool('DUPLICATE_FAST_PATH') if duplicate_fast_path is None else duplicate_fast_path
+        ),
+        'checkpoint_callback': checkpoint_callback,
+        'completed_stages': [],
+        'timer': JobTimer(),
+        # Duplicate detection
+        'is_duplicate': False,
+        'existing_job': None,
+        'duplicate_method': 'none',
+        # Stage outputs (job_data may be pre-filled by a caller that already scraped)
+        'job_data': job_data,
+        'card': None,
+        'trello_error': None,
+        'cover_letter_text': None,
+        'cover_letter_language': None,
+        'cover_letter_error': None,
+        'cover_letter_file': None,
+        'docx_file': None,
+        'pdf_file': None,
+    }
+
+
+# Stage outputs saved after each completed stage so an interrupted job can resume
+CHECKPOINT_FIELDS = (
+    'job_data', 'card', 'trello_error', 'cover_letter_text', 'cover_letter_language',
+    'cover_letter_error', 'docx_file', 'pdf_file', 'is_duplicate', 'duplicate_method',
+)
+
+
+def _checkpoint(ctx: Dict[str, Any], stage_name: str) -> None:
+    """Mark a stage as completed and hand a snapshot of its outputs to the checkpoint callback."""
+    ctx['completed_stages'].append(stage_name)
+    if not ctx.get('checkpoint_callback'):
+        return
+    
+    checkpoint = {field: ctx[field] for field in CHECKPOINT_FIELDS}
+    if checkpoint['job_data'] is not None:
+        checkpoint['job_data'] = dict(checkpoint['job_data'])
+    for field in ('docx_file', 'pdf_file'):
+        if checkpoint[field] is not None:
+            checkpoint[field] = str(checkpoint[field])
+    checkpoint['completed_stages'] = list(ctx['completed_stages'])
+    try:
+        ctx['checkpoint_callback'](checkpoint)
+    except Exception as e:
+        # Checkpointing must never break processing
+        logger.warning("Failed to save checkpoint after stage '%s': %s", stage_name, e)
+
+
+def _restore_checkpoint(ctx: Dict[str, Any], checkpoint: Dict[str, Any]) -> None:
+    """Load stage outputs from a previous (interrupted) run into the job context."""
+    for field in CHECKPOINT_FIELDS:
+        if field in checkpoint:
+            ctx[field] = checkpoint[field]
+    ctx['completed_stages'] = list(checkpoint.get('completed_stages', []))
+
+
+def _report_progress(ctx: Dict[str, Any], **kwargs: Any) -> None:
+    """
+    Forward progress to the job's callback, if any.
+    
+    Trello (20%) and the cover letter (60%) report from concurrent branches,
+    so an update below the highest progress already reported is dropped
+    rather than moving the progress bar backwards.
+    """
+    if not ctx.get('progress_callback'):
+        return
+    state = ctx['progress_state']
+    with state['lock']:
+        progress = kwargs.get('progress')
+        if progress is not None:
+            if progress < state['high']:
+                return
+            state['high'] = progress
+        ctx['progress_callback'](**kwargs)
+
+
+def _stage_scrape(ctx: Dict[str, Any]) -> None:
+    """
+    Steps 0a, 1, 1b and 0b: URL hash duplicate check, scraping, company page
+    lookup and semantic duplicate check. Sets ctx['result'] if scraping fails.
+    """
+    _check_url_duplicate(ctx)
+    if 'result' in ctx:
+        return
+    
+    if _start_fetch(ctx):
+        # Use new job-source-aware scraping
+        with span('scrape.posting'):
+            ctx['job_data'] = scrape_job_posting(ctx['url'])
+    
+    _process_scraped_job(ctx)
+
+
+def _check_url_duplicate(ctx: Dict[str, Any]) -> None:
+    """Step 0a: URL hash duplicate check. Sets ctx['result'] on a duplicate fast path hit."""
+    url = ctx['url']
+    
+    # Step 0a: URL Hash Check (fast, before scraping)
+    if not ctx['skip_duplicate_check']:
         logger.info("STEP 0a: URL hash duplicate check...")
         logger.info("%s", "-" * 80)
         
         db = get_db()
-        is_duplicate, existing_job, duplicate_method = db.check_duplicate(url)
+        with span('db.duplicate_check'):
+            is_duplicate, existing_job, duplicate_method = db.check_duplicate(url)
+        ctx.update(is_duplicate=is_duplicate, existing_job=existing_job, duplicate_method=duplicate_method)
         
         if is_duplicate and duplicate_method == 'url_hash':
             # EXACT duplicate found - stop immediately
@@ -154,21 +306,39 @@ def process_job_posting(
             logger.warning("  Processed: %s", existing_job['processed_at'])
             if existing_job.get('trello_card_url'):
                 logger.warning("  Trello Card: %s", existing_job['trello_card_url'])
+            if ctx['duplicate_fast_path']:
+                cached = get_cached_duplicate_result(url)
+                if cached:
+                    logger.warning("⚠️  Duplicate fast path: returning stored result")
+                    ctx['result'] = cached
+                    return
             logger.warning("⚠️  SKIPPING PROCESSING (exact duplicate)")
             # PRODUCTION: This should return early
             # return {'status': 'duplicate', 'existing_job': existing_job, 'message': 'Exact duplicate found'}
         else:
             logger.info("✓ No URL hash duplicate found, proceeding to scrape...")
-    
+
+
+def _start_fetch(ctx: Dict[str, Any]) -> bool:
+    """Step 1 preamble. Returns False if the posting was already scraped by the caller."""
     # Step 1: Scrape the job posting
     logger.info("STEP 1: Scraping job posting...")
     logger.info("%s", "-" * 80)
     
-    if progress_callback:
-        progress_callback(progress=5, message='Gathering Information')
+    _report_progress(ctx, progress=5, message='Gathering Information')
     
-    # Use new job-source-aware scraping
-    job_data = scrape_job_posting(url)
+    if ctx['job_data']:
+        # Caller already scraped this URL (e.g. the web UI's quick scrape)
+        logger.info("Using pre-scraped job data, skipping fetch")
+        return False
+    return True
+
+
+def _process_scraped_job(ctx: Dict[str, Any]) -> None:
+    """Steps 1b and 0b on the fetched ctx['job_data']. Sets ctx['result'] if scraping failed."""
+    url = ctx['url']
+    skip_duplicate_check = ctx['skip_duplicate_check']
+    job_data = ctx['job_data']
     
     if not job_data:
         logger.error("Failed to scrape job posting!")
@@ -178,11 +348,12 @@ def process_job_posting(
             context={"url": url},
             severity="error",
         )
-        return {
+        ctx['result'] = {
             'status': 'failed',
             'step': 'scraping',
             'error': 'Scraper returned no data'
         }
+        return
     
     logger.info("Successfully scraped job data!")
     
@@ -190,9 +361,9 @@ def process_job_posting(
     if not job_data.get('company_page_url') and job_data.get('company_name'):
         logger.info("Searching for company page URL...")
         try:
-            from scraper import StepstoneScraper  # Import here to use the method
             scraper = StepstoneScraper()
-            company_page_url = scraper._find_company_page_url(job_data['company_name'])
+            with span('company_search'):
+                company_page_url = scraper._find_company_page_url(job_data['company_name'])
             if company_page_url:
                 job_data['company_page_url'] = company_page_url
                 logger.info(f"Found company page: {company_page_url}")
@@ -200,18 +371,18 @@ def process_job_posting(
             logger.warning(f"Could not find company page: {e}")
     
     # Step 0b: Semantic Duplicate Check (after scraping)
-    if not skip_duplicate_check and not is_duplicate:
+    if not skip_duplicate_check and not ctx['is_duplicate']:
         logger.info("STEP 0b: Semantic duplicate check (Company + Job Title)...")
         logger.info("%s", "-" * 80)
         
-        if not db:
-            db = get_db()
-        
-        is_duplicate, existing_job, duplicate_method = db.check_duplicate(
-            url, 
-            company_name=job_data.get('company_name'),
-            job_title=job_data.get('job_title')
-        )
+        db = get_db()
+        with span('db.duplicate_check'):
+            is_duplicate, existing_job, duplicate_method = db.check_duplicate(
+                url, 
+                company_name=job_data.get('company_name'),
+                job_title=job_data.get('job_title')
+            )
+        ctx.update(is_duplicate=is_duplicate, existing_job=existing_job, duplicate_method=duplicate_method)
         
         if is_duplicate and duplicate_method == 'semantic':
             logger.warning("⚠️  SEMANTIC DUPLICATE DETECTED (reposted or cross-source)!")
@@ -229,283 +400,312 @@ def process_job_posting(
         else:
             logger.info("✓ No semantic duplicate found, proceeding...")
     
-    if progress_callback:
-        progress_callback(
-            progress=15,
-            message='Gathering Information',
-            job_title=job_data.get('job_title', ''),
-            company_name=job_data.get('company_name', '')
-        )
+    _report_progress(
+        ctx,
+        progress=15,
+        message='Gathering Information',
+        job_title=job_data.get('job_title', ''),
+        company_name=job_data.get('company_name', '')
+    )
     
-    # Save scraped data
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     # Skip saving JSON file
+    # timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     # filename = DATA_DIR / f"scraped_job_{timestamp}.json"
     # save_to_json(job_data, str(filename))
+
+
+def _stage_trello(ctx: Dict[str, Any]) -> None:
+    """Step 2: Create Trello card (optional). Failures degrade gracefully."""
+    if not ctx['create_trello_card']:
+        logger.info("Skipping Trello card creation (disabled)")
+        return
     
-    # Step 2: Create Trello card (optional)
-    card = None
-    trello_error = None  # NEW: Track Trello creation errors
-    if create_trello_card:
-        logger.info("%s", "=" * 80)
-        logger.info("STEP 2: Creating Trello card...")
-        logger.info("%s", "-" * 80)
-        
-        if progress_callback:
-            progress_callback(progress=20, message='Creating Trello Card')
+    job_data = ctx['job_data']
+    logger.info("%s", "=" * 80)
+    logger.info("STEP 2: Creating Trello card...")
+    logger.info("%s", "-" * 80)
+    
+    _report_progress(ctx, progress=20, message='Creating Trello Card')
+    
+    try:
+        trello = TrelloConnect()
+        ctx['card'] = trello.create_card_from_job_data(job_data)
         
-        try:
-            trello = TrelloConnect()
-            card = trello.create_card_from_job_data(job_data)
-            
-            if not card:
-                logger.warning("⚠️  Failed to create Trello card (returned None)")
-                trello_error = "Card creation returned None"
-                # GRACEFUL DEGRADATION: Continue processing instead of failing
-        except Exception as e:
-            logger.error("🔴 Exception creating Trello card: %s", e)
-            report_error(
-                "Trello card creation failed",
-                exc=e,
-                context={"company_name": job_data.get('company_name'), "url": url},
-                severity="warning"
-            )
-            trello_error = str(e)
+        if not ctx['card']:
+            logger.warning("⚠️  Failed to create Trello card (returned None)")
+            ctx['trello_error'] = "Card creation returned None"
             # GRACEFUL DEGRADATION: Continue processing instead of failing
+    except Exception as e:
+        logger.error("🔴 Exception creating Trello card: %s", e)
+        report_error(
+            "Trello card creation failed",
+            exc=e,
+            context={"company_name": job_data.get('company_name'), "url": ctx['url']},
+            severity="warning"
+        )
+        ctx['trello_error'] = str(e)
+        # GRACEFUL DEGRADATION: Continue processing instead of failing
+
+
+def _record_cover_letter_error(ctx: Dict[str, Any], e: Exception) -> None:
+    """Store and report a cover letter/document failure; processing continues."""
+    job_data = ctx['job_data']
+    logger.warning("Cover letter generation failed: %s", e)
+    ctx['cover_letter_error'] = str(e)  # Store error for retry
+    report_error(
+        "Cover letter generation failed",
+        exc=e,
+        context={
+            "company": job_data.get('company_name'),
+            "title": job_data.get('job_title'),
+            "url": job_data.get('source_url'),
+        },
+        severity="error",
+    )
+    logger.info("Continuing without cover letter...")
+    import traceback
+    logger.debug("Traceback:")
+    logger.debug("%s", traceback.format_exc())
+
+
+def _build_placeholder_cover_letter(job_data: Dict[str, Any], target_language: str) -> tuple:
+    """Build a 200-word placeholder letter (used when OpenAI is disabled)."""
+    logger.info("Using placeholder cover letter (OpenAI disabled)")
+    
+    # We still need the generator for salutation and valediction methods
+    # but we'll skip the actual AI call
+    try:
+        ai_generator = CoverLetterGenerator()
+    except Exception:
+        # If CoverLetterGenerator fails (missing API key), create a minimal mock
+        ai_generator = None
+    
+    # Generate 200-word placeholder body
+    company = job_data.get('company_name', 'the company')
+    position = job_data.get('job_title', 'this position')
+    placeholder_words = [
+        f"I am writing to express my strong interest in the {position} position at {company}.",
+        "With my extensive background in software development and proven track record of delivering high-quality solutions,",
+        "I am confident that I would be a valuable addition to your team.",
+        "Throughout my career, I have developed expertise in various technologies and methodologies.",
+        "My experience includes working on complex projects that required both technical skills and collaborative teamwork.",
+        "I have consistently demonstrated my ability to adapt to new challenges and learn emerging technologies quickly.",
+        "In my previous roles, I have successfully led development initiatives and mentored junior developers.",
+        "I am particularly drawn to this opportunity because of your company's reputation for innovation and excellence.",
+        "My technical skills combined with my passion for creating elegant solutions make me an ideal candidate.",
+        "I am excited about the possibility of contributing to your team's success and growing with the organization.",
+        "I believe my background aligns well with the requirements outlined in the job description.",
+        "I am eager to bring my expertise to your company and help drive your projects forward.",
+        "Thank you for considering my application. I look forward to the opportunity to discuss",
+        "how my skills can contribute to your team's objectives and organizational goals.",
+    ]
+    cover_letter_body = " ".join(placeholder_words)
+    
+    # Determine language: use target_language if forced, otherwise default to English for placeholder
+    if target_language == 'de':
+        language = 'german'
+    elif target_language == 'en':
+        language = 'english'
     else:
-        logger.info("Skipping Trello card creation (disabled)")
+        language = 'english'  # Default to English for placeholder
+    
+    # Generate salutation and valediction using the generator if available
+    if ai_generator:
+        seniority = ai_generator.detect_seniority(
+            job_data.get('job_title', ''),
+            job_data.get('job_description', '')
+        )
+        formality = 'formal'  # Default for placeholder
+        salutation = ai_generator.generate_salutation(job_data, language, formality, seniority)
+        valediction = ai_generator.generate_valediction(language, formality, seniority)
+    else:
+        # Fallback if generator not available
+        salutation = "Dear Hiring Manager,"
+        valediction = "Sincerely,"
+        seniority = "mid"
+    
+    # Store all parts in job_data (same as AI path)
+    job_data['cover_letter_salutation'] = salutation
+    job_data['cover_letter_body'] = cover_letter_body
+    job_data['cover_letter_valediction'] = valediction
+    
+    # Combine for preview and file saving
+    cover_letter_text = f"{salutation}\n\n{cover_letter_body}\n\n{valediction}"
     
-    # Step 3: Generate cover letter (optional)
-    cover_letter_text = None
-    cover_letter_file = None
-    docx_file = None
-    pdf_file = None
-    cover_letter_error = None  # NEW: Track cover letter generation errors
+    logger.info(f"Generated placeholder: salutation='{salutation}', body_words={len(cover_letter_body.split())}, valediction='{valediction}'")
+    return cover_letter_text, language
+
+
+def _start_cover_letter_step(ctx: Dict[str, Any]) -> None:
+    logger.info("%s", "=" * 80)
+    logger.info("STEP 3: Generating cover letter...")
+    logger.info("%s", "-" * 80)
+    
+    _report_progress(ctx, progress=60, message='Generating Cover Letter with AI')
+
+
+def _use_placeholder_cover_letter() -> bool:
+    """Check if we should use placeholder (for testing or when OpenAI is unavailable)."""
+    return os.getenv('USE_PLACEHOLDER_COVER_LETTER', 'false').lower() == 'true'
+
+
+def _generation_language(target_language: str) -> Optional[str]:
+    """
+    Convert target_language value to format expected by generate_cover_letter
+    UI sends: 'auto', 'de', 'en'
+    generate_cover_letter expects: None for auto-detect, or 'german', 'english'
+    """
+    if target_language == 'de':
+        return 'german'
+    elif target_language == 'en':
+        return 'english'
+    return None  # auto-detect
+
+
+def _assemble_ai_cover_letter(ctx: Dict[str, Any], ai_generator: Any, cover_letter_body: str) -> tuple:
+    """Combine the generated body with salutation/valediction; returns (text, language)."""
+    job_data = ctx['job_data']
     
-    if generate_cover_letter:
+    # Determine language: use target_language if forced, otherwise detect from job description
+    language = _generation_language(ctx['target_language'])
+    if language is None:
+        # Auto-detect from job description
+        language = ai_generator.detect_language(job_data.get('job_description', ''))
+    
+    # Combine salutation + body + valediction for complete letter
+    salutation = job_data.get('cover_letter_salutation', '')
+    valediction = job_data.get('cover_letter_valediction', '')
+    return f"{salutation}\n\n{cover_letter_body}\n\n{valediction}", language
+
+
+def _store_cover_letter(ctx: Dict[str, Any], cover_letter_text: str, language: str) -> None:
+    # Display preview
+    logger.info("--- Cover Letter Preview ---")
+    preview = cover_letter_text[:300] + "..." if len(cover_letter_text) > 300 else cover_letter_text
+    logger.info("%s", preview)
+    logger.info("%s", "-" * 80)
+    
+    # TXT file generation is skipped for both the placeholder and the AI path
+    logger.info("TXT file generation skipped (not needed)")
+    
+    ctx['cover_letter_text'] = cover_letter_text
+    ctx['cover_letter_language'] = language
+
+
+def _stage_cover_letter(ctx: Dict[str, Any]) -> None:
+    """Step 3: Generate the cover letter text (optional)."""
+    if not ctx['generate_cover_letter']:
+        return
+    
+    job_data = ctx['job_data']
+    _start_cover_letter_step(ctx)
+    
+    try:
+        if _use_placeholder_cover_letter():
+            cover_letter_text, language = _build_placeholder_cover_letter(job_data, ctx['target_language'])
+        else:
+            # Generate AI text
+            ai_generator = CoverLetterGenerator()
+            
+            # Generate with auto_trim=True to handle content that's slightly short
+            cover_letter_body = ai_generator.generate_cover_letter(
+                job_data, 
+                target_language=_generation_language(ctx['target_language']), 
+                auto_trim=True,
+                debug_truncate=ctx['debug_truncate']  # Pass debug flag
+            )
+            cover_letter_text, language = _assemble_ai_cover_letter(ctx, ai_generator, cover_letter_body)
+        
+        _store_cover_letter(ctx, cover_letter_text, language)
+    except Exception as e:
+        _record_cover_letter_error(ctx, e)
+
+
+def _stage_documents(ctx: Dict[str, Any]) -> None:
+    """Steps 4 and 5: Render the Word document and optionally convert to PDF."""
+    if not ctx['generate_cover_letter'] or ctx['cover_letter_text'] is None:
+        return
+    
+    job_data = ctx['job_data']
+    cover_letter_text = ctx['cover_letter_text']
+    language = ctx['cover_letter_language']
+    
+    try:
+        # Step 4: Generate Word document
         logger.info("%s", "=" * 80)
-        logger.info("STEP 3: Generating cover letter...")
+        logger.info("STEP 4: Creating Word document...")
         logger.info("%s", "-" * 80)
         
-        if progress_callback:
-            progress_callback(progress=60, message='Generating Cover Letter with AI')
+        _report_progress(ctx, progress=80, message='Creating Word document')
         
-        try:
-            # Check if we should use placeholder (for testing or when OpenAI is unavailable)
-            use_placeholder = os.getenv('USE_PLACEHOLDER_COVER_LETTER', 'false').lower() == 'true'
-            
-            if use_placeholder:
-                logger.info("Using placeholder cover letter (OpenAI disabled)")
-                
-                # We still need the generator for salutation and valediction methods
-                # but we'll skip the actual AI call
-                try:
-                    ai_generator = CoverLetterGenerator()
-                except Exception:
-                    # If CoverLetterGenerator fails (missing API key), create a minimal mock
-                    ai_generator = None
-                
-                # Generate 200-word placeholder body
-                company = job_data.get('company_name', 'the company')
-                position = job_data.get('job_title', 'this position')
-                placeholder_words = [
-                    f"I am writing to express my strong interest in the {position} position at {company}.",
-                    "With my extensive background in software development and proven track record of delivering high-quality solutions,",
-                    "I am confident that I would be a valuable addition to your team.",
-                    "Throughout my career, I have developed expertise in various technologies and methodologies.",
-                    "My experience includes working on complex projects that required both technical skills and collaborative teamwork.",
-                    "I have consistently demonstrated my ability to adapt to new challenges and learn emerging technologies quickly.",
-                    "In my previous roles, I have successfully led development initiatives and mentored junior developers.",
-                    "I am particularly drawn to this opportunity because of your company's reputation for innovation and excellence.",
-                    "My technical skills combined with my passion for creating elegant solutions make me an ideal candidate.",
-                    "I am excited about the possibility of contributing to your team's success and growing with the organization.",
-                    "I believe my background aligns well with the requirements outlined in the job description.",
-                    "I am eager to bring my expertise to your company and help drive your projects forward.",
-                    "Thank you for considering my application. I look forward to the opportunity to discuss",
-                    "how my skills can contribute to your team's objectives and organizational goals.",
-                ]
-                cover_letter_body = " ".join(placeholder_words)
-                
-                # Determine language: use target_language if forced, otherwise default to English for placeholder
-                if target_language == 'de':
-                    language = 'german'
-                elif target_language == 'en':
-                    language = 'english'
-                else:
-                    language = 'english'  # Default to English for placeholder
-                
-                # Generate salutation and valediction using the generator if available
-                if ai_generator:
-                    seniority = ai_generator.detect_seniority(
-                        job_data.get('job_title', ''),
-                        job_data.get('job_description', '')
-                    )
-                    formality = 'formal'  # Default for placeholder
-                    salutation = ai_generator.generate_salutation(job_data, language, formality, seniority)
-                    valediction = ai_generator.generate_valediction(language, formality, seniority)
-                else:
-                    # Fallback if generator not available
-                    salutation = "Dear Hiring Manager,"
-                    valediction = "Sincerely,"
-                    seniority = "mid"
-                
-                # Store all parts in job_data (same as AI path)
-                job_data['cover_letter_salutation'] = salutation
-                job_data['cover_letter_body'] = cover_letter_body
-                job_data['cover_letter_valediction'] = valediction
-                
-                # Combine for preview and file saving
-                cover_letter_text = f"{salutation}\n\n{cover_letter_body}\n\n{valediction}"
-                
-                logger.info(f"Generated placeholder: salutation='{salutation}', body_words={len(cover_letter_body.split())}, valediction='{valediction}'")
-            else:
-                # Generate AI text
-                ai_generator = CoverLetterGenerator()
-                
-                # Convert target_language value to format expected by generate_cover_letter
-                # UI sends: 'auto', 'de', 'en'
-                # generate_cover_letter expects: None for auto-detect, or 'german', 'english'
-                if target_language == 'de':
-                    lang_for_generation = 'german'
-                elif target_language == 'en':
-                    lang_for_generation = 'english'
-                else:
-                    lang_for_generation = None  # auto-detect
-                
-                # Generate with auto_trim=True to handle content that's slightly short
-                cover_letter_body = ai_generator.generate_cover_letter(
-                    job_data, 
-                    target_language=lang_for_generation, 
-                    auto_trim=True,
-                    debug_truncate=debug_truncate  # Pass debug flag
-                )
-                
-                # Determine language: use target_language if forced, otherwise detect from job description
-                if target_language == 'de':
-                    language = 'german'
-                elif target_language == 'en':
-                    language = 'english'
-                else:
-                    # Auto-detect from job description
-                    language = ai_generator.detect_language(job_data.get('job_description', ''))
-                
-                # Combine salutation + body + valediction for complete letter
-                salutation = job_data.get('cover_letter_salutation', '')
-                valediction = job_data.get('cover_letter_valediction', '')
-                cover_letter_text = f"{salutation}\n\n{cover_letter_body}\n\n{valediction}"
-            
-            # Display preview
-            logger.info("--- Cover Letter Preview ---")
-            preview = cover_letter_text[:300] + "..." if len(cover_letter_text) > 300 else cover_letter_text
-            logger.info("%s", preview)
-            logger.info("%s", "-" * 80)
-            
-            # Save text version (complete with salutation and valediction)
-            if use_placeholder:
-                # Skip saving TXT file for placeholder
-                # output_dir = Path('output/cover_letters')
-                # output_dir.mkdir(parents=True, exist_ok=True)
-                # company_safe = job_data.get('company_name', 'Company').replace(' ', '_')
-                # timestamp_now = datetime.now().strftime("%Y%m%d_%H%M%S")
-                # cover_letter_file = output_dir / f"cover_letter_{company_safe}_{timestamp_now}.txt"
-                # with open(cover_letter_file, 'w', encoding='utf-8') as f:
-                #     f.write(cover_letter_text)
-                # logger.info(f"Cover letter saved: {cover_letter_file}")
-                logger.info("TXT file generation skipped (not needed)")
-            else:
-                # Skip saving TXT file for AI path too
-                # output_dir = Path('output/cover_letters')
-                # output_dir.mkdir(parents=True, exist_ok=True)
-                # company_safe = job_data.get('company_name', 'Company').replace(' ', '_')
-                # timestamp_now = datetime.now().strftime("%Y%m%d_%H%M%S")
-                # cover_letter_file = output_dir / f"cover_letter_{company_safe}_{timestamp_now}.txt"
-                # with open(cover_letter_file, 'w', encoding='utf-8') as f:
-                #     f.write(cover_letter_text)
-                # logger.info(f"Cover letter saved: {cover_letter_file}")
-                logger.info("TXT file generation skipped (not needed)")
-            
-            # Step 4: Generate Word document
-            logger.info("%s", "=" * 80)
-            logger.info("STEP 4: Creating Word document...")
-            logger.info("%s", "-" * 80)
-            
-            if progress_callback:
-                progress_callback(progress=80, message='Creating Word document')
-            
-            word_generator = WordCoverLetterGenerator()
-            
-            # Generate filename based on language
-            sender_name = word_generator.sender['name']  # "Dr. Kai Voges"
-            # Remove title (Dr., Prof., etc.) from filename
-            sender_name_no_title = sender_name.replace('Dr. ', '').replace('Prof. ', '')
-            company_name = job_data.get('company_name', 'Company')
-            date_str = datetime.now().strftime('%Y-%m-%d')  # e.g., "2025-10-14"
-            
-            if language == 'german':
-                base_filename = f"Anschreiben - {sender_name_no_title} - {date_str} - {company_name}"
-            else:  # English
-                base_filename = f"Cover letter - {sender_name_no_title} - {date_str} - {company_name}"
-            
-            docx_filename = f"output/cover_letters/{base_filename}.docx"
-            
-            # Important: Pass only the BODY to the template generator
-            # The template has separate placeholders for salutation and valediction
-            cover_letter_body_only = job_data.get('cover_letter_body', cover_letter_text)
-            
+        word_generator = WordCoverLetterGenerator()
+        
+        # Generate filename based on language
+        sender_name = word_generator.sender['name']  # "Dr. Kai Voges"
+        # Remove title (Dr., Prof., etc.) from filename
+        sender_name_no_title = sender_name.replace('Dr. ', '').replace('Prof. ', '')
+        company_name = job_data.get('company_name', 'Company')
+        date_str = datetime.now().strftime('%Y-%m-%d')  # e.g., "2025-10-14"
+        
+        if language == 'german':
+            base_filename = f"Anschreiben - {sender_name_no_title} - {date_str} - {company_name}"
+        else:  # English
+            base_filename = f"Cover letter - {sender_name_no_title} - {date_str} - {company_name}"
+        
+        docx_filename = f"output/cover_letters/{base_filename}.docx"
+        
+        # Important: Pass only the BODY to the template generator
+        # The template has separate placeholders for salutation and valediction
+        cover_letter_body_only = job_data.get('cover_letter_body', cover_letter_text)
+        
+        with span('docx.render'):
             docx_file = word_generator.generate_from_template(
                 cover_letter_body_only,
                 job_data,
                 docx_filename,
                 language=language
             )
+        ctx['docx_file'] = docx_file
+        
+        # Step 5: Convert to PDF (optional)
+        if ctx['generate_pdf']:
+            logger.info("%s", "=" * 80)
+            logger.info("STEP 5: Converting to PDF...")
+            logger.info("%s", "-" * 80)
             
-            # Step 5: Convert to PDF (optional)
-            if generate_pdf:
-                logger.info("%s", "=" * 80)
-                logger.info("STEP 5: Converting to PDF...")
-                logger.info("%s", "-" * 80)
-                
-                if progress_callback:
-                    progress_callback(progress=90, message='Saving PDF')
-                
-                try:
-                    pdf_filename = docx_filename.replace('.docx', '.pdf')
-                    pdf_file = word_generator.convert_to_pdf(docx_file, pdf_filename)
-                    
-                    if not pdf_file:
-                        logger.warning("⚠️  PDF conversion skipped - install with: pip install docx2pdf")
-                except Exception as pdf_error:
-                    logger.error("🔴 PDF conversion failed: %s", pdf_error)
-                    report_error(
-                        "PDF conversion failed",
-                        exc=pdf_error,
-                        context={"docx_file": docx_file},
-                        severity="warning"
-                    )
-                    # GRACEFUL DEGRADATION: Continue without PDF instead of failing
-                    logger.info("Continuing without PDF file (DOCX already created)")
+            _report_progress(ctx, progress=90, message='Saving PDF')
             
-        except Exception as e:
-            logger.warning("Cover letter generation failed: %s", e)
-            cover_letter_error = str(e)  # NEW: Store error for retry
-            report_error(
-                "Cover letter generation failed",
-                exc=e,
-                context={
-                    "company": job_data.get('company_name'),
-                    "title": job_data.get('job_title'),
-                    "url": job_data.get('source_url'),
-                },
-                severity="error",
-            )
-            logger.info("Continuing without cover letter...")
-            import traceback
-            logger.debug("Traceback:")
-            logger.debug("%s", traceback.format_exc())
+            try:
+                pdf_filename = docx_filename.replace('.docx', '.pdf')
+                with span('pdf.convert'):
+                    ctx['pdf_file'] = word_generator.convert_to_pdf(docx_file, pdf_filename)
+                
+                if not ctx['pdf_file']:
+                    logger.warning("⚠️  PDF conversion skipped - install with: pip install docx2pdf")
+            except Exception as pdf_error:
+                logger.error("🔴 PDF conversion failed: %s", pdf_error)
+                report_error(
+                    "PDF conversion failed",
+                    exc=pdf_error,
+                    context={"docx_file": docx_file},
+                    severity="warning"
+                )
+                # GRACEFUL DEGRADATION: Continue without PDF instead of failing
+                logger.info("Continuing without PDF file (DOCX already created)")
+    except Exception as e:
+        _record_cover_letter_error(ctx, e)
+
+
+def _stage_persist(ctx: Dict[str, Any]) -> None:
+    """Save the job to the database and build the final result dict."""
+    url = ctx['url']
+    job_data = ctx['job_data']
+    card = ctx['card']
+    generate_cover_letter = ctx['generate_cover_letter']
     
     # Save to database (after successful processing)
     # In testing mode, we skip saving if it's a duplicate to avoid UNIQUE constraint errors
-    if not skip_duplicate_check:
+    if not ctx['skip_duplicate_check']:
         logger.info("%s", "=" * 80)
         logger.info("Saving to database...")
         logger.info("%s", "-" * 80)
@@ -516,9 +716,9 @@ def process_job_posting(
             # Use the is_duplicate flag that was already determined in Steps 0a/0b
             # Don't re-check here because it would overwrite semantic detection with only hash check
             
-            if is_duplicate:
+            if ctx['is_duplicate']:
                 logger.info("⚠️  Skipping database save - job already exists in database")
-                logger.info("    Duplicate method: %s", duplicate_method)
+                logger.info("    Duplicate method: %s", ctx['duplicate_method'])
                 logger.info("    (This is expected in testing mode when processing duplicates)")
             else:
                 # Extract AI metadata if available
@@ -527,19 +727,20 @@ def process_job_posting(
                 word_count = job_data.get('cover_letter_word_count', None)
                 generation_cost = job_data.get('ai_generation_cost', None)
                 
-                job_id = db.save_processed_job(
-                    source_url=url,
-                    company_name=job_data.get('company_name', 'Unknown'),
-                    job_title=job_data.get('job_title', 'Unknown'),
-                    trello_card_id=card.get('id') if card else None,
-                    trello_card_url=card.get('shortUrl') if card else None,
-                    docx_file_path=str(docx_file) if docx_file else None,
-                    ai_model=ai_model if generate_cover_letter else None,
-                    language=language_code if generate_cover_letter else None,
-                    word_count=word_count,
-                    generation_cost=generation_cost,
-                    cover_letter_text=cover_letter_text if generate_cover_letter else None
-                )
+                with span('db.write'):
+                    job_id = db.save_processed_job(
+                        source_url=url,
+                        company_name=job_data.get('company_name', 'Unknown'),
+                        job_title=job_data.get('job_title', 'Unknown'),
+                        trello_card_id=card.get('id') if card else None,
+                        trello_card_url=card.get('shortUrl') if card else None,
+                        docx_file_path=str(ctx['docx_file']) if ctx['docx_file'] else None,
+                        ai_model=ai_model if generate_cover_letter else None,
+                        language=language_code if generate_cover_letter else None,
+                        word_count=word_count,
+                        generation_cost=generation_cost,
+                        cover_letter_text=ctx['cover_letter_text'] if generate_cover_letter else None
+                    )
                 
                 logger.info("✓ Saved to database (job_id: %s)", job_id)
             
@@ -547,6 +748,16 @@ def process_job_posting(
             logger.warning("Failed to save to database: %s", e)
             # Non-critical error, continue anyway
     
+    ctx['result'] = _build_job_result(ctx)
+
+
+def _build_job_result(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """Determine overall status, log the summary and return the result dict."""
+    job_data = ctx['job_data']
+    card = ctx['card']
+    trello_error = ctx['trello_error']
+    cover_letter_error = ctx['cover_letter_error']
+    
     # Success or partial success!
     logger.info("%s", "=" * 80)
     logger.info("AUTOMATION COMPLETE!")
@@ -555,7 +766,7 @@ def process_job_posting(
     # Determine overall status
     has_errors = bool(trello_error or cover_letter_error)
     
-    # NEW: If only cover letter failed (no trello error), mark as cover_letter_failed for retry
+    # If only cover letter failed (no trello error), mark as cover_letter_failed for retry
     if cover_letter_error and not trello_error:
         overall_status = 'cover_letter_failed'
     else:
@@ -571,16 +782,15 @@ def process_job_posting(
     elif trello_error:
         logger.info("  ⚠️  Trello Card: FAILED - %s", trello_error)
     
-    # logger.info("  Data saved: %s", filename)  # JSON file saving disabled
-    if cover_letter_file:
-        logger.info("  ✅ Cover Letter (TXT): %s", cover_letter_file)
-    if docx_file:
-        logger.info("  ✅ Cover Letter (DOCX): %s", docx_file)
-    elif cover_letter_error and generate_cover_letter:
+    if ctx['cover_letter_file']:
+        logger.info("  ✅ Cover Letter (TXT): %s", ctx['cover_letter_file'])
+    if ctx['docx_file']:
+        logger.info("  ✅ Cover Letter (DOCX): %s", ctx['docx_file'])
+    elif cover_letter_error and ctx['generate_cover_letter']:
         logger.info("  ⚠️  Cover Letter (DOCX): FAILED - %s", cover_letter_error)
     
-    if pdf_file:
-        logger.info("  ✅ Cover Letter (PDF): %s", pdf_file)
+    if ctx['pdf_file']:
+        logger.info("  ✅ Cover Letter (PDF): %s", ctx['pdf_file'])
     
     return {
         'status': overall_status,
@@ -589,46 +799,562 @@ def process_job_posting(
         'trello_error': trello_error,
         'cover_letter_error': cover_letter_error,
         # 'data_file': filename,  # JSON file saving disabled
-        'cover_letter_text_file': cover_letter_file,
-        'cover_letter_docx_file': docx_file,
-        'cover_letter_pdf_file': pdf_file,
-        'is_duplicate': is_duplicate  # NEW: Flag indicating if this was a duplicate job posting
+        'cover_letter_text_file': ctx['cover_letter_file'],
+        'cover_letter_docx_file': ctx['docx_file'],
+        'cover_letter_pdf_file': ctx['pdf_file'],
+        'is_duplicate': ctx['is_duplicate']  # Flag indicating if this was a duplicate job posting
     }
 
 
-def batch_process_urls(urls: List[str]) -> List[Dict[str, Any]]:
+def _run_stage(ctx: Dict[str, Any], name: str, stage: callable) -> None:
+    """Run one stage with the job's timer active, recorded as span 'stage.<name>'."""
+    with use_timer(ctx['timer']), span(f'stage.{name}'):
+        stage(ctx)
+
+
+def _finish_timings(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach the job's timing breakdown to its result and store it in the database."""
+    result = ctx['result']
+    result['timings'] = ctx['timer'].summary()
+    logger.info("Job timings: total %.0f ms (%s)", result['timings']['total_ms'], ", ".join(
+        f"{name} {ms:.0f}" for name, ms in result['timings']['breakdown'].items() if name.startswith('stage.')
+    ))
+    
+    # Same rule as the job record itself: testing runs don't write to the database
+    if not ctx['skip_duplicate_check']:
+        try:
+            get_db().save_job_timings(ctx['url'], result.get('status'), result['timings'])
+        except Exception as e:
+            logger.warning("Failed to save job timings: %s", e)
+    return result
+
+
+# Ordered processing stages shared by process_job_posting and the staged pipeline
+JOB_STAGES = [
+    ('scrape', _stage_scrape),
+    ('trello', _stage_trello),
+    ('cover_letter', _stage_cover_letter),
+    ('documents', _stage_documents),
+    ('persist', _stage_persist),
+]
+
+
+def _stage_trello_and_cover_letter(ctx: Dict[str, Any]) -> None:
+    """
+    Steps 2 and 3 concurrently: both only depend on the scraped job_data and
+    spend most of their time waiting on the network (Trello API / OpenAI).
+    
+    The Trello branch works on a snapshot of job_data because cover letter
+    generation adds salutation/body/valediction keys while it runs. Each branch
+    is checkpointed as soon as it finishes; branches completed in a previous
+    run are skipped.
+    """
+    run_trello = 'trello' not in ctx['completed_stages']
+    run_letter = 'cover_letter' not in ctx['completed_stages']
+    
+    if not (run_trello and run_letter and ctx['create_trello_card'] and ctx['generate_cover_letter']):
+        if run_trello:
+            _run_stage(ctx, 'trello', _stage_trello)
+            _checkpoint(ctx, 'trello')
+        if run_letter:
+            _run_stage(ctx, 'cover_letter', _stage_cover_letter)
+            _checkpoint(ctx, 'cover_letter')
+        return
+    
+    trello_ctx = dict(ctx, job_data=dict(ctx['job_data']))
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='job-branch') as executor:
+        trello_future = executor.submit(
+            contextvars.copy_context().run, _run_stage, trello_ctx, 'trello', _stage_trello
+        )
+        letter_future = executor.submit(
+            contextvars.copy_context().run, _run_stage, ctx, 'cover_letter', _stage_cover_letter
+        )
+        branch_error = None
+        for future in as_completed([trello_future, letter_future]):
+            # Checkpoint whichever branch finished even if the other one blew up
+            if future.exception() is not None:
+                branch_error = branch_error or future.exception()
+            elif future is trello_future:
+                ctx['card'] = trello_ctx['card']
+                ctx['trello_error'] = trello_ctx['trello_error']
+                _checkpoint(ctx, 'trello')
+            else:
+                _checkpoint(ctx, 'cover_letter')
+    
+    if branch_error is not None:
+        raise branch_error
+
+
+# Stages for a single job: Trello and cover letter overlap to cut per-job latency
+SINGLE_JOB_STAGES = [
+    ('scrape', _stage_scrape),
+    ('trello_and_cover_letter', _stage_trello_and_cover_letter),
+    ('documents', _stage_documents),
+    ('persist', _stage_persist),
+]
+
+
+def process_job_posting(
+    url: str,
+    generate_cover_letter: bool = True,
+    generate_pdf: bool = False,  # Disabled by default to save time for manual edits
+    create_trello_card: bool = True,  # NEW: Whether to create Trello card
+    target_language: str = 'auto',  # NEW: Target language (auto, de, en)
+    skip_duplicate_check: bool = False,  # Allow skipping duplicate check for testing
+    progress_callback: Optional[callable] = None,  # NEW: Callback to report progress
+    debug_truncate: bool = False,  # NEW: Debug mode - truncate cover letters to 120 words to test retry
+    job_data: Optional[Dict[str, Any]] = None,  # Pre-scraped data; skips the fetch in Step 1
+    duplicate_fast_path: Optional[bool] = None,  # Return stored result for exact duplicates
+    checkpoint_callback: Optional[callable] = None,  # Receives stage outputs after each stage
+    resume_from: Optional[Dict[str, Any]] = None  # Checkpoint of an interrupted run
+) -> Dict[str, Any]:
     """
-    Process multiple job posting URLs
+    Complete workflow: Scrape job posting, create Trello card, generate cover letter and PDF
+    
+    Trello card creation and cover letter generation run concurrently once the
+    job is scraped; their errors are merged into the result as before.
     
     Args:
-        urls (list): List of Stepstone URLs
+        url (str): Stepstone job posting URL
+        generate_cover_letter (bool): Whether to generate a cover letter and Word document
+        generate_pdf (bool): Whether to convert to PDF (default: False, as manual edits are needed)
+        create_trello_card (bool): Whether to create a Trello card (default: True)
+        target_language (str): Target language for cover letter (auto, de, en). Default: auto-detect
+        skip_duplicate_check (bool): Skip duplicate detection (for testing/re-processing)
+        progress_callback (callable): Optional callback function to report progress. Called as:
+                                     progress_callback(progress=0-100, message='...', job_title='...', company_name='...')
+        debug_truncate (bool): Debug mode - artificially truncate to 120 words to test retry flow
+        job_data (dict): Already scraped job data for this URL. When given, Step 1 does not
+                         fetch the page again (company page lookup and duplicate checks still run)
+        duplicate_fast_path (bool): Return the stored result (status 'duplicate') for URLs that
+                                    were already processed instead of reprocessing them.
+                                    Default: DUPLICATE_FAST_PATH env var (off)
+        checkpoint_callback (callable): Called as checkpoint_callback(checkpoint) after each completed
+                                        stage; checkpoint holds the stage outputs and 'completed_stages'
+        resume_from (dict): A checkpoint from an interrupted run; completed stages are skipped and
+                            their outputs (scraped data, Trello card, letter text) reused
         
     Returns:
-        list: Results for each URL
+        dict: Result with status and data
     """
     
-    results = []
+    logger.info("%s", "=" * 80)
+    logger.info("JOB APPLICATION AUTOMATION")
+    logger.info("%s", "=" * 80)
+    logger.info("Processing: %s", url)
+    
+    ctx = _new_job_context(
+        url,
+        generate_cover_letter=generate_cover_letter,
+        generate_pdf=generate_pdf,
+        create_trello_card=create_trello_card,
+        target_language=target_language,
+        skip_duplicate_check=skip_duplicate_check,
+        progress_callback=progress_callback,
+        debug_truncate=debug_truncate,
+        job_data=job_data,
+        duplicate_fast_path=duplicate_fast_path,
+        checkpoint_callback=checkpoint_callback,
+    )
+    if resume_from:
+        _restore_checkpoint(ctx, resume_from)
+        logger.info("Resuming job after stages: %s", ", ".join(ctx['completed_stages']) or 'none')
+    
+    for name, stage in SINGLE_JOB_STAGES:
+        if name in ctx['completed_stages']:
+            logger.info("Skipping stage '%s' (completed in previous run)", name)
+            continue
+        _run_stage(ctx, name, stage)
+        if 'result' in ctx:
+            break
+        _checkpoint(ctx, name)
+    
+    return _finish_timings(ctx)
+
+
+async def _astage_scrape(ctx: Dict[str, Any]) -> None:
+    """Async Steps 0a, 1, 1b and 0b: the posting is fetched on the event loop,
+    database checks and the company page search run in worker threads."""
+    await asyncio.to_thread(_check_url_duplicate, ctx)
+    if 'result' in ctx:
+        return
+    
+    if _start_fetch(ctx):
+        with span('scrape.posting'):
+            ctx['job_data'] = await scrape_job_posting_async(ctx['url'])
+    
+    await asyncio.to_thread(_process_scraped_job, ctx)
+
+
+async def _astage_cover_letter(ctx: Dict[str, Any]) -> None:
+    """Async Step 3: the OpenAI request goes through the AsyncOpenAI client."""
+    if not ctx['generate_cover_letter']:
+        return
+    if _use_placeholder_cover_letter():
+        await asyncio.to_thread(_stage_cover_letter, ctx)
+        return
+    
+    _start_cover_letter_step(ctx)
+    try:
+        # Constructor reads the CV PDFs from disk
+        ai_generator = await asyncio.to_thread(CoverLetterGenerator)
+        cover_letter_body = await ai_generator.agenerate_cover_letter(
+            ctx['job_data'],
+            target_language=_generation_language(ctx['target_language']),
+            auto_trim=True,
+            debug_truncate=ctx['debug_truncate']
+        )
+        cover_letter_text, language = _assemble_ai_cover_letter(ctx, ai_generator, cover_letter_body)
+        _store_cover_letter(ctx, cover_letter_text, language)
+    except Exception as e:
+        _record_cover_letter_error(ctx, e)
+
+
+async def _astage_trello_and_cover_letter(ctx: Dict[str, Any]) -> None:
+    """
+    Async Steps 2 and 3 concurrently (same semantics as _stage_trello_and_cover_letter).
+    
+    Only the cover letter branch is natively async. Trello is not: TrelloConnect
+    uses the blocking requests helper, so its branch is wrapped in
+    asyncio.to_thread and holds a worker thread for the whole card creation.
+    """
+    trello_ctx = dict(ctx, job_data=dict(ctx['job_data']))
+    
+    async def trello_branch() -> None:
+        await asyncio.to_thread(_run_stage, trello_ctx, 'trello', _stage_trello)
+        ctx['card'] = trello_ctx['card']
+        ctx['trello_error'] = trello_ctx['trello_error']
+        await asyncio.to_thread(_checkpoint, ctx, 'trello')
+    
+    async def letter_branch() -> None:
+        with span('stage.cover_letter'):
+            await _astage_cover_letter(ctx)
+        await asyncio.to_thread(_checkpoint, ctx, 'cover_letter')
+    
+    branches = []
+    if 'trello' not in ctx['completed_stages']:
+        branches.append(trello_branch())
+    if 'cover_letter' not in ctx['completed_stages']:
+        branches.append(letter_branch())
+    
+    # Let both branches finish (and checkpoint) before surfacing a crash
+    for outcome in await asyncio.gather(*branches, return_exceptions=True):
+        if isinstance(outcome, BaseException):
+            raise outcome
+
+
+async def _astage_documents(ctx: Dict[str, Any]) -> None:
+    # python-docx rendering and PDF conversion are blocking
+    await asyncio.to_thread(_stage_documents, ctx)
+
+
+async def _astage_persist(ctx: Dict[str, Any]) -> None:
+    await asyncio.to_thread(_stage_persist, ctx)
+
+
+# Async counterpart of SINGLE_JOB_STAGES
+ASYNC_JOB_STAGES = [
+    ('scrape', _astage_scrape),
+    ('trello_and_cover_letter', _astage_trello_and_cover_letter),
+    ('documents', _astage_documents),
+    ('persist', _astage_persist),
+]
+
+
+async def process_job_posting_async(url: str, **options: Any) -> Dict[str, Any]:
+    """
+    Async counterpart of process_job_posting
+    
+    Takes the same keyword options and returns the same result. Scraping and the
+    OpenAI request run on the event loop; blocking work (database, Trello,
+    DOCX/PDF) is handed to worker threads, so many jobs can share one loop.
+    
+    Args:
+        url (str): Job posting URL
+        **options: Same keyword options as process_job_posting
+        
+    Returns:
+        dict: Result with status and data
+    """
+    resume_from = options.pop('resume_from', None)
     
     logger.info("%s", "=" * 80)
-    logger.info("BATCH PROCESSING %s JOB POSTINGS", len(urls))
+    logger.info("JOB APPLICATION AUTOMATION (async)")
     logger.info("%s", "=" * 80)
+    logger.info("Processing: %s", url)
     
-    for i, url in enumerate(urls, 1):
-        logger.info("%s", "=" * 80)
-        logger.info("Processing %s/%s", i, len(urls))
-        logger.info("%s", "=" * 80)
+    ctx = _new_job_context(url, **options)
+    if resume_from:
+        _restore_checkpoint(ctx, resume_from)
+        logger.info("Resuming job after stages: %s", ", ".join(ctx['completed_stages']) or 'none')
+    
+    with use_timer(ctx['timer']):
+        for name, stage in ASYNC_JOB_STAGES:
+            if name in ctx['completed_stages']:
+                logger.info("Skipping stage '%s' (completed in previous run)", name)
+                continue
+            with span(f'stage.{name}'):
+                await stage(ctx)
+            if 'result' in ctx:
+                break
+            await asyncio.to_thread(_checkpoint, ctx, name)
+    
+    return await asyncio.to_thread(_finish_timings, ctx)
+
+
+# Job queue ids of CLI runs; the web app's jobs use 'job_'
+CLI_JOB_PREFIX = 'cli_'
+
+
+def _job_queue_update(action: str, job_id: str, *args: Any) -> None:
+    """Mirror a job state change into the persistent job queue (never fails the job)."""
+    try:
+        getattr(get_job_queue(), action)(job_id, *args)
+    except Exception as e:
+        logger.warning("[%s] Could not update job queue (%s): %s", job_id, action, e)
+
+
+def enqueue_jobs(urls: List[str], **options: Any) -> List[Dict[str, Any]]:
+    """
+    Record CLI jobs in the persistent job queue so an interrupted run can be resumed.
+    
+    Args:
+        urls (list): Job posting URLs
+        **options: process_job_posting options stored with each job (JSON serializable)
         
-        result = process_job_posting(url)
-        results.append({
-            'url': url,
-            **result
-        })
+    Returns:
+        list: One job record per URL (job_id, url, options, checkpoint) for the
+              ``jobs`` argument of batch_process_urls / pipeline_process_urls /
+              process_urls_async and for process_queued_job
+    """
+    jobs = []
+    for url in urls:
+        job_id = f"{CLI_JOB_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        _job_queue_update('enqueue', job_id, url, options)
+        jobs.append({'job_id': job_id, 'url': url, 'options': dict(options), 'checkpoint': None})
+    return jobs
+
+
+def resumable_jobs() -> List[Dict[str, Any]]:
+    """CLI jobs that were pending or running when the last run stopped (oldest first)."""
+    try:
+        return get_job_queue().get_resumable(prefix=CLI_JOB_PREFIX)
+    except Exception as e:
+        logger.warning("Could not load pending jobs: %s", e)
+        return []
+
+
+def _queued_job_options(job: Dict[str, Any], process_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """process_job_posting options for a queued job: its stored options, checkpointing and resume point."""
+    job_id = job['job_id']
+    return {
+        **process_kwargs,
+        **job['options'],
+        'checkpoint_callback': lambda checkpoint: _job_queue_update('save_checkpoint', job_id, checkpoint),
+        'resume_from': job.get('checkpoint') or None,
+    }
+
+
+def _finish_queued_job(job: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """Store a queued job's final result (failed jobs are not resumed either)."""
+    if result.get('status') in ('success', 'duplicate', 'cover_letter_failed'):
+        _job_queue_update('complete', job['job_id'], result)
+    else:
+        _job_queue_update('fail', job['job_id'], result.get('error') or 'Unknown error', result)
+
+
+def process_queued_job(job: Dict[str, Any], **process_kwargs: Any) -> Dict[str, Any]:
+    """
+    Run process_job_posting for a job from enqueue_jobs / resumable_jobs
+    
+    The job is marked running, checkpointed after every stage and marked
+    completed or failed at the end; a resumed job skips its completed stages.
+    """
+    _job_queue_update('mark_running', job['job_id'])
+    try:
+        result = process_job_posting(job['url'], **_queued_job_options(job, process_kwargs))
+    except Exception as e:
+        _job_queue_update('fail', job['job_id'], str(e))
+        raise
+    _finish_queued_job(job, result)
+    return result
+
+
+def pipeline_process_urls(
+    urls: List[str],
+    workers: Optional[Dict[str, int]] = None,
+    queue_size: Optional[int] = None,
+    per_host_delay: Optional[float] = None,
+    jobs: Optional[List[Dict[str, Any]]] = None,
+    **process_kwargs: Any
+) -> List[Dict[str, Any]]:
+    """
+    Process many job postings through a staged pipeline
+    
+    Each step of process_job_posting (scrape → Trello → cover letter → documents →
+    database) runs on its own worker pool with a bounded input queue. A full queue
+    blocks the upstream stage (backpressure), so throughput is bounded by the
+    slowest stage rather than the sum of all stages.
+    
+    Args:
+        urls (list): Job posting URLs
+        workers (dict): Worker count per stage name; defaults come from
+                        PIPELINE_<STAGE>_WORKERS env vars (see PIPELINE_DEFAULT_WORKERS)
+        queue_size (int): Capacity of each stage's input queue (default: PIPELINE_QUEUE_SIZE or 8)
+        per_host_delay (float): Minimum seconds between scrapes of the same host
+                                (default: BATCH_PER_HOST_DELAY env or 3.0)
+        jobs (list): Job queue records for ``urls`` (same order, see enqueue_jobs); each job
+                     is checkpointed after every stage and resumes from its stored checkpoint
+        **process_kwargs: Same options as process_job_posting
+        
+    Returns:
+        list: Results in input order (same shape as process_job_posting results)
+    """
+    workers = dict(workers or {})
+    if queue_size is None:
+        queue_size = get_int('PIPELINE_QUEUE_SIZE', 8)
+    if per_host_delay is None:
+        per_host_delay = get_float('BATCH_PER_HOST_DELAY', 3.0)
+    throttle = HostThrottle(min_interval=per_host_delay)
+    
+    def polite_scrape(ctx: Dict[str, Any]) -> None:
+        with throttle.slot(ctx['url']):
+            _stage_scrape(ctx)
+    
+    def timed(name: str, handler: callable) -> callable:
+        def run(ctx: Dict[str, Any]) -> None:
+            # Queued jobs go running when the first stage picks them up, not
+            # when the whole batch is handed to the pipeline
+            job_id = ctx.pop('queue_job_id', None)
+            if job_id is not None:
+                _job_queue_update('mark_running', job_id)
+            if name in ctx['completed_stages']:
+                return
+            _run_stage(ctx, name, handler)
+            if 'result' not in ctx:
+                _checkpoint(ctx, name)
+        return run
+    
+    def new_context(url: str, job: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if job is None:
+            return _new_job_context(url, **process_kwargs)
+        options = _queued_job_options(job, process_kwargs)
+        resume_from = options.pop('resume_from')
+        ctx = _new_job_context(url, **options)
+        if resume_from:
+            _restore_checkpoint(ctx, resume_from)
+        ctx['queue_job_id'] = job['job_id']
+        return ctx
+    
+    stages = []
+    for name, handler in JOB_STAGES:
+        count = workers.get(name) or get_int(f'PIPELINE_{name.upper()}_WORKERS', PIPELINE_DEFAULT_WORKERS[name])
+        handler = polite_scrape if name == 'scrape' else handler
+        stages.append(PipelineStage(name, timed(name, handler), workers=count, queue_size=queue_size))
+    
+    logger.info("%s", "=" * 80)
+    logger.info("PIPELINE PROCESSING %s JOB POSTINGS", len(urls))
+    logger.info("  Stages: %s", ", ".join(f"{s.name}×{s.workers}" for s in stages))
+    logger.info("%s", "=" * 80)
+    
+    jobs = jobs or [None] * len(urls)
+    pipeline = JobPipeline(stages)
+    contexts = [new_context(url, job) for url, job in zip(urls, jobs)]
+    finished = pipeline.run(contexts)
+    
+    results = []
+    for url, job, ctx in zip(urls, jobs, finished):
+        ctx.setdefault('result', {'status': 'failed', 'step': 'pipeline', 'error': 'No result produced'})
+        results.append({'url': url, **_finish_timings(ctx)})
+        if job is not None:
+            _finish_queued_job(job, ctx['result'])
+    
+    for stat in pipeline.stats():
+        logger.info("  Stage %-12s processed=%-4s busy=%.1fs max_queue=%s",
+                    stat['name'], stat['processed'], stat['busy_seconds'], stat['max_queue_depth'])
+    successful = sum(1 for r in results if r['status'] == 'success')
+    logger.info("Pipeline results: %s/%s successful", successful, len(urls))
+    return results
+
+
+def batch_process_urls(
+    urls: List[str],
+    max_workers: Optional[int] = None,
+    per_host_delay: Optional[float] = None,
+    jobs: Optional[List[Dict[str, Any]]] = None,
+    **process_kwargs: Any
+) -> List[Dict[str, Any]]:
+    """
+    Process multiple job posting URLs concurrently
+    
+    Jobs run on a bounded thread pool so that network waits of different jobs
+    (scraping, OpenAI, Trello) overlap. Politeness is enforced per host: two jobs
+    for the same job board start at least ``per_host_delay`` seconds apart, while
+    jobs for different hosts start immediately.
+    
+    Args:
+        urls (list): List of job posting URLs
+        max_workers (int): Number of jobs processed in parallel
+                           (default: BATCH_MAX_WORKERS env or 4; 1 = sequential)
+        per_host_delay (float): Minimum seconds between job starts on the same host
+                                (default: BATCH_PER_HOST_DELAY env or 3.0)
+        jobs (list): Job queue records for ``urls`` (same order, see enqueue_jobs); each job
+                     runs through process_queued_job (checkpointed, resumable)
+        **process_kwargs: Forwarded to process_job_posting (e.g. generate_pdf=True)
         
-        # Wait between requests (be polite to Stepstone)
-        if i < len(urls):
-            import time
-            logger.info("Waiting 3 seconds before next job...")
-            time.sleep(3)
+    Returns:
+        list: Results for each URL, in input order. Each result carries a
+              'timing' dict with 'wait_seconds' (politeness delay) and
+              'duration_seconds' (processing time).
+    """
+    if max_workers is None:
+        max_workers = get_int('BATCH_MAX_WORKERS', 4)
+    if per_host_delay is None:
+        per_host_delay = get_float('BATCH_PER_HOST_DELAY', 3.0)
+    max_workers = max(1, min(max_workers, len(urls) or 1))
+    
+    throttle = HostThrottle(min_interval=per_host_delay)
+    
+    logger.info("%s", "=" * 80)
+    logger.info("BATCH PROCESSING %s JOB POSTINGS (%s workers, %.1fs per-host delay)",
+                len(urls), max_workers, per_host_delay)
+    logger.info("%s", "=" * 80)
+    
+    def run_one(index: int, url: str, job: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        with throttle.slot(url) as waited:
+            logger.info("Processing %s/%s: %s", index, len(urls), url)
+            started = time.monotonic()
+            try:
+                if job is None:
+                    result = process_job_posting(url, **process_kwargs)
+                else:
+                    result = process_queued_job(job, **process_kwargs)
+            except Exception as e:
+                logger.exception("Unhandled error processing %s: %s", url, e)
+                report_error(
+                    "Batch job failed",
+                    exc=e,
+                    context={"url": url},
+                    severity="error",
+                )
+                result = {'status': 'failed', 'step': 'exception', 'error': str(e)}
+        return {
+            'url': url,
+            **result,
+            'timing': {
+                'wait_seconds': round(waited, 3),
+                'duration_seconds': round(time.monotonic() - started, 3),
+            }
+        }
+    
+    batch_started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='batch') as executor:
+        futures = [
+            executor.submit(run_one, i, url, job)
+            for i, (url, job) in enumerate(zip(urls, jobs or [None] * len(urls)), 1)
+        ]
+        results = [future.result() for future in futures]
+    batch_elapsed = time.monotonic() - batch_started
     
     # Final summary
     logger.info("%s", "=" * 80)
@@ -636,18 +1362,93 @@ def batch_process_urls(urls: List[str]) -> List[Dict[str, Any]]:
     logger.info("%s", "=" * 80)
     
     successful = sum(1 for r in results if r['status'] == 'success')
-    logger.info("Results: %s/%s successful", successful, len(urls))
+    logger.info("Results: %s/%s successful in %.1fs", successful, len(urls), batch_elapsed)
     
     for i, result in enumerate(results, 1):
-        status_icon = "✓" if result['status'] == 'success' else "✗"
-        company = result.get('job_data', {}).get('company_name', 'Unknown') if 'job_data' in result else 'Unknown'
-        logger.info("%s. %s %s", i, status_icon, company)
-        if result['status'] == 'success':
+        status_icon = {'success': "✓", 'duplicate': "="}.get(result['status'], "✗")
+        company = (result.get('job_data') or {}).get('company_name', 'Unknown')
+        logger.info("%s. %s %s (%.1fs, waited %.1fs)", i, status_icon, company,
+                    result['timing']['duration_seconds'], result['timing']['wait_seconds'])
+        if result.get('trello_card'):
             logger.info("   Card: %s", result['trello_card']['shortUrl'])
     
     return results
 
 
+async def process_urls_async(
+    urls: List[str],
+    concurrency: Optional[int] = None,
+    per_host_delay: Optional[float] = None,
+    jobs: Optional[List[Dict[str, Any]]] = None,
+    **process_kwargs: Any
+) -> List[Dict[str, Any]]:
+    """
+    Process many job postings concurrently on one event loop
+    
+    Async counterpart of batch_process_urls: instead of one thread per job, up to
+    ``concurrency`` jobs are in flight as coroutines. Run it from synchronous
+    code with utils.aio.run_sync (see the --async CLI flag).
+    
+    Args:
+        urls (list): Job posting URLs
+        concurrency (int): Jobs in flight at once (default: ASYNC_MAX_CONCURRENCY env or 10)
+        per_host_delay (float): Minimum seconds between job starts on the same host
+                                (default: BATCH_PER_HOST_DELAY env or 3.0)
+        jobs (list): Job queue records for ``urls`` (same order, see enqueue_jobs); each job
+                     is checkpointed after every stage and resumes from its stored checkpoint
+        **process_kwargs: Forwarded to process_job_posting_async
+        
+    Returns:
+        list: Results in input order, each with a 'timing' dict like batch_process_urls
+    """
+    if concurrency is None:
+        concurrency = get_int('ASYNC_MAX_CONCURRENCY', 10)
+    if per_host_delay is None:
+        per_host_delay = get_float('BATCH_PER_HOST_DELAY', 3.0)
+    throttle = HostThrottle(min_interval=per_host_delay)
+    
+    logger.info("%s", "=" * 80)
+    logger.info("ASYNC PROCESSING %s JOB POSTINGS (concurrency %s, %.1fs per-host delay)",
+                len(urls), concurrency, per_host_delay)
+    logger.info("%s", "=" * 80)
+    
+    async def run_one(url: str, job: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        waited = await throttle.wait_async(url)
+        started = time.monotonic()
+        try:
+            if job is None:
+                result = await process_job_posting_async(url, **process_kwargs)
+            else:
+                await asyncio.to_thread(_job_queue_update, 'mark_running', job['job_id'])
+                result = await process_job_posting_async(url, **_queued_job_options(job, process_kwargs))
+                await asyncio.to_thread(_finish_queued_job, job, result)
+        except Exception as e:
+            logger.exception("Unhandled error processing %s: %s", url, e)
+            report_error(
+                "Batch job failed",
+                exc=e,
+                context={"url": url},
+                severity="error",
+            )
+            result = {'status': 'failed', 'step': 'exception', 'error': str(e)}
+            if job is not None:
+                await asyncio.to_thread(_job_queue_update, 'fail', job['job_id'], str(e))
+        return {
+            'url': url,
+            **result,
+            'timing': {
+                'wait_seconds': round(waited, 3),
+                'duration_seconds': round(time.monotonic() - started, 3),
+            }
+        }
+    
+    runs = [run_one(url, job) for url, job in zip(urls, jobs or [None] * len(urls))]
+    results = await gather_limited(concurrency, runs)
+    successful = sum(1 for r in results if r['status'] == 'success')
+    logger.info("Async results: %s/%s successful", successful, len(urls))
+    return results
+
+
 def interactive_mode() -> None:
     """
     Interactive command-line interface
@@ -668,7 +1469,7 @@ def interactive_mode() -> None:
         if choice == '1':
             url = input("\nEnter Stepstone job URL: ").strip()
             if url:
-                process_job_posting(url)
+                process_queued_job(enqueue_jobs([url])[0])
             else:
                 logger.error("No URL provided!")
         
@@ -682,7 +1483,7 @@ def interactive_mode() -> None:
                 urls.append(url)
             
             if urls:
-                batch_process_urls(urls)
+                batch_process_urls(urls, jobs=enqueue_jobs(urls))
             else:
                 logger.error("No URLs provided!")
         
@@ -695,15 +1496,48 @@ def interactive_mode() -> None:
 
 
 if __name__ == "__main__":
-    # Check if URL provided as command line argument
-    if len(sys.argv) > 1:
-        # Command line mode
-        urls = sys.argv[1:]
-        
-        if len(urls) == 1:
-            process_job_posting(urls[0])
-        else:
-            batch_process_urls(urls)
-    else:
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Job application automation")
+    parser.add_argument('urls', nargs='*', help="Job posting URL(s); interactive mode if omitted")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Parallel jobs for batch mode (default: BATCH_MAX_WORKERS or 4)")
+    parser.add_argument('--per-host-delay', type=float, default=None,
+                        help="Seconds between job starts on the same host (default: BATCH_PER_HOST_DELAY or 3)")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="Run batches through the staged pipeline (one worker pool per step)")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="Run batches as coroutines on one event loop (--workers sets the concurrency)")
+    parser.add_argument('--duplicate-fast-path', action='store_true', default=None,
+                        help="Return the stored result for already processed URLs (default: DUPLICATE_FAST_PATH)")
+    parser.add_argument('--offline', action='store_true',
+                        help="Replay job pages from the HTTP cache without network access (HTTP_CACHE_OFFLINE)")
+    parser.add_argument('--no-resume', action='store_true',
+                        help="Don't resume jobs interrupted by the last run (they stay in the job queue)")
+    args = parser.parse_args()
+    if args.offline:
+        os.environ['HTTP_CACHE_OFFLINE'] = 'true'
+    
+    # Jobs interrupted by the last run go first, with their stored options and checkpoints
+    jobs = [] if args.no_resume else resumable_jobs()
+    if jobs:
+        logger.info("Resuming %s interrupted job(s) from the job queue", len(jobs))
+    
+    options = {'duplicate_fast_path': args.duplicate_fast_path}
+    jobs += enqueue_jobs(args.urls, **options)
+    urls = [job['url'] for job in jobs]
+    
+    if len(jobs) == 1:
+        process_queued_job(jobs[0], **options)
+    elif jobs and args.pipeline:
+        pipeline_process_urls(urls, per_host_delay=args.per_host_delay, jobs=jobs, **options)
+    elif jobs and args.use_async:
+        run_sync(process_urls_async(urls, concurrency=args.workers,
+                                    per_host_delay=args.per_host_delay, jobs=jobs, **options))
+    elif jobs:
+        batch_process_urls(urls, max_workers=args.workers, per_host_delay=args.per_host_delay,
+                           jobs=jobs, **options)
+    
+    if not args.urls:
         # Interactive mode
-        interactive_mode()
\ No newline at end of file
+        interactive_mode()
@@ -0,0 +1,229 @@
+"""
+Staged Job Pipeline
+Runs each processing step on its own worker pool with a bounded input queue.
+
+Items flow stage → stage through ``queue.Queue(maxsize=...)``. When a downstream
+stage falls behind, its queue fills up and upstream workers block on ``put()``,
+so backpressure propagates all the way back to the producer and memory stays
+bounded no matter how many postings are submitted. Steady-state throughput is
+limited by the slowest stage (per worker) instead of the sum of all stages.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from utils.log_config import get_logger
+
+logger = get_logger(__name__)
+
+# Marks the end of input for a stage's workers
+_STOP = object()
+
+
+class PipelineStage:
+    """
+    One step of the pipeline: a handler, a worker pool and a bounded input queue.
+
+    The handler receives the item (a mutable dict) and updates it in place.
+    An item whose 'result' key is set is considered finished and is passed
+    through the remaining stages untouched.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Dict[str, Any]], None],
+        workers: int = 1,
+        queue_size: int = 8
+    ):
+        """
+        Initialize a stage.
+
+        Args:
+            name: Stage name (used in logs, stats and failure results)
+            handler: Callable that processes one item in place
+            workers: Number of worker threads for this stage
+            queue_size: Capacity of the input queue (0 = unbounded)
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, int(workers))
+        self.queue_size = max(0, int(queue_size))
+        self.queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        self._lock = threading.Lock()
+        self._stopped_workers = 0
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+
+    def put(self, envelope: Any) -> None:
+        """Enqueue an item, blocking while the queue is full (backpressure)."""
+        self.queue.put(envelope)
+        depth = self.queue.qsize()
+        with self._lock:
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for this stage."""
+        with self._lock:
+            return {
+                'name': self.name,
+                'workers': self.workers,
+                'processed': self.processed,
+                'failed': self.failed,
+                'busy_seconds': round(self.busy_seconds, 3),
+                'max_queue_depth': self.max_queue_depth,
+            }
+
+
+class JobPipeline:
+    """
+    Connects PipelineStages in order and runs a batch of items through them.
+
+    Usage:
+        pipeline = JobPipeline([
+            PipelineStage('scrape', scrape_handler, workers=4),
+            PipelineStage('persist', persist_handler, workers=1),
+        ])
+        finished = pipeline.run(items)
+    """
+
+    def __init__(self, stages: List[PipelineStage]):
+        if not stages:
+            raise ValueError("JobPipeline requires at least one stage")
+        self.stages = stages
+        self._output: queue.Queue = queue.Queue()
+        self._aborted = threading.Event()
+        self._abort_lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+
+    def run(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process all items through every stage.
+
+        Args:
+            items: Mutable dicts to process
+
+        Returns:
+            list: The same items in input order, after all stages ran
+
+        Raises:
+            BaseException: A non-``Exception`` error (KeyboardInterrupt,
+                SystemExit, ...) raised by a handler is re-raised here once
+                the pipeline has been told to shut down
+        """
+        items = list(items)
+        self._aborted.clear()
+        self._error = None
+        threads = []
+        for index, stage in enumerate(self.stages):
+            stage._stopped_workers = 0
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index,),
+                    name=f"pipeline-{stage.name}-{n}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        # Feed from a separate thread so the caller can drain the output
+        # concurrently while the first stage's queue applies backpressure.
+        feeder = threading.Thread(target=self._feed, args=(items,), name="pipeline-feeder", daemon=True)
+        feeder.start()
+
+        finished: Dict[int, Dict[str, Any]] = {}
+        while len(finished) < len(items):
+            envelope = self._output.get()
+            if envelope is _STOP:
+                raise self._error
+            position, item = envelope
+            finished[position] = item
+
+        feeder.join()
+        for thread in threads:
+            thread.join()
+
+        return [finished[i] for i in range(len(items))]
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return per-stage counters (processed, busy time, max queue depth)."""
+        return [stage.stats() for stage in self.stages]
+
+    def _feed(self, items: List[Dict[str, Any]]) -> None:
+        first = self.stages[0]
+        for position, item in enumerate(items):
+            if self._aborted.is_set():
+                return
+            first.put((position, item))
+        for _ in range(first.workers):
+            first.put(_STOP)
+
+    def _worker(self, index: int) -> None:
+        stage = self.stages[index]
+        is_last = index == len(self.stages) - 1
+
+        while True:
+            envelope = stage.queue.get()
+            if envelope is _STOP:
+                self._stop_worker(index)
+                return
+
+            position, item = envelope
+            try:
+                if 'result' not in item and not self._aborted.is_set():
+                    self._process(stage, item)
+            except BaseException as e:
+                # KeyboardInterrupt, SystemExit, ...: this worker dies, so stop
+                # the pipeline instead of leaving run() waiting for the item
+                item['result'] = {'status': 'failed', 'step': stage.name, 'error': repr(e)}
+                self._abort(e)
+                self._stop_worker(index)
+                raise
+            finally:
+                if is_last:
+                    self._output.put((position, item))
+                else:
+                    self.stages[index + 1].put(envelope)
+
+    def _process(self, stage: PipelineStage, item: Dict[str, Any]) -> None:
+        """Run a stage's handler on one item, turning an Exception into a failed result."""
+        started = time.monotonic()
+        try:
+            stage.handler(item)
+        except Exception as e:
+            logger.error("Pipeline stage '%s' failed: %s", stage.name, e)
+            item['result'] = {'status': 'failed', 'step': stage.name, 'error': str(e)}
+            with stage._lock:
+                stage.failed += 1
+        finally:
+            with stage._lock:
+                stage.processed += 1
+                stage.busy_seconds += time.monotonic() - started
+
+    def _abort(self, error: BaseException) -> None:
+        """Record the first fatal error and wake run() so it can re-raise it."""
+        with self._abort_lock:
+            if self._error is not None:
+                return
+            self._error = error
+        self._aborted.set()
+        logger.error("Pipeline aborted: %r", error)
+        self._output.put(_STOP)
+
+    def _stop_worker(self, index: int) -> None:
+        """Count a stopped worker; the last one to stop shuts down the next stage."""
+        stage = self.stages[index]
+        with stage._lock:
+            stage._stopped_workers += 1
+            all_stopped = stage._stopped_workers == stage.workers
+        if all_stopped and index < len(self.stages) - 1:
+            following = self.stages[index + 1]
+            for _ in range(following.workers):
+                following.put(_STOP)
@@ -4,7 +4,7 @@ Refactored from function-based to class-based for better maintainability and tes
 """
 
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, ElementFilter, Tag
 from datetime import datetime
 import json
 import re
@@ -14,15 +14,25 @@ from abc import ABC, abstractmethod
 import asyncio
 
 try:
+    from .utils.env import get_bool, get_int, get_str
     from .utils.log_config import get_logger
-    from .utils.http_utils import request_with_retries
+    from .utils.http_cache import get_response_cache
+    from .utils.http_utils import MarkerWatch, arequest_with_retries
+    from .utils.html_scan import HtmlScan, SoupPage, SubtreeFilter, fragment_text, job_posting
     from .utils.errors import ScraperError
+    from .utils.timing import span
+    from .utils.text_patterns import EMAIL_RE, PHONE_RE, clean_job_title, find_reference
 except Exception:
     import os, sys
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from utils.env import get_bool, get_int, get_str
     from utils.log_config import get_logger
-    from utils.http_utils import request_with_retries
+    from utils.http_cache import get_response_cache
+    from utils.http_utils import MarkerWatch, arequest_with_retries
+    from utils.html_scan import HtmlScan, SoupPage, SubtreeFilter, fragment_text, job_posting
     from utils.errors import ScraperError
+    from utils.timing import span
+    from utils.text_patterns import EMAIL_RE, PHONE_RE, clean_job_title, find_reference
 
 # Type aliases for clarity
 JobData = Dict[str, Any]
@@ -34,11 +44,50 @@ class BaseJobScraper(ABC):
     """
     Abstract base class for job scrapers.
     Defines the interface and shared utilities for all job scraper implementations.
+    
+    Pages are streamed with a byte cap (``SCRAPER_MAX_BYTES``, default 5 MB).
+    With ``SCRAPER_EARLY_STOP`` the download also ends as soon as all
+    ``STOP_MARKERS`` groups (see ``MarkerWatch``) have been received.
+    
+    ``SCRAPER_PARSE_MODE`` selects how pages are read (see ``html_scan``):
+    ``scan`` (regexes plus partial DOM), ``targeted`` (lxml tree of the
+    ``PARSE_ONLY`` subtrees) or ``full``. Modes a scraper does not list in
+    ``PARSE_MODES`` fall back to its first one.
     """
     
+    # Markup the scraper needs; empty disables early stop
+    STOP_MARKERS: Tuple[Any, ...] = ()
+    
+    # Supported parse modes, default first
+    PARSE_MODES: Tuple[str, ...] = ('full',)
+    
+    # Subtrees the scraper queries, for the ``targeted`` mode
+    PARSE_ONLY: Optional[ElementFilter] = None
+    
     def __init__(self):
-        """Initialize the scraper with logger."""
+        """Initialize the scraper with logger and download limits."""
         self.logger = get_logger(self.__class__.__name__)
+        self.max_bytes = get_int('SCRAPER_MAX_BYTES', 5 * 1024 * 1024)
+        self.early_stop = get_bool('SCRAPER_EARLY_STOP', False)
+        mode = get_str('SCRAPER_PARSE_MODE', '').lower()
+        self.parse_mode = mode if mode in self.PARSE_MODES else self.PARSE_MODES[0]
+    
+    def _fetch_options(self) -> Dict[str, Any]:
+        """Streaming options for ``arequest_with_retries`` (byte cap, early stop)."""
+        options: Dict[str, Any] = {'max_bytes': self.max_bytes if self.max_bytes > 0 else None}
+        if self.early_stop and self.STOP_MARKERS:
+            options['stop_when'] = MarkerWatch(*self.STOP_MARKERS)
+        return options
+    
+    def _page(self, content: bytes) -> Union[HtmlScan, SoupPage]:
+        """Page view for field extraction in the configured parse mode."""
+        with span('html.parse', bytes=len(content), mode=self.parse_mode):
+            if self.parse_mode == 'scan':
+                return HtmlScan(content)
+            if self.parse_mode == 'targeted' and self.PARSE_ONLY is not None:
+                soup = BeautifulSoup(content, 'lxml', parse_only=self.PARSE_ONLY)
+                return SoupPage(soup, scan=HtmlScan(content))
+            return SoupPage(BeautifulSoup(content, 'lxml'))
     
     @abstractmethod
     async def scrape(self, url: str) -> Optional[JobData]:
@@ -104,7 +153,7 @@ class BaseJobScraper(ABC):
         try:
             from .utils.web_search import WebSearcher
             
-            searcher = WebSearcher(max_results=3, rate_limit_delay=0.5)
+            searcher = WebSearcher(max_results=3)
             query = f"{company_name} official website"
             results = searcher.search(query)
             
@@ -126,6 +175,23 @@ class StepstoneScraper(BaseJobScraper):
     Extracts job data using JSON-LD structured data with DOM fallbacks.
     """
     
+    STOP_MARKERS = (
+        ('application/ld+json', 'JobPosting', '</script>'),
+        'data-at="header-job-title"',
+        'data-at="metadata-company-name"',
+        'data-at="metadata-location"',
+        'data-at="metadata-work-type"',
+    )
+    
+    PARSE_MODES = ('scan', 'targeted', 'full')
+    # JSON-LD, the data-at fields and links (only <a href> can be an apply link)
+    PARSE_ONLY = SubtreeFilter(
+        ('script', {'type': 'application/ld+json'}),
+        (None, {'data-at': {'header-job-title', 'metadata-company-name', 'metadata-location', 'metadata-work-type'}}),
+        ('a', {'href': True}),
+    )
+    APPLY_TEXT_RE = re.compile('jetzt bewerben|apply now|bewerben', re.I)
+    
     async def scrape(self, url: str) -> Optional[JobData]:
         """
         Scrape a Stepstone job posting and extract key information.
@@ -136,8 +202,6 @@ class StepstoneScraper(BaseJobScraper):
         Returns:
             Dictionary containing extracted job information or None if scraping failed
         """
-        job_data = self._create_empty_job_data(url)
-        
         try:
             # Set headers to mimic a real browser
             headers = {
@@ -149,7 +213,9 @@ class StepstoneScraper(BaseJobScraper):
             # Fetch the page with retries
             self.logger.info("Fetching URL: %s", url)
             try:
-                response = request_with_retries('GET', url, headers=headers, timeout=10)
+                response = await arequest_with_retries(
+                    'GET', url, headers=headers, timeout=10, cache=get_response_cache(), **self._fetch_options()
+                )
             except requests.HTTPError as e:
                 status = getattr(getattr(e, 'response', None), 'status_code', 'unknown')
                 self.logger.error("HTTP error fetching %s (status %s): %s", url, status, str(e))
@@ -158,63 +224,98 @@ class StepstoneScraper(BaseJobScraper):
                 self.logger.error("Network error fetching %s: %s", url, e)
                 raise ScraperError(f"Network error for {url}") from e
 
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'lxml')
             self.logger.debug("Page fetched successfully. Extracting data...")
+            job_data = self.parse(response.content, url)
             
-            # Extract Stepstone Job ID from URL
-            stepstone_id_match = re.search(r'--(\d+)-inline\.html', url)
-            if stepstone_id_match:
-                job_data['stepstone_job_id'] = stepstone_id_match.group(1)
-                self.logger.debug("Stepstone Job ID: %s", job_data['stepstone_job_id'])
+            # 12. Search for company page URL if not already set
+            # Skip web search for now - will be done in background if needed
+            # if not job_data.get('company_page_url') and job_data.get('company_name'):
+            #     company_page_url = self._find_company_page_url(job_data['company_name'])
+            #     if company_page_url:
+            #         job_data['company_page_url'] = company_page_url
+            #         self.logger.debug("Company Page URL: %s", job_data['company_page_url'])
             
-            # Extract from JSON-LD (most reliable!)
-            json_ld_data = self._extract_from_json_ld(soup)
+            self.logger.info("Scraping completed successfully")
+            return job_data
+
+        except ScraperError:
+            return None
+        except Exception as e:
+            self.logger.exception("Error parsing page %s: %s", url, e)
+            return None
+    
+    def parse(self, content: bytes, url: str) -> JobData:
+        """
+        Extract job data from a fetched Stepstone page.
+        
+        Args:
+            content: Raw page HTML
+            url: The URL the page was fetched from
             
-            # 1. Job Title
+        Returns:
+            Dictionary containing extracted job information
+        """
+        job_data = self._create_empty_job_data(url)
+        page = self._page(content)
+        
+        # Extract Stepstone Job ID from URL
+        stepstone_id_match = re.search(r'--(\d+)-inline\.html', url)
+        if stepstone_id_match:
+            job_data['stepstone_job_id'] = stepstone_id_match.group(1)
+            self.logger.debug("Stepstone Job ID: %s", job_data['stepstone_job_id'])
+        
+        # Extract from JSON-LD (most reliable!)
+        with span('field.json_ld'):
+            json_ld_data = self._extract_from_json_ld(page)
+        
+        # 1. Job Title
+        with span('field.job_title'):
             if json_ld_data and 'title' in json_ld_data:
                 job_data['job_title'] = json_ld_data['title']
                 job_data['job_title_clean'] = self._clean_job_title(job_data['job_title'])
             else:
-                title_tag = soup.find(attrs={'data-at': 'header-job-title'})
+                title_tag = page.find_data_at('header-job-title')
                 if title_tag:
                     job_data['job_title'] = title_tag.get_text(strip=True)
                     job_data['job_title_clean'] = self._clean_job_title(job_data['job_title'])
-            
+        
             if job_data['job_title']:
                 self.logger.debug("Job Title: %s", job_data['job_title'])
                 if job_data['job_title_clean'] and job_data['job_title'] != job_data['job_title_clean']:
                     self.logger.debug("  Clean: %s", job_data['job_title_clean'])
-            
-            # 2. Company Name
+        
+        # 2. Company Name
+        with span('field.company_name'):
             if json_ld_data and 'hiringOrganization' in json_ld_data:
                 job_data['company_name'] = json_ld_data['hiringOrganization'].get('name')
             else:
-                company_tag = soup.find(attrs={'data-at': 'metadata-company-name'})
+                company_tag = page.find_data_at('metadata-company-name')
                 if company_tag:
                     job_data['company_name'] = company_tag.get_text(strip=True)
-            
+        
             if job_data['company_name']:
                 self.logger.debug("Company: %s", job_data['company_name'])
-            
-            # 3. Location
+        
+        # 3. Location
+        with span('field.location'):
             if json_ld_data and 'jobLocation' in json_ld_data:
                 location_data = json_ld_data['jobLocation']
                 if isinstance(location_data, dict) and 'address' in location_data:
                     address = location_data['address']
                     if isinstance(address, dict):
                         job_data['location'] = address.get('addressLocality', '')
-            
+        
             if not job_data['location']:
-                location_tag = soup.find(attrs={'data-at': 'metadata-location'})
+                location_tag = page.find_data_at('metadata-location')
                 if location_tag:
                     job_data['location'] = location_tag.get_text(strip=True)
-            
+        
             if job_data['location']:
                 self.logger.debug("Location: %s", job_data['location'])
-            
-            # 4. Work Mode
-            work_type_tag = soup.find(attrs={'data-at': 'metadata-work-type'})
+        
+        # 4. Work Mode
+        with span('field.work_mode'):
+            work_type_tag = page.find_data_at('metadata-work-type')
             if work_type_tag:
                 work_type_text = work_type_tag.get_text(strip=True).lower()
                 if 'homeoffice' in work_type_text or 'remote' in work_type_text:
@@ -225,46 +326,34 @@ class StepstoneScraper(BaseJobScraper):
                 else:
                     job_data['work_mode'] = 'office'
                 self.logger.debug("Work Mode: %s", job_data['work_mode'])
-            
-            # 5. Publication Date
+        
+        # 5. Publication Date
+        with span('field.publication_date'):
             if json_ld_data and 'datePosted' in json_ld_data:
                 job_data['publication_date'] = json_ld_data['datePosted']
                 self.logger.debug("Publication Date: %s", job_data['publication_date'])
-            
-            # 5b. Industry (from JSON-LD)
+        
+        # 5b. Industry (from JSON-LD)
+        with span('field.industry'):
             if json_ld_data and 'industry' in json_ld_data:
                 job_data['industry'] = json_ld_data['industry']
                 self.logger.debug("Industry: %s", job_data['industry'])
-            
-            # 6. Job Description
+        
+        # 6. Job Description
+        with span('field.job_description'):
             if json_ld_data and 'description' in json_ld_data:
-                desc_html = json_ld_data['description']
-                desc_soup = BeautifulSoup(desc_html, 'lxml')
-                job_data['job_description'] = desc_soup.get_text(separator='\n', strip=True)
+                job_data['job_description'] = fragment_text(json_ld_data['description'])
                 desc_preview = job_data['job_description'][:200] + "..."
                 self.logger.debug("Job Description preview: %s", desc_preview)
-            
-            # 6b. Extract Company Reference Number from job description
+        
+        # 6b. Extract Company Reference Number from job description
+        with span('field.company_job_reference'):
             if job_data.get('job_description'):
-                ref_patterns = [
-                    r'Referenznummer[:\s]+([A-Z0-9\-_/]+)',
-                    r'Referenz[:\s]+([A-Z0-9\-_/]+)',
-                    r'Job-ID[:\s]+([A-Z0-9\-_/]+)',
-                    r'Job ID[:\s]+([A-Z0-9\-_/]+)',
-                    r'Kennziffer[:\s]+([A-Z0-9\-_/]+)',
-                    r'Stellennummer[:\s]+([A-Z0-9\-_/]+)',
-                    r'Reference[:\s]+([A-Z0-9\-_/]+)',
-                    r'Req\.?\s*ID[:\s]+([A-Z0-9\-_/]+)',
-                    r'Position\s*ID[:\s]+([A-Z0-9\-_/]+)',
-                ]
-                
-                for pattern in ref_patterns:
-                    match = re.search(pattern, job_data['job_description'], re.IGNORECASE)
-                    if match:
-                        job_data['company_job_reference'] = match.group(1).strip()
-                        self.logger.debug("Company Reference Number: %s", job_data['company_job_reference'])
-                        break
-            
+                reference = find_reference(job_data['job_description'])
+                if reference:
+                    job_data['company_job_reference'] = reference
+                    self.logger.debug("Company Reference Number: %s", reference)
+        
             # Also check if it's in JSON-LD
             if json_ld_data and 'identifier' in json_ld_data:
                 if not job_data.get('company_job_reference'):
@@ -273,10 +362,10 @@ class StepstoneScraper(BaseJobScraper):
                         ref_value = ref_value.get('value', '')
                     job_data['company_job_reference'] = str(ref_value)
                     self.logger.debug("Company Reference (from JSON-LD): %s", job_data['company_job_reference'])
-            
-            # 7. Company Address
-            # Priority: JSON-LD > Description Text
-            
+        
+        # 7. Company Address
+        # Priority: JSON-LD > Description Text
+        with span('field.company_address'):
             # Phase 1: Try JSON-LD structured data (PRIMARY - most reliable)
             if json_ld_data and 'jobLocation' in json_ld_data:
                 location_data = json_ld_data['jobLocation']
@@ -291,7 +380,7 @@ class StepstoneScraper(BaseJobScraper):
                         address_parts.append(address['addressLocality'])
                     if 'addressCountry' in address:
                         address_parts.append(address['addressCountry'])
-                    
+                
                     if address_parts:
                         job_data['company_address'] = ', '.join(address_parts)
                         lines = self._split_address(address)
@@ -305,7 +394,7 @@ class StepstoneScraper(BaseJobScraper):
                         self.logger.info("  Address Line 1: %s", job_data['company_address_line1'])
                         self.logger.info("  Address Line 2: %s", job_data['company_address_line2'])
                         self.logger.debug("  Full Address: %s", job_data['company_address'])
-            
+        
             # Phase 2: Fallback to extracting from job description text
             if not job_data.get('company_address'):
                 if job_data.get('job_description') and job_data.get('company_name'):
@@ -321,10 +410,11 @@ class StepstoneScraper(BaseJobScraper):
                         self.logger.info("  Address Line 1: %s", job_data['company_address_line1'])
                         self.logger.info("  Address Line 2: %s", job_data['company_address_line2'])
                         self.logger.debug("  Full Address: %s", job_data['company_address'])
-            
-            # 8. Website Link
+        
+        # 8. Website Link
+        with span('field.website_link'):
             real_company_website = None
-            
+        
             if json_ld_data and 'hiringOrganization' in json_ld_data:
                 org = json_ld_data['hiringOrganization']
                 if 'url' in org:
@@ -333,27 +423,28 @@ class StepstoneScraper(BaseJobScraper):
                         real_company_website = url_value
                         job_data['website_link'] = url_value
                         self.logger.debug("Company Website: %s", job_data['website_link'])
-            
+        
             # Construct likely company website from company name
             if not real_company_website and job_data.get('company_name'):
                 company_clean = job_data['company_name'].lower()
                 for suffix in ['gmbh', 'ag', 'se', 'kg', 'ohg', 'gbr', 'ug', 'ev', 'mbh', 'ltd', 'inc', 'llc', 'corp']:
                     company_clean = company_clean.replace(' ' + suffix, '')
                 company_clean = re.sub(r'[^a-z0-9]', '', company_clean)
-                
+            
                 job_data['website_link'] = f"https://www.{company_clean}.de"
                 self.logger.debug("Estimated Website: %s", job_data['website_link'])
                 real_company_website = job_data['website_link']
-            
+        
             # 9. Career Page Link
             if real_company_website and real_company_website.startswith('http'):
                 if 'stepstone.de' not in real_company_website:
                     base_url = real_company_website.rstrip('/')
                     job_data['career_page_link'] = f"{base_url}/karriere"
                     self.logger.debug("Career Page (estimated): %s", job_data['career_page_link'])
-                    
-            # 10. Direct Apply Link
-            apply_buttons = soup.find_all(['a', 'button'], string=re.compile('jetzt bewerben|apply now|bewerben', re.I))
+                
+        # 10. Direct Apply Link
+        with span('field.direct_apply_link'):
+            apply_buttons = page.find_tags(['a', 'button'], self.APPLY_TEXT_RE)
             for button in apply_buttons:
                 if button.name == 'a' and button.get('href'):
                     href = button['href']
@@ -361,77 +452,37 @@ class StepstoneScraper(BaseJobScraper):
                         job_data['direct_apply_link'] = href if href.startswith('http') else f'https://{href}'
                         self.logger.debug("Direct Apply Link: %s", job_data['direct_apply_link'])
                         break
-            
-            # 11. Contact Information
-            page_text = soup.get_text()
-            
+        
+        # 11. Contact Information
+        with span('field.contact_person'):
+            page_text = page.text()
+        
             # Email
-            emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', page_text)
+            emails = EMAIL_RE.findall(page_text)
             emails = [e for e in emails if not any(x in e.lower() for x in ['beispiel', 'example', 'noreply'])]
             if emails:
                 job_data['contact_person']['email'] = emails[0]
                 self.logger.debug("Contact Email: %s", job_data['contact_person']['email'])
-            
+        
             # Phone
-            phones = re.findall(r'\+?\d{2,4}[\s\-]?\(?\d{2,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4}', page_text)
+            phones = PHONE_RE.findall(page_text)
             phones = [p for p in phones if len(p.replace(' ', '').replace('-', '')) > 8]
             if phones:
                 job_data['contact_person']['phone'] = phones[0].strip()
                 self.logger.debug("Contact Phone: %s", job_data['contact_person']['phone'])
-            
-            # 12. Search for company page URL if not already set
-            # Skip web search for now - will be done in background if needed
-            # if not job_data.get('company_page_url') and job_data.get('company_name'):
-            #     company_page_url = self._find_company_page_url(job_data['company_name'])
-            #     if company_page_url:
-            #         job_data['company_page_url'] = company_page_url
-            #         self.logger.debug("Company Page URL: %s", job_data['company_page_url'])
-            
-            self.logger.info("Scraping completed successfully")
-            return job_data
-
-        except ScraperError:
-            return None
-        except Exception as e:
-            self.logger.exception("Error parsing page %s: %s", url, e)
-            return None
+        
+        return job_data
     
-    def _extract_from_json_ld(self, soup: BeautifulSoup) -> Optional[JsonLD]:
-        """Extract JSON-LD structured data from the page."""
-        json_ld_script = soup.find('script', type='application/ld+json')
-        if json_ld_script and json_ld_script.string:
-            try:
-                return json.loads(json_ld_script.string)
-            except:
-                pass
-        return None
+    def _extract_from_json_ld(self, page: Union[HtmlScan, SoupPage]) -> Optional[JsonLD]:
+        """Extract the JSON-LD JobPosting (or the first JSON-LD object) from the page."""
+        try:
+            return job_posting(page.json_ld_blocks())
+        except Exception:
+            return None
     
     def _clean_job_title(self, title: Optional[str]) -> Optional[str]:
         """Remove gender markers from job titles (German and English variants)."""
-        if not title:
-            return title
-        
-        gender_patterns = [
-            # German variants (m/w/d = male/female/diverse)
-            r'\(m/w/d\)', r'\(w/m/d\)', r'\(d/m/w\)',
-            r'\(m/w\)', r'\(w/m\)',
-            # English variants (m/f/x, f/m/x = male/female/non-binary)
-            r'\(m/f/d\)', r'\(f/m/d\)', r'\(m/f/x\)', r'\(f/m/x\)',
-            r'\(m/f\)', r'\(f/m\)',
-            r'\(gn\)', r'\(all genders\)', r'\(x/w/m\)',
-            # Non-parenthesized versions
-            r'm/w/d', r'w/m/d', r'm/f/d', r'f/m/d', r'm/f/x', r'f/m/x',
-            r'm/w(?!\w)', r'w/m(?!\w)', r'm/f(?!\w)', r'f/m(?!\w)',
-        ]
-        
-        cleaned = title
-        for pattern in gender_patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
-        
-        cleaned = re.sub(r'\s+', ' ', cleaned)
-        cleaned = re.sub(r'\s*-\s*$', '', cleaned)
-        cleaned = re.sub(r'^\s*-\s*', '', cleaned)
-        return cleaned.strip()
+        return clean_job_title(title)
     
     def _split_address(self, address_dict: Address) -> Tuple[str, str]:
         """Split address into two lines for letter formatting."""
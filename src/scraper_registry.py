@@ -0,0 +1,148 @@
+"""
+Scraper Registry
+Maps job posting URLs to the ``BaseJobScraper`` implementation for their site.
+
+Each entry pairs compiled host and (optional) path patterns with a scraper
+class given as ``"module:Class"``. The module is imported the first time a
+URL of that site is scraped, so a Stepstone-only run never imports the
+LinkedIn scraper, and no job board costs anything until it is used. New job
+boards are added to ``BUILTIN_SCRAPERS`` (or with ``registry.register``)
+without touching ``main.py``. Entries are tried in registration order; the
+first match wins.
+
+    scraper = registry.for_url(url)   # None for unsupported sites
+    job_data = await scraper.scrape(url)
+"""
+
+import importlib
+import re
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Pattern, Type, Union
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from scraper import BaseJobScraper
+
+# (name, "module:Class", host pattern, path pattern or None)
+BUILTIN_SCRAPERS = (
+    ('stepstone', 'scraper:StepstoneScraper', r'(?:^|\.)stepstone\.[a-z.]+$', None),
+    ('linkedin', 'linkedin_scraper:LinkedInScraper', r'(?:^|\.)linkedin\.com$', r'/jobs/'),
+)
+
+
+def _import(module: str):
+    """Import a sibling module the same way this module was imported (``src.X`` or ``X``)."""
+    if __package__:
+        return importlib.import_module(f'.{module}', __package__)
+    return importlib.import_module(module)
+
+
+class ScraperEntry:
+    """One registered job board: URL patterns and its (lazily loaded) scraper class."""
+
+    def __init__(
+        self,
+        name: str,
+        target: Union[str, Type['BaseJobScraper']],
+        hosts: Union[str, Pattern[str]],
+        paths: Union[str, Pattern[str], None] = None,
+    ):
+        """
+        Args:
+            name: Job source name ('stepstone', 'linkedin', ...)
+            target: ``"module:Class"`` (imported on first use) or the class itself
+            hosts: Pattern searched in the lowercased host name
+            paths: Pattern searched in the URL path (None: any path)
+        """
+        self.name = name
+        self.target = target
+        self.hosts = re.compile(hosts) if isinstance(hosts, str) else hosts
+        self.paths = re.compile(paths) if isinstance(paths, str) else paths
+        self._cls: Optional[Type['BaseJobScraper']] = None if isinstance(target, str) else target
+        self._load_lock = threading.Lock()
+
+    def matches(self, host: str, path: str) -> bool:
+        return bool(self.hosts.search(host)) and (self.paths is None or bool(self.paths.search(path)))
+
+    @property
+    def loaded(self) -> bool:
+        return self._cls is not None
+
+    def load(self) -> Type['BaseJobScraper']:
+        """
+        Import and return the scraper class (cached after the first call).
+
+        Each entry has its own lock, so importing one job board's module never
+        blocks lookups or loads of the other boards.
+        """
+        if self._cls is None:
+            with self._load_lock:
+                if self._cls is None:
+                    module_name, _, class_name = self.target.partition(':')
+                    cls = getattr(_import(module_name), class_name)
+                    if not issubclass(cls, _import('scraper').BaseJobScraper):
+                        raise TypeError(f"{self.target} is not a BaseJobScraper")
+                    self._cls = cls
+        return self._cls
+
+
+class ScraperRegistry:
+    """Thread-safe, ordered collection of ``ScraperEntry`` objects."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, ScraperEntry] = {}
+
+    def register(
+        self,
+        name: str,
+        target: Union[str, Type['BaseJobScraper']],
+        hosts: Union[str, Pattern[str]],
+        paths: Union[str, Pattern[str], None] = None,
+    ) -> ScraperEntry:
+        """Add a job board (replacing an entry with the same name, in place)."""
+        entry = ScraperEntry(name, target, hosts, paths)
+        with self._lock:
+            self._entries[name] = entry
+        return entry
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._entries.pop(name, None)
+
+    @property
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def entry(self, name: str) -> Optional[ScraperEntry]:
+        with self._lock:
+            return self._entries.get(name)
+
+    def match(self, url: str) -> Optional[ScraperEntry]:
+        """Return the first entry whose patterns match ``url``, if any."""
+        parts = urlsplit(url.strip() if '//' in url else f'//{url.strip()}')
+        host = (parts.hostname or '').lower()
+        with self._lock:
+            entries = list(self._entries.values())
+        for entry in entries:
+            if entry.matches(host, parts.path or '/'):
+                return entry
+        return None
+
+    def source(self, url: str) -> Optional[str]:
+        """Name of the job source for ``url`` (None for unsupported sites)."""
+        entry = self.match(url)
+        return entry.name if entry else None
+
+    def for_url(self, url: str) -> Optional['BaseJobScraper']:
+        """A new scraper instance for ``url`` (None for unsupported sites)."""
+        entry = self.match(url)
+        if entry is None:
+            return None
+        return entry.load()()
+
+
+registry = ScraperRegistry()
+for _name, _target, _hosts, _paths in BUILTIN_SCRAPERS:
+    registry.register(_name, _target, _hosts, _paths)
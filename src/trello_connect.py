@@ -13,12 +13,14 @@ try:
     from .utils.log_config import get_logger
     from .utils.env import load_env, get_str
     from .utils.http_utils import request_with_retries
+    from .utils.text_patterns import clean_job_title
 except ImportError:
     import sys
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
     from utils.log_config import get_logger
     from utils.env import load_env, get_str
     from utils.http_utils import request_with_retries
+    from utils.text_patterns import clean_job_title
 
 
 class TrelloConnect:
@@ -131,16 +133,20 @@ class TrelloConnect:
     
     def _enrich_job_data(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Enrich job_data with detected language, seniority, and normalized work_mode.
+        Enrich job_data with detected language, seniority, clean job title, and normalized work_mode.
         
         Args:
             job_data: Original job data dict
             
         Returns:
-            Enriched copy of job_data with language, seniority, and work_mode normalized
+            Enriched copy of job_data with language, seniority, job_title_clean, and work_mode normalized
         """
         enriched = job_data.copy()
         
+        # Scrapers without title cleaning leave job_title_clean empty
+        if not enriched.get('job_title_clean') and enriched.get('job_title'):
+            enriched['job_title_clean'] = clean_job_title(enriched['job_title'])
+        
         # Detect language if not already present
         if not enriched.get('language'):
             job_desc = enriched.get('job_description', '')
@@ -0,0 +1,73 @@
+"""Shared long-lived event loop for running coroutines from synchronous code.
+
+``asyncio.run`` creates and tears down an event loop per call, which throws
+away connection pools and makes concurrent callers (batch threads, the Flask
+worker pool) each spin up their own loop. ``run_sync`` instead submits the
+coroutine to one background loop thread that lives as long as the process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Coroutine, List, Optional, TypeVar
+
+from .log_config import get_logger
+
+
+logger = get_logger(__name__)
+
+T = TypeVar('T')
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop, starting its thread on first use."""
+    global _loop, _loop_thread
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                _loop_thread = threading.Thread(target=run, name='event-loop', daemon=True)
+                _loop_thread.start()
+                ready.wait()
+                _loop = loop
+                logger.debug("Started shared event loop thread")
+    return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """Run a coroutine on the shared loop and block until it finishes.
+
+    The caller's context variables (e.g. the active job timer) are visible
+    inside the coroutine. Must not be called from the loop thread itself.
+    """
+    loop = get_loop()
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError("run_sync() called from the shared event loop; await the coroutine instead")
+
+    # The task is created in a copy of the calling thread's context
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    return future.result(timeout)
+
+
+async def gather_limited(limit: int, awaitables: List[Awaitable[T]]) -> List[T]:
+    """Await all ``awaitables`` with at most ``limit`` running at a time (results in order)."""
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def guarded(awaitable: Awaitable[T]) -> T:
+        async with semaphore:
+            return await awaitable
+
+    return list(await asyncio.gather(*(guarded(a) for a in awaitables)))
@@ -0,0 +1,177 @@
+"""Per-host circuit breakers for the HTTP retry layer.
+
+When Trello or a job board is degraded, every job in a batch would otherwise
+burn its full retry budget against it. A ``CircuitBreaker`` counts
+consecutive failures (network errors and retryable statuses) per host and,
+past a threshold, opens: requests to that host fail fast with
+``CircuitOpenError`` until the open period ends. Then a single half-open
+probe is let through; success closes the circuit, failure re-opens it for a
+longer (jittered, ``Retry-After``-aware) period.
+
+Breakers also keep a moving average of request latency, which the retry
+loop uses to scale its backoff for slow hosts (``retry_delay``).
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+from .env import get_float, get_int
+from .log_config import get_logger
+from .throttle import host_key
+
+
+logger = get_logger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request while the host's circuit is open."""
+
+
+class CircuitBreaker:
+    """Failure tracking and fail-fast state for one host (thread-safe).
+
+    - ``failure_threshold``: consecutive failures that open the circuit
+    - ``reset_timeout``: first open period in seconds; doubles per re-open
+      up to ``max_timeout``
+    """
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 max_timeout: float = 300.0) -> None:
+        self.host = host
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.max_timeout = max_timeout
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opens = 0
+        self.open_until = 0.0
+        self.probe_in_flight = False
+        self.probe_started = 0.0
+        self.latency_ewma: Optional[float] = None
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now (claims the probe when half-open)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() >= self.open_until:
+                self.state = HALF_OPEN
+                self.probe_in_flight = False
+                logger.info("Circuit for %s half-open; probing", self.host)
+            # A probe that never reported back (e.g. the caller crashed) is replaced
+            stale_probe = time.monotonic() - self.probe_started > self.reset_timeout
+            if self.state == HALF_OPEN and (not self.probe_in_flight or stale_probe):
+                self.probe_in_flight = True
+                self.probe_started = time.monotonic()
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, latency: Optional[float] = None) -> None:
+        with self._lock:
+            self._observe(latency)
+            if self.state != CLOSED:
+                logger.info("Circuit for %s closed after successful probe", self.host)
+            self.state = CLOSED
+            self.failures = 0
+            self.opens = 0
+            self.probe_in_flight = False
+
+    def record_failure(self, latency: Optional[float] = None, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self._observe(latency)
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open(retry_after)
+
+    def _observe(self, latency: Optional[float]) -> None:
+        if latency is not None:
+            self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+
+    def _open(self, retry_after: Optional[float]) -> None:
+        """Open the circuit (caller holds the lock)."""
+        timeout = min(self.max_timeout, self.reset_timeout * (2 ** self.opens))
+        timeout = max(timeout * random.uniform(0.8, 1.2), retry_after or 0.0)
+        self.opens += 1
+        self.state = OPEN
+        self.probe_in_flight = False
+        self.open_until = time.monotonic() + timeout
+        logger.warning("Circuit for %s opened for %.1fs after %s consecutive failures",
+                       self.host, timeout, self.failures)
+
+    def retry_delay(self, attempt: int, backoff: float) -> float:
+        """Jittered backoff before retry ``attempt`` (1-based).
+
+        Exponential in the attempt number, but at least the host's typical
+        latency so a slow host isn't hit again immediately.
+        """
+        base = backoff * (2 ** (attempt - 1))
+        with self._lock:
+            if self.latency_ewma is not None:
+                base = max(base, min(self.latency_ewma, self.max_timeout))
+        return random.uniform(base / 2, base)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'opens': self.opens,
+                'rejected': self.rejected,
+                'retry_in_s': round(max(0.0, self.open_until - time.monotonic()), 1) if self.state == OPEN else 0.0,
+                'latency_ms': round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+            }
+
+
+class BreakerRegistry:
+    """One ``CircuitBreaker`` per host, created on first use."""
+
+    def __init__(self, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None) -> None:
+        self.failure_threshold = failure_threshold or get_int('HTTP_BREAKER_THRESHOLD', 5)
+        self.reset_timeout = reset_timeout if reset_timeout is not None else get_float('HTTP_BREAKER_RESET', 30.0)
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, url: str) -> CircuitBreaker:
+        host = host_key(url)
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(
+                    host, failure_threshold=self.failure_threshold, reset_timeout=self.reset_timeout
+                )
+            return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.stats() for host, breaker in breakers.items()}
+
+    def any_open(self) -> bool:
+        return any(s['state'] != CLOSED for s in self.stats().values())
+
+
+_registry: Optional[BreakerRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_breakers() -> BreakerRegistry:
+    """Return the process-wide breaker registry (``HTTP_BREAKER_THRESHOLD``, ``HTTP_BREAKER_RESET``)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = BreakerRegistry()
+    return _registry
@@ -12,10 +12,9 @@ import argparse
 import json
 from typing import Any, Dict
 
-import requests
-
 import src.utils.env as env_utils
 import src.utils.trello as trello_utils
+from src.utils.http_pool import get_session
 from src.utils.html_utils import (
     load_html_file,
     parse_html,
@@ -110,7 +109,7 @@ def cmd_trello_auth(_: argparse.Namespace) -> int:
         return 1
 
     url = f"{trello_utils.TRELLO_API_BASE}/members/me"
-    resp = requests.get(url, params=auth, timeout=20)
+    resp = get_session(url).get(url, params=auth, timeout=20)
     print(f"\nStatus Code: {resp.status_code}")
     if resp.status_code == 200:
         data = resp.json()
@@ -137,7 +136,7 @@ def cmd_trello_inspect(_: argparse.Namespace) -> int:
     base = trello_utils.TRELLO_API_BASE
     def get(path: str, **params: Any):
         p = {**auth, **params}
-        return requests.get(f"{base}/{path}", params=p, timeout=30)
+        return get_session(base).get(f"{base}/{path}", params=p, timeout=30)
 
     # Board info
     print("=== Trello Board Inspect ===")
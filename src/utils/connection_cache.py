@@ -0,0 +1,566 @@
+"""DNS and TLS session caching for the shared HTTP transports.
+
+Every job talks to the same few hosts (api.trello.com, stepstone.de,
+linkedin.com, api.openai.com, duckduckgo.com), yet each new connection
+resolves the host name again and runs a full TLS handshake. ``DNSCache``
+keeps resolved addresses for ``HTTP_DNS_TTL`` seconds (default 300, 0
+disables it). ``TLSSessionCache`` keeps the latest TLS session per host so
+new connections resume it with an abbreviated handshake
+(``HTTP_TLS_RESUMPTION``, default on).
+
+Both plug into requests via ``CachingHTTPAdapter`` and into httpx via
+``httpx_transport`` / ``httpx_async_transport``. Lookup and handshake times
+are recorded so ``connection_stats()`` can estimate the time saved.
+
+The shared ``SSLContext`` goes through requests' public pool-key hook. The
+connection class (urllib3) and the network backend (httpcore) have no public
+hook, so they are set on library internals. That is only done for the major
+versions it was written against (urllib3 2, httpcore 1) and when the
+attributes exist; otherwise the stock transports are used, without caching.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import os
+import socket
+import ssl
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import anyio
+import httpcore
+import httpx
+import urllib3
+from requests.adapters import HTTPAdapter
+from requests.certs import where as default_ca_bundle
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.poolmanager import PoolManager
+from urllib3.util.ssl_ import create_urllib3_context, resolve_cert_reqs
+
+from .env import get_bool, get_float
+from .log_config import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def _major(version: str) -> int:
+    return int(version.split('.')[0])
+
+
+def urllib3_hooks_available() -> bool:
+    """Whether the urllib3 internals ``CachingHTTPAdapter`` relies on are present.
+
+    Those are ``PoolManager.pool_classes_by_scheme`` and
+    ``HTTPConnection._new_conn`` / ``_dns_host``, checked on urllib3 2.x only.
+    """
+    try:
+        return (
+            _major(urllib3.__version__) == 2
+            and isinstance(PoolManager().pool_classes_by_scheme, dict)
+            and callable(getattr(HTTPConnection, '_new_conn', None))
+            and isinstance(HTTPConnection('localhost')._dns_host, str)
+        )
+    except Exception:
+        return False
+
+
+def httpcore_hooks_available(transport: Any) -> bool:
+    """Whether an httpx transport exposes the httpcore pool whose backend we replace (httpcore 1.x)."""
+    pool = getattr(transport, '_pool', None)
+    return (
+        _major(httpcore.__version__) == 1
+        and isinstance(pool, (httpcore.ConnectionPool, httpcore.AsyncConnectionPool))
+        and hasattr(pool, '_network_backend')
+    )
+
+
+_warned: Set[str] = set()
+
+
+def _warn_fallback(library: str, version: str) -> None:
+    if library not in _warned:
+        _warned.add(library)
+        logger.warning("%s %s: transport internals changed; using the stock transport without "
+                       "DNS/TLS session caching", library, version)
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip('[]'))
+        return True
+    except ValueError:
+        return False
+
+
+class DNSCache:
+    """Thread-safe host name -> addresses cache with a fixed TTL.
+
+    Failed connects invalidate the entry so a moved host is re-resolved on
+    the next attempt. IP literals and ``localhost`` are never cached.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 256) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, List[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.lookup_seconds = 0.0
+
+    def _skip(self, host: str) -> bool:
+        return self.ttl <= 0 or not host or host == 'localhost' or _is_ip(host)
+
+    def cached(self, host: str) -> Optional[List[str]]:
+        """Return the cached addresses for ``host`` (and count a hit), or None."""
+        if self._skip(host):
+            return None
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            self.hits += 1
+            return list(entry[1])
+
+    def resolve(self, host: str) -> Optional[List[str]]:
+        """Return the addresses for ``host``, resolving on a miss.
+
+        Returns None when the host is not cacheable or cannot be resolved;
+        the caller then connects by name as usual (and gets the usual error).
+        """
+        if self._skip(host):
+            return None
+        addresses = self.cached(host)
+        if addresses is not None:
+            return addresses
+        started = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(host, None, 0, socket.SOCK_STREAM)
+        except OSError:
+            return None
+        elapsed = time.perf_counter() - started
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self.misses += 1
+            self.lookup_seconds += elapsed
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(min(self._entries, key=lambda h: self._entries[h][0]))
+            self._entries[host] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def invalidate(self, host: str) -> None:
+        with self._lock:
+            self._entries.pop(host, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hits, misses, average lookup time and the lookup time saved by hits (ms)."""
+        with self._lock:
+            avg = self.lookup_seconds / self.misses if self.misses else None
+            return {
+                'ttl_s': self.ttl,
+                'hosts': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'lookup_ms': round(avg * 1000, 2) if avg is not None else None,
+                'saved_ms': round(avg * self.hits * 1000, 1) if avg is not None else 0.0,
+            }
+
+
+class TLSSessionCache:
+    """Latest TLS session per ``(host, port)`` plus handshake timings.
+
+    A session can only be resumed with the ``SSLContext`` that created it,
+    so entries remember their context and are ignored for any other.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._sessions: Dict[Tuple[str, int], Tuple[Any, ssl.SSLSession]] = {}
+        self.full = 0
+        self.resumed = 0
+        self.full_seconds = 0.0
+        self.resumed_seconds = 0.0
+
+    def get(self, host: str, port: int, context: Any) -> Optional[ssl.SSLSession]:
+        if not self.enabled or context is None:
+            return None
+        with self._lock:
+            entry = self._sessions.get((host, port))
+        if entry is None or entry[0] is not context:
+            return None
+        return entry[1]
+
+    def save(self, host: str, port: int, context: Any, ssl_object: Any) -> None:
+        """Remember the session of an established TLS socket/object, if it has one."""
+        session = getattr(ssl_object, 'session', None)
+        if not self.enabled or context is None or session is None:
+            return
+        with self._lock:
+            self._sessions[(host, port)] = (context, session)
+
+    def record_handshake(self, seconds: float, resumed: bool) -> None:
+        with self._lock:
+            if resumed:
+                self.resumed += 1
+                self.resumed_seconds += seconds
+            else:
+                self.full += 1
+                self.full_seconds += seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Handshake counts, average full/resumed handshake time and the estimated time saved (ms)."""
+        with self._lock:
+            full_avg = self.full_seconds / self.full if self.full else None
+            resumed_avg = self.resumed_seconds / self.resumed if self.resumed else None
+            saved = (full_avg - resumed_avg) * self.resumed if full_avg is not None and resumed_avg is not None else 0.0
+            return {
+                'enabled': self.enabled,
+                'sessions': len(self._sessions),
+                'handshakes': self.full + self.resumed,
+                'resumed': self.resumed,
+                'full_ms': round(full_avg * 1000, 2) if full_avg is not None else None,
+                'resumed_ms': round(resumed_avg * 1000, 2) if resumed_avg is not None else None,
+                'saved_ms': round(max(0.0, saved) * 1000, 1),
+            }
+
+
+class _ResumingContext:
+    """``SSLContext`` stand-in that offers a cached session when wrapping a socket.
+
+    Everything else (settings, ALPN, verification) goes to the real context.
+    """
+
+    def __init__(self, context: ssl.SSLContext, session: ssl.SSLSession) -> None:
+        object.__setattr__(self, '_context', context)
+        object.__setattr__(self, '_session', session)
+
+    def wrap_socket(self, sock: socket.socket, server_side: bool = False, do_handshake_on_connect: bool = True,
+                    suppress_ragged_eofs: bool = True, server_hostname: Optional[str] = None,
+                    session: Optional[ssl.SSLSession] = None) -> ssl.SSLSocket:
+        return self._context.wrap_socket(
+            sock, server_side=server_side, do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs, server_hostname=server_hostname,
+            session=session or self._session,
+        )
+
+    def wrap_bio(self, incoming: ssl.MemoryBIO, outgoing: ssl.MemoryBIO, server_side: bool = False,
+                 server_hostname: Optional[str] = None, session: Optional[ssl.SSLSession] = None) -> ssl.SSLObject:
+        return self._context.wrap_bio(
+            incoming, outgoing, server_side=server_side, server_hostname=server_hostname,
+            session=session or self._session,
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._context, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._context, name, value)
+
+
+def _offer_session(context: Any, host: str, port: int) -> Any:
+    session = tls_sessions.get(host, port, context)
+    return _ResumingContext(context, session) if session is not None else context
+
+
+# --- requests / urllib3 ---
+
+class _CachingConnectionMixin:
+    """Connect to cached addresses while keeping the host name for SNI and Host."""
+
+    _tcp_seconds = 0.0
+
+    def _new_conn(self) -> socket.socket:
+        started = time.perf_counter()
+        host = self._dns_host  # type: ignore[attr-defined]
+        addresses = dns_cache.resolve(host.rstrip('.'))
+        if not addresses:
+            sock = super()._new_conn()  # type: ignore[misc]
+            self._tcp_seconds = time.perf_counter() - started
+            return sock
+        last_error: Optional[Exception] = None
+        for address in addresses:
+            self._dns_host = address
+            try:
+                sock = super()._new_conn()  # type: ignore[misc]
+                self._tcp_seconds = time.perf_counter() - started
+                return sock
+            except (NewConnectionError, ConnectTimeoutError) as e:
+                last_error = e
+            finally:
+                self._dns_host = host
+        dns_cache.invalidate(host.rstrip('.'))
+        raise last_error  # type: ignore[misc]
+
+
+class CachingHTTPConnection(_CachingConnectionMixin, HTTPConnection):
+    pass
+
+
+_ssl_contexts: Dict[str, ssl.SSLContext] = {}
+_ssl_contexts_lock = threading.Lock()
+
+
+def _shared_ssl_context(url: str, verify: Any, cert: Any) -> Optional[ssl.SSLContext]:
+    """Return one verifying ``SSLContext`` per CA bundle, loaded once.
+
+    requests leaves ``ssl_context`` unset, so urllib3 would build a new
+    context and re-read the CA bundle for every connection, which also rules
+    out session resumption. The context comes from urllib3's own
+    ``create_urllib3_context``; urllib3 still applies ``cert_reqs`` and
+    hostname checks to it. Unverified and client-certificate connections keep
+    urllib3's default handling.
+    """
+    if not url.lower().startswith('https') or not verify or cert:
+        return None
+    location = default_ca_bundle() if verify is True else verify
+    with _ssl_contexts_lock:
+        context = _ssl_contexts.get(location)
+        if context is None:
+            context = create_urllib3_context(cert_reqs=resolve_cert_reqs('CERT_REQUIRED'))
+            try:
+                if os.path.isdir(location):
+                    context.load_verify_locations(capath=location)
+                else:
+                    context.load_verify_locations(cafile=location)
+            except OSError:
+                return None  # Let requests/urllib3 report the bad CA path as usual
+            context = _ssl_contexts[location] = context
+    return context
+
+
+class CachingHTTPSConnection(_CachingConnectionMixin, HTTPSConnection):
+    def connect(self) -> None:
+        context = self.ssl_context
+        if context is not None:
+            self.ssl_context = _offer_session(context, self.host, self.port)
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            self.ssl_context = context
+        tls_sessions.record_handshake(
+            time.perf_counter() - started - self._tcp_seconds, bool(getattr(self.sock, 'session_reused', False))
+        )
+
+    def getresponse(self) -> Any:  # type: ignore[override]
+        sock = self.sock  # dropped by http.client when the server closes the connection
+        resp = super().getresponse()
+        # TLS 1.3 delivers session tickets after the handshake; by now they have arrived
+        tls_sessions.save(self.host, self.port, self.ssl_context, sock)
+        return resp
+
+
+class _CachingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachingHTTPConnection
+
+
+class _CachingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachingHTTPSConnection
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """``HTTPAdapter`` whose connections use the DNS and TLS session caches.
+
+    Verifying HTTPS pools get a shared ``SSLContext`` through the public
+    ``build_connection_pool_key_attributes`` / ``cert_verify`` hooks. The
+    caching connection classes need urllib3 internals and are only installed
+    when ``urllib3_hooks_available()``.
+    """
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        if not _URLLIB3_HOOKS:
+            _warn_fallback('urllib3', urllib3.__version__)
+            return
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CachingHTTPConnectionPool,
+            'https': _CachingHTTPSConnectionPool,
+        }
+
+    def build_connection_pool_key_attributes(self, request: Any, verify: Any, cert: Any = None
+                                             ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        context = _shared_ssl_context(request.url, verify, cert)
+        if context is not None and 'ssl_context' not in pool_kwargs:
+            # The CA bundle is already loaded into the context
+            pool_kwargs.pop('ca_certs', None)
+            pool_kwargs.pop('ca_cert_dir', None)
+            pool_kwargs['ssl_context'] = context
+        return host_params, pool_kwargs
+
+    def cert_verify(self, conn: Any, url: str, verify: Any, cert: Any) -> None:
+        super().cert_verify(conn, url, verify, cert)
+        if _shared_ssl_context(url, verify, cert) is not None:
+            # Otherwise urllib3 reloads the bundle into the shared context on every connect
+            conn.ca_certs = conn.ca_cert_dir = None
+
+
+# --- httpx / httpcore ---
+
+class _CachingStream(httpcore.NetworkStream):
+    def __init__(self, stream: httpcore.NetworkStream, host: str, port: int,
+                 context: Optional[ssl.SSLContext] = None) -> None:
+        self._stream = stream
+        self._host = host
+        self._port = port
+        self._context = context
+
+    def read(self, max_bytes: int, timeout: Optional[float] = None) -> bytes:
+        data = self._stream.read(max_bytes, timeout)
+        if self._context is not None:
+            tls_sessions.save(self._host, self._port, self._context, self._stream.get_extra_info('ssl_object'))
+            self._context = None  # once per connection is enough
+        return data
+
+    def write(self, buffer: bytes, timeout: Optional[float] = None) -> None:
+        self._stream.write(buffer, timeout)
+
+    def close(self) -> None:
+        self._stream.close()
+
+    def start_tls(self, ssl_context: ssl.SSLContext, server_hostname: Optional[str] = None,
+                  timeout: Optional[float] = None) -> httpcore.NetworkStream:
+        host = server_hostname or self._host
+        started = time.perf_counter()
+        stream = self._stream.start_tls(_offer_session(ssl_context, host, self._port), host, timeout)
+        ssl_object = stream.get_extra_info('ssl_object')
+        tls_sessions.record_handshake(time.perf_counter() - started, bool(getattr(ssl_object, 'session_reused', False)))
+        return _CachingStream(stream, host, self._port, ssl_context)
+
+    def get_extra_info(self, info: str) -> Any:
+        return self._stream.get_extra_info(info)
+
+
+class _AsyncCachingStream(httpcore.AsyncNetworkStream):
+    def __init__(self, stream: httpcore.AsyncNetworkStream, host: str, port: int,
+                 context: Optional[ssl.SSLContext] = None) -> None:
+        self._stream = stream
+        self._host = host
+        self._port = port
+        self._context = context
+
+    async def read(self, max_bytes: int, timeout: Optional[float] = None) -> bytes:
+        data = await self._stream.read(max_bytes, timeout)
+        if self._context is not None:
+            tls_sessions.save(self._host, self._port, self._context, self._stream.get_extra_info('ssl_object'))
+            self._context = None
+        return data
+
+    async def write(self, buffer: bytes, timeout: Optional[float] = None) -> None:
+        await self._stream.write(buffer, timeout)
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+    async def start_tls(self, ssl_context: ssl.SSLContext, server_hostname: Optional[str] = None,
+                        timeout: Optional[float] = None) -> httpcore.AsyncNetworkStream:
+        host = server_hostname or self._host
+        started = time.perf_counter()
+        stream = await self._stream.start_tls(_offer_session(ssl_context, host, self._port), host, timeout)
+        ssl_object = stream.get_extra_info('ssl_object')
+        tls_sessions.record_handshake(time.perf_counter() - started, bool(getattr(ssl_object, 'session_reused', False)))
+        return _AsyncCachingStream(stream, host, self._port, ssl_context)
+
+    def get_extra_info(self, info: str) -> Any:
+        return self._stream.get_extra_info(info)
+
+
+class CachingBackend(httpcore.NetworkBackend):
+    """httpcore backend that connects via ``dns_cache`` and resumes TLS sessions."""
+
+    def __init__(self, backend: Optional[httpcore.NetworkBackend] = None) -> None:
+        self._backend = backend or httpcore.SyncBackend()
+
+    def connect_tcp(self, host: str, port: int, timeout: Optional[float] = None,
+                    local_address: Optional[str] = None, socket_options: Any = None) -> httpcore.NetworkStream:
+        last_error: Optional[Exception] = None
+        for address in dns_cache.resolve(host) or [host]:
+            try:
+                stream = self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+                return _CachingStream(stream, host, port)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        dns_cache.invalidate(host)
+        raise last_error  # type: ignore[misc]
+
+    def connect_unix_socket(self, path: str, timeout: Optional[float] = None,
+                            socket_options: Any = None) -> httpcore.NetworkStream:
+        return self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    def sleep(self, seconds: float) -> None:
+        self._backend.sleep(seconds)
+
+
+class AsyncCachingBackend(httpcore.AsyncNetworkBackend):
+    """Async ``CachingBackend``; cache misses are resolved in a worker thread."""
+
+    def __init__(self, backend: Optional[httpcore.AsyncNetworkBackend] = None) -> None:
+        self._backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host: str, port: int, timeout: Optional[float] = None,
+                          local_address: Optional[str] = None, socket_options: Any = None
+                          ) -> httpcore.AsyncNetworkStream:
+        addresses = dns_cache.cached(host)
+        if addresses is None:
+            addresses = await anyio.to_thread.run_sync(dns_cache.resolve, host)
+        last_error: Optional[Exception] = None
+        for address in addresses or [host]:
+            try:
+                stream = await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+                return _AsyncCachingStream(stream, host, port)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        dns_cache.invalidate(host)
+        raise last_error  # type: ignore[misc]
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None,
+                                  socket_options: Any = None) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+def _install_backend(transport: Any, backend: Any) -> Any:
+    # httpx does not take a network backend; set it on the underlying httpcore pool
+    if httpcore_hooks_available(transport):
+        transport._pool._network_backend = backend
+    else:
+        _warn_fallback('httpcore', httpcore.__version__)
+    return transport
+
+
+def httpx_transport(**kwargs: Any) -> httpx.HTTPTransport:
+    """``httpx.HTTPTransport(**kwargs)`` connecting through the caches (TLS settings via ``verify``)."""
+    return _install_backend(httpx.HTTPTransport(**kwargs), CachingBackend())
+
+
+def httpx_async_transport(**kwargs: Any) -> httpx.AsyncHTTPTransport:
+    """``httpx.AsyncHTTPTransport(**kwargs)`` connecting through the caches (TLS settings via ``verify``)."""
+    return _install_backend(httpx.AsyncHTTPTransport(**kwargs), AsyncCachingBackend())
+
+
+def connection_stats() -> Dict[str, Any]:
+    """DNS and TLS cache statistics for the metrics endpoint."""
+    return {'dns': dns_cache.stats(), 'tls': tls_sessions.stats()}
+
+
+_URLLIB3_HOOKS = urllib3_hooks_available()
+
+# Process-wide caches shared by all pooled sessions and clients
+dns_cache = DNSCache(ttl=get_float('HTTP_DNS_TTL', 300.0))
+tls_sessions = TLSSessionCache(enabled=get_bool('HTTP_TLS_RESUMPTION', True))
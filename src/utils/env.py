@@ -77,6 +77,51 @@ def get_str(name: str, default: Optional[str] = None) -> str:
     
     return default if default is not None else ""
 
+def get_int(name: str, default: int) -> int:
+    """Get an integer environment variable.
+
+    Args:
+        name: Name of the environment variable
+        default: Value returned when the variable is unset, empty or not an integer
+
+    Returns:
+        int: The parsed value or default
+    """
+    try:
+        return int(get_str(name, str(default)))
+    except ValueError:
+        return default
+
+def get_float(name: str, default: float) -> float:
+    """Get a float environment variable.
+
+    Args:
+        name: Name of the environment variable
+        default: Value returned when the variable is unset, empty or not a number
+
+    Returns:
+        float: The parsed value or default
+    """
+    try:
+        return float(get_str(name, str(default)))
+    except ValueError:
+        return default
+
+def get_bool(name: str, default: bool = False) -> bool:
+    """Get a boolean environment variable.
+
+    Args:
+        name: Name of the environment variable
+        default: Value returned when the variable is unset or empty
+
+    Returns:
+        bool: True for "1", "true", "yes" or "on" (case-insensitive), else False
+    """
+    value = get_str(name)
+    if not value:
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
 def validate_all_env() -> None:
     """Validate all required environment variables at startup.
     
@@ -0,0 +1,92 @@
+"""In-process publish/subscribe broker for pushing job updates to clients.
+
+Background jobs publish status snapshots; each Server-Sent Events connection
+holds a subscription and streams what it receives. Subscriber queues are
+bounded so a stalled browser tab can never make publishers block or grow
+memory without limit — the oldest pending event is dropped instead.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import queue
+import threading
+from typing import Any, Dict, Optional
+
+from .log_config import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class Subscription:
+    """A single consumer's bounded event queue."""
+
+    def __init__(self, broker: "EventBroker", maxsize: int) -> None:
+        self._broker = broker
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=maxsize)
+
+    def _offer(self, event: Dict[str, Any]) -> None:
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()  # Drop the oldest event
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Return the next event, or None if nothing arrived within ``timeout``."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self._broker.unsubscribe(self)
+
+
+class EventBroker:
+    """Fan-out of published events to all current subscribers (thread-safe)."""
+
+    def __init__(self, queue_size: int = 256) -> None:
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: set = set()
+        self._ids = itertools.count(1)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self, self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Send ``data`` as an event of ``event_type`` to every subscriber."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            event = {'id': next(self._ids), 'event': event_type, 'data': data}
+        for subscription in subscribers:
+            subscription._offer(event)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Encode an event in the ``text/event-stream`` wire format."""
+    payload = json.dumps(event['data'], default=str, ensure_ascii=False)
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {payload}\n\n"
+
+
+# Process-wide broker used by the web app
+broker = EventBroker()
@@ -0,0 +1,282 @@
+"""Field extraction from job pages without building a full DOM.
+
+A full BeautifulSoup tree of a job page costs far more than the handful of
+fields the scrapers read. ``HtmlScan`` works on the raw markup instead:
+
+- JSON-LD blocks are located with a regex and handed to ``json.loads``
+- ``data-at`` elements and apply buttons are cut out of the markup and
+  parsed on their own (a partial DOM)
+- the visible page text is the markup minus scripts, styles, comments and tags
+
+``SoupPage`` offers the same methods over a BeautifulSoup tree: either the
+whole page, or only the subtrees a scraper queries (``SubtreeFilter``
+passed as ``parse_only``), with the page text then taken from ``HtmlScan``.
+Scrapers choose between these modes with ``SCRAPER_PARSE_MODE``.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import html as html_lib
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Sequence, Tuple, Union
+
+from bs4 import BeautifulSoup, ElementFilter, Tag
+
+from .html_utils import extract_json_ld_blocks
+
+
+# Size of the markup window parsed around a match (partial DOM)
+WINDOW = 4096
+
+_JSON_LD_RE = re.compile(
+    r'<script\b[^>]*\btype\s*=\s*["\']?application/ld\+json["\']?[^>]*>(.*?)</script\s*>', re.I | re.S
+)
+# Start of markup whose text BeautifulSoup's get_text() leaves out
+_HIDDEN_RE = re.compile(r'<(script|style|template)\b[^>]*>|<!--', re.I)
+_TAG_RE = re.compile(r'</?[A-Za-z][^>]*>|<![^>]*>|<\?[^>]*>')
+_OPEN_RE = re.compile(r'<([A-Za-z][\w-]*)')
+
+
+@functools.lru_cache(maxsize=32)
+def _tag_pattern(name: str) -> Pattern[str]:
+    """Opening and closing tags of one element name (group 1 is ``/`` for closing)."""
+    return re.compile(r'<(/?)' + re.escape(name) + r'\b', re.I)
+
+
+@functools.lru_cache(maxsize=8)
+def _close_pattern(name: str) -> Pattern[str]:
+    return re.compile(r'</' + re.escape(name) + r'\s*>', re.I)
+
+
+def job_posting(blocks: Sequence[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Return the ``JobPosting`` among parsed JSON-LD objects, else the first object."""
+    for block in blocks:
+        types = block.get('@type')
+        if types == 'JobPosting' or (isinstance(types, list) and 'JobPosting' in types):
+            return block
+    return blocks[0] if blocks else None
+
+
+def class_pattern(*names: str) -> Pattern[str]:
+    """Regex matching a raw ``class`` attribute that contains any of ``names``.
+
+    ``parse_only`` filters see attributes before the class list is split.
+    """
+    return re.compile(r'(?:^|\s)(?:' + '|'.join(map(re.escape, names)) + r')(?:\s|$)')
+
+
+class SubtreeFilter(ElementFilter):
+    """``parse_only`` filter that builds only the subtrees a scraper queries.
+
+    Each rule is a ``(name, attrs)`` pair; a top-level tag is kept, with its
+    whole subtree, if it matches any rule. ``name=None`` matches every tag.
+    Attribute values may be a string, a set of strings, ``True`` (present)
+    or a compiled regex (searched in the raw value). Unlike ``SoupStrainer``,
+    whose matching costs about as much as the tree it saves, rules are
+    plain dict lookups.
+    """
+
+    def __init__(self, *rules: Tuple[Optional[str], Dict[str, Any]]) -> None:
+        super().__init__()
+        self.rules = rules
+
+    @property
+    def includes_everything(self) -> bool:
+        return False
+
+    def allow_tag_creation(self, nsprefix: Optional[str], name: str, attrs: Optional[Dict[str, Any]]) -> bool:
+        attrs = attrs or {}
+        for rule_name, rule_attrs in self.rules:
+            if rule_name is not None and rule_name != name:
+                continue
+            if all(_attr_matches(attrs.get(key), expected) for key, expected in rule_attrs.items()):
+                return True
+        return False
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+
+def _attr_matches(value: Any, expected: Any) -> bool:
+    if value is None:
+        return False
+    if expected is True:
+        return True
+    if isinstance(value, list):
+        value = ' '.join(value)
+    if isinstance(expected, str):
+        return value == expected
+    if isinstance(expected, (set, frozenset)):
+        return value in expected
+    return expected.search(value) is not None
+
+
+def fragment_text(fragment: str) -> str:
+    """Text of an HTML fragment, one stripped line per text node.
+
+    Same result as ``BeautifulSoup(fragment, 'lxml').get_text('\\n', strip=True)``
+    without building a BeautifulSoup tree.
+    """
+    if not fragment:
+        return ''
+    try:
+        import lxml.etree
+        import lxml.html
+
+        root = lxml.html.fragment_fromstring(fragment, create_parent='div')
+        lxml.etree.strip_elements(root, 'script', 'style', 'template', with_tail=False)
+        return '\n'.join(s.strip() for s in root.itertext() if s.strip())
+    except Exception:
+        # lxml rejects some input (e.g. control characters) that BeautifulSoup accepts
+        return BeautifulSoup(fragment, 'lxml').get_text(separator='\n', strip=True)
+
+
+class HtmlScan:
+    """Lazy, regex-driven view of one HTML page."""
+
+    def __init__(self, content: Union[bytes, str], window: int = WINDOW) -> None:
+        if isinstance(content, bytes):
+            content = content.decode('utf-8', errors='replace')
+        self.html = content
+        self.window = window
+        self.partial_parses = 0
+        self._hidden: Optional[Tuple[List[int], List[int]]] = None
+        self._text: Optional[str] = None
+
+    def json_ld_blocks(self) -> List[Dict[str, Any]]:
+        """Parsed JSON-LD objects (lists are flattened, invalid blocks skipped)."""
+        results: List[Dict[str, Any]] = []
+        for match in _JSON_LD_RE.finditer(self.html):
+            content = match.group(1).strip()
+            if not content:
+                continue
+            try:
+                data = json.loads(content)
+            except ValueError:
+                continue
+            items = data if isinstance(data, list) else [data]
+            results.extend(item for item in items if isinstance(item, dict))
+        return results
+
+    def find_data_at(self, name: str) -> Optional[Tag]:
+        """First element with ``data-at="<name>"``, parsed on its own (partial DOM)."""
+        pattern = re.compile(r'data-at\s*=\s*["\']?' + re.escape(name) + r'(?=["\'\s/>])')
+        for match in pattern.finditer(self.html):
+            if self._is_hidden(match.start()):
+                continue
+            start = self.html.rfind('<', 0, match.start())
+            opening = _OPEN_RE.match(self.html, start) if start >= 0 else None
+            if opening is None:
+                continue
+            end = self._element_end(start, opening.group(1))
+            tag = self._parse(start, end).find(attrs={'data-at': name})
+            if tag is not None:
+                return tag
+        return None
+
+    def find_tags(self, names: Sequence[str], string: Pattern[str]) -> Iterator[Tag]:
+        """Yield ``names`` elements whose string matches, like ``soup.find_all(names, string=...)``.
+
+        Elements outside scripts are pre-filtered on their tag-stripped markup;
+        only candidates are parsed. Yields lazily in document order.
+        """
+        opening = re.compile(r'<(' + '|'.join(map(re.escape, names)) + r')\b', re.I)
+        for match in opening.finditer(self.html):
+            if self._is_hidden(match.start()):
+                continue
+            end = self._element_end(match.start(), match.group(1))
+            content_start = self.html.find('>', match.end(), end) + 1 or end
+            inner = html_lib.unescape(_TAG_RE.sub('', self.html[content_start:end]))
+            if not string.search(inner):
+                continue
+            tag = self._parse(match.start(), end).find(match.group(1).lower())
+            if tag is not None and tag.string is not None and string.search(tag.string):
+                yield tag
+
+    def text(self, separator: str = '') -> str:
+        """Visible page text, the same string as ``soup.get_text(separator)``.
+
+        With a separator, whitespace may differ where tags are adjacent.
+        """
+        if separator:
+            return html_lib.unescape(_TAG_RE.sub(separator, separator.join(self._visible())))
+        if self._text is None:
+            self._text = html_lib.unescape(_TAG_RE.sub('', ''.join(self._visible())))
+        return self._text
+
+    def _visible(self) -> List[str]:
+        pieces, pos = [], 0
+        for start, end in zip(*self._hidden_spans()):
+            pieces.append(self.html[pos:start])
+            pos = end
+        pieces.append(self.html[pos:])
+        return pieces
+
+    def _parse(self, start: int, end: int) -> BeautifulSoup:
+        self.partial_parses += 1
+        return BeautifulSoup(self.html[start:end], 'lxml')
+
+    def _element_end(self, start: int, name: str) -> int:
+        """End offset of the element opened at ``start`` (capped at ``window``)."""
+        limit = min(len(self.html), start + self.window)
+        depth = 0
+        for match in _tag_pattern(name).finditer(self.html, start, limit):
+            depth += -1 if match.group(1) else 1
+            if depth == 0:
+                return self.html.find('>', match.end(), limit) + 1 or limit
+        return limit
+
+    def _hidden_spans(self) -> Tuple[List[int], List[int]]:
+        """Start and end offsets of scripts, styles, templates and comments."""
+        if self._hidden is None:
+            starts: List[int] = []
+            ends: List[int] = []
+            pos = 0
+            while True:
+                match = _HIDDEN_RE.search(self.html, pos)
+                if match is None:
+                    break
+                if match.group(1):
+                    close = _close_pattern(match.group(1).lower()).search(self.html, match.end())
+                    pos = close.end() if close else len(self.html)
+                else:
+                    close_at = self.html.find('-->', match.end())
+                    pos = close_at + 3 if close_at >= 0 else len(self.html)
+                starts.append(match.start())
+                ends.append(pos)
+            self._hidden = (starts, ends)
+        return self._hidden
+
+    def _is_hidden(self, pos: int) -> bool:
+        starts, ends = self._hidden_spans()
+        i = bisect.bisect_right(starts, pos) - 1
+        return i >= 0 and pos < ends[i]
+
+
+class SoupPage:
+    """``HtmlScan`` interface over a BeautifulSoup tree.
+
+    Pass ``scan`` when the tree was built with ``parse_only``: the page text
+    then comes from the raw markup instead of the partial tree.
+    """
+
+    def __init__(self, soup: BeautifulSoup, scan: Optional[HtmlScan] = None) -> None:
+        self.soup = soup
+        self.scan = scan
+
+    def json_ld_blocks(self) -> List[Dict[str, Any]]:
+        return extract_json_ld_blocks(self.soup)
+
+    def find_data_at(self, name: str) -> Optional[Tag]:
+        return self.soup.find(attrs={'data-at': name})
+
+    def find_tags(self, names: Sequence[str], string: Pattern[str]) -> Iterator[Tag]:
+        return iter(self.soup.find_all(list(names), string=string))
+
+    def text(self, separator: str = '') -> str:
+        if self.scan is not None:
+            return self.scan.text(separator)
+        return self.soup.get_text(separator)
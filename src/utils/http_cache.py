@@ -0,0 +1,233 @@
+"""On-disk HTTP response cache for job pages.
+
+Retrying or re-processing a posting (and debugging a scraper) fetches the same
+Stepstone/LinkedIn HTML again and again. ``ResponseCache`` stores successful
+GET responses on disk, keyed by a hash of the normalized URL:
+
+- ``<key>.meta.json``: URL, status, headers, validators, storage time
+- ``<key>.body.gz``: gzip-compressed body
+
+Fresh entries (younger than ``ttl`` seconds) are served without a request.
+Stale entries with an ETag/Last-Modified are revalidated with a conditional
+request; a 304 refreshes the entry. The total body size is bounded by
+``max_bytes`` with least-recently-used eviction. In ``offline`` mode only the
+cache is consulted, so scrapes of previously seen pages can be replayed
+without network access.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .env import get_bool, get_float, get_int, get_str
+from .log_config import get_logger
+
+
+logger = get_logger(__name__)
+
+# Query parameters that never change the page content
+_IGNORED_PARAMS = ('utm_', 'trk', 'refId', 'trackingId')
+
+
+def normalize_url(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """Return a canonical form of ``url`` (plus request params) for cache keys.
+
+    Lowercases scheme and host, drops the fragment and tracking parameters
+    and sorts the query string.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((str(k), str(v)) for k, v in params.items())
+    query = sorted(
+        (k, v) for k, v in query
+        if not any(k == p or (p.endswith('_') and k.startswith(p)) for p in _IGNORED_PARAMS)
+    )
+    return urlunsplit((
+        parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', urlencode(query), ''
+    ))
+
+
+class CachedResponse:
+    """A response loaded from the cache."""
+
+    def __init__(self, meta: Dict[str, Any], body: bytes) -> None:
+        self.url: str = meta['url']
+        self.status_code: int = meta['status']
+        self.headers: Dict[str, str] = meta.get('headers', {})
+        self.stored_at: float = meta['stored_at']
+        self.complete: bool = meta.get('complete', True)
+        self.content = body
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def validators(self) -> Dict[str, str]:
+        """Return conditional request headers for revalidating this entry."""
+        headers = {}
+        lowered = {k.lower(): v for k, v in self.headers.items()}
+        if lowered.get('etag'):
+            headers['If-None-Match'] = lowered['etag']
+        if lowered.get('last-modified'):
+            headers['If-Modified-Since'] = lowered['last-modified']
+        return headers
+
+
+class ResponseCache:
+    """Size-bounded, gzip-compressed response cache in ``directory`` (thread-safe)."""
+
+    def __init__(self, directory: Path, ttl: float = 3600.0, max_bytes: int = 200 * 1024 * 1024,
+                 offline: bool = False) -> None:
+        self.directory = Path(directory)
+        self.ttl = float(ttl)
+        self.max_bytes = int(max_bytes)
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._counts = {'hits': 0, 'misses': 0, 'revalidated': 0}
+
+    @staticmethod
+    def key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        return hashlib.sha256(normalize_url(url, params).encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        base = self.directory / key[:2]
+        return base / f"{key}.meta.json", base / f"{key}.body.gz"
+
+    def get(self, url: str, params: Optional[Mapping[str, Any]] = None) -> Optional[CachedResponse]:
+        """Return the stored entry for ``url`` (fresh or stale), or None."""
+        meta_path, body_path = self._paths(self.key(url, params))
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            with gzip.open(body_path, 'rb') as fh:
+                body = fh.read()
+        except (OSError, ValueError, EOFError):
+            return None
+        try:
+            os.utime(meta_path)  # Mark as recently used for LRU eviction
+        except OSError:
+            pass
+        return CachedResponse(meta, body)
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return entry.age() < self.ttl
+
+    def store(self, url: str, status: int, headers: Mapping[str, str], body: bytes,
+              params: Optional[Mapping[str, Any]] = None, complete: bool = True) -> None:
+        """Store a response unless it forbids caching (``Cache-Control: no-store``).
+
+        ``complete=False`` marks a body cut short by a streaming byte cap or
+        early stop.
+        """
+        if 'no-store' in str(headers.get('Cache-Control', headers.get('cache-control', ''))).lower():
+            return
+        kept = {k: v for k, v in headers.items()
+                if k.lower() in ('content-type', 'etag', 'last-modified', 'cache-control')}
+        meta = {'url': url, 'status': status, 'headers': kept, 'stored_at': time.time(), 'complete': complete}
+        meta_path, body_path = self._paths(self.key(url, params))
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(body_path, gzip.compress(body))
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        self._evict()
+
+    def touch(self, entry: CachedResponse, headers: Mapping[str, str],
+              params: Optional[Mapping[str, Any]] = None) -> None:
+        """Mark a revalidated entry as fresh again, taking over updated validators."""
+        meta_path, _ = self._paths(self.key(entry.url, params))
+        for name in ('ETag', 'Last-Modified'):
+            value = headers.get(name) or headers.get(name.lower())
+            if value:
+                entry.headers = {k: v for k, v in entry.headers.items() if k.lower() != name.lower()}
+                entry.headers[name] = value
+        entry.stored_at = time.time()
+        meta = {'url': entry.url, 'status': entry.status_code, 'headers': entry.headers,
+                'stored_at': entry.stored_at, 'complete': entry.complete}
+        try:
+            self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        except OSError as e:
+            logger.debug("Could not refresh cache entry for %s: %s", entry.url, e)
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _entries(self) -> Iterable[Tuple[float, int, Path, Path]]:
+        for meta_path in self.directory.glob('*/*.meta.json'):
+            body_path = meta_path.with_name(meta_path.name.replace('.meta.json', '.body.gz'))
+            try:
+                yield meta_path.stat().st_mtime, body_path.stat().st_size, meta_path, body_path
+            except OSError:
+                continue
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _, _ in entries)
+            for _, size, meta_path, body_path in entries:
+                if total <= self.max_bytes:
+                    break
+                for path in (meta_path, body_path):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+                total -= size
+                logger.debug("Evicted cached response %s", meta_path.name)
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _, _ in self._entries())
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, _, meta_path, body_path in list(self._entries()):
+                for path in (meta_path, body_path):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+
+    def record(self, outcome: str) -> None:
+        """Count a lookup outcome: ``hits``, ``misses`` or ``revalidated``."""
+        with self._lock:
+            self._counts[outcome] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        return {**counts, 'size_bytes': self.size_bytes(), 'offline': self.offline}
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide job page cache, or None if ``HTTP_CACHE_ENABLED`` is false.
+
+    Configured via ``HTTP_CACHE_DIR`` (default ``<DATA_DIR>/http_cache``),
+    ``HTTP_CACHE_TTL`` (seconds, default 3600), ``HTTP_CACHE_MAX_MB``
+    (default 200) and ``HTTP_CACHE_OFFLINE``.
+    """
+    global _default_cache
+    if not get_bool('HTTP_CACHE_ENABLED', True):
+        return None
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                directory = get_str('HTTP_CACHE_DIR') or str(Path(get_str('DATA_DIR', 'data')) / 'http_cache')
+                _default_cache = ResponseCache(
+                    Path(directory),
+                    ttl=get_float('HTTP_CACHE_TTL', 3600.0),
+                    max_bytes=get_int('HTTP_CACHE_MAX_MB', 200) * 1024 * 1024,
+                    offline=get_bool('HTTP_CACHE_OFFLINE', False),
+                )
+    return _default_cache
@@ -0,0 +1,100 @@
+"""In-process registry of outgoing HTTP request metrics.
+
+Every call through the HTTP core (``http_utils.request_with_retries`` and
+``arequest_with_retries``) is recorded here with host, method, final status,
+latency, response size, retries, cache outcome and HTTP version. Callers
+that shared another caller's in-flight request count as ``coalesced``.
+The web app reports the aggregates at ``/api/http-metrics``.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from .timing import percentile
+
+
+class _HostMetrics:
+    def __init__(self, window: int) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.coalesced = 0
+        self.bytes = 0
+        self.statuses: Dict[str, int] = {}
+        self.methods: Dict[str, int] = {}
+        self.cache: Dict[str, int] = {}
+        self.protocols: Dict[str, int] = {}
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = list(self.latencies)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'coalesced': self.coalesced,
+            'bytes': self.bytes,
+            'statuses': dict(self.statuses),
+            'methods': dict(self.methods),
+            'cache': dict(self.cache),
+            'protocols': dict(self.protocols),
+            'latency_ms': {
+                'p50': percentile(latencies, 50),
+                'p95': percentile(latencies, 95),
+                'max': max(latencies) if latencies else None,
+                'mean': round(sum(latencies) / len(latencies), 1) if latencies else None,
+            },
+        }
+
+
+class HttpMetrics:
+    """Thread-safe per-host request counters (latency percentiles over the last ``window`` calls)."""
+
+    def __init__(self, window: int = 1000) -> None:
+        self.window = window
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostMetrics] = {}
+
+    def record(self, host: str, method: str, latency: float, status: Optional[int] = None,
+               nbytes: int = 0, attempts: int = 1, cache: Optional[str] = None,
+               error: Optional[str] = None, protocol: Optional[str] = None, coalesced: bool = False) -> None:
+        """Record one logical request (all its retries) that took ``latency`` seconds."""
+        with self._lock:
+            metrics = self._hosts.get(host)
+            if metrics is None:
+                metrics = self._hosts[host] = _HostMetrics(self.window)
+            metrics.requests += 1
+            metrics.retries += max(0, attempts - 1)
+            metrics.coalesced += int(coalesced)
+            metrics.bytes += nbytes
+            metrics.methods[method] = metrics.methods.get(method, 0) + 1
+            outcome = str(status) if status is not None else (error or 'error')
+            metrics.statuses[outcome] = metrics.statuses.get(outcome, 0) + 1
+            if error or (status is not None and status >= 400):
+                metrics.errors += 1
+            if cache:
+                metrics.cache[cache] = metrics.cache.get(cache, 0) + 1
+            if protocol:
+                metrics.protocols[protocol] = metrics.protocols.get(protocol, 0) + 1
+            metrics.latencies.append(round(latency * 1000, 1))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return per-host aggregates plus totals across hosts."""
+        with self._lock:
+            hosts = {host: metrics.snapshot() for host, metrics in self._hosts.items()}
+        totals = {
+            key: sum(h[key] for h in hosts.values())
+            for key in ('requests', 'errors', 'retries', 'coalesced', 'bytes')
+        }
+        return {'hosts': hosts, 'totals': totals}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+
+
+# Process-wide registry fed by the HTTP core
+http_metrics = HttpMetrics()
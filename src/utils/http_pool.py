@@ -0,0 +1,236 @@
+"""Shared keep-alive HTTP sessions, one per host.
+
+``requests.request`` builds a throwaway session per call, so every Trello
+round-trip and every page fetch pays a fresh TCP+TLS handshake. ``SessionPool``
+keeps one ``requests.Session`` per host with a sized urllib3 connection pool,
+so consecutive requests to the same host reuse open connections. Sessions are
+safe to share between worker threads.
+
+Cookies are not persisted between calls, matching the previous stateless
+``requests.request`` behavior.
+
+Coroutines use ``get_async_client()``: one pooled ``httpx.AsyncClient`` per
+event loop (httpx clients cannot be shared across loops).
+
+Hosts listed in ``HTTP_HTTP2_HOSTS`` (e.g. ``api.trello.com``) are served by
+httpx with HTTP/2 instead, so many small calls share one multiplexed
+connection; this needs the optional ``h2`` package and is skipped without it.
+All clients advertise every content encoding they can decode
+(``ACCEPT_ENCODING``: gzip and deflate, plus br/zstd when installed), and
+open new connections through the DNS and TLS session caches in
+``connection_cache``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import importlib.util
+import threading
+import weakref
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import httpx
+import requests
+from .connection_cache import CachingHTTPAdapter, httpx_async_transport, httpx_transport
+from .env import get_int, get_str
+from .log_config import get_logger
+from .throttle import host_key
+
+
+logger = get_logger(__name__)
+
+# httpx negotiates HTTP/2 only with the optional h2 package installed
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+
+def _accept_encoding() -> str:
+    """Content codings both requests (urllib3) and httpx can decode here."""
+    encodings = ['gzip', 'deflate']
+    if importlib.util.find_spec('brotli') or importlib.util.find_spec('brotlicffi'):
+        encodings.append('br')
+    if importlib.util.find_spec('zstandard'):
+        encodings.append('zstd')
+    return ', '.join(encodings)
+
+
+ACCEPT_ENCODING = _accept_encoding()
+
+
+def parse_hosts(spec: str) -> Tuple[str, ...]:
+    """Parse a comma-separated host list (``"api.trello.com, stepstone.de"``)."""
+    return tuple(h for h in (item.strip().lower() for item in spec.split(',')) if h)
+
+
+def _cookie_jar() -> CookieJar:
+    return CookieJar(DefaultCookiePolicy(allowed_domains=[]))
+
+
+class SessionPool:
+    """Thread-safe registry of pooled ``requests.Session`` objects keyed by host.
+
+    - ``maxsize``: connections kept open per host (``HTTP_POOL_MAXSIZE``, default 10)
+    - ``host_maxsize``: per-host overrides, e.g. ``{'api.trello.com': 20}``
+    - ``http2_hosts``: hosts (and their subdomains) served over HTTP/2 by
+      httpx (``HTTP_HTTP2_HOSTS``, default none)
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, host_maxsize: Optional[Dict[str, int]] = None,
+                 http2_hosts: Optional[Iterable[str]] = None) -> None:
+        self.maxsize = maxsize if maxsize is not None else get_int('HTTP_POOL_MAXSIZE', 10)
+        self.host_maxsize = dict(host_maxsize or {})
+        self.http2_hosts = (
+            tuple(h.lower() for h in http2_hosts) if http2_hosts is not None
+            else parse_hosts(get_str('HTTP_HTTP2_HOSTS'))
+        )
+        if self.http2_hosts and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested for %s but the 'h2' package is not installed; using HTTP/1.1",
+                           ', '.join(self.http2_hosts))
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._http2_client: Optional[httpx.Client] = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _create_session(self, host: str) -> requests.Session:
+        size = max(1, self.host_maxsize.get(host, self.maxsize))
+        session = requests.Session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        adapter = CachingHTTPAdapter(pool_connections=4, pool_maxsize=size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        logger.debug("Created HTTP session for %s (pool size %s)", host, size)
+        return session
+
+    def get(self, url: str) -> requests.Session:
+        """Return the shared session for the URL's host (created on first use)."""
+        host = host_key(url)
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._sessions[host] = self._create_session(host)
+            return session
+
+    def uses_http2(self, url: str) -> bool:
+        """Return True if the URL's host should be fetched over HTTP/2."""
+        if not HTTP2_AVAILABLE or not self.http2_hosts:
+            return False
+        host = host_key(url)
+        return any(host == h or host.endswith('.' + h) for h in self.http2_hosts)
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(max_connections=None, max_keepalive_connections=self.maxsize)
+
+    def get_http2_client(self) -> httpx.Client:
+        """Return the shared HTTP/2 client for ``http2_hosts`` (created on first use).
+
+        One multiplexed connection per host carries concurrent requests from
+        all threads.
+        """
+        with self._lock:
+            if self._http2_client is None or self._http2_client.is_closed:
+                self._http2_client = httpx.Client(
+                    transport=httpx_transport(http2=HTTP2_AVAILABLE, limits=self._limits()),
+                    cookies=httpx.Cookies(_cookie_jar()), headers={'Accept-Encoding': ACCEPT_ENCODING},
+                )
+            return self._http2_client
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        """Return the pooled async client of the running event loop (created on first use).
+
+        httpx keeps up to ``maxsize`` idle keep-alive connections per client;
+        ``http2_hosts`` are mounted on an HTTP/2 transport.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                mounts = {
+                    f"all://*{host}": httpx_async_transport(http2=True, limits=self._limits())
+                    for host in (self.http2_hosts if HTTP2_AVAILABLE else ())
+                }
+                client = self._async_clients[loop] = httpx.AsyncClient(
+                    transport=httpx_async_transport(limits=self._limits()), cookies=httpx.Cookies(_cookie_jar()),
+                    headers={'Accept-Encoding': ACCEPT_ENCODING}, mounts=mounts or None,
+                )
+            return client
+
+    async def aclose(self) -> None:
+        """Close the running loop's async client, if any."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def close(self) -> None:
+        """Close all sessions and their connections; new ones are created on demand."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+            http2_client, self._http2_client = self._http2_client, None
+        for session in sessions.values():
+            session.close()
+        if http2_client is not None:
+            http2_client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request and connection counts per host plus the reuse hit-rate.
+
+        A request that did not need a new connection counts as a reuse hit.
+        """
+        with self._lock:
+            sessions = dict(self._sessions)
+
+        per_host: Dict[str, Dict[str, int]] = {}
+        for host, session in sessions.items():
+            requests_made = connections = 0
+            adapter = session.get_adapter('https://')
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    requests_made += pool.num_requests
+                    connections += pool.num_connections
+            per_host[host] = {'requests': requests_made, 'connections': connections}
+
+        total_requests = sum(h['requests'] for h in per_host.values())
+        total_connections = sum(h['connections'] for h in per_host.values())
+        reused = max(0, total_requests - total_connections)
+        return {
+            'hosts': len(per_host),
+            'requests': total_requests,
+            'connections': total_connections,
+            'reused': reused,
+            'reuse_rate': round(reused / total_requests, 3) if total_requests else None,
+            'per_host': per_host,
+            'http2_hosts': list(self.http2_hosts) if HTTP2_AVAILABLE else [],
+            'accept_encoding': ACCEPT_ENCODING,
+        }
+
+
+# Process-wide pool used by the HTTP helpers, scrapers and CLI
+session_pool = SessionPool()
+atexit.register(session_pool.close)
+
+
+def get_session(url: str) -> requests.Session:
+    """Return the shared keep-alive session for the URL's host."""
+    return session_pool.get(url)
+
+
+def uses_http2(url: str) -> bool:
+    """Return True if the shared pool sends requests for the URL over HTTP/2."""
+    return session_pool.uses_http2(url)
+
+
+def get_http2_client() -> httpx.Client:
+    """Return the shared HTTP/2 client for the configured hosts."""
+    return session_pool.get_http2_client()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the shared pooled async client for the running event loop."""
+    return session_pool.get_async_client()
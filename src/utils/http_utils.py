@@ -1,16 +1,57 @@
-"""HTTP utilities with retry support."""
+"""HTTP core: requests with retries, pooling, caching and metrics.
+
+This is the single implementation behind ``utils.http`` and
+``utils.http_utils``; every call is recorded in ``http_metrics``.
+
+Requests go through the shared per-host keep-alive sessions in ``http_pool``;
+hosts configured for HTTP/2 there are sent through its httpx client instead
+and come back as ``requests.Response`` all the same.
+``arequest_with_retries`` is the coroutine counterpart for code running on an
+event loop; it raises the same ``requests`` exceptions so callers can share
+their error handling.
+
+Every attempt first checks the host's circuit breaker (failing fast with
+``CircuitOpenError`` while it is open) and takes a token from the shared
+per-host ``RateLimiter``; ``Retry-After`` on a retryable answer holds back
+the whole host. Backoff between attempts is jittered and scaled to the
+host's observed latency.
+
+Concurrent identical GETs (same URL, params, headers and download limits)
+are coalesced: one request goes out and every caller gets its response
+(``single_flight.in_flight``).
+
+Both accept an optional ``cache`` (``http_cache.ResponseCache``) that serves
+and stores GET responses on disk, and can stream the body with a byte cap
+(``max_bytes``) and an early-stop predicate (``stop_when``, e.g.
+``MarkerWatch``) instead of downloading it in full.
+"""
 
 from __future__ import annotations
 
-from typing import Dict, Any, Optional
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+import asyncio
+import copy
 import time
+import httpx
 import requests
+from requests.structures import CaseInsensitiveDict
 
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, get_breakers
+from .http_cache import CachedResponse, ResponseCache, normalize_url
+from .http_metrics import http_metrics
+from .http_pool import get_async_client, get_http2_client, get_session, uses_http2
 from .log_config import get_logger
+from .single_flight import in_flight
+from .throttle import get_rate_limiter, host_key, parse_retry_after
+from .timing import span
 
 
 logger = get_logger(__name__)
 
+# Called with the body received so far; True stops the download
+StopCondition = Callable[[bytearray], bool]
+
 
 def request_with_retries(
     method: str,
@@ -24,25 +65,433 @@ def request_with_retries(
     retries: int = 3,
     backoff: float = 0.5,
     retry_on: tuple[int, ...] = (429, 500, 502, 503, 504),
+    cache: Optional[ResponseCache] = None,
+    max_bytes: Optional[int] = None,
+    stop_when: Optional[StopCondition] = None,
 ) -> requests.Response:
     """Perform an HTTP request with basic retries on transient errors.
 
-    Raises requests.HTTPError for non-success after retries.
+    The whole call (including retries) is timed as span ``http.<host>`` and
+    recorded in ``http_metrics``. Raises requests.HTTPError for non-success after retries.
+    With ``cache``, GET requests are answered from / stored in the cache.
+    With ``max_bytes``/``stop_when`` the body is streamed and cut off at the
+    cap or as soon as ``stop_when(body_so_far)`` is true (span attributes
+    ``truncated`` / ``stopped_early``).
+    """
+    with _instrument(method, url) as attrs:
+        resp = entry = None
+        if cache is not None and method.upper() == 'GET':
+            partial_ok = bool(max_bytes or stop_when)
+            entry, headers = _cache_lookup(cache, url, params, headers, attrs, partial_ok)
+            if attrs.get('cache') == 'hit':
+                resp = _requests_response(entry)
+        if resp is None:
+            def fetch() -> requests.Response:
+                resp = _request_with_retries(
+                    method, url, params=params, headers=headers, json=json, data=data,
+                    timeout=timeout, retries=retries, backoff=backoff, retry_on=retry_on, attrs=attrs,
+                    max_bytes=max_bytes, stop_when=stop_when,
+                )
+                attrs['status'] = resp.status_code
+                if cache is not None and method.upper() == 'GET':
+                    if _cache_update(cache, url, params, entry, resp.status_code, resp.headers, resp.content, attrs):
+                        resp = _requests_response(entry)
+                return resp
+
+            key = _flight_key(
+                method, url, params, headers, json, data, max_bytes, stop_when,
+                timeout=timeout, retries=retries, backoff=backoff, retry_on=retry_on, cache=cache,
+            )
+            resp, shared = in_flight.do(key, fetch)
+            if shared:
+                resp = _shared_copy(resp, attrs)
+        attrs['bytes'] = len(resp.content or b'')
+        return resp
+
+
+# Read size for streamed bodies
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class MarkerWatch:
+    """Early-stop predicate: true once every marker group has arrived.
+
+    Each group is a marker or a tuple of markers that must appear in that
+    order, e.g. ``('application/ld+json', 'JobPosting', '</script>')`` for a
+    complete JSON-LD posting block. Scans only the newly received bytes on
+    each call, so checking a growing buffer stays linear.
+    """
+
+    def __init__(self, *groups: Union[str, bytes, Tuple[Union[str, bytes], ...]]) -> None:
+        self._groups: List[List[bytes]] = [
+            [m.encode('utf-8') if isinstance(m, str) else m for m in (g if isinstance(g, tuple) else (g,))]
+            for g in groups
+        ]
+        self._next = [0] * len(self._groups)
+        self._offset = [0] * len(self._groups)
+        # Equal for watches over the same markers (see ``_flight_key``)
+        self.key = tuple(tuple(g) for g in self._groups)
+
+    def __call__(self, buffer: bytearray) -> bool:
+        done = True
+        for i, group in enumerate(self._groups):
+            while self._next[i] < len(group):
+                marker = group[self._next[i]]
+                found = buffer.find(marker, self._offset[i])
+                if found < 0:
+                    self._offset[i] = max(self._offset[i], len(buffer) - len(marker) + 1)
+                    done = False
+                    break
+                self._offset[i] = found + len(marker)
+                self._next[i] += 1
+        return done
+
+
+class _BodyReader:
+    """Collects streamed chunks up to a byte cap or until a stop condition holds."""
+
+    def __init__(self, max_bytes: Optional[int], stop_when: Optional[StopCondition], attrs: Dict[str, Any]) -> None:
+        self.max_bytes = max_bytes
+        self.stop_when = stop_when
+        self.attrs = attrs
+        self.buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> bool:
+        """Add a chunk; returns True when reading should stop."""
+        self.buffer += chunk
+        if self.max_bytes and len(self.buffer) >= self.max_bytes:
+            del self.buffer[self.max_bytes:]
+            self.attrs['truncated'] = True
+            return True
+        if self.stop_when is not None and self.stop_when(self.buffer):
+            self.attrs['stopped_early'] = True
+            return True
+        return False
+
+    def read(self, chunks: Iterable[bytes]) -> bytes:
+        for chunk in chunks:
+            if chunk and self.feed(chunk):
+                break
+        return bytes(self.buffer)
+
+
+def _read_streamed(resp: requests.Response, max_bytes: Optional[int], stop_when: Optional[StopCondition],
+                   attrs: Dict[str, Any]) -> None:
+    """Load a ``stream=True`` response body within the limits and release the connection."""
+    try:
+        resp._content = _BodyReader(max_bytes, stop_when, attrs).read(resp.iter_content(STREAM_CHUNK_SIZE))
+        resp._content_consumed = True
+    finally:
+        resp.close()
+
+
+def _with_body(resp: httpx.Response, request: httpx.Request, body: bytes) -> httpx.Response:
+    """Rebuild a streamed response around its (already decoded, possibly cut) body."""
+    headers = [(k, v) for k, v in resp.headers.multi_items()
+               if k.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')]
+    return httpx.Response(resp.status_code, headers=headers, content=body, request=request,
+                          extensions={'http_version': resp.extensions.get('http_version', b'HTTP/1.1')})
+
+
+def _stream(client: httpx.Client, request: httpx.Request, max_bytes: Optional[int],
+            stop_when: Optional[StopCondition], attrs: Dict[str, Any]) -> httpx.Response:
+    """Sync ``_astream`` for the HTTP/2 client."""
+    resp = client.send(request, stream=True)
+    try:
+        body = _BodyReader(max_bytes, stop_when, attrs).read(resp.iter_bytes(STREAM_CHUNK_SIZE))
+    finally:
+        resp.close()
+    return _with_body(resp, request, body)
+
+
+async def _astream(client: httpx.AsyncClient, request: httpx.Request, max_bytes: Optional[int],
+                   stop_when: Optional[StopCondition], attrs: Dict[str, Any]) -> httpx.Response:
+    """Send ``request`` streaming and return a response holding the (possibly cut) body."""
+    resp = await client.send(request, stream=True)
+    reader = _BodyReader(max_bytes, stop_when, attrs)
+    try:
+        async for chunk in resp.aiter_bytes(STREAM_CHUNK_SIZE):
+            if chunk and reader.feed(chunk):
+                break
+    finally:
+        await resp.aclose()
+    return _with_body(resp, request, bytes(reader.buffer))
+
+
+def _send_http2(
+    method: str,
+    url: str,
+    *,
+    params: Optional[Dict[str, Any]],
+    headers: Optional[Dict[str, str]],
+    json: Optional[Dict[str, Any]],
+    data: Optional[Dict[str, Any]],
+    timeout: int,
+    max_bytes: Optional[int],
+    stop_when: Optional[StopCondition],
+    attrs: Dict[str, Any],
+) -> requests.Response:
+    """Send one attempt through the shared HTTP/2 client and adapt the result to ``requests``."""
+    client = get_http2_client()
+    request = client.build_request(
+        method.upper(), url, params=params, headers=headers, json=json, data=data, timeout=timeout
+    )
+    try:
+        if max_bytes or stop_when:
+            resp = _stream(client, request, max_bytes, stop_when, attrs)
+        else:
+            resp = client.send(request)
+    except httpx.RequestError as e:
+        raise _as_requests_error(e) from e
+    attrs['http_version'] = resp.http_version
+    return _as_requests_response(resp)
+
+
+def _as_requests_response(resp: httpx.Response) -> requests.Response:
+    """Build a ``requests.Response`` from a complete ``httpx.Response``."""
+    out = requests.Response()
+    out.status_code = resp.status_code
+    out.reason = resp.reason_phrase
+    out._content = resp.content
+    out.headers = CaseInsensitiveDict(resp.headers)
+    out.url = str(resp.url)
+    out.encoding = requests.utils.get_encoding_from_headers(out.headers)
+    return out
+
+
+@contextmanager
+def _instrument(method: str, url: str) -> Iterator[Dict[str, Any]]:
+    """Time a logical request as span ``http.<host>`` and record it in ``http_metrics``.
+
+    Yields the span attributes; the request code fills in ``status``,
+    ``attempts``, ``bytes`` and ``cache``.
+    """
+    host = host_key(url)
+    with span(f"http.{host}", method=method.upper()) as attrs:
+        started = time.perf_counter()
+        try:
+            yield attrs
+        except Exception as e:
+            attrs['error'] = type(e).__name__
+            raise
+        finally:
+            http_metrics.record(
+                host, method.upper(), time.perf_counter() - started,
+                status=attrs.get('status'), nbytes=attrs.get('bytes', 0), attempts=attrs.get('attempts', 1),
+                cache=attrs.get('cache'), error=attrs.get('error'), protocol=attrs.get('http_version'),
+                coalesced=attrs.get('coalesced', False),
+            )
+
+
+def _cache_lookup(
+    cache: ResponseCache,
+    url: str,
+    params: Optional[Dict[str, Any]],
+    headers: Optional[Dict[str, str]],
+    attrs: Dict[str, Any],
+    partial_ok: bool = False,
+) -> Tuple[Optional[CachedResponse], Optional[Dict[str, str]]]:
+    """Look up ``url`` in the cache before a GET.
+
+    Sets ``attrs['cache'] = 'hit'`` when the entry can be served as is (fresh,
+    or any entry in offline mode). Otherwise returns the request headers with
+    conditional validators added for a stale entry. Partial bodies (from a
+    capped or early-stopped download) only count for ``partial_ok`` callers.
+    """
+    entry = cache.get(url, params)
+    if entry is not None and not entry.complete and not partial_ok:
+        entry = None
+    if entry is not None and (cache.offline or cache.is_fresh(entry)):
+        cache.record('hits')
+        attrs['cache'] = 'hit'
+        attrs['status'] = entry.status_code
+        return entry, headers
+    if cache.offline:
+        cache.record('misses')
+        raise requests.ConnectionError(f"Offline mode: no cached response for {url}")
+    if entry is not None:
+        headers = {**(headers or {}), **entry.validators()}
+    return entry, headers
+
+
+def _cache_update(
+    cache: ResponseCache,
+    url: str,
+    params: Optional[Dict[str, Any]],
+    entry: Optional[CachedResponse],
+    status: int,
+    headers: Any,
+    content: bytes,
+    attrs: Dict[str, Any],
+) -> bool:
+    """Store a fetched GET response. Returns True if it revalidated ``entry`` (304)."""
+    try:
+        if status == 304 and entry is not None:
+            cache.touch(entry, headers, params)
+            cache.record('revalidated')
+            attrs['cache'] = 'revalidated'
+            return True
+        cache.record('misses')
+        attrs['cache'] = 'miss'
+        if status == 200:
+            complete = not (attrs.get('truncated') or attrs.get('stopped_early'))
+            cache.store(url, status, headers, content, params, complete=complete)
+    except OSError as e:
+        logger.warning("HTTP cache write failed for %s: %s", url, e)
+    return False
+
+
+def _flight_key(
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]],
+    headers: Optional[Dict[str, str]],
+    json: Optional[Dict[str, Any]],
+    data: Optional[Dict[str, Any]],
+    max_bytes: Optional[int],
+    stop_when: Optional[StopCondition],
+    *,
+    timeout: float = 10,
+    retries: int = 3,
+    backoff: float = 0.5,
+    retry_on: Tuple[int, ...] = (429, 500, 502, 503, 504),
+    cache: Optional[ResponseCache] = None,
+) -> Optional[Tuple[Any, ...]]:
+    """Identity of a request for coalescing; None for anything but plain GET/HEAD.
+
+    The retry and cache policy is part of the key: a caller only shares a
+    request made with the same timeout, retries and cache, so e.g. a 3-retry
+    call never inherits the failure of a concurrent 0-retry probe.
     """
+    if method.upper() not in ('GET', 'HEAD') or json is not None or data is not None:
+        return None
+    stop_key = getattr(stop_when, 'key', stop_when) if stop_when is not None else None
+    return (
+        method.upper(), normalize_url(url, params),
+        tuple(sorted((k.lower(), str(v)) for k, v in (headers or {}).items())),
+        max_bytes, stop_key,
+        timeout, retries, backoff, tuple(retry_on), id(cache) if cache is not None else None,
+    )
+
+
+def _shared_copy(resp: Any, attrs: Dict[str, Any]) -> Any:
+    """Give a coalesced caller its own copy of the leader's response."""
+    attrs['coalesced'] = True
+    attrs['status'] = resp.status_code
+    if isinstance(resp, httpx.Response):
+        return _with_body(resp, resp.request, resp.content)
+    clone = copy.copy(resp)
+    clone.headers = copy.copy(resp.headers)
+    return clone
+
+
+def _note_rate_wait(attrs: Dict[str, Any], waited: float) -> None:
+    """Add rate limiter wait time to the request span."""
+    if waited > 0:
+        attrs['rate_wait_ms'] = round(attrs.get('rate_wait_ms', 0.0) + waited * 1000, 1)
+
+
+def _retry_after(resp: Any) -> Optional[float]:
+    return parse_retry_after((getattr(resp, 'headers', None) or {}).get('Retry-After'))
+
+
+def _honor_retry_after(url: str, resp: Any) -> None:
+    """Hold back the host if a retryable answer carries ``Retry-After``."""
+    delay = _retry_after(resp)
+    if delay:
+        get_rate_limiter().defer(url, delay)
+
+
+def _check_circuit(breaker: CircuitBreaker, method: str, url: str, attrs: Dict[str, Any]) -> None:
+    """Fail fast while the host's circuit is open."""
+    if not breaker.allow():
+        attrs['circuit'] = 'open'
+        logger.warning("HTTP %s %s not sent: circuit for %s is open", method, url, breaker.host)
+        raise CircuitOpenError(f"Circuit open for {breaker.host}: {method} {url} not sent")
+
+
+def _record_outcome(breaker: CircuitBreaker, resp: Any, retry_on: tuple[int, ...], latency: float) -> None:
+    """Count retryable statuses as host failures; anything else shows the host is up."""
+    if resp.status_code in retry_on:
+        breaker.record_failure(latency, retry_after=_retry_after(resp))
+    else:
+        breaker.record_success(latency)
+
+
+def _requests_response(entry: CachedResponse) -> requests.Response:
+    """Build a ``requests.Response`` from a cache entry."""
+    resp = requests.Response()
+    resp.status_code = entry.status_code
+    resp._content = entry.content
+    resp.headers = CaseInsensitiveDict(entry.headers)
+    resp.url = entry.url
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    return resp
+
+
+def _httpx_response(entry: CachedResponse) -> httpx.Response:
+    """Build an ``httpx.Response`` from a cache entry."""
+    return httpx.Response(
+        entry.status_code, headers=entry.headers, content=entry.content,
+        request=httpx.Request('GET', entry.url),
+    )
+
+
+def _request_with_retries(
+    method: str,
+    url: str,
+    *,
+    params: Optional[Dict[str, Any]],
+    headers: Optional[Dict[str, str]],
+    json: Optional[Dict[str, Any]],
+    data: Optional[Dict[str, Any]],
+    timeout: int,
+    retries: int,
+    backoff: float,
+    retry_on: tuple[int, ...],
+    attrs: Dict[str, Any],
+    max_bytes: Optional[int] = None,
+    stop_when: Optional[StopCondition] = None,
+) -> requests.Response:
     attempt = 0
     last_exc: Optional[Exception] = None
 
+    limiter = get_rate_limiter()
+    breaker = get_breakers().get(url)
+
     while attempt <= retries:
+        attrs['attempts'] = attempt + 1
+        _check_circuit(breaker, method, url, attrs)
+        _note_rate_wait(attrs, limiter.acquire(url))
+        started = time.monotonic()
         try:
-            resp = requests.request(
-                method=method.upper(), url=url, params=params, headers=headers, json=json, data=data, timeout=timeout
-            )
+            try:
+                streaming = bool(max_bytes or stop_when)
+                if uses_http2(url):
+                    resp = _send_http2(
+                        method, url, params=params, headers=headers, json=json, data=data, timeout=timeout,
+                        max_bytes=max_bytes, stop_when=stop_when, attrs=attrs,
+                    )
+                else:
+                    resp = get_session(url).request(
+                        method=method.upper(), url=url, params=params, headers=headers, json=json, data=data,
+                        timeout=timeout, **({'stream': True} if streaming else {}),
+                    )
+                    attrs['http_version'] = 'HTTP/1.1'
+                    if streaming:
+                        _read_streamed(resp, max_bytes, stop_when, attrs)
+            except requests.RequestException:
+                breaker.record_failure(time.monotonic() - started)
+                raise
+            _record_outcome(breaker, resp, retry_on, time.monotonic() - started)
+            attrs['status'] = resp.status_code
             if resp.status_code < 400:
                 return resp
             if resp.status_code not in retry_on or attempt == retries:
                 logger.error("HTTP %s %s failed with %s: %s", method, url, resp.status_code, resp.text[:300])
                 resp.raise_for_status()
             else:
+                _honor_retry_after(url, resp)
                 logger.warning("HTTP %s %s returned %s; retrying (attempt %s/%s)", method, url, resp.status_code, attempt + 1, retries)
         except requests.RequestException as e:
             # If this is an HTTPError with a non-retryable status, don't retry
@@ -58,9 +507,135 @@ def request_with_retries(
             logger.warning("HTTP %s %s exception: %s; retrying (attempt %s/%s)", method, url, e, attempt + 1, retries)
 
         attempt += 1
-        time.sleep(backoff * (2 ** (attempt - 1)))
+        time.sleep(breaker.retry_delay(attempt, backoff))
 
     # Should not reach here
     if last_exc:
         raise last_exc
     raise requests.HTTPError(f"Request failed: {method} {url}")
+
+
+async def arequest_with_retries(
+    method: str,
+    url: str,
+    *,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    json: Optional[Dict[str, Any]] = None,
+    data: Optional[Dict[str, Any]] = None,
+    timeout: int = 10,
+    retries: int = 3,
+    backoff: float = 0.5,
+    retry_on: tuple[int, ...] = (429, 500, 502, 503, 504),
+    cache: Optional[ResponseCache] = None,
+    max_bytes: Optional[int] = None,
+    stop_when: Optional[StopCondition] = None,
+) -> httpx.Response:
+    """Async ``request_with_retries`` on the pooled ``httpx.AsyncClient``.
+
+    Same retry statuses, backoff schedule (slept with ``asyncio.sleep``),
+    span, ``cache`` and streaming options. Errors surface as ``requests.HTTPError``
+    (with ``.response`` set), ``requests.Timeout`` or ``requests.ConnectionError``.
+    """
+    with _instrument(method, url) as attrs:
+        resp = entry = None
+        if cache is not None and method.upper() == 'GET':
+            partial_ok = bool(max_bytes or stop_when)
+            entry, headers = _cache_lookup(cache, url, params, headers, attrs, partial_ok)
+            if attrs.get('cache') == 'hit':
+                resp = _httpx_response(entry)
+        if resp is None:
+            async def fetch() -> httpx.Response:
+                resp = await _arequest_with_retries(
+                    method, url, params=params, headers=headers, json=json, data=data,
+                    timeout=timeout, retries=retries, backoff=backoff, retry_on=retry_on, attrs=attrs,
+                    max_bytes=max_bytes, stop_when=stop_when,
+                )
+                attrs['status'] = resp.status_code
+                if cache is not None and method.upper() == 'GET':
+                    if _cache_update(cache, url, params, entry, resp.status_code, resp.headers, resp.content, attrs):
+                        resp = _httpx_response(entry)
+                return resp
+
+            key = _flight_key(
+                method, url, params, headers, json, data, max_bytes, stop_when,
+                timeout=timeout, retries=retries, backoff=backoff, retry_on=retry_on, cache=cache,
+            )
+            resp, shared = await in_flight.ado(key, fetch)
+            if shared:
+                resp = _shared_copy(resp, attrs)
+        attrs['bytes'] = len(resp.content)
+        return resp
+
+
+def _as_requests_error(e: httpx.RequestError) -> requests.RequestException:
+    """Map an httpx transport error to the equivalent ``requests`` exception."""
+    if isinstance(e, httpx.TimeoutException):
+        return requests.Timeout(str(e))
+    if isinstance(e, httpx.TransportError):
+        return requests.ConnectionError(str(e))
+    return requests.RequestException(str(e))
+
+
+async def _arequest_with_retries(
+    method: str,
+    url: str,
+    *,
+    params: Optional[Dict[str, Any]],
+    headers: Optional[Dict[str, str]],
+    json: Optional[Dict[str, Any]],
+    data: Optional[Dict[str, Any]],
+    timeout: int,
+    retries: int,
+    backoff: float,
+    retry_on: tuple[int, ...],
+    attrs: Dict[str, Any],
+    max_bytes: Optional[int] = None,
+    stop_when: Optional[StopCondition] = None,
+) -> httpx.Response:
+    attempt = 0
+    client = get_async_client()
+
+    limiter = get_rate_limiter()
+    breaker = get_breakers().get(url)
+
+    while attempt <= retries:
+        attrs['attempts'] = attempt + 1
+        _check_circuit(breaker, method, url, attrs)
+        _note_rate_wait(attrs, await limiter.acquire_async(url))
+        started = time.monotonic()
+        try:
+            if max_bytes or stop_when:
+                resp = await _astream(
+                    client, client.build_request(
+                        method.upper(), url, params=params, headers=headers, json=json, data=data, timeout=timeout
+                    ), max_bytes, stop_when, attrs,
+                )
+            else:
+                resp = await client.request(
+                    method.upper(), url, params=params, headers=headers, json=json, data=data, timeout=timeout
+                )
+        except httpx.RequestError as e:
+            breaker.record_failure(time.monotonic() - started)
+            if attempt == retries:
+                logger.exception("HTTP %s %s failed after retries: %s", method, url, e)
+                raise _as_requests_error(e) from e
+            logger.warning("HTTP %s %s exception: %s; retrying (attempt %s/%s)", method, url, e, attempt + 1, retries)
+        else:
+            _record_outcome(breaker, resp, retry_on, time.monotonic() - started)
+            attrs['status'] = resp.status_code
+            attrs['http_version'] = resp.http_version
+            if resp.status_code < 400:
+                return resp
+            if resp.status_code not in retry_on or attempt == retries:
+                logger.error("HTTP %s %s failed with %s: %s", method, url, resp.status_code, resp.text[:300])
+                raise requests.HTTPError(
+                    f"{resp.status_code} Error: {resp.reason_phrase} for url: {url}", response=resp
+                )
+            _honor_retry_after(url, resp)
+            logger.warning("HTTP %s %s returned %s; retrying (attempt %s/%s)", method, url, resp.status_code, attempt + 1, retries)
+
+        attempt += 1
+        await asyncio.sleep(breaker.retry_delay(attempt, backoff))
+
+    raise requests.HTTPError(f"Request failed: {method} {url}")
@@ -0,0 +1,112 @@
+"""Single-flight de-duplication of identical in-flight requests.
+
+When the same job URL is submitted twice in a batch, or the quick scrape and
+``process_job_posting`` fetch the same page at once, both requests would go
+out. ``SingleFlight`` lets the first caller (the leader) do the work while
+concurrent callers with the same key wait for and share its result, or its
+exception. Nothing is cached: once the leader finishes, the next caller
+starts a new request.
+
+Threads use ``do``; coroutines use ``ado`` (the shared work runs as a task,
+so a cancelled leader does not cancel it for the others).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from .env import get_bool
+
+
+T = TypeVar('T')
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe registry of in-flight calls keyed by request identity."""
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+        self.leaders = 0
+        self.shared = 0
+
+    def do(self, key: Optional[Hashable], fn: Callable[[], T]) -> Tuple[T, bool]:
+        """Run ``fn`` unless an identical call is in flight; returns ``(result, shared)``.
+
+        ``key=None`` (or a disabled registry) always runs ``fn``.
+        """
+        if key is None or not self.enabled:
+            return fn(), False
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: Optional[Hashable], factory: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Async ``do``: await ``factory()`` or the identical call already running on this loop."""
+        if key is None or not self.enabled:
+            return await factory(), False
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            shared = task is not None and not task.done()
+            if shared:
+                self.shared += 1
+            else:
+                task = self._tasks[task_key] = loop.create_task(factory())
+                task.add_done_callback(lambda t: self._forget(task_key, t))
+                self.leaders += 1
+        return await asyncio.shield(task), shared
+
+    def _forget(self, task_key: Tuple[asyncio.AbstractEventLoop, Hashable], task: asyncio.Task) -> None:
+        with self._lock:
+            if self._tasks.get(task_key) is task:
+                del self._tasks[task_key]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every waiter was cancelled
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'in_flight': len(self._calls) + len(self._tasks),
+                'leaders': self.leaders,
+                'shared': self.shared,
+            }
+
+
+# Process-wide registry used by the HTTP core (``HTTP_SINGLE_FLIGHT``, default on)
+in_flight = SingleFlight(enabled=get_bool('HTTP_SINGLE_FLIGHT', True))
@@ -0,0 +1,91 @@
+"""Precompiled text patterns shared by the scrapers and TrelloConnect.
+
+Job-title cleaning used to run ~25 ``re.sub`` calls per title, and reference
+extraction tried 9 patterns one after another against the whole description,
+recompiling them from strings on every call. Here each family is a single
+alternation compiled once at import:
+
+- ``GENDER_MARKER_RE`` removes every gender marker in one ``sub``
+- ``REFERENCE_RE`` has one named group per label; ``find_reference`` scans
+  the text once and keeps the match of the highest-priority label, so the
+  result is the same as trying the labels in order. Case-insensitive
+  searches are slow in ``re``, so candidates are located in the lowercased
+  text and only confirmed with ``REFERENCE_RE``
+
+Contact and emoji patterns used by the scrapers live here too.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Optional
+
+
+# Gender markers (German m/w/d, English m/f/d, m/f/x), parenthesized ones first
+_GENDER_MARKERS = (
+    r'\((?:m/w/d|w/m/d|d/m/w|m/w|w/m|m/f/d|f/m/d|m/f/x|f/m/x|m/f|f/m|gn|all genders|x/w/m)\)',
+    r'm/w/d|w/m/d|m/f/d|f/m/d|m/f/x|f/m/x',
+    r'(?:m/w|w/m|m/f|f/m)(?!\w)',
+)
+GENDER_MARKER_RE = re.compile('|'.join(_GENDER_MARKERS), re.IGNORECASE)
+_EDGE_DASH_RE = re.compile(r'^\s*-\s*|\s*-\s*$')
+
+# Labels in priority order: the first label found anywhere in the text wins
+_REFERENCE_LABELS = (
+    ('referenznummer', r'Referenznummer'),
+    ('referenz', r'Referenz'),
+    ('job_id', r'Job-ID'),
+    ('job_id_spaced', r'Job ID'),
+    ('kennziffer', r'Kennziffer'),
+    ('stellennummer', r'Stellennummer'),
+    ('reference', r'Reference'),
+    ('req_id', r'Req\.?\s*ID'),
+    ('position_id', r'Position\s*ID'),
+)
+REFERENCE_RE = re.compile(
+    '|'.join(rf'{label}[:\s]+(?P<{name}>[A-Z0-9\-_/]+)' for name, label in _REFERENCE_LABELS),
+    re.IGNORECASE,
+)
+_REFERENCE_RANK: Dict[str, int] = {name: rank for rank, (name, _) in enumerate(_REFERENCE_LABELS)}
+_REFERENCE_LABEL_RE = re.compile('|'.join(label.lower() for _, label in _REFERENCE_LABELS))
+
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_RE = re.compile(r'\+?\d{2,4}[\s\-]?\(?\d{2,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4}')
+EMOJI_RE = re.compile(r'[\U0001F300-\U0001F9FF]')
+
+
+def clean_job_title(title: Optional[str]) -> Optional[str]:
+    """Remove gender markers (German and English variants) from a job title."""
+    if not title:
+        return title
+    cleaned = ' '.join(GENDER_MARKER_RE.sub('', title).split())
+    return _EDGE_DASH_RE.sub('', cleaned).strip()
+
+
+def find_reference(text: Optional[str]) -> Optional[str]:
+    """Return the company's job reference number from a job description, if any."""
+    if not text:
+        return None
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        candidates = _REFERENCE_LABEL_RE
+    else:
+        # Lowercasing changed offsets (e.g. "İ"); search the text itself
+        candidates, lowered = REFERENCE_RE, text
+    best_rank, best_value = len(_REFERENCE_RANK), None
+    pos = 0
+    while True:
+        label = candidates.search(lowered, pos)
+        if label is None:
+            break
+        # Labels can overlap ("Reference: Referenznummer: X"), so resume right after the start
+        pos = label.start() + 1
+        match = REFERENCE_RE.match(text, label.start())
+        if match is None:
+            continue
+        rank = _REFERENCE_RANK[match.lastgroup]
+        if rank < best_rank:
+            best_rank, best_value = rank, match.group(match.lastgroup)
+            if rank == 0:
+                break
+    return best_value.strip() if best_value else None
@@ -0,0 +1,292 @@
+"""Per-host politeness throttling for concurrent workloads.
+
+Replaces the fixed global sleep between jobs with a spacing rule that only
+applies to requests against the same host, so work for different job boards
+(or for different stages of different jobs) can overlap freely.
+
+``RateLimiter`` is the request-level counterpart: a process-wide token bucket
+per host that every HTTP helper acquires from before sending, so parallel
+jobs stay under Trello's per-token limits and don't hammer the job boards.
+``Retry-After`` answers block the host until the server says it is ready.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+from .env import get_str
+from .log_config import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def host_key(url: str) -> str:
+    """Return a normalized host key for a URL (lowercase, without ``www.``)."""
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class HostThrottle:
+    """Thread-safe politeness limiter keyed by host.
+
+    - ``min_interval``: minimum number of seconds between two slot grants for
+      the same host (0 disables spacing).
+    - ``max_concurrent``: optional cap on simultaneously held slots per host.
+    """
+
+    def __init__(self, min_interval: float = 3.0, max_concurrent: Optional[int] = None) -> None:
+        self.min_interval = max(0.0, float(min_interval))
+        self.max_concurrent = max_concurrent
+        self._lock = threading.Lock()
+        self._next_allowed: Dict[str, float] = {}
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+
+    def _semaphore(self, host: str) -> Optional[threading.Semaphore]:
+        if not self.max_concurrent:
+            return None
+        with self._lock:
+            sem = self._semaphores.get(host)
+            if sem is None:
+                sem = threading.Semaphore(self.max_concurrent)
+                self._semaphores[host] = sem
+            return sem
+
+    def _reserve(self, host: str) -> float:
+        """Reserve the next start time for host and return the required wait."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed.get(host, 0.0))
+            self._next_allowed[host] = start + self.min_interval
+            return start - now
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[float]:
+        """Hold a politeness slot for the URL's host.
+
+        Yields the number of seconds spent waiting for the slot.
+        """
+        host = host_key(url)
+        sem = self._semaphore(host)
+        started = time.monotonic()
+        if sem is not None:
+            sem.acquire()
+        try:
+            wait = self._reserve(host)
+            if wait > 0:
+                logger.debug("Throttling %s: waiting %.2fs", host, wait)
+                time.sleep(wait)
+            yield time.monotonic() - started
+        finally:
+            if sem is not None:
+                sem.release()
+
+    async def wait_async(self, url: str) -> float:
+        """Non-blocking counterpart of ``slot`` for coroutines (spacing only).
+
+        Waits with ``asyncio.sleep`` until the host's next start time and
+        returns the seconds waited. ``max_concurrent`` is not applied here.
+        """
+        wait = self._reserve(host_key(url))
+        if wait > 0:
+            logger.debug("Throttling %s: waiting %.2fs", host_key(url), wait)
+            await asyncio.sleep(wait)
+        return max(0.0, wait)
+
+
+# Requests per second and burst size per host (host_key form; subdomains inherit).
+# Trello allows 100 requests per 10s per token.
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    'api.trello.com': (8.0, 10),
+    'stepstone.de': (1.0, 2),
+    'linkedin.com': (0.5, 1),
+    'duckduckgo.com': (1.0, 1),
+}
+
+
+def parse_rate_limits(spec: str) -> Dict[str, Tuple[float, int]]:
+    """Parse ``"host=rate[:burst],..."`` (e.g. ``"api.trello.com=5:10,stepstone.de=0.5"``)."""
+    limits: Dict[str, Tuple[float, int]] = {}
+    for item in spec.split(','):
+        if '=' not in item:
+            continue
+        host, _, value = item.partition('=')
+        rate, _, burst = value.partition(':')
+        try:
+            limits[host.strip().lower()] = (float(rate), int(burst) if burst else 1)
+        except ValueError:
+            logger.warning("Ignoring invalid rate limit entry: %s", item.strip())
+    return limits
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds from a ``Retry-After`` header (seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class _Bucket:
+    """Token state for one host; ``rate=None`` only tracks ``Retry-After`` blocks."""
+
+    def __init__(self, rate: Optional[float], burst: int) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.waits = 0
+        self.deferrals = 0
+
+
+class RateLimiter:
+    """Thread-safe token bucket per host.
+
+    Each host refills at ``rate`` tokens per second up to ``burst``. A caller
+    takes one token per request; if none is left it waits for its turn
+    (reservations queue up, so bursts are smoothed instead of rejected).
+    Hosts without a configured limit (and no ``default``) are not limited.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                 default: Optional[Tuple[float, int]] = None) -> None:
+        self.limits = dict(limits or {})
+        self.default = default
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _Bucket] = {}
+
+    def configure(self, host: str, rate: float, burst: int = 1) -> None:
+        """Set (or replace) the limit for ``host``, keeping its current token state."""
+        host = host.lower()
+        with self._lock:
+            self.limits[host] = (rate, burst)
+            bucket = self._buckets.get(host)
+            if bucket is not None and rate <= 0:
+                del self._buckets[host]
+            elif bucket is not None:
+                bucket.rate = rate
+                bucket.burst = max(1, burst)
+                bucket.tokens = min(bucket.tokens, bucket.burst)
+
+    def _limit_for(self, host: str) -> Tuple[Optional[str], Optional[Tuple[float, int]]]:
+        parts = host.split('.')
+        for i in range(len(parts) - 1):
+            candidate = '.'.join(parts[i:])
+            if candidate in self.limits:
+                return candidate, self.limits[candidate]
+        return (host, self.default) if self.default else (None, None)
+
+    def _bucket(self, url: str) -> Optional[_Bucket]:
+        """Return the bucket for the URL's host (caller holds the lock)."""
+        host = host_key(url)
+        key, limit = self._limit_for(host)
+        if key is None or limit is None or limit[0] <= 0:
+            return self._buckets.get(host)  # Pass-through bucket left by defer(), if any
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(*limit)
+        return bucket
+
+    def _reserve(self, url: str) -> float:
+        """Take a token for the URL's host and return the required wait."""
+        with self._lock:
+            bucket = self._bucket(url)
+            if bucket is None:
+                return 0.0
+            now = time.monotonic()
+            wait = 0.0
+            if bucket.rate is not None:
+                bucket.tokens = min(bucket.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+                bucket.updated = now
+                bucket.tokens -= 1
+                if bucket.tokens < 0:
+                    wait = -bucket.tokens / bucket.rate
+            wait = max(wait, bucket.blocked_until - now)
+            if wait > 0:
+                bucket.waits += 1
+            return wait
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to the URL's host may be sent; return seconds waited."""
+        wait = self._reserve(url)
+        if wait > 0:
+            logger.debug("Rate limiting %s: waiting %.2fs", host_key(url), wait)
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        """Non-blocking counterpart of ``acquire`` for coroutines."""
+        wait = self._reserve(url)
+        if wait > 0:
+            logger.debug("Rate limiting %s: waiting %.2fs", host_key(url), wait)
+            await asyncio.sleep(wait)
+        return wait
+
+    def defer(self, url: str, seconds: float) -> None:
+        """Hold back all requests to the URL's host for ``seconds`` (from ``Retry-After``).
+
+        Applies to unlimited hosts too, via a pass-through bucket that only
+        tracks the block.
+        """
+        with self._lock:
+            bucket = self._bucket(url)
+            if bucket is None:
+                bucket = self._buckets[host_key(url)] = _Bucket(None, 1)
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + seconds)
+            bucket.deferrals += 1
+        logger.info("Server asked to retry %s after %.1fs; holding requests", host_key(url), seconds)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-host limit, queued waits and Retry-After deferrals."""
+        with self._lock:
+            now = time.monotonic()
+            return {
+                host: {
+                    'rate': bucket.rate,
+                    'burst': bucket.burst,
+                    'waits': bucket.waits,
+                    'deferrals': bucket.deferrals,
+                    'blocked_for_s': round(max(0.0, bucket.blocked_until - now), 1),
+                }
+                for host, bucket in self._buckets.items()
+            }
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter shared by all HTTP callers.
+
+    ``DEFAULT_RATE_LIMITS`` can be extended or overridden with
+    ``HTTP_RATE_LIMITS`` (``host=rate[:burst],...``); ``HTTP_RATE_LIMIT_DEFAULT``
+    (``rate[:burst]``) limits every other host.
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                limits = {**DEFAULT_RATE_LIMITS, **parse_rate_limits(get_str('HTTP_RATE_LIMITS'))}
+                default_spec = get_str('HTTP_RATE_LIMIT_DEFAULT')
+                default = parse_rate_limits(f"*={default_spec}").get('*') if default_spec else None
+                _rate_limiter = RateLimiter(limits, default)
+    return _rate_limiter
@@ -0,0 +1,105 @@
+"""Lightweight per-job timing spans.
+
+A ``JobTimer`` collects named spans (wall-clock durations plus a few
+attributes such as HTTP status or OpenAI token counts) for one job. The
+active timer lives in a context variable, so code deep in the call stack —
+HTTP helpers, HTML parsing, the OpenAI call, document rendering — records
+spans with ``with span('name'):`` without a timer being passed around.
+Outside a job, ``span`` is a cheap no-op.
+
+Threads started via ``contextvars.copy_context().run`` see the same timer.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+_current_timer: contextvars.ContextVar[Optional["JobTimer"]] = contextvars.ContextVar(
+    'job_timer', default=None
+)
+
+
+class JobTimer:
+    """Thread-safe collection of timing spans for a single job."""
+
+    def __init__(self) -> None:
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._spans: List[Dict[str, Any]] = []
+
+    def record(self, name: str, started: float, duration: float, **attrs: Any) -> None:
+        """Add a finished span (``started`` is a ``time.perf_counter()`` value)."""
+        entry = {
+            'name': name,
+            'start_ms': round((started - self._started) * 1000, 1),
+            'duration_ms': round(duration * 1000, 1),
+        }
+        entry.update(attrs)
+        with self._lock:
+            self._spans.append(entry)
+
+    @property
+    def spans(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the job's breakdown: total, summed time per span name, raw spans."""
+        spans = self.spans
+        breakdown: Dict[str, float] = {}
+        for entry in spans:
+            breakdown[entry['name']] = round(breakdown.get(entry['name'], 0.0) + entry['duration_ms'], 1)
+        return {
+            'total_ms': round((time.perf_counter() - self._started) * 1000, 1),
+            'breakdown': breakdown,
+            'spans': sorted(spans, key=lambda entry: entry['start_ms']),
+        }
+
+
+def current_timer() -> Optional[JobTimer]:
+    """Return the timer of the job running in this context, if any."""
+    return _current_timer.get()
+
+
+@contextmanager
+def use_timer(timer: Optional[JobTimer]) -> Iterator[Optional[JobTimer]]:
+    """Make ``timer`` the active timer for the enclosed block."""
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """Time the enclosed block as span ``name`` on the active timer.
+
+    Yields a dict; keys added to it inside the block (e.g. ``status``,
+    ``total_tokens``) are stored with the span. Spans are recorded even if
+    the block raises.
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        yield attrs
+        return
+    started = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        timer.record(name, started, time.perf_counter() - started, **attrs)
+
+
+def percentile(values: Iterable[float], pct: float) -> Optional[float]:
+    """Return the ``pct`` percentile (0-100, nearest rank) of ``values``."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
@@ -12,6 +12,8 @@ from typing import Dict, Optional
 import requests
 
 from .env import load_env, get_str
+from .http_pool import get_session
+from .throttle import get_rate_limiter
 
 
 TRELLO_API_BASE = "https://api.trello.com/1"
@@ -44,4 +46,5 @@ def trello_get(path: str, params: Optional[Dict[str, str]] = None, timeout: int
     auth = get_auth_params()
     merged = {**(params or {}), **auth} if auth else (params or {})
     url = f"{TRELLO_API_BASE}/{path.lstrip('/')}"
-    return requests.get(url, params=merged, timeout=timeout)
+    get_rate_limiter().acquire(url)
+    return get_session(url).get(url, params=merged, timeout=timeout)
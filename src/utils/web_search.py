@@ -6,7 +6,7 @@ specifically designed to find job-related information such as career pages,
 contact persons, and company addresses.
 """
 
-import time
+import warnings
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 
@@ -15,14 +15,19 @@ from duckduckgo_search import DDGS
 # Use custom logger from utils
 try:
     from .log_config import get_logger
+    from .throttle import get_rate_limiter
 except ImportError:
     import sys
     import os
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
     from utils.log_config import get_logger
+    from utils.throttle import get_rate_limiter
 
 logger = get_logger(__name__)
 
+# Searches share the process-wide rate limit of this host
+SEARCH_URL = "https://duckduckgo.com/"
+
 
 @dataclass
 class SearchResult:
@@ -40,13 +45,13 @@ class WebSearcher:
     Features:
     - No API key required
     - Privacy-friendly
-    - Rate limiting built-in
+    - Rate limiting shared by all instances (per-host token bucket)
     - Site-specific search capabilities
     """
     
     def __init__(
         self,
-        rate_limit_delay: float = 1.0,
+        rate_limit_delay: Optional[float] = None,
         max_results: int = 10,
         region: str = "de-de"
     ):
@@ -54,27 +59,27 @@ class WebSearcher:
         Initialize the WebSearcher.
         
         Args:
-            rate_limit_delay: Seconds to wait between searches (politeness)
+            rate_limit_delay: Deprecated and ignored. The duckduckgo.com limit is shared by
+                all callers and set in DEFAULT_RATE_LIMITS / HTTP_RATE_LIMITS (default 1 search/s).
             max_results: Maximum number of results to return per search
             region: Search region (de-de for Germany, en-us for US)
         """
-        self.rate_limit_delay = rate_limit_delay
+        if rate_limit_delay is not None:
+            warnings.warn(
+                "WebSearcher(rate_limit_delay=...) is ignored; configure duckduckgo.com in HTTP_RATE_LIMITS",
+                DeprecationWarning,
+                stacklevel=2,
+            )
         self.max_results = max_results
         self.region = region
-        self._last_search_time = 0.0
         
-        logger.info(
-            f"WebSearcher initialized | region={region} | max_results={max_results} | delay={rate_limit_delay}s"
-        )
+        logger.info(f"WebSearcher initialized | region={region} | max_results={max_results}")
     
     def _rate_limit(self):
-        """Enforce rate limiting between searches."""
-        elapsed = time.time() - self._last_search_time
-        if elapsed < self.rate_limit_delay:
-            wait_time = self.rate_limit_delay - elapsed
-            logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
-            time.sleep(wait_time)
-        self._last_search_time = time.time()
+        """Wait for a search slot from the shared per-host rate limiter."""
+        wait_time = get_rate_limiter().acquire(SEARCH_URL)
+        if wait_time > 0:
+            logger.debug(f"Rate limiting: waited {wait_time:.2f}s")
     
     def search(
         self,
@@ -0,0 +1,126 @@
+"""Bounded worker pool with fair scheduling across batches.
+
+Replaces one-thread-per-request in the web app: at most ``max_workers`` jobs
+run at a time, everything else waits in a queue. Jobs are grouped by batch and
+dispatched round-robin across batches, so one user pasting 100 URLs does not
+starve a single job submitted from another tab.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from .log_config import get_logger
+
+
+logger = get_logger(__name__)
+
+_Task = Tuple[str, Callable[..., Any], tuple, dict]
+
+
+class FairWorkerPool:
+    """Fixed-size thread pool with per-batch FIFO queues served round-robin.
+
+    - ``submit(job_id, fn, *args, batch_id=..., **kwargs)`` queues a call.
+    - ``position(job_id)`` returns the 1-based place in the dispatch order
+      (None once the job started or is unknown).
+    - ``cancel(job_id)`` drops a job that has not started yet.
+
+    Worker threads are started lazily on the first submit.
+    """
+
+    def __init__(self, max_workers: int = 3, name: str = 'job-worker') -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.name = name
+        self._cond = threading.Condition()
+        self._batches: "OrderedDict[str, Deque[_Task]]" = OrderedDict()
+        self._running: Set[str] = set()
+        self._threads: List[threading.Thread] = []
+
+    def submit(self, job_id: str, fn: Callable[..., Any], *args: Any,
+               batch_id: Optional[str] = None, **kwargs: Any) -> int:
+        """Queue ``fn(*args, **kwargs)``; jobs without a batch form their own batch.
+
+        Returns the job's queue position (1 = next to start).
+        """
+        batch = batch_id or job_id
+        with self._cond:
+            self._batches.setdefault(batch, deque()).append((job_id, fn, args, kwargs))
+            self._ensure_workers()
+            self._cond.notify()
+            return self._position_locked(job_id) or 1
+
+    def position(self, job_id: str) -> Optional[int]:
+        """Return the 1-based dispatch position of a queued job."""
+        with self._cond:
+            return self._position_locked(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Remove a queued (not yet running) job. Returns True if it was removed."""
+        with self._cond:
+            for batch, tasks in list(self._batches.items()):
+                for task in tasks:
+                    if task[0] == job_id:
+                        tasks.remove(task)
+                        if not tasks:
+                            del self._batches[batch]
+                        return True
+        return False
+
+    def stats(self) -> Dict[str, int]:
+        """Return current pool occupancy."""
+        with self._cond:
+            return {
+                'max_workers': self.max_workers,
+                'running': len(self._running),
+                'queued': sum(len(tasks) for tasks in self._batches.values()),
+                'batches': len(self._batches),
+            }
+
+    def _position_locked(self, job_id: str) -> Optional[int]:
+        # Replays the round-robin order: round r takes the r-th job of every batch
+        queues = list(self._batches.values())
+        longest = max((len(tasks) for tasks in queues), default=0)
+        position = 0
+        for round_index in range(longest):
+            for tasks in queues:
+                if round_index < len(tasks):
+                    position += 1
+                    if tasks[round_index][0] == job_id:
+                        return position
+        return None
+
+    def _ensure_workers(self) -> None:
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(
+                target=self._worker, name=f"{self.name}-{len(self._threads)}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_task(self) -> _Task:
+        """Take the next job round-robin across batches (caller holds the lock)."""
+        batch, tasks = next(iter(self._batches.items()))
+        task = tasks.popleft()
+        if tasks:
+            self._batches.move_to_end(batch)
+        else:
+            del self._batches[batch]
+        return task
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._batches:
+                    self._cond.wait()
+                job_id, fn, args, kwargs = self._next_task()
+                self._running.add(job_id)
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                logger.exception("Job %s failed in worker pool: %s", job_id, e)
+            finally:
+                with self._cond:
+                    self._running.discard(job_id)
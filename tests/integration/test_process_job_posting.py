@@ -88,3 +88,282 @@ def test_process_job_posting_happy_path(monkeypatch, tmp_path):
     assert Path(result["cover_letter_docx_file"]).exists()
     # PDF generation is disabled by default
     # assert Path(result["cover_letter_pdf_file"]).exists()
+
+
+def test_trello_and_cover_letter_run_concurrently(monkeypatch, tmp_path):
+    import threading
+
+    # Both branches must be in flight at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    monkeypatch.setattr(main, "scrape_job_posting", lambda url: fake_scrape(url))
+
+    class FakeTrello:
+        def create_card_from_job_data(self, job_data):
+            barrier.wait()
+            assert "cover_letter_body" not in job_data  # Works on a snapshot
+            return {"shortUrl": "https://trello.example/card"}
+    monkeypatch.setattr(main, "TrelloConnect", lambda: FakeTrello())
+
+    class FakeAI:
+        def generate_cover_letter(self, job_data, **__):
+            barrier.wait()
+            job_data["cover_letter_salutation"] = "Dear Hiring Manager,"
+            job_data["cover_letter_body"] = "Body."
+            job_data["cover_letter_valediction"] = "Sincerely,"
+            return "Body."
+    monkeypatch.setattr(main, "CoverLetterGenerator", lambda: FakeAI())
+
+    class FakeWord:
+        sender = {'name': 'Dr. Kai Voges'}
+
+        def generate_from_template(self, text, job, docx_filename, language="english"):
+            p = tmp_path / "out" / "letter.docx"
+            p.write_text(text, encoding="utf-8")
+            return str(p)
+    monkeypatch.setattr(main, "WordCoverLetterGenerator", lambda: FakeWord())
+
+    result = main.process_job_posting(
+        "https://www.stepstone.de/stellenangebote--Parallel--1-inline.html",
+        target_language="en",
+        skip_duplicate_check=True,
+    )
+
+    assert result["status"] == "success"
+    assert result["trello_card"]["shortUrl"] == "https://trello.example/card"
+    assert result["job_data"]["cover_letter_body"] == "Body."
+    assert Path(result["cover_letter_docx_file"]).read_text(encoding="utf-8") == "Body."
+
+    # Both branches are timed even though they ran on worker threads
+    breakdown = result["timings"]["breakdown"]
+    for name in ("stage.scrape", "stage.trello", "stage.cover_letter", "stage.documents", "docx.render"):
+        assert name in breakdown
+    assert result["timings"]["total_ms"] >= breakdown["stage.scrape"]
+
+
+def test_parallel_branch_errors_are_merged(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "scrape_job_posting", lambda url: fake_scrape(url))
+    monkeypatch.setattr(main, "report_error", lambda *a, **k: None)
+
+    class FailingTrello:
+        def create_card_from_job_data(self, job_data):
+            raise RuntimeError("trello down")
+    monkeypatch.setattr(main, "TrelloConnect", lambda: FailingTrello())
+
+    class FailingAI:
+        def generate_cover_letter(self, *_, **__):
+            raise RuntimeError("openai down")
+    monkeypatch.setattr(main, "CoverLetterGenerator", lambda: FailingAI())
+
+    result = main.process_job_posting(
+        "https://www.stepstone.de/stellenangebote--Parallel--2-inline.html",
+        skip_duplicate_check=True,
+    )
+
+    assert result["status"] == "partial_success"
+    assert result["trello_error"] == "trello down"
+    assert result["cover_letter_error"] == "openai down"
+    assert result["cover_letter_docx_file"] is None
+
+
+def test_pre_scraped_job_data_skips_fetch(monkeypatch):
+    def no_scrape(url):
+        raise AssertionError("should not scrape again")
+    monkeypatch.setattr(main, "scrape_job_posting", no_scrape)
+
+    job_data = fake_scrape("https://www.stepstone.de/stellenangebote--Pre--3-inline.html")
+    job_data["company_page_url"] = "https://testco.example"
+
+    result = main.process_job_posting(
+        job_data["source_url"],
+        generate_cover_letter=False,
+        create_trello_card=False,
+        skip_duplicate_check=True,
+        job_data=job_data,
+    )
+
+    assert result["status"] == "success"
+    assert result["job_data"] is job_data
+
+
+def test_duplicate_fast_path_returns_stored_result(monkeypatch, tmp_path):
+    from src.database import ApplicationDB
+
+    db = ApplicationDB(db_path=str(tmp_path / "fast_path.db"))
+    url = "https://www.stepstone.de/stellenangebote--Repeat--4-inline.html"
+    docx = tmp_path / "out" / "repeat.docx"
+    docx.write_text("docx", encoding="utf-8")
+    db.save_processed_job(
+        source_url=url,
+        company_name="RepeatCo",
+        job_title="Engineer",
+        trello_card_id="c1",
+        trello_card_url="https://trello.example/repeat",
+        docx_file_path=str(docx),
+        ai_model="test-model",
+        language="en",
+        cover_letter_text="Stored letter",
+    )
+    monkeypatch.setattr(main, "get_db", lambda: db)
+
+    def no_scrape(url):
+        raise AssertionError("should not scrape a known duplicate")
+    monkeypatch.setattr(main, "scrape_job_posting", no_scrape)
+
+    result = main.process_job_posting(url, duplicate_fast_path=True)
+
+    assert result["status"] == "duplicate"
+    assert result["is_duplicate"] is True
+    assert result["trello_card"]["shortUrl"] == "https://trello.example/repeat"
+    assert result["cover_letter_docx_file"] == str(docx)
+    assert result["cover_letter_text"] == "Stored letter"
+    assert main.get_cached_duplicate_result("https://www.stepstone.de/other") is None
+
+
+def test_progress_never_goes_backwards_with_concurrent_branches(monkeypatch, tmp_path):
+    import threading
+
+    letter_started = threading.Event()
+    monkeypatch.setattr(main, "scrape_job_posting", lambda url: fake_scrape(url))
+
+    # Hold the Trello branch back until the cover letter has reported 60%
+    stage_trello = main._stage_trello
+    def late_trello(ctx):
+        assert letter_started.wait(5)
+        stage_trello(ctx)
+    monkeypatch.setattr(main, "_stage_trello", late_trello)
+
+    class FakeTrello:
+        def create_card_from_job_data(self, job_data):
+            return {"shortUrl": "https://trello.example/card"}
+    monkeypatch.setattr(main, "TrelloConnect", lambda: FakeTrello())
+    monkeypatch.setenv("USE_PLACEHOLDER_COVER_LETTER", "true")
+
+    class FakeWord:
+        sender = {'name': 'Dr. Kai Voges'}
+
+        def generate_from_template(self, text, job, docx_filename, language="english"):
+            p = tmp_path / "out" / "letter.docx"
+            p.write_text(text, encoding="utf-8")
+            return str(p)
+    monkeypatch.setattr(main, "WordCoverLetterGenerator", lambda: FakeWord())
+
+    reported = []
+    def progress_callback(progress=0, message='', **_):
+        reported.append(progress)
+        if progress == 60:
+            letter_started.set()
+
+    result = main.process_job_posting(
+        "https://www.stepstone.de/stellenangebote--Progress--6-inline.html",
+        skip_duplicate_check=True,
+        progress_callback=progress_callback,
+    )
+
+    assert result["trello_card"]["shortUrl"] == "https://trello.example/card"
+    assert 60 in reported and 20 not in reported
+    assert reported == sorted(reported)
+
+
+def test_checkpoints_allow_resume_without_repeating_stages(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "scrape_job_posting", lambda url: fake_scrape(url))
+
+    class FakeTrello:
+        def create_card_from_job_data(self, job_data):
+            return {"id": "card1", "shortUrl": "https://trello.example/card"}
+    monkeypatch.setattr(main, "TrelloConnect", lambda: FakeTrello())
+
+    class CrashingAI:
+        def generate_cover_letter(self, *_, **__):
+            raise KeyboardInterrupt  # Simulates the process dying mid-letter
+    monkeypatch.setattr(main, "CoverLetterGenerator", lambda: CrashingAI())
+
+    checkpoints = []
+    url = "https://www.stepstone.de/stellenangebote--Resume--5-inline.html"
+    with pytest.raises(KeyboardInterrupt):
+        main.process_job_posting(
+            url, create_trello_card=True, skip_duplicate_check=True,
+            checkpoint_callback=checkpoints.append,
+        )
+
+    last = checkpoints[-1]
+    assert "scrape" in last["completed_stages"]
+    assert last["card"]["id"] == "card1"
+    assert "cover_letter" not in last["completed_stages"]
+
+    # Resume: scraping and Trello must not run again
+    def no_call(*_, **__):
+        raise AssertionError("completed stage ran again")
+    monkeypatch.setattr(main, "scrape_job_posting", no_call)
+    monkeypatch.setattr(main, "TrelloConnect", no_call)
+
+    class FakeAI:
+        def generate_cover_letter(self, job_data, **__):
+            job_data["cover_letter_body"] = "Resumed body."
+            return "Resumed body."
+    monkeypatch.setattr(main, "CoverLetterGenerator", lambda: FakeAI())
+
+    class FakeWord:
+        sender = {'name': 'Dr. Kai Voges'}
+
+        def generate_from_template(self, text, job, docx_filename, language="english"):
+            p = tmp_path / "out" / "resumed.docx"
+            p.write_text(text, encoding="utf-8")
+            return str(p)
+    monkeypatch.setattr(main, "WordCoverLetterGenerator", lambda: FakeWord())
+
+    result = main.process_job_posting(
+        url, create_trello_card=True, target_language="en", skip_duplicate_check=True,
+        resume_from=last,
+    )
+
+    assert result["status"] == "success"
+    assert result["trello_card"]["id"] == "card1"
+    assert Path(result["cover_letter_docx_file"]).read_text(encoding="utf-8") == "Resumed body."
+
+
+def test_async_batch_overlaps_jobs_on_one_loop(monkeypatch, tmp_path):
+    import asyncio
+    from src.utils.aio import run_sync
+
+    async def fake_scrape_async(url):
+        await asyncio.sleep(0.05)
+        return fake_scrape(url)
+    monkeypatch.setattr(main, "scrape_job_posting_async", fake_scrape_async)
+
+    class FakeTrello:
+        def create_card_from_job_data(self, job_data):
+            return {"shortUrl": "https://trello.example/card"}
+    monkeypatch.setattr(main, "TrelloConnect", lambda: FakeTrello())
+
+    in_flight = {"now": 0, "max": 0}
+
+    class FakeAsyncAI:
+        def detect_language(self, *_):
+            return "english"
+
+        async def agenerate_cover_letter(self, job_data, **__):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.05)
+            in_flight["now"] -= 1
+            job_data["cover_letter_body"] = "Async body."
+            return "Async body."
+    monkeypatch.setattr(main, "CoverLetterGenerator", FakeAsyncAI)
+
+    class FakeWord:
+        sender = {'name': 'Dr. Kai Voges'}
+
+        def generate_from_template(self, text, job, docx_filename, language="english"):
+            p = tmp_path / "out" / Path(docx_filename).name
+            p.write_text(text, encoding="utf-8")
+            return str(p)
+    monkeypatch.setattr(main, "WordCoverLetterGenerator", lambda: FakeWord())
+
+    urls = [f"https://host{i}.example/job/{i}" for i in range(4)]
+    results = run_sync(main.process_urls_async(urls, concurrency=4, per_host_delay=0, skip_duplicate_check=True))
+
+    assert [r["url"] for r in results] == urls
+    assert all(r["status"] == "success" for r in results)
+    assert in_flight["max"] == 4  # All OpenAI calls in flight together on one loop
+    assert "stage.cover_letter" in results[0]["timings"]["breakdown"]
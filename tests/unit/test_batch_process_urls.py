@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+
+os.environ.setdefault("SKIP_ENV_VALIDATION", "1")
+
+from src import main
+
+
+def test_batch_runs_concurrently_and_keeps_input_order(monkeypatch):
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def fake_process(url, **kwargs):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        # Later URLs finish first to prove results are re-ordered
+        time.sleep(0.05 if url.endswith("/1") else 0.01)
+        with lock:
+            active["now"] -= 1
+        return {"status": "success", "job_data": {"company_name": url}, "trello_card": None}
+
+    monkeypatch.setattr(main, "process_job_posting", fake_process)
+    urls = [f"https://host{i}.example/{i}" for i in range(1, 5)]
+
+    results = main.batch_process_urls(urls, max_workers=4, per_host_delay=0)
+
+    assert [r["url"] for r in results] == urls
+    assert active["max"] > 1
+    for r in results:
+        assert r["timing"]["duration_seconds"] >= 0
+        assert "wait_seconds" in r["timing"]
+
+
+def test_batch_forwards_options_and_captures_exceptions(monkeypatch):
+    seen = []
+
+    def fake_process(url, **kwargs):
+        seen.append(kwargs)
+        if "boom" in url:
+            raise RuntimeError("boom")
+        return {"status": "success", "job_data": {}, "trello_card": None}
+
+    monkeypatch.setattr(main, "process_job_posting", fake_process)
+    monkeypatch.setattr(main, "report_error", lambda *a, **k: None)
+
+    results = main.batch_process_urls(
+        ["https://a.example/ok", "https://b.example/boom"],
+        max_workers=2, per_host_delay=0, generate_pdf=True,
+    )
+
+    assert results[0]["status"] == "success"
+    assert results[1]["status"] == "failed"
+    assert results[1]["error"] == "boom"
+    assert all(kw == {"generate_pdf": True} for kw in seen)
+
+
+def test_batch_jobs_are_checkpointed_and_resumed(monkeypatch, tmp_path):
+    from src.job_queue import JobQueue
+
+    queue = JobQueue(db_path=str(tmp_path / "queue.db"))
+    monkeypatch.setattr(main, "get_job_queue", lambda: queue)
+    monkeypatch.setattr(main, "report_error", lambda *a, **k: None)
+
+    # A job interrupted by the previous run, plus two new ones
+    queue.enqueue("cli_old", "https://a.example/old", {"generate_pdf": True})
+    queue.mark_running("cli_old")
+    queue.save_checkpoint("cli_old", {"completed_stages": ["scrape"], "job_data": {"company_name": "Old"}})
+    queue.enqueue("job_web", "https://a.example/web")  # Web jobs are resumed by app.py
+    jobs = main.resumable_jobs() + main.enqueue_jobs(["https://b.example/new", "https://c.example/boom"])
+    assert [job["job_id"] for job in jobs][0] == "cli_old"
+
+    seen = {}
+
+    def fake_process(url, checkpoint_callback=None, resume_from=None, **kwargs):
+        seen[url] = (resume_from, kwargs)
+        if "boom" in url:
+            raise RuntimeError("boom")
+        checkpoint_callback({"completed_stages": ["scrape", "trello"]})
+        return {"status": "success", "job_data": {}, "trello_card": None}
+
+    monkeypatch.setattr(main, "process_job_posting", fake_process)
+
+    results = main.batch_process_urls([job["url"] for job in jobs], max_workers=2, per_host_delay=0, jobs=jobs)
+
+    assert [r["status"] for r in results] == ["success", "success", "failed"]
+    assert seen["https://a.example/old"] == ({"completed_stages": ["scrape"], "job_data": {"company_name": "Old"}},
+                                             {"generate_pdf": True})
+    assert seen["https://b.example/new"] == (None, {})
+    states = {job["job_id"]: queue.get(job["job_id"]) for job in jobs}
+    assert [job["state"] for job in states.values()] == ["completed", "completed", "failed"]
+    assert states["cli_old"]["attempts"] == 2
+    assert states["cli_old"]["checkpoint"]["completed_stages"] == ["scrape", "trello"]
+    assert main.resumable_jobs() == []
+
+
+def test_async_jobs_record_final_state(monkeypatch, tmp_path):
+    from src.job_queue import JobQueue
+    from src.utils.aio import run_sync
+
+    queue = JobQueue(db_path=str(tmp_path / "queue.db"))
+    monkeypatch.setattr(main, "get_job_queue", lambda: queue)
+
+    async def fake_process(url, checkpoint_callback=None, resume_from=None, **kwargs):
+        checkpoint_callback({"completed_stages": ["scrape"]})
+        return {"status": "cover_letter_failed" if "short" in url else "failed", "error": "no data"}
+
+    monkeypatch.setattr(main, "process_job_posting_async", fake_process)
+    jobs = main.enqueue_jobs(["https://a.example/short", "https://b.example/gone"])
+
+    run_sync(main.process_urls_async([job["url"] for job in jobs], per_host_delay=0, jobs=jobs))
+
+    short, gone = (queue.get(job["job_id"]) for job in jobs)
+    assert (short["state"], gone["state"]) == ("completed", "failed")
+    assert short["checkpoint"] == {"completed_stages": ["scrape"]}
+    assert gone["error"] == "no data"
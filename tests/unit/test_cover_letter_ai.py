@@ -192,4 +192,65 @@ def test_get_system_prompt_language_variants():
     de_prompt = ai._get_system_prompt('german', 'senior')
     en_prompt = ai._get_system_prompt('english', 'junior')
     assert 'deutsche Bewerbungsanschreiben' in de_prompt
-    assert 'English cover letters' in en_prompt
\ No newline at end of file
+    assert 'English cover letters' in en_prompt
+
+def test_agenerate_cover_letter_uses_async_client_and_retries(monkeypatch):
+    import asyncio
+    from src import cover_letter as cover_letter_module
+
+    ai = CoverLetterGenerator()
+    ai.cv_en = "dummy cv text " * 50
+    ai.cv_de = "dummy cv text " * 50
+    body = " ".join(["word"] * 200)
+    calls = {"count": 0}
+    sleeps = []
+
+    class Message:
+        content = body
+
+    class Choice:
+        message = Message()
+
+    class Response:
+        choices = [Choice()]
+        usage = None
+
+    class DummyAsyncClient:
+        class chat:
+            class completions:
+                @staticmethod
+                async def create(**kwargs):
+                    calls["count"] += 1
+                    if calls["count"] == 1:
+                        raise cover_letter_module.RateLimitError.__new__(cover_letter_module.RateLimitError)
+                    return Response()
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(cover_letter_module.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(ai, "_get_async_client", lambda: DummyAsyncClient())
+    job_data = {'job_title': 'Engineer', 'job_description': 'We do things', 'company_name': 'Acme'}
+
+    result = asyncio.run(ai.agenerate_cover_letter(job_data, target_language='english'))
+
+    assert result == body
+    assert calls["count"] == 2
+    assert sleeps == [1.0]
+    assert job_data['cover_letter_body'] == body
+    assert job_data['cover_letter_salutation']
+
+
+def test_async_client_is_shared_per_event_loop():
+    import asyncio
+
+    first, second = CoverLetterGenerator(), CoverLetterGenerator()
+
+    async def clients():
+        return first._get_async_client(), second._get_async_client()
+
+    a, b = asyncio.run(clients())
+    c, _ = asyncio.run(clients())
+
+    assert a is b  # One client per loop, not one per generator/job
+    assert c is not a
@@ -551,3 +551,101 @@ class TestEdgeCases:
         
         assert is_duplicate is True
         assert method == 'semantic'
+
+
+class TestCachedResult:
+    """Tests for the duplicate fast path lookup"""
+    
+    def test_cached_result_unknown_url(self, temp_db):
+        """Test that an unprocessed URL has no cached result"""
+        assert temp_db.get_cached_result("https://www.stepstone.de/job-unknown") is None
+    
+    def test_cached_result_includes_latest_generation(self, temp_db):
+        """Test that the cached result joins the latest generation metadata"""
+        url = "https://www.stepstone.de/job-cached"
+        temp_db.save_processed_job(
+            source_url=url,
+            company_name='Cache GmbH',
+            job_title='Engineer',
+            trello_card_id='card1',
+            trello_card_url='https://trello.com/c/cache',
+            docx_file_path='output/cover_letters/cache.docx',
+            ai_model='gpt-4o-mini',
+            language='de',
+            cover_letter_text='Sehr geehrte Damen und Herren'
+        )
+        
+        cached = temp_db.get_cached_result(url)
+        
+        assert cached['company_name'] == 'Cache GmbH'
+        assert cached['trello_card_url'] == 'https://trello.com/c/cache'
+        assert cached['docx_file_path'] == 'output/cover_letters/cache.docx'
+        assert cached['cover_letter_text'] == 'Sehr geehrte Damen und Herren'
+        assert cached['language'] == 'de'
+    
+    def test_cached_result_without_generation(self, temp_db):
+        """Test that jobs without AI generation still return a cached result"""
+        url = "https://www.stepstone.de/job-no-letter"
+        temp_db.save_processed_job(source_url=url, company_name='NoLetter AG', job_title='Dev')
+        
+        cached = temp_db.get_cached_result(url)
+        
+        assert cached['company_name'] == 'NoLetter AG'
+        assert cached['cover_letter_text'] is None
+
+
+class TestJobTimings:
+    """Tests for stored per-job timing breakdowns"""
+    
+    def test_timing_stats_empty(self, temp_db):
+        """Test that no samples give no aggregates"""
+        assert temp_db.get_timing_stats() == {}
+    
+    def test_timing_stats_percentiles(self, temp_db):
+        """Test that p50/p95 are computed per span name across jobs"""
+        for i in range(1, 21):
+            temp_db.save_job_timings(
+                f"https://www.stepstone.de/job-timed-{i}",
+                'success',
+                {'total_ms': 1000.0 * i, 'breakdown': {'stage.scrape': 10.0 * i, 'openai.chat': 100.0}}
+            )
+        
+        stats = temp_db.get_timing_stats()
+        
+        assert set(stats) == {'job.total', 'stage.scrape', 'openai.chat'}
+        assert stats['stage.scrape']['count'] == 20
+        assert stats['stage.scrape']['p50_ms'] == 100.0
+        assert stats['stage.scrape']['p95_ms'] == 190.0
+        assert stats['job.total']['max_ms'] == 20000.0
+        assert stats['openai.chat']['mean_ms'] == 100.0
+    
+    def test_timing_stats_limit_uses_most_recent_samples(self, temp_db):
+        """Test that limit keeps only the newest samples per span"""
+        for duration in (5.0, 7.0, 9.0):
+            temp_db.save_job_timings("https://www.stepstone.de/job-limit", 'success',
+                                     {'total_ms': duration, 'breakdown': {}})
+        
+        stats = temp_db.get_timing_stats(limit=2)
+        
+        assert stats['job.total']['count'] == 2
+        assert stats['job.total']['max_ms'] == 9.0
+    
+    def test_timing_stats_period_and_per_span_limit(self, temp_db):
+        """Test that the period cutoff and limit apply per span name in SQL"""
+        temp_db.save_job_timings("https://www.stepstone.de/job-period", 'success',
+                                 {'total_ms': 50.0, 'breakdown': {'stage.scrape': 1.0}})
+        with temp_db._get_connection() as conn:
+            conn.execute("""
+                INSERT INTO job_timings (job_id, source_url, status, span_name, duration_ms, recorded_at)
+                VALUES ('job-old', 'https://www.stepstone.de/job-old', 'success', 'job.total', 999.0,
+                        datetime('now', '-30 days'))
+            """)
+        
+        weekly = temp_db.get_timing_stats(period='week', limit=1)
+        everything = temp_db.get_timing_stats(period='all')
+        
+        assert weekly['job.total'] == {'count': 1, 'p50_ms': 50.0, 'p95_ms': 50.0,
+                                       'mean_ms': 50.0, 'max_ms': 50.0}
+        assert weekly['stage.scrape']['count'] == 1
+        assert everything['job.total']['count'] == 2
+        assert everything['job.total']['max_ms'] == 999.0
@@ -5,7 +5,7 @@ import pytest
 import os
 from src.docx_generator import WordCoverLetterGenerator
 
-def test_template_replacement():
+def test_template_replacement(tmp_path):
     """Test template placeholder replacement"""
     generator = WordCoverLetterGenerator()
     
@@ -17,7 +17,7 @@ def test_template_replacement():
     }
     
     test_letter = "This is a test cover letter body text."
-    output_path = "output/cover_letters/test_template.docx"
+    output_path = str(tmp_path / "test_template.docx")
     
     # Generate document
     result_path = generator.generate_from_template(
@@ -92,3 +92,22 @@ def test_validate_all_env_env_file_missing():
         with pytest.raises(ValueError) as exc_info:
             validate_all_env()
         assert "Could not load environment file" in str(exc_info.value)
+
+def test_get_int_and_get_float():
+    """Test numeric getters fall back to the default on bad input"""
+    from src.utils.env import get_int, get_float
+    with mock.patch.dict(os.environ, {"INT_VAR": "7", "FLOAT_VAR": "2.5", "BAD_VAR": "abc"}):
+        assert get_int("INT_VAR", 1) == 7
+        assert get_int("BAD_VAR", 3) == 3
+        assert get_int("MISSING_VAR", 4) == 4
+        assert get_float("FLOAT_VAR", 1.0) == 2.5
+        assert get_float("BAD_VAR", 0.5) == 0.5
+
+
+def test_get_bool():
+    """Test boolean getter accepts common truthy strings"""
+    from src.utils.env import get_bool
+    with mock.patch.dict(os.environ, {"FLAG_ON": "True", "FLAG_OFF": "no"}):
+        assert get_bool("FLAG_ON") is True
+        assert get_bool("FLAG_OFF", default=True) is False
+        assert get_bool("MISSING_FLAG", default=True) is True
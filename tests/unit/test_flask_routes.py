@@ -1,6 +1,7 @@
 import os
 import json
 import io
+import time
 from unittest import mock
 
 import pytest
@@ -56,9 +57,228 @@ def test_process_and_status_flow(client, monkeypatch):
     s = client.get(f"/status/{job_id}")
     assert s.status_code == 200
     j = s.get_json()
-    assert j["status"] in {"processing", "complete"}
+    assert j["status"] in {"queued", "processing", "complete"}
 
 
 def test_download_invalid_file_returns_404(client):
     resp = client.get("/download/does_not_exist.txt")
     assert resp.status_code == 404
+
+
+def test_background_worker_scrapes_once(monkeypatch):
+    import main as main_module
+    from src import app as app_module
+
+    scrapes = []
+
+    def fake_scrape(url):
+        scrapes.append(url)
+        return {"job_title": "Engineer", "company_name": "ACME", "source_url": url}
+
+    captured = {}
+
+    def fake_process(url, **kwargs):
+        captured.update(kwargs)
+        return {"status": "failed", "error": "stop here"}
+
+    monkeypatch.setattr(main_module, "scrape_job_posting", fake_scrape)
+    monkeypatch.setattr(app_module, "process_job_posting", fake_process)
+
+    app_module.processing_status["job_once"] = {"status": "processing", "url": "https://x.example/1"}
+    app_module.process_in_background("job_once", "https://x.example/1")
+
+    assert scrapes == ["https://x.example/1"]
+    assert captured["job_data"]["company_name"] == "ACME"
+    app_module.processing_status.pop("job_once", None)
+
+
+def test_process_duplicate_fast_path_completes_immediately(client, monkeypatch):
+    from src import app as app_module
+
+    cached = {
+        "status": "duplicate",
+        "job_data": {"company_name": "RepeatCo", "job_title": "Engineer", "source_url": "https://x.example/dup"},
+        "trello_card": {"id": "c1", "shortUrl": "https://trello.example/repeat"},
+        "cover_letter_docx_file": "output/cover_letters/repeat.docx",
+        "cover_letter_pdf_file": None,
+        "is_duplicate": True,
+    }
+    monkeypatch.setattr(app_module, "get_cached_duplicate_result", lambda url: cached)
+
+    def no_worker(*args, **kwargs):
+        raise AssertionError("worker must not start for a cached duplicate")
+    monkeypatch.setattr(app_module, "process_in_background", no_worker)
+
+    resp = client.post("/process", json={
+        "url": "https://x.example/dup",
+        "create_trello_card": True,
+        "duplicate_fast_path": True,
+    })
+    body = resp.get_json()
+    assert body["duplicate"] is True
+
+    status = client.get(f"/status/{body['job_id']}").get_json()
+    assert status["status"] == "complete"
+    assert status["result"]["is_duplicate"] is True
+    assert status["result"]["trello_card"] == "https://trello.example/repeat"
+    assert status["result"]["files"]["docx"] == "output/cover_letters/repeat.docx"
+
+
+def test_resume_pending_jobs_restarts_with_checkpoint(monkeypatch, tmp_path):
+    from src import app as app_module
+    from src.job_queue import JobQueue
+
+    queue = JobQueue(db_path=str(tmp_path / "queue.db"))
+    queue.enqueue("job_resume", "https://x.example/r", {"create_trello_card": False, "generate_documents": True})
+    queue.mark_running("job_resume")
+    queue.save_checkpoint("job_resume", {"completed_stages": ["scrape"], "job_data": {"company_name": "ACME"}})
+    queue.enqueue("job_done", "https://x.example/d")
+    queue.complete("job_done", {"status": "complete", "message": "done", "progress": 100})
+    monkeypatch.setattr(app_module, "get_job_queue", lambda: queue)
+
+    calls = []
+    monkeypatch.setattr(app_module, "process_in_background", lambda *a, **k: calls.append((a, k)))
+
+    assert app_module.resume_pending_jobs() == 1
+    for _ in range(50):
+        if calls:
+            break
+        time.sleep(0.01)
+
+    args, kwargs = calls[0]
+    assert args[:4] == ("job_resume", "https://x.example/r", False, True)
+    assert kwargs["resume_from"]["completed_stages"] == ["scrape"]
+    assert app_module.processing_status["job_resume"]["company_name"] == "ACME"
+    app_module.processing_status.pop("job_resume", None)
+
+    # Finished jobs are still answerable after a restart
+    with app_module.app.test_client() as c:
+        assert c.get("/status/job_done").get_json()["message"] == "done"
+
+
+def test_retry_cover_letter_after_restart_updates_job_queue(monkeypatch, tmp_path):
+    import cover_letter
+    import docx_generator
+    from src import app as app_module
+    from src.job_queue import JobQueue
+
+    queue = JobQueue(db_path=str(tmp_path / "queue.db"))
+    queue.enqueue("job_retry", "https://x.example/c")
+    queue.complete("job_retry", {
+        "status": "cover_letter_failed", "message": "Cover letter failed: too short", "progress": 100,
+        "job_data": {"company_name": "ACME", "job_title": "Engineer", "job_description": "Build things."},
+        "result": {"company": "ACME", "trello_card": "https://trello.example/c", "files": {"docx": None}},
+    })
+    # Interrupted retries go back to cover_letter_failed instead of rerunning the job
+    queue.enqueue("job_interrupted", "https://x.example/i")
+    queue.complete("job_interrupted", {"status": "cover_letter_failed", "progress": 100, "job_data": {}})
+    queue.mark_running("job_interrupted")
+    monkeypatch.setattr(app_module, "get_job_queue", lambda: queue)
+
+    class InlinePool:
+        def submit(self, job_id, fn, *args, **kwargs):
+            fn(*args, **kwargs)
+            return 0
+    monkeypatch.setattr(app_module, "worker_pool", InlinePool())
+
+    class FakeAI:
+        def generate_cover_letter(self, job_data, **__):
+            return "Body."
+        def detect_language(self, *_):
+            return "english"
+    monkeypatch.setattr(cover_letter, "CoverLetterGenerator", FakeAI)
+
+    class FakeWord:
+        sender = {'name': 'Dr. Kai Voges'}
+
+        def generate_from_template(self, text, job, docx_filename, language="english"):
+            return str(tmp_path / "letter.docx")
+    monkeypatch.setattr(docx_generator, "WordCoverLetterGenerator", FakeWord)
+
+    assert app_module.resume_pending_jobs() == 0
+    assert app_module.processing_status.pop("job_interrupted")["status"] == "cover_letter_failed"
+    assert queue.get("job_interrupted")["state"] == "failed"
+
+    with app_module.app.test_client() as c:
+        assert c.post("/retry-cover-letter/job_retry").status_code == 200
+        app_module.processing_status.pop("job_retry")
+        status = c.get("/status/job_retry").get_json()
+
+    job = queue.get("job_retry")
+    assert job["state"] == "completed"
+    assert job["attempts"] == 1
+    assert status["status"] == "complete"
+    assert status["result"]["files"]["docx"] == str(tmp_path / "letter.docx")
+    assert status["result"]["trello_card"] == "https://trello.example/c"
+
+
+def test_process_reports_queue_position(client, monkeypatch):
+    from src import app as app_module
+    from src.utils.worker_pool import FairWorkerPool
+
+    pool = FairWorkerPool(max_workers=1)
+    monkeypatch.setattr(app_module, "worker_pool", pool)
+    monkeypatch.setattr(app_module, "_job_queue_update", lambda *a, **k: None)
+
+    import threading
+    gate = threading.Event()
+    monkeypatch.setattr(app_module, "process_in_background", lambda *a, **k: gate.wait(2))
+
+    payload = {"url": "https://x.example/q", "create_trello_card": True, "batch_id": "batch_1"}
+    first = client.post("/process", json=payload).get_json()
+    for _ in range(200):
+        if pool.stats()["running"] == 1:
+            break
+        time.sleep(0.01)
+    second = client.post("/process", json=payload).get_json()
+
+    status = client.get(f"/status/{second['job_id']}").get_json()
+    gate.set()
+
+    assert second["queue_position"] >= 1
+    assert status["status"] == "queued"
+    assert status["queue_position"] == 1
+    for job in (first, second):
+        app_module.processing_status.pop(job["job_id"], None)
+
+
+def test_events_stream_sends_snapshot_and_published_updates(client):
+    from src import app as app_module
+
+    app_module.processing_status["job_sse"] = {"status": "processing", "progress": 30, "message": "Scraping"}
+    resp = client.get("/events?job_id=job_sse", buffered=False)
+    assert resp.mimetype == "text/event-stream"
+    chunks = (chunk.decode() for chunk in resp.response)
+
+    assert next(chunks).startswith("retry:")
+    snapshot = next(chunks)
+    assert "event: job" in snapshot and '"progress": 30' in snapshot
+
+    app_module.processing_status["job_other"] = {"status": "processing", "progress": 1}
+    app_module._publish_job("job_other")  # filtered out
+    app_module.processing_status["job_sse"]["progress"] = 60
+    app_module._publish_job("job_sse")
+    update = next(chunks)
+    assert '"job_id": "job_sse"' in update and '"progress": 60' in update
+
+    resp.close()
+    for job_id in ("job_sse", "job_other"):
+        app_module.processing_status.pop(job_id, None)
+
+
+def test_http_metrics_endpoint_reports_recorded_requests(client):
+    from src import app as app_module
+
+    app_module.http_metrics.reset()
+    app_module.http_metrics.record("api.trello.com", "POST", 0.12, status=200, nbytes=512)
+    app_module.http_metrics.record("api.trello.com", "PUT", 0.3, status=503, attempts=3)
+
+    data = client.get("/api/http-metrics").get_json()
+    trello = data["hosts"]["api.trello.com"]
+    assert trello["requests"] == 2
+    assert trello["errors"] == 1
+    assert trello["retries"] == 2
+    assert trello["latency_ms"]["max"] == 300.0
+    assert data["totals"]["bytes"] == 512
+    assert set(data["connections"]) == {"dns", "tls"}
+    app_module.http_metrics.reset()
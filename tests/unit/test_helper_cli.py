@@ -35,7 +35,7 @@ def test_inspect_html_happy_path(tmp_path, capsys):
     assert "JSON-LD" in out
 
 
-@mock.patch("requests.get")
+@mock.patch("requests.Session.get")
 def test_trello_auth_missing_credentials(mock_get, capsys):
     # Simulate empty env loader
     with mock.patch("src.utils.env.load_env"):
@@ -47,7 +47,7 @@ def test_trello_auth_missing_credentials(mock_get, capsys):
             mock_get.assert_not_called()
 
 
-@mock.patch("requests.get")
+@mock.patch("requests.Session.get")
 def test_trello_auth_success(mock_get, capsys):
     class Resp:
         status_code = 200
@@ -62,7 +62,7 @@ def test_trello_auth_success(mock_get, capsys):
             assert "Success" in out
 
 
-@mock.patch("requests.get")
+@mock.patch("requests.Session.get")
 def test_trello_inspect_missing_board(mock_get, capsys):
     with mock.patch("src.utils.env.load_env"):
         with mock.patch("src.utils.trello.get_auth_params", return_value={"key": "k", "token": "t"}):
@@ -74,7 +74,7 @@ def test_trello_inspect_missing_board(mock_get, capsys):
                 mock_get.assert_not_called()
 
 
-@mock.patch("requests.get")
+@mock.patch("requests.Session.get")
 def test_trello_inspect_happy_path(mock_get, capsys):
     # Prepare responses for board, lists, labels
     class Resp:
@@ -0,0 +1,67 @@
+import pytest
+
+from src.job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(db_path=str(tmp_path / "queue.db"))
+
+
+def test_enqueue_and_get(queue):
+    queue.enqueue("job_1", "https://x.example/1", {"generate_pdf": True})
+
+    job = queue.get("job_1")
+
+    assert job["state"] == "pending"
+    assert job["attempts"] == 0
+    assert job["options"] == {"generate_pdf": True}
+    assert job["checkpoint"] is None
+    assert queue.get("missing") is None
+
+
+def test_running_checkpoint_and_resumable(queue):
+    queue.enqueue("job_1", "https://x.example/1")
+    queue.enqueue("job_2", "https://x.example/2")
+    queue.enqueue("job_3", "https://x.example/3")
+
+    queue.mark_running("job_1")
+    queue.save_checkpoint("job_1", {"completed_stages": ["scrape"], "job_data": {"company_name": "ACME"}})
+    queue.complete("job_2", {"status": "complete"})
+    queue.cancel("job_3")
+
+    resumable = queue.get_resumable()
+
+    assert [job["job_id"] for job in resumable] == ["job_1"]
+    assert resumable[0]["state"] == "running"
+    assert resumable[0]["attempts"] == 1
+    assert resumable[0]["checkpoint"]["job_data"]["company_name"] == "ACME"
+    assert queue.get("job_2")["result"] == {"status": "complete"}
+    assert queue.count_by_state() == {"running": 1, "completed": 1, "cancelled": 1}
+
+
+def test_resumable_filters_by_prefix(queue):
+    queue.enqueue("job_1", "https://x.example/1")
+    queue.enqueue("cli_1", "https://x.example/2")
+
+    assert [job["job_id"] for job in queue.get_resumable(prefix="cli_")] == ["cli_1"]
+    assert [job["job_id"] for job in queue.get_resumable(prefix="job_")] == ["job_1"]
+    assert len(queue.get_resumable()) == 2
+
+
+def test_fail_records_error(queue):
+    queue.enqueue("job_1", "https://x.example/1")
+    queue.fail("job_1", "boom", {"status": "error"})
+
+    job = queue.get("job_1")
+
+    assert job["state"] == "failed"
+    assert job["error"] == "boom"
+    assert job["result"] == {"status": "error"}
+
+
+def test_schema_survives_reopen(tmp_path):
+    path = str(tmp_path / "queue.db")
+    JobQueue(db_path=path).enqueue("job_1", "https://x.example/1")
+
+    assert JobQueue(db_path=path).get("job_1")["url"] == "https://x.example/1"
@@ -0,0 +1,195 @@
+import os
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("SKIP_ENV_VALIDATION", "1")
+
+from src.pipeline import JobPipeline, PipelineStage
+from src import main
+
+
+def _sleep_stage(name, seconds, log=None):
+    def handler(item):
+        time.sleep(seconds)
+        item.setdefault("visited", []).append(name)
+        if log is not None:
+            log.append((name, item["id"]))
+    return handler
+
+
+def test_pipeline_keeps_input_order_and_runs_all_stages():
+    pipeline = JobPipeline([
+        PipelineStage("a", _sleep_stage("a", 0.001), workers=3),
+        PipelineStage("b", _sleep_stage("b", 0.001), workers=2),
+    ])
+    items = [{"id": i} for i in range(20)]
+
+    finished = pipeline.run(items)
+
+    assert [item["id"] for item in finished] == list(range(20))
+    assert all(item["visited"] == ["a", "b"] for item in finished)
+    stats = {s["name"]: s for s in pipeline.stats()}
+    assert stats["a"]["processed"] == 20
+    assert stats["b"]["processed"] == 20
+
+
+def test_pipeline_throughput_bounded_by_slowest_stage():
+    delay = 0.02
+    stages = [PipelineStage(name, _sleep_stage(name, delay), workers=1) for name in ("s1", "s2", "s3")]
+    items = [{"id": i} for i in range(15)]
+
+    started = time.monotonic()
+    JobPipeline(stages).run(items)
+    elapsed = time.monotonic() - started
+
+    # Sequential would take 15 * 3 * delay = 0.9s; pipelined ~ (15 + 2) * delay
+    assert elapsed < 0.6
+
+
+def test_pipeline_backpressure_bounds_queue_depth():
+    release = threading.Event()
+
+    def slow(item):
+        release.wait(1)
+
+    fast = PipelineStage("fast", lambda item: None, workers=2, queue_size=2)
+    slow_stage = PipelineStage("slow", slow, workers=1, queue_size=2)
+    pipeline = JobPipeline([fast, slow_stage])
+
+    timer = threading.Timer(0.1, release.set)
+    timer.start()
+    pipeline.run([{"id": i} for i in range(10)])
+    timer.join()
+
+    assert fast.max_queue_depth <= 2
+    assert slow_stage.max_queue_depth <= 2
+
+
+def test_pipeline_failure_marks_result_and_skips_later_stages():
+    def explode(item):
+        if item["id"] == 1:
+            raise RuntimeError("boom")
+
+    later = []
+    pipeline = JobPipeline([
+        PipelineStage("first", explode, workers=2),
+        PipelineStage("second", lambda item: later.append(item["id"]), workers=1),
+    ])
+
+    finished = pipeline.run([{"id": i} for i in range(3)])
+
+    assert finished[1]["result"] == {"status": "failed", "step": "first", "error": "boom"}
+    assert sorted(later) == [0, 2]
+    assert pipeline.stats()[0]["failed"] == 1
+
+
+# The worker re-raises the SystemExit after aborting the pipeline
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_pipeline_base_exception_in_worker_aborts_run_instead_of_hanging():
+    def exit_on_second(item):
+        if item["id"] == 1:
+            raise SystemExit(3)
+
+    pipeline = JobPipeline([
+        PipelineStage("first", exit_on_second, workers=1, queue_size=1),
+        PipelineStage("second", lambda item: None, workers=1),
+    ])
+    items = [{"id": i} for i in range(5)]
+    raised = []
+
+    def run():
+        try:
+            pipeline.run(items)
+        except BaseException as e:
+            raised.append(e)
+
+    runner = threading.Thread(target=run, daemon=True)
+    runner.start()
+    runner.join(5)
+    for thread in threading.enumerate():
+        if thread.name == "pipeline-first-0":
+            thread.join(5)
+
+    assert not runner.is_alive()
+    assert isinstance(raised[0], SystemExit) and raised[0].code == 3
+    assert items[1]["result"] == {"status": "failed", "step": "first", "error": "SystemExit(3)"}
+
+def test_pipeline_process_urls_uses_job_stages(monkeypatch):
+    def scrape(ctx):
+        if "bad" in ctx["url"]:
+            ctx["result"] = {"status": "failed", "step": "scraping", "error": "Scraper returned no data"}
+            return
+        ctx["job_data"] = {"company_name": ctx["url"]}
+
+    def persist(ctx):
+        ctx["result"] = {"status": "success", "job_data": ctx["job_data"], "pdf": ctx["generate_pdf"]}
+
+    monkeypatch.setattr(main, "_stage_scrape", scrape)
+    monkeypatch.setattr(main, "JOB_STAGES", [("scrape", scrape), ("persist", persist)])
+
+    results = main.pipeline_process_urls(
+        ["https://a.example/1", "https://b.example/bad", "https://c.example/3"],
+        per_host_delay=0, generate_pdf=True,
+    )
+
+    assert [r["status"] for r in results] == ["success", "failed", "success"]
+    assert results[0]["url"] == "https://a.example/1"
+    assert results[0]["pdf"] is True
+    assert results[1]["step"] == "scraping"
+
+
+def test_pipeline_process_urls_resumes_queued_jobs(monkeypatch, tmp_path):
+    from src.job_queue import JobQueue
+
+    queue = JobQueue(db_path=str(tmp_path / "queue.db"))
+    monkeypatch.setattr(main, "get_job_queue", lambda: queue)
+    ran = []
+
+    def scrape(ctx):
+        ran.append(("scrape", ctx["url"]))
+        ctx["job_data"] = {"company_name": ctx["url"]}
+
+    def persist(ctx):
+        ran.append(("persist", ctx["url"]))
+        ctx["result"] = {"status": "success", "job_data": ctx["job_data"]}
+
+    monkeypatch.setattr(main, "_stage_scrape", scrape)
+    monkeypatch.setattr(main, "JOB_STAGES", [("scrape", scrape), ("persist", persist)])
+
+    queue.enqueue("cli_old", "https://a.example/old")
+    queue.save_checkpoint("cli_old", {"completed_stages": ["scrape"], "job_data": {"company_name": "Saved"}})
+    jobs = main.resumable_jobs() + main.enqueue_jobs(["https://b.example/new"])
+
+    results = main.pipeline_process_urls([job["url"] for job in jobs], per_host_delay=0, jobs=jobs)
+
+    assert [r["job_data"]["company_name"] for r in results] == ["Saved", "https://b.example/new"]
+    assert ("scrape", "https://a.example/old") not in ran
+    new = queue.get(jobs[1]["job_id"])
+    assert new["state"] == "completed"
+    assert new["checkpoint"]["completed_stages"] == ["scrape"]
+    assert queue.get("cli_old")["state"] == "completed"
+
+
+def test_pipeline_process_urls_marks_jobs_running_when_first_stage_starts(monkeypatch, tmp_path):
+    from src.job_queue import JobQueue
+
+    queue = JobQueue(db_path=str(tmp_path / "queue.db"))
+    monkeypatch.setattr(main, "get_job_queue", lambda: queue)
+    seen = {}
+
+    def scrape(ctx):
+        seen[ctx["url"]] = {job["url"]: queue.get(job["job_id"])["state"] for job in jobs}
+        ctx["result"] = {"status": "success"}
+
+    monkeypatch.setattr(main, "_stage_scrape", scrape)
+    monkeypatch.setattr(main, "JOB_STAGES", [("scrape", scrape)])
+    jobs = main.enqueue_jobs(["https://a.example/1", "https://b.example/2"])
+
+    main.pipeline_process_urls([job["url"] for job in jobs], workers={"scrape": 1},
+                               per_host_delay=0, jobs=jobs)
+
+    assert seen["https://a.example/1"] == {"https://a.example/1": "running", "https://b.example/2": "pending"}
+    assert seen["https://b.example/2"]["https://b.example/2"] == "running"
+    assert all(queue.get(job["job_id"])["attempts"] == 1 for job in jobs)
@@ -0,0 +1,107 @@
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.scraper import BaseJobScraper, StepstoneScraper
+from src.scraper_registry import ScraperRegistry, registry
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.mark.parametrize("url, source", [
+    ("https://www.stepstone.de/stellenangebote--Data-Engineer--12345-inline.html", "stepstone"),
+    ("https://stepstone.at/stellenangebote--X--1-inline.html", "stepstone"),
+    ("www.stepstone.de/stellenangebote--X--1-inline.html", "stepstone"),
+    ("https://www.linkedin.com/jobs/view/4012345678/", "linkedin"),
+    ("https://de.linkedin.com/jobs/collections/recommended/?currentJobId=4012345678", "linkedin"),
+    ("https://www.linkedin.com/company/acme/", None),  # not a job page
+    ("https://notstepstone.example.com/jobs/1", None),
+    ("https://example.com/?ref=stepstone", None),
+])
+def test_builtin_sources(url, source):
+    assert registry.source(url) == source
+
+
+def test_for_url_returns_a_new_scraper_instance():
+    url = "https://www.stepstone.de/stellenangebote--Data-Engineer--12345-inline.html"
+    scraper = registry.for_url(url)
+    assert isinstance(scraper, StepstoneScraper)
+    assert registry.for_url(url) is not scraper
+    assert registry.for_url("https://example.com/job/1") is None
+
+
+def test_register_loads_target_on_first_use():
+    class IndeedScraper(BaseJobScraper):
+        async def scrape(self, url):
+            return None
+
+    reg = ScraperRegistry()
+    lazy = reg.register("stepstone", "scraper:StepstoneScraper", r"stepstone\.de$")
+    reg.register("indeed", IndeedScraper, r"(?:^|\.)indeed\.com$", r"^/viewjob")
+    assert reg.names == ["stepstone", "indeed"]
+    assert not lazy.loaded
+
+    assert isinstance(reg.for_url("https://de.indeed.com/viewjob?jk=abc"), IndeedScraper)
+    assert reg.source("https://de.indeed.com/companies") is None
+    assert not lazy.loaded
+    assert isinstance(reg.for_url("https://www.stepstone.de/x"), StepstoneScraper)
+    assert lazy.loaded
+
+    reg.register("broken", "scraper:save_to_json", r"broken\.example$")
+    with pytest.raises(TypeError):
+        reg.for_url("https://broken.example/job")
+
+
+def test_slow_scraper_import_does_not_block_other_lookups(monkeypatch):
+    import src.scraper_registry as scraper_registry
+
+    started, release = threading.Event(), threading.Event()
+    real_import = scraper_registry._import
+
+    def slow_import(module):
+        if module == "slow_board":
+            started.set()
+            release.wait(5)
+            return real_import("scraper")
+        return real_import(module)
+
+    monkeypatch.setattr(scraper_registry, "_import", slow_import)
+    reg = ScraperRegistry()
+    reg.register("slow", "slow_board:StepstoneScraper", r"slow\.example$")
+    reg.register("stepstone", StepstoneScraper, r"stepstone\.de$")
+    loaded = []
+    loader = threading.Thread(target=lambda: loaded.append(reg.for_url("https://slow.example/job")))
+    loader.start()
+    assert started.wait(5)
+
+    def other_lookups():
+        found.append(reg.for_url("https://www.stepstone.de/x"))
+        reg.register("other", StepstoneScraper, r"other\.example$")
+        found.append(reg.source("https://other.example/job"))
+
+    found = []
+    lookups = threading.Thread(target=other_lookups)
+    lookups.start()
+    lookups.join(1)
+    blocked = lookups.is_alive()
+    release.set()
+    loader.join(5)
+    lookups.join(5)
+
+    assert not blocked
+    assert isinstance(found[0], StepstoneScraper) and found[1] == "other"
+    assert isinstance(loaded[0], StepstoneScraper)
+
+def test_stepstone_dispatch_does_not_import_linkedin_or_playwright():
+    code = (
+        "import sys\n"
+        "from src.scraper_registry import registry\n"
+        "registry.for_url('https://www.stepstone.de/stellenangebote--X--1-inline.html')\n"
+        "assert 'src.scraper' in sys.modules\n"
+        "print('src.linkedin_scraper' in sys.modules, 'playwright' in sys.modules)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "False"]
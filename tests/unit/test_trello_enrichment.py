@@ -160,3 +160,14 @@ def test_enrich_job_data_is_non_destructive():
     # Enriched should have new fields
     assert 'seniority' in enriched
     assert 'language' in enriched or enriched.get('job_description') is None
+
+
+def test_enrich_job_data_cleans_job_title():
+    """Test that job_title_clean is filled from job_title when missing"""
+    tc = TrelloConnect()
+    
+    enriched = tc._enrich_job_data({'job_title': 'Data Engineer (m/w/d)', 'job_title_clean': None})
+    assert enriched['job_title_clean'] == 'Data Engineer'
+    
+    enriched = tc._enrich_job_data({'job_title': 'Data Engineer (m/w/d)', 'job_title_clean': 'Engineer'})
+    assert enriched['job_title_clean'] == 'Engineer'
@@ -0,0 +1,73 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from src.utils.aio import gather_limited, get_loop, run_sync
+
+
+def test_run_sync_reuses_one_loop():
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    assert run_sync(current_loop()) is run_sync(current_loop()) is get_loop()
+
+
+def test_run_sync_propagates_context_and_errors():
+    var = contextvars.ContextVar("var", default=None)
+    var.set("job-1")
+
+    async def read():
+        return var.get()
+
+    async def fail():
+        raise ValueError("boom")
+
+    assert run_sync(read()) == "job-1"
+    with pytest.raises(ValueError):
+        run_sync(fail())
+
+
+def test_run_sync_from_many_threads():
+    async def work(i):
+        await asyncio.sleep(0.05)
+        return i
+
+    results = []
+    threads = [threading.Thread(target=lambda i=i: results.append(run_sync(work(i)))) for i in range(5)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(results) == list(range(5))
+    assert time.monotonic() - started < 0.25  # Overlapped on the shared loop
+
+
+def test_run_sync_inside_loop_is_rejected():
+    async def nested():
+        async def inner():
+            return 1
+        return run_sync(inner())
+
+    with pytest.raises(RuntimeError):
+        run_sync(nested())
+
+
+def test_gather_limited_bounds_concurrency_and_keeps_order():
+    active = {"now": 0, "max": 0}
+
+    async def work(i):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return i
+
+    results = asyncio.run(gather_limited(3, [work(i) for i in range(10)]))
+
+    assert results == list(range(10))
+    assert active["max"] == 3
@@ -0,0 +1,71 @@
+from src.utils import circuit_breaker as cb
+from src.utils.circuit_breaker import BreakerRegistry, CircuitBreaker
+
+
+def test_opens_after_threshold_and_fails_fast():
+    breaker = CircuitBreaker("api.trello.com", failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.record_failure(0.1)
+        assert breaker.allow()
+    breaker.record_failure(0.1)
+    assert breaker.state == cb.OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("stepstone.de", failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == cb.CLOSED
+
+
+def test_half_open_allows_single_probe_then_closes(monkeypatch):
+    now = {"t": 1000.0}
+    monkeypatch.setattr(cb.time, "monotonic", lambda: now["t"])
+    breaker = CircuitBreaker("stepstone.de", failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now["t"] += 13  # past the (at most +20% jittered) open period
+    assert breaker.allow()
+    assert breaker.state == cb.HALF_OPEN
+    assert not breaker.allow()  # probe already in flight
+    breaker.record_success(0.2)
+    assert breaker.state == cb.CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_for_longer_and_respects_retry_after(monkeypatch):
+    now = {"t": 1000.0}
+    monkeypatch.setattr(cb.time, "monotonic", lambda: now["t"])
+    breaker = CircuitBreaker("linkedin.com", failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    now["t"] += 13
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == cb.OPEN
+    assert 16 <= breaker.open_until - now["t"] <= 24  # second open period: 20s +/- 20%
+
+    breaker.record_failure(retry_after=120)
+    assert breaker.open_until - now["t"] >= 120
+
+
+def test_retry_delay_is_jittered_and_scaled_by_latency():
+    breaker = CircuitBreaker("api.trello.com")
+    delays = [breaker.retry_delay(2, 0.5) for _ in range(50)]
+    assert all(0.5 <= d <= 1.0 for d in delays)
+    assert len(set(delays)) > 1
+
+    breaker.record_success(4.0)
+    assert all(2.0 <= breaker.retry_delay(1, 0.5) <= 4.0 for _ in range(20))
+
+
+def test_registry_keys_breakers_by_host():
+    registry = BreakerRegistry(failure_threshold=1, reset_timeout=30)
+    registry.get("https://www.stepstone.de/a").record_failure()
+    assert registry.get("https://stepstone.de/b").state == cb.OPEN
+    assert registry.get("https://api.trello.com/1").state == cb.CLOSED
+    assert registry.any_open()
+    assert set(registry.stats()) == {"stepstone.de", "api.trello.com"}
@@ -0,0 +1,190 @@
+import asyncio
+import shutil
+import socket
+import ssl
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import requests
+
+from src.utils import connection_cache
+from src.utils.connection_cache import CachingHTTPAdapter, DNSCache, TLSSessionCache
+
+
+class CloseHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.0"  # every request needs a new connection
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(httpd):
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd.server_address[1]
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Resolve the fake host ``jobs.test`` to 127.0.0.1 and count lookups."""
+    calls = []
+    real = socket.getaddrinfo
+
+    def fake(host, *args, **kwargs):
+        if host == "jobs.test":
+            calls.append(host)
+            host = "127.0.0.1"
+        return real(host, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake)
+    monkeypatch.setattr(connection_cache, "dns_cache", DNSCache(ttl=60))
+    monkeypatch.setattr(connection_cache, "tls_sessions", TLSSessionCache())
+    return calls
+
+
+def test_dns_cache_hits_expiry_and_invalidate(lookups, monkeypatch):
+    cache = DNSCache(ttl=60)
+    assert cache.resolve("jobs.test") == ["127.0.0.1"]
+    assert cache.resolve("jobs.test") == ["127.0.0.1"]
+    assert len(lookups) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    cache.invalidate("jobs.test")
+    cache.resolve("jobs.test")
+    assert len(lookups) == 2
+
+    assert cache.resolve("127.0.0.1") is None
+    assert cache.resolve("localhost") is None
+    assert DNSCache(ttl=0).resolve("jobs.test") is None
+
+
+def test_tls_sessions_are_only_offered_to_their_context():
+    cache = TLSSessionCache()
+    context, other = object(), object()
+
+    class FakeSocket:
+        session = "session-1"
+
+    cache.save("api.trello.com", 443, context, FakeSocket())
+    assert cache.get("api.trello.com", 443, context) == "session-1"
+    assert cache.get("api.trello.com", 443, other) is None
+    assert cache.get("api.trello.com", 8443, context) is None
+
+    cache.record_handshake(0.040, resumed=False)
+    cache.record_handshake(0.010, resumed=True)
+    assert cache.stats()["saved_ms"] == 30.0
+
+
+def test_requests_adapter_reuses_dns_answers(lookups):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), CloseHandler)
+    port = _serve(httpd)
+    session = requests.Session()
+    session.mount("http://", CachingHTTPAdapter())
+    try:
+        for _ in range(3):
+            assert session.get(f"http://jobs.test:{port}/", timeout=5).text == "ok"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    assert len(lookups) == 1
+    assert connection_cache.dns_cache.stats()["hits"] == 2
+
+
+def test_async_httpx_transport_reuses_dns_answers(lookups):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), CloseHandler)
+    port = _serve(httpd)
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=connection_cache.httpx_async_transport()) as client:
+            for _ in range(3):
+                assert (await client.get(f"http://jobs.test:{port}/")).text == "ok"
+
+    try:
+        asyncio.run(fetch())
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    assert len(lookups) == 1
+
+
+@pytest.mark.skipif(shutil.which("openssl") is None, reason="needs openssl to create a test certificate")
+def test_tls_sessions_are_resumed_across_connections(lookups, tmp_path):
+    cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", str(key), "-out", str(cert),
+         "-days", "1", "-subj", "/CN=jobs.test", "-addext", "subjectAltName=DNS:jobs.test"],
+        check=True, capture_output=True,
+    )
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), CloseHandler)
+    server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    server_context.load_cert_chain(cert, key)
+    httpd.socket = server_context.wrap_socket(httpd.socket, server_side=True)
+    port = _serve(httpd)
+
+    session = requests.Session()
+    session.trust_env = False
+    session.mount("https://", CachingHTTPAdapter())
+    try:
+        for _ in range(3):
+            assert session.get(f"https://jobs.test:{port}/", verify=str(cert), timeout=5).text == "ok"
+        with httpx.Client(transport=connection_cache.httpx_transport(verify=ssl.create_default_context(cafile=cert))) as client:
+            for _ in range(3):
+                assert client.get(f"https://jobs.test:{port}/").text == "ok"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    stats = connection_cache.tls_sessions.stats()
+    assert stats["handshakes"] == 6
+    assert stats["resumed"] == 4  # first connection of each client is a full handshake
+
+
+def test_private_transport_hooks_are_still_available():
+    # Fails loudly when a urllib3/httpcore release moves the internals we patch
+    # (the code itself silently falls back to the stock transports)
+    assert connection_cache.urllib3_hooks_available()
+    assert CachingHTTPAdapter().poolmanager.pool_classes_by_scheme["https"] is connection_cache._CachingHTTPSConnectionPool
+    assert isinstance(connection_cache.httpx_transport()._pool._network_backend, connection_cache.CachingBackend)
+    assert isinstance(connection_cache.httpx_async_transport()._pool._network_backend,
+                      connection_cache.AsyncCachingBackend)
+
+
+def test_falls_back_to_stock_transports_without_hooks(lookups, monkeypatch):
+    monkeypatch.setattr(connection_cache, "_URLLIB3_HOOKS", False)
+    monkeypatch.setattr(connection_cache, "httpcore_hooks_available", lambda transport: False)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), CloseHandler)
+    port = _serve(httpd)
+    session = requests.Session()
+    session.mount("http://", CachingHTTPAdapter())
+    transport = connection_cache.httpx_transport()
+    try:
+        assert session.get(f"http://jobs.test:{port}/", timeout=5).text == "ok"
+        with httpx.Client(transport=transport) as client:
+            assert client.get(f"http://jobs.test:{port}/").text == "ok"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    assert session.get_adapter("http://x").poolmanager.pool_classes_by_scheme["http"] is not \
+        connection_cache._CachingHTTPConnectionPool
+    assert not isinstance(transport._pool._network_backend, connection_cache.CachingBackend)
+    assert connection_cache.dns_cache.stats()["hits"] == 0
+
+
+def test_verifying_pools_share_one_ssl_context():
+    adapter = CachingHTTPAdapter()
+    request = requests.Request("GET", "https://api.trello.com/1/boards").prepare()
+    _, first = adapter.build_connection_pool_key_attributes(request, True)
+    _, second = adapter.build_connection_pool_key_attributes(request, True)
+    _, unverified = adapter.build_connection_pool_key_attributes(request, False)
+
+    assert first["ssl_context"] is second["ssl_context"]
+    assert first["ssl_context"].verify_mode == ssl.CERT_REQUIRED
+    assert "ssl_context" not in unverified
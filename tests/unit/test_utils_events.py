@@ -0,0 +1,63 @@
+import json
+import threading
+
+from src.utils.events import EventBroker, format_sse
+
+
+def test_publish_fans_out_to_all_subscribers():
+    broker = EventBroker()
+    first, second = broker.subscribe(), broker.subscribe()
+
+    broker.publish("job", {"job_id": "a", "progress": 10})
+
+    for sub in (first, second):
+        event = sub.get(timeout=1)
+        assert event["event"] == "job"
+        assert event["data"]["progress"] == 10
+    assert broker.subscriber_count == 2
+
+
+def test_closed_subscription_stops_receiving():
+    broker = EventBroker()
+    sub = broker.subscribe()
+    sub.close()
+
+    broker.publish("files", {})
+
+    assert broker.subscriber_count == 0
+    assert sub.get(timeout=0.01) is None
+
+
+def test_slow_subscriber_drops_oldest_events():
+    broker = EventBroker(queue_size=3)
+    sub = broker.subscribe()
+
+    for i in range(10):
+        broker.publish("job", {"n": i})
+
+    received = [sub.get(timeout=0.1)["data"]["n"] for _ in range(3)]
+    assert received == [7, 8, 9]
+    assert sub.get(timeout=0.01) is None
+
+
+def test_publish_from_many_threads_keeps_unique_ids():
+    broker = EventBroker(queue_size=1000)
+    sub = broker.subscribe()
+    threads = [threading.Thread(target=lambda: [broker.publish("job", {}) for _ in range(50)]) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    ids = [sub.get(timeout=0.1)["id"] for _ in range(200)]
+    assert len(set(ids)) == 200
+
+
+def test_format_sse_wire_format():
+    text = format_sse({"id": 5, "event": "job", "data": {"message": "Größe"}})
+
+    lines = text.split("\n")
+    assert lines[0] == "id: 5"
+    assert lines[1] == "event: job"
+    assert json.loads(lines[2][len("data: "):]) == {"message": "Größe"}
+    assert text.endswith("\n\n")
@@ -0,0 +1,155 @@
+import json
+import re
+
+from bs4 import BeautifulSoup
+
+from src.linkedin_scraper import LinkedInScraper
+from src.scraper import StepstoneScraper
+from src.utils.html_scan import HtmlScan, SoupPage, SubtreeFilter, class_pattern, fragment_text, job_posting
+from src.utils.timing import JobTimer, use_timer
+
+DESCRIPTION = (
+    "<p>Wir suchen <b>Sie</b> &amp; Ihr Team.</p><ul><li>Python</li><li> SQL </li></ul>"
+    "<!-- intern --><p>Referenznummer: ABC-123</p><script>track()</script>"
+    "<p>Kontakt: jobs@acme.de, Tel. +49 30 1234567</p>"
+)
+POSTING = {
+    "@type": "JobPosting",
+    "title": "Data Engineer (m/w/d)",
+    "description": DESCRIPTION,
+    "hiringOrganization": {"name": "Acme GmbH", "url": "https://acme.de"},
+    "jobLocation": {"address": {"streetAddress": "Hauptstr. 1", "postalCode": "10115", "addressLocality": "Berlin"}},
+    "datePosted": "2026-01-15",
+}
+PAGE = (
+    '<!DOCTYPE html><html><head><title>Job &ndash; Acme</title><style>.x{}</style>'
+    '<script type="application/ld+json">{"@type": "BreadcrumbList"}</script>'
+    '<script type="application/ld+json">' + json.dumps(POSTING).replace("</", "<\\/") + '</script>'
+    '<script type="application/ld+json">not json</script>'
+    # Markup inside scripts must not count
+    '<script>var tpl = \'<span data-at="metadata-work-type">fake</span><a href="https://evil">Jetzt bewerben</a>\';</script>'
+    '</head><body><!-- <a href="https://comment">bewerben</a> -->'
+    '<DIV data-at="metadata-work-type"><div>Homeoffice</div> möglich, <div>Hybrid</div></DIV>'
+    '<span data-at=metadata-location>Berlin</span>'
+    '<a href="https://www.stepstone.de/jobs">Alle Jobs</a><p>Jetzt bewerben lohnt sich</p>'
+    '<button type="button"><span>Jetzt bewerben</span></button>'
+    '<a class="apply" href="https://acme.de/apply"><span>Jetzt bewerben</span></a>'
+    '<template><p>hidden@acme.de</p></template>'
+    '<footer>Fragen? support&#64;stepstone.de</footer></body></html>'
+)
+APPLY = re.compile("jetzt bewerben|apply now|bewerben", re.I)
+
+
+def _pages():
+    return HtmlScan(PAGE.encode("utf-8")), SoupPage(BeautifulSoup(PAGE, "lxml"))
+
+
+def test_scan_matches_full_dom_without_parsing_the_page():
+    scan, soup = _pages()
+
+    assert job_posting(scan.json_ld_blocks()) == job_posting(soup.json_ld_blocks()) == POSTING
+    for name in ("metadata-work-type", "metadata-location", "header-job-title"):
+        expected = soup.find_data_at(name)
+        found = scan.find_data_at(name)
+        assert (found and found.get_text(strip=True)) == (expected and expected.get_text(strip=True))
+    assert [(t.name, t.get("href")) for t in scan.find_tags(["a", "button"], APPLY)] == \
+        [(t.name, t.get("href")) for t in soup.find_tags(["a", "button"], APPLY)]
+    assert scan.text() == soup.text()
+    assert scan.partial_parses <= 4  # only the matching elements were parsed
+
+
+def test_fragment_text_matches_beautifulsoup():
+    expected = BeautifulSoup(DESCRIPTION, "lxml").get_text(separator="\n", strip=True)
+    assert fragment_text(DESCRIPTION) == expected
+    # lxml rejects control characters; the BeautifulSoup fallback handles them
+    raw = "<p>Text\x0b with control chars</p>"
+    assert fragment_text(raw) == BeautifulSoup(raw, "lxml").get_text(separator="\n", strip=True)
+    assert fragment_text("") == ""
+
+
+def test_job_posting_prefers_job_posting_type():
+    assert job_posting([{"@type": "BreadcrumbList"}, {"@type": ["JobPosting"], "title": "x"}])["title"] == "x"
+    assert job_posting([{"@type": "Organization"}]) == {"@type": "Organization"}
+    assert job_posting([]) is None
+
+
+def test_subtree_filter_builds_only_matching_subtrees():
+    html = (
+        '<html><head><title>T</title></head><body><nav><a href="/x">Home</a></nav>'
+        '<ul><li class="item description__job-criteria-item"><h3>Industries</h3><span>IT</span></li>'
+        '<li class="other">B</li></ul><p data-at="x">P</p></body></html>'
+    )
+    keep = SubtreeFilter(("title", {}), (None, {"class": class_pattern("description__job-criteria-item")}))
+    soup = BeautifulSoup(html, "lxml", parse_only=keep)
+    assert [t.name for t in soup.find_all(True)] == ["title", "li", "h3", "span"]
+    assert soup.select_one("li.description__job-criteria-item").get_text("|") == "Industries|IT"
+
+    soup = BeautifulSoup(html, "lxml", parse_only=SubtreeFilter(("a", {"href": True}), (None, {"data-at": {"x"}})))
+    assert [t.name for t in soup.find_all(True)] == ["a", "p"]
+
+
+def _parse_all_modes(monkeypatch, scraper_cls, content, url):
+    results = {}
+    for mode in scraper_cls.PARSE_MODES:
+        monkeypatch.setenv("SCRAPER_PARSE_MODE", mode)
+        scraper = scraper_cls()
+        assert scraper.parse_mode == mode
+        job = scraper.parse(content, url)
+        job.pop("scraped_at")
+        results[mode] = job
+    return results
+
+
+def test_stepstone_parse_is_identical_in_all_modes(monkeypatch):
+    url = "https://www.stepstone.de/stellenangebote--Data-Engineer--12345-inline.html"
+    results = _parse_all_modes(monkeypatch, StepstoneScraper, PAGE.encode("utf-8"), url)
+
+    assert set(results) == {"scan", "targeted", "full"}
+    assert results["scan"] == results["targeted"] == results["full"]
+    job = results["scan"]
+    assert job["job_title_clean"] == "Data Engineer"
+    assert job["work_mode"] == "hybrid"
+    assert job["company_job_reference"] == "ABC-123"
+    assert job["direct_apply_link"] == "https://acme.de/apply"
+    assert job["contact_person"]["email"] == "support@stepstone.de"  # &#64; decoded in both modes
+
+
+def test_stepstone_parse_records_field_spans():
+    url = "https://www.stepstone.de/stellenangebote--Data-Engineer--12345-inline.html"
+    with use_timer(JobTimer()) as timer:
+        StepstoneScraper().parse(PAGE.encode("utf-8"), url)
+    names = {entry["name"] for entry in timer.spans}
+    assert "html.parse" in names
+    assert {"field.json_ld", "field.job_title", "field.direct_apply_link", "field.contact_person"} <= names
+
+
+LINKEDIN_PAGE = (
+    "<html><head><title>Acme GmbH hiring Data Engineer in Berlin, Germany | LinkedIn</title>"
+    "<script>window.x = 'remote';</script></head><body>"
+    '<nav><a href="/a">Jobs</a></nav><span class="posted-time-ago__text">Posted 2 days ago</span>'
+    '<div class="description__text description__text--rich"><section><div>'
+    + "Wir suchen Verstärkung für unser Team in Berlin. " * 5
+    + "Arbeitsmodell: Hybrid mit zwei Tagen im Büro.</div></section></div>"
+    '<ul class="description__job-criteria-list">'
+    '<li class="description__job-criteria-item"><h3>Employment type</h3><span>Full-time</span></li>'
+    '<li class="description__job-criteria-item"><h3>Industries</h3><span>Software Development</span></li>'
+    "</ul></body></html>"
+)
+
+
+def test_linkedin_targeted_parse_matches_full_parse(monkeypatch):
+    url = "https://www.linkedin.com/jobs/view/4012345678/"
+    monkeypatch.setenv("SCRAPER_PARSE_MODE", "scan")  # not supported: falls back to the default
+    assert LinkedInScraper().parse_mode == "targeted"
+
+    results = _parse_all_modes(monkeypatch, LinkedInScraper, LINKEDIN_PAGE.encode("utf-8"), url)
+    for job in results.values():
+        job["publication_date"] = job["publication_date"][:10]  # relative to now()
+
+    assert results["targeted"] == results["full"]
+    job = results["targeted"]
+    assert (job["company_name"], job["job_title"], job["location"]) == ("Acme GmbH", "Data Engineer", "Berlin, Germany")
+    assert job["linkedin_job_id"] == "4012345678"
+    assert job["industry"] == "Software Development"
+    assert job["work_mode"] == "hybrid"
+    assert job["job_description"].startswith("Wir suchen")
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import time
+
+import httpx
+import pytest
+import requests
+
+from src.utils.http_cache import ResponseCache, normalize_url
+from src.utils.http_utils import arequest_with_retries, request_with_retries
+
+
+class DummyResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode("utf-8", "replace")
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        raise requests.HTTPError(self.text, response=self)
+
+
+def test_normalize_url_ignores_fragment_tracking_and_param_order():
+    a = normalize_url("HTTPS://WWW.Stepstone.de/job?b=2&a=1&utm_source=x#top")
+    b = normalize_url("https://www.stepstone.de/job?a=1&b=2")
+    assert a == b
+    assert normalize_url("https://x.de/job", {"page": 2}) == "https://x.de/job?page=2"
+
+
+def test_store_and_get_roundtrip_gzip(tmp_path):
+    cache = ResponseCache(tmp_path)
+    body = b"<html>" + b"job " * 1000 + b"</html>"
+    cache.store("https://x.de/job", 200, {"Content-Type": "text/html", "ETag": '"v1"', "Set-Cookie": "a=b"}, body)
+
+    entry = cache.get("https://x.de/job#frag")
+    assert entry.content == body
+    assert entry.headers == {"Content-Type": "text/html", "ETag": '"v1"'}
+    assert cache.is_fresh(entry)
+    assert cache.size_bytes() < len(body)
+
+
+def test_no_store_responses_are_skipped(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.store("https://x.de/job", 200, {"Cache-Control": "no-store"}, b"secret")
+    assert cache.get("https://x.de/job") is None
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    body = bytes(range(256)) * 40  # identical bodies, identical compressed sizes
+    cache = ResponseCache(tmp_path, max_bytes=10 ** 9)
+    cache.store("https://x.de/1", 200, {}, body)
+    cache.store("https://x.de/2", 200, {}, body)
+    entry_size = cache.size_bytes() // 2
+
+    old = time.time() - 100
+    for meta in tmp_path.glob("*/*.meta.json"):
+        os.utime(meta, (old, old))
+    cache.get("https://x.de/1")  # marks /1 as recently used
+
+    cache.max_bytes = entry_size * 2
+    cache.store("https://x.de/3", 200, {}, body)
+    assert cache.get("https://x.de/1") is not None
+    assert cache.get("https://x.de/2") is None
+    assert cache.get("https://x.de/3") is not None
+
+
+def test_request_with_retries_serves_fresh_entry_without_request(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path, ttl=60)
+    calls = []
+
+    def fake_request(self, method, url, **kwargs):
+        calls.append(kwargs.get("headers"))
+        return DummyResponse(200, b"<html>page</html>", {"ETag": '"v1"'})
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+
+    first = request_with_retries("GET", "https://x.de/job", cache=cache)
+    second = request_with_retries("GET", "https://x.de/job", cache=cache)
+    assert first.content == second.content == b"<html>page</html>"
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_request_with_retries_revalidates_stale_entry(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path, ttl=0)
+    cache.store("https://x.de/job", 200, {"ETag": '"v1"', "Content-Type": "text/html; charset=utf-8"}, b"cached")
+    sent = {}
+
+    def fake_request(self, method, url, **kwargs):
+        sent.update(kwargs.get("headers") or {})
+        return DummyResponse(304, b"", {"ETag": '"v2"'})
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+
+    resp = request_with_retries("GET", "https://x.de/job", headers={"User-Agent": "t"}, cache=cache)
+    assert sent == {"User-Agent": "t", "If-None-Match": '"v1"'}
+    assert resp.status_code == 200
+    assert resp.text == "cached"
+    assert cache.get("https://x.de/job").headers["ETag"] == '"v2"'
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_offline_mode_replays_stale_entries_and_fails_for_unknown(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path, ttl=0, offline=True)
+    cache.store("https://x.de/job", 200, {}, b"cached")
+
+    def fail_request(self, method, url, **kwargs):
+        raise AssertionError("network used in offline mode")
+
+    monkeypatch.setattr(requests.Session, "request", fail_request)
+
+    assert request_with_retries("GET", "https://x.de/job", cache=cache).content == b"cached"
+    with pytest.raises(requests.ConnectionError):
+        request_with_retries("GET", "https://x.de/other", cache=cache)
+
+
+def test_arequest_with_retries_uses_cache(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path, ttl=60)
+    calls = {"count": 0}
+
+    def handler(request):
+        calls["count"] += 1
+        return httpx.Response(200, content=b"async page")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr("src.utils.http_utils.get_async_client", lambda: client)
+
+    async def fetch_twice():
+        first = await arequest_with_retries("GET", "https://x.de/job", cache=cache)
+        second = await arequest_with_retries("GET", "https://x.de/job", cache=cache)
+        return first, second
+
+    first, second = asyncio.run(fetch_twice())
+    assert first.content == second.content == b"async page"
+    assert calls["count"] == 1
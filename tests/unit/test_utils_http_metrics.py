@@ -0,0 +1,68 @@
+import pytest
+import requests
+
+from src.utils import http as http_alias
+from src.utils import http_utils
+from src.utils.circuit_breaker import BreakerRegistry
+from src.utils.http_metrics import HttpMetrics
+
+
+class DummyResponse:
+    def __init__(self, status_code, content=b""):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode()
+        self.headers = {}
+
+    def raise_for_status(self):
+        raise requests.HTTPError(self.text, response=self)
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    registry = HttpMetrics()
+    monkeypatch.setattr(http_utils, "http_metrics", registry)
+    monkeypatch.setattr(http_utils, "get_breakers", lambda: BreakerRegistry(failure_threshold=10))
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    return registry
+
+
+def test_both_import_paths_share_one_implementation():
+    assert http_alias.request_with_retries is http_utils.request_with_retries
+    assert http_alias.arequest_with_retries is http_utils.arequest_with_retries
+
+
+def test_requests_are_recorded_per_host(monkeypatch, metrics):
+    responses = [DummyResponse(503), DummyResponse(200, b"x" * 50), DummyResponse(404, b"missing")]
+
+    def fake_request(self, method, url, **kwargs):
+        return responses.pop(0)
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+
+    http_utils.request_with_retries("GET", "https://www.stepstone.de/job")
+    with pytest.raises(requests.HTTPError):
+        http_alias.request_with_retries("PUT", "https://www.stepstone.de/other")
+
+    host = metrics.snapshot()["hosts"]["stepstone.de"]
+    assert host["requests"] == 2
+    assert host["retries"] == 1
+    assert host["errors"] == 1
+    assert host["bytes"] == 50
+    assert host["statuses"] == {"200": 1, "404": 1}
+    assert host["methods"] == {"GET": 1, "PUT": 1}
+    assert host["latency_ms"]["p50"] is not None
+
+
+def test_network_errors_are_recorded_by_type(monkeypatch, metrics):
+    def fake_request(self, method, url, **kwargs):
+        raise requests.ConnectionError("refused")
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+
+    with pytest.raises(requests.ConnectionError):
+        http_utils.request_with_retries("GET", "https://api.trello.com/1/boards", retries=1)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["hosts"]["api.trello.com"]["statuses"] == {"ConnectionError": 1}
+    assert snapshot["totals"] == {"requests": 1, "errors": 1, "retries": 1, "coalesced": 0, "bytes": 0}
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import requests
+
+from src.utils import http_pool, http_utils
+from src.utils.circuit_breaker import BreakerRegistry
+from src.utils.http_metrics import HttpMetrics
+from src.utils.http_pool import SessionPool
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=abc")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_same_host_shares_session():
+    pool = SessionPool(maxsize=2)
+    assert pool.get("https://api.trello.com/1/cards") is pool.get("https://api.trello.com/1/boards")
+    assert pool.get("https://api.trello.com/1") is not pool.get("https://www.stepstone.de/job")
+    pool.close()
+
+
+def test_sequential_requests_reuse_connection(server):
+    pool = SessionPool(maxsize=2)
+    for _ in range(5):
+        resp = pool.get(server).get(f"{server}/page", timeout=5)
+        assert resp.status_code == 200
+
+    stats = pool.stats()
+    assert stats["requests"] == 5
+    assert stats["connections"] == 1
+    assert stats["reused"] == 4
+    assert stats["reuse_rate"] == 0.8
+    pool.close()
+
+
+def test_cookies_are_not_persisted(server):
+    pool = SessionPool()
+    session = pool.get(server)
+    session.get(server, timeout=5)
+    assert len(session.cookies) == 0
+    pool.close()
+
+
+def test_close_recreates_sessions_lazily():
+    pool = SessionPool()
+    first = pool.get("https://example.com")
+    pool.close()
+    assert pool.stats()["hosts"] == 0
+    assert pool.get("https://example.com") is not first
+    pool.close()
+
+
+def test_async_client_is_shared_per_event_loop():
+    pool = SessionPool()
+
+    async def grab():
+        first, second = pool.get_async_client(), pool.get_async_client()
+        await pool.aclose()
+        return first, second
+
+    first, second = asyncio.run(grab())
+    assert first is second
+    assert first.is_closed
+    assert asyncio.run(grab())[0] is not first
+
+
+def test_http2_hosts_match_host_and_subdomains(monkeypatch):
+    monkeypatch.setattr(http_pool, "HTTP2_AVAILABLE", True)
+    pool = SessionPool(http2_hosts=["trello.com"])
+    assert pool.uses_http2("https://api.trello.com/1/cards")
+    assert pool.uses_http2("https://trello.com/b/x")
+    assert not pool.uses_http2("https://nottrello.com/")
+    assert not pool.uses_http2("https://www.stepstone.de/job")
+
+    monkeypatch.setattr(http_pool, "HTTP2_AVAILABLE", False)
+    assert not pool.uses_http2("https://api.trello.com/1/cards")
+
+
+def test_http2_hosts_from_env(monkeypatch):
+    monkeypatch.setenv("HTTP_HTTP2_HOSTS", " api.trello.com, Stepstone.de ,")
+    assert SessionPool().http2_hosts == ("api.trello.com", "stepstone.de")
+
+
+def test_sessions_advertise_supported_encodings():
+    pool = SessionPool()
+    assert "gzip" in http_pool.ACCEPT_ENCODING
+    assert pool.get("https://example.com").headers["Accept-Encoding"] == http_pool.ACCEPT_ENCODING
+    pool.close()
+
+
+def test_http2_hosts_go_through_httpx_and_return_requests_responses(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"id": "card1"}, extensions={"http_version": b"HTTP/2"})
+
+    registry = HttpMetrics()
+    monkeypatch.setattr(http_utils, "http_metrics", registry)
+    monkeypatch.setattr(http_utils, "uses_http2", lambda url: True)
+    monkeypatch.setattr(http_utils, "get_http2_client", lambda: httpx.Client(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(http_utils, "get_breakers", lambda: BreakerRegistry(failure_threshold=10))
+
+    resp = http_utils.request_with_retries("POST", "https://api.trello.com/1/cards", params={"name": "x"}, json={"a": 1})
+    assert isinstance(resp, requests.Response)
+    assert resp.json() == {"id": "card1"}
+    assert seen[0].url.params["name"] == "x"
+    assert registry.snapshot()["hosts"]["api.trello.com"]["protocols"] == {"HTTP/2": 1}
+
+
+def test_http2_transport_errors_surface_as_requests_errors(monkeypatch):
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    monkeypatch.setattr(http_utils, "uses_http2", lambda url: True)
+    monkeypatch.setattr(http_utils, "get_http2_client", lambda: httpx.Client(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(http_utils, "get_breakers", lambda: BreakerRegistry(failure_threshold=10))
+    monkeypatch.setattr(http_utils.time, "sleep", lambda s: None)
+
+    with pytest.raises(requests.ConnectionError):
+        http_utils.request_with_retries("GET", "https://api.trello.com/1/boards", retries=1)
@@ -1,13 +1,26 @@
+import asyncio
+
+import httpx
 import requests
 import pytest
 
-from src.utils.http_utils import request_with_retries
+from src.utils.circuit_breaker import BreakerRegistry
+from src.utils.http_utils import arequest_with_retries, request_with_retries
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    registry = BreakerRegistry(failure_threshold=5, reset_timeout=30)
+    monkeypatch.setattr("src.utils.http_utils.get_breakers", lambda: registry)
+    return registry
 
 
 class DummyResponse:
-    def __init__(self, status_code: int, text: str = ""):
+    def __init__(self, status_code: int, text: str = "", headers=None):
         self.status_code = status_code
         self.text = text or f"status={status_code}"
+        self.content = self.text.encode()
+        self.headers = headers or {}
 
     def raise_for_status(self):
         raise requests.HTTPError(self.text, response=self)
@@ -17,7 +30,7 @@ def test_request_with_retries_success_after_transient(monkeypatch):
     calls = {"count": 0}
     sleeps: list[float] = []
 
-    def fake_request(method, url, **kwargs):
+    def fake_request(self, method, url, **kwargs):
         calls["count"] += 1
         if calls["count"] == 1:
             return DummyResponse(429, text="rate limited")
@@ -26,25 +39,25 @@ def test_request_with_retries_success_after_transient(monkeypatch):
     def fake_sleep(seconds: float):
         sleeps.append(seconds)
 
-    monkeypatch.setattr(requests, "request", fake_request)
+    monkeypatch.setattr(requests.Session, "request", fake_request)
     monkeypatch.setattr("time.sleep", fake_sleep)
 
     resp = request_with_retries("GET", "http://example.com/test")
     assert isinstance(resp, DummyResponse)
     assert resp.status_code == 200
     assert calls["count"] == 2
-    # first backoff should be 0.5 by default
-    assert sleeps == [0.5]
+    # first backoff is jittered within [0.25, 0.5] by default
+    assert len(sleeps) == 1 and 0.25 <= sleeps[0] <= 0.5
 
 
 def test_request_with_retries_non_retryable_raises(monkeypatch):
     calls = {"count": 0}
 
-    def fake_request(method, url, **kwargs):
+    def fake_request(self, method, url, **kwargs):
         calls["count"] += 1
         return DummyResponse(401, text="unauthorized")
 
-    monkeypatch.setattr(requests, "request", fake_request)
+    monkeypatch.setattr(requests.Session, "request", fake_request)
 
     with pytest.raises(requests.HTTPError):
         request_with_retries("POST", "http://example.com/resource")
@@ -55,14 +68,14 @@ def test_request_with_retries_exhausts_and_raises(monkeypatch):
     calls = {"count": 0}
     sleeps: list[float] = []
 
-    def fake_request(method, url, **kwargs):
+    def fake_request(self, method, url, **kwargs):
         calls["count"] += 1
         return DummyResponse(503, text="service unavailable")
 
     def fake_sleep(seconds: float):
         sleeps.append(seconds)
 
-    monkeypatch.setattr(requests, "request", fake_request)
+    monkeypatch.setattr(requests.Session, "request", fake_request)
     monkeypatch.setattr("time.sleep", fake_sleep)
 
     with pytest.raises(requests.HTTPError):
@@ -70,15 +83,16 @@ def test_request_with_retries_exhausts_and_raises(monkeypatch):
 
     # Should attempt retries+1 times: 3
     assert calls["count"] == 3
-    # Should have slept exactly 'retries' times with exponential backoff: 0.5, 1.0
-    assert sleeps == [0.5, 1.0]
+    # Should have slept exactly 'retries' times with jittered exponential backoff: ~0.5, ~1.0
+    assert len(sleeps) == 2
+    assert 0.25 <= sleeps[0] <= 0.5 and 0.5 <= sleeps[1] <= 1.0
 
 
 def test_request_with_retries_exception_then_success(monkeypatch):
     calls = {"count": 0}
     sleeps: list[float] = []
 
-    def fake_request(method, url, **kwargs):
+    def fake_request(self, method, url, **kwargs):
         calls["count"] += 1
         if calls["count"] == 1:
             raise requests.Timeout("timeout")
@@ -87,11 +101,139 @@ def test_request_with_retries_exception_then_success(monkeypatch):
     def fake_sleep(seconds: float):
         sleeps.append(seconds)
 
-    monkeypatch.setattr(requests, "request", fake_request)
+    monkeypatch.setattr(requests.Session, "request", fake_request)
     monkeypatch.setattr("time.sleep", fake_sleep)
 
     resp = request_with_retries("GET", "http://example.com/slow")
     assert isinstance(resp, DummyResponse)
     assert resp.status_code == 200
     assert calls["count"] == 2
-    assert sleeps == [0.5]
+    assert len(sleeps) == 1 and 0.25 <= sleeps[0] <= 0.5
+
+
+def test_request_with_retries_honors_retry_after(monkeypatch):
+    from src.utils.throttle import RateLimiter
+
+    limiter = RateLimiter()
+    monkeypatch.setattr("src.utils.http_utils.get_rate_limiter", lambda: limiter)
+    responses = [DummyResponse(429, headers={"Retry-After": "3"}), DummyResponse(200, text="ok")]
+    sleeps: list[float] = []
+
+    def fake_request(self, method, url, **kwargs):
+        return responses.pop(0)
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    monkeypatch.setattr("time.sleep", lambda seconds: sleeps.append(seconds))
+
+    resp = request_with_retries("GET", "http://example.com/limited")
+    assert resp.status_code == 200
+    # Backoff first, then the limiter holds the host until Retry-After has passed
+    # (the faked sleep doesn't advance the clock, so the full delay remains)
+    assert 0.25 <= sleeps[0] <= 0.5
+    assert 2.9 < sleeps[1] <= 3.0
+
+
+def _mock_async_client(monkeypatch, handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr("src.utils.http_utils.get_async_client", lambda: client)
+    return client
+
+
+def _fake_async_sleep(monkeypatch, sleeps):
+    async def fake_sleep(seconds: float):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr("src.utils.http_utils.asyncio.sleep", fake_sleep)
+
+
+def test_arequest_with_retries_success_after_transient(monkeypatch):
+    calls = {"count": 0}
+    sleeps: list[float] = []
+
+    def handler(request):
+        calls["count"] += 1
+        if calls["count"] == 1:
+            return httpx.Response(429, text="rate limited")
+        return httpx.Response(200, text="ok")
+
+    _mock_async_client(monkeypatch, handler)
+    _fake_async_sleep(monkeypatch, sleeps)
+
+    resp = asyncio.run(arequest_with_retries("GET", "http://example.com/test"))
+    assert resp.status_code == 200
+    assert resp.text == "ok"
+    assert calls["count"] == 2
+    assert len(sleeps) == 1 and 0.25 <= sleeps[0] <= 0.5
+
+
+def test_arequest_with_retries_non_retryable_raises_requests_error(monkeypatch):
+    calls = {"count": 0}
+
+    def handler(request):
+        calls["count"] += 1
+        return httpx.Response(401, text="unauthorized")
+
+    _mock_async_client(monkeypatch, handler)
+
+    with pytest.raises(requests.HTTPError) as exc_info:
+        asyncio.run(arequest_with_retries("POST", "http://example.com/resource"))
+    assert exc_info.value.response.status_code == 401
+    assert calls["count"] == 1
+
+
+def test_arequest_with_retries_exhausts_and_raises(monkeypatch):
+    calls = {"count": 0}
+    sleeps: list[float] = []
+
+    def handler(request):
+        calls["count"] += 1
+        return httpx.Response(503, text="service unavailable")
+
+    _mock_async_client(monkeypatch, handler)
+    _fake_async_sleep(monkeypatch, sleeps)
+
+    with pytest.raises(requests.HTTPError):
+        asyncio.run(arequest_with_retries("GET", "http://example.com/down", retries=2))
+    assert calls["count"] == 3
+    assert len(sleeps) == 2
+    assert 0.25 <= sleeps[0] <= 0.5 and 0.5 <= sleeps[1] <= 1.0
+
+
+def test_arequest_with_retries_timeout_maps_to_requests_timeout(monkeypatch):
+    calls = {"count": 0}
+    sleeps: list[float] = []
+
+    def handler(request):
+        calls["count"] += 1
+        raise httpx.ReadTimeout("timeout", request=request)
+
+    _mock_async_client(monkeypatch, handler)
+    _fake_async_sleep(monkeypatch, sleeps)
+
+    with pytest.raises(requests.Timeout):
+        asyncio.run(arequest_with_retries("GET", "http://example.com/slow", retries=1))
+    assert calls["count"] == 2
+    assert len(sleeps) == 1 and 0.25 <= sleeps[0] <= 0.5
+
+
+def test_request_with_retries_fails_fast_while_circuit_open(monkeypatch, fresh_breakers):
+    from src.utils.circuit_breaker import CircuitOpenError
+
+    calls = {"count": 0}
+
+    def fake_request(self, method, url, **kwargs):
+        calls["count"] += 1
+        return DummyResponse(503, text="down")
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+
+    with pytest.raises(requests.HTTPError):
+        request_with_retries("GET", "http://example.com/a", retries=3)
+    with pytest.raises(CircuitOpenError):
+        request_with_retries("GET", "http://example.com/b", retries=3)
+    # 4 attempts for the first call, 1 more opens the circuit, then nothing is sent
+    assert calls["count"] == 5
+    assert fresh_breakers.stats()["example.com"]["state"] == "open"
+    # CircuitOpenError is a ConnectionError, so existing network error handling applies
+    assert issubclass(CircuitOpenError, requests.RequestException)
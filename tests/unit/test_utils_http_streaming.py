@@ -0,0 +1,117 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from src.utils import http_utils
+from src.utils.circuit_breaker import BreakerRegistry
+from src.utils.http_cache import ResponseCache
+from src.utils.http_utils import MarkerWatch, arequest_with_retries, request_with_retries
+
+HEAD = (
+    b'<html><head><title>Job</title>'
+    b'<script type="application/ld+json">{"@type": "JobPosting", "title": "Dev"}</script></head>'
+    b'<body><h1 data-at="header-job-title">Dev</h1>'
+)
+PAGE = HEAD + b"<script>" + b"x" * 500_000 + b"</script></body></html>"
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    monkeypatch.setattr(http_utils, "get_breakers", lambda: BreakerRegistry(failure_threshold=10))
+
+
+def _mock_client(monkeypatch, body=PAGE):
+    async def chunks():
+        # Stream in 8 KB chunks like a real server would
+        for i in range(0, len(body), 8192):
+            yield body[i:i + 8192]
+
+    def handler(request):
+        return httpx.Response(200, headers={"Content-Type": "text/html"}, content=chunks())
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_utils, "get_async_client", lambda: client)
+
+
+def test_marker_watch_needs_all_groups_in_order_across_chunks():
+    watch = MarkerWatch(("application/ld+json", "JobPosting", "</script>"), 'data-at="header-job-title"')
+    buffer = bytearray()
+    results = []
+    for i in range(0, len(HEAD), 7):  # markers get split between chunks
+        buffer += HEAD[i:i + 7]
+        results.append(watch(buffer))
+    assert results[-1] is True
+    assert not any(results[:-2])
+
+    # "</script>" before the JSON-LD block does not count
+    watch = MarkerWatch(("application/ld+json", "JobPosting", "</script>"))
+    assert not watch(bytearray(b'<script></script><script type="application/ld+json">{"@type": "JobPosting"'))
+
+
+def test_async_stream_stops_early_once_markers_arrived(monkeypatch):
+    _mock_client(monkeypatch)
+    watch = MarkerWatch(("application/ld+json", "JobPosting", "</script>"), 'data-at="header-job-title"')
+
+    resp = asyncio.run(arequest_with_retries("GET", "https://www.stepstone.de/job", stop_when=watch))
+    assert resp.status_code == 200
+    assert resp.content.startswith(HEAD)
+    assert len(resp.content) <= http_utils.STREAM_CHUNK_SIZE  # stopped after the first read
+    assert resp.headers["content-length"] == str(len(resp.content))
+
+
+def test_async_stream_respects_byte_cap(monkeypatch):
+    _mock_client(monkeypatch)
+    resp = asyncio.run(arequest_with_retries("GET", "https://www.stepstone.de/job", max_bytes=100_000))
+    assert len(resp.content) == 100_000
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client stopped reading at its byte cap
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_sync_stream_respects_byte_cap(server):
+    resp = request_with_retries("GET", f"{server}/job", max_bytes=20_000)
+    assert len(resp.content) == 20_000
+    assert resp.text.startswith("<html>")
+
+
+def test_partial_bodies_are_cached_only_for_streaming_callers(tmp_path, monkeypatch):
+    _mock_client(monkeypatch)
+    cache = ResponseCache(tmp_path, ttl=60)
+
+    asyncio.run(arequest_with_retries("GET", "https://www.stepstone.de/job", max_bytes=1000, cache=cache))
+    assert cache.get("https://www.stepstone.de/job").complete is False
+
+    capped = asyncio.run(arequest_with_retries("GET", "https://www.stepstone.de/job", max_bytes=1000, cache=cache))
+    assert cache.stats()["hits"] == 1 and len(capped.content) == 1000
+
+    full = asyncio.run(arequest_with_retries("GET", "https://www.stepstone.de/job", cache=cache))
+    assert full.content == PAGE
+    assert cache.get("https://www.stepstone.de/job").complete is True
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+import requests
+
+from src.utils import http_utils
+from src.utils.circuit_breaker import BreakerRegistry
+from src.utils.http_metrics import HttpMetrics
+from src.utils.http_utils import MarkerWatch, _flight_key
+from src.utils.single_flight import SingleFlight
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    monkeypatch.setattr(http_utils, "get_breakers", lambda: BreakerRegistry(failure_threshold=10))
+    monkeypatch.setattr(http_utils, "in_flight", SingleFlight())
+    registry = HttpMetrics()
+    monkeypatch.setattr(http_utils, "http_metrics", registry)
+    return registry
+
+
+class DummyResponse:
+    def __init__(self, status_code=200, content=b"page"):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode()
+        self.headers = {"Content-Type": "text/html"}
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return "result"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", work))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    while flight.stats()["shared"] < 3:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert all(result == "result" for result, _ in results)
+    assert flight.do("k", lambda: "again") == ("again", False)  # nothing is kept afterwards
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise requests.ConnectionError("down")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("k", fail)
+        except requests.ConnectionError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    leader.join()
+    follower.join()
+    assert len(errors) == 2
+
+
+def test_flight_key_only_for_plain_gets():
+    url = "https://www.stepstone.de/job?b=2&a=1"
+    assert _flight_key("GET", url, None, {"User-Agent": "x"}, None, None, None, None) == \
+        _flight_key("get", "https://www.stepstone.de/job?a=1&b=2", None, {"user-agent": "x"}, None, None, None, None)
+    assert _flight_key("POST", url, None, None, None, None, None, None) is None
+    assert _flight_key("GET", url, None, None, {"q": 1}, None, None, None) is None
+    # Fresh watches over the same markers coalesce; different limits don't
+    assert _flight_key("GET", url, None, None, None, None, 100, MarkerWatch("</h1>")) == \
+        _flight_key("GET", url, None, None, None, None, 100, MarkerWatch("</h1>"))
+    assert _flight_key("GET", url, None, None, None, None, 100, None) != \
+        _flight_key("GET", url, None, None, None, None, 200, None)
+    # Callers with a different retry or cache policy don't share a request
+    plain = _flight_key("GET", url, None, None, None, None, None, None)
+    assert plain == _flight_key("GET", url, None, None, None, None, None, None, retries=3, timeout=10)
+    assert plain != _flight_key("GET", url, None, None, None, None, None, None, retries=0)
+    assert plain != _flight_key("GET", url, None, None, None, None, None, None, timeout=30)
+    assert plain != _flight_key("GET", url, None, None, None, None, None, None, retry_on=(503,))
+    assert plain != _flight_key("GET", url, None, None, None, None, None, None, cache=object())
+
+
+def test_request_with_retries_coalesces_identical_gets(monkeypatch, isolated):
+    release = threading.Event()
+    calls = []
+
+    def fake_request(self, method, url, **kwargs):
+        calls.append(url)
+        release.wait(5)
+        return DummyResponse()
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+
+    results = []
+    fetch = lambda: results.append(http_utils.request_with_retries("GET", "https://api.trello.com/1/lists/l/cards"))
+    threads = [threading.Thread(target=fetch) for _ in range(3)]
+    for t in threads:
+        t.start()
+    while http_utils.in_flight.stats()["shared"] < 2:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert [r.content for r in results] == [b"page"] * 3
+    assert len({id(r) for r in results}) == 3  # every caller gets its own response object
+    trello = isolated.snapshot()["hosts"]["api.trello.com"]
+    assert trello["requests"] == 3 and trello["coalesced"] == 2
+
+
+def test_arequest_with_retries_coalesces_identical_gets(monkeypatch):
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, content=b"<html>job</html>")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_utils, "get_async_client", lambda: client)
+
+    async def fetch_all():
+        url = "https://www.stepstone.de/job"
+        return await asyncio.gather(*(http_utils.arequest_with_retries("GET", url) for _ in range(3)),
+                                    http_utils.arequest_with_retries("POST", url))
+
+    responses = asyncio.run(fetch_all())
+    assert len(calls) == 2  # three GETs shared one request; the POST went out on its own
+    assert all(r.content == b"<html>job</html>" for r in responses)
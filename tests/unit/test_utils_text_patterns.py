@@ -0,0 +1,81 @@
+import re
+
+import pytest
+
+from src.utils.text_patterns import EMAIL_RE, EMOJI_RE, PHONE_RE, clean_job_title, find_reference
+
+GENDER_PATTERNS = [
+    r'\(m/w/d\)', r'\(w/m/d\)', r'\(d/m/w\)', r'\(m/w\)', r'\(w/m\)',
+    r'\(m/f/d\)', r'\(f/m/d\)', r'\(m/f/x\)', r'\(f/m/x\)', r'\(m/f\)', r'\(f/m\)',
+    r'\(gn\)', r'\(all genders\)', r'\(x/w/m\)',
+    r'm/w/d', r'w/m/d', r'm/f/d', r'f/m/d', r'm/f/x', r'f/m/x',
+    r'm/w(?!\w)', r'w/m(?!\w)', r'm/f(?!\w)', r'f/m(?!\w)',
+]
+REFERENCE_PATTERNS = [
+    r'Referenznummer', r'Referenz', r'Job-ID', r'Job ID', r'Kennziffer',
+    r'Stellennummer', r'Reference', r'Req\.?\s*ID', r'Position\s*ID',
+]
+
+
+def _clean_sequentially(title):
+    """The former implementation: one re.sub per marker."""
+    for pattern in GENDER_PATTERNS:
+        title = re.sub(pattern, '', title, flags=re.IGNORECASE)
+    title = re.sub(r'\s+', ' ', title)
+    title = re.sub(r'\s*-\s*$', '', title)
+    return re.sub(r'^\s*-\s*', '', title).strip()
+
+
+def _reference_sequentially(text):
+    """The former implementation: the first label (in priority order) found anywhere wins."""
+    for label in REFERENCE_PATTERNS:
+        match = re.search(label + r'[:\s]+([A-Z0-9\-_/]+)', text, re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("Data Engineer (m/w/d)", "Data Engineer"),
+    ("Senior Developer (M/W/D) - Berlin", "Senior Developer - Berlin"),
+    ("- Produktmanager w/m/d -", "Produktmanager"),
+    ("Product Owner (all genders)", "Product Owner"),
+    ("Sales Manager m/f (Remote)", "Sales Manager (Remote)"),
+    ("Ingenieur m/wx", "Ingenieur m/wx"),
+    ("Head of Sales", "Head of Sales"),
+])
+def test_clean_job_title(title, expected):
+    assert clean_job_title(title) == expected == _clean_sequentially(title)
+
+
+def test_clean_job_title_passes_empty_values_through():
+    assert clean_job_title(None) is None
+    assert clean_job_title("") == ""
+
+
+@pytest.mark.parametrize("text", [
+    "Referenznummer: ABC-123",
+    "Position ID: 77 und Referenz: R/55",  # later in the text but higher priority
+    "Reference: Referenznummer: X-1",  # overlapping labels
+    "Job-ID 4711, Kennziffer: K-9",
+    "REQ. ID: 900 and ReqID 901",
+    "Referenz ohne Nummer: ?",
+    "Keine Angabe",
+    "Stellennummer: 12 İstanbul",  # lowercasing changes the length
+])
+def test_find_reference_matches_label_priority(text):
+    assert find_reference(text) == _reference_sequentially(text)
+
+
+def test_find_reference_values():
+    assert find_reference("Position ID: 77 und Referenz: R/55") == "R/55"
+    assert find_reference("Reference: Referenznummer: X-1") == "X-1"
+    assert find_reference("") is None
+    assert find_reference(None) is None
+
+
+def test_contact_and_emoji_patterns():
+    text = "Kontakt: jobs@acme.de, Tel. +49 30 1234567 🚀"
+    assert EMAIL_RE.findall(text) == ["jobs@acme.de"]
+    assert PHONE_RE.findall(text) == ["+49 30 1234567"]
+    assert EMOJI_RE.sub('', text).endswith("1234567 ")
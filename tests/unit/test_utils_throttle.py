@@ -0,0 +1,109 @@
+import threading
+import time
+
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.utils.throttle import HostThrottle, RateLimiter, host_key, parse_rate_limits, parse_retry_after
+
+
+def test_host_key_normalizes_www_and_case():
+    assert host_key("https://WWW.Stepstone.de/job/1") == "stepstone.de"
+    assert host_key("https://linkedin.com/jobs/view/1") == "linkedin.com"
+
+
+def test_same_host_is_spaced_out(monkeypatch):
+    throttle = HostThrottle(min_interval=0.05)
+    waits = []
+    for _ in range(3):
+        with throttle.slot("https://www.stepstone.de/a") as waited:
+            waits.append(waited)
+    assert waits[0] < 0.03
+    # Later grants must wait for the interval
+    assert waits[1] >= 0.03
+    assert waits[2] >= 0.03
+
+
+def test_different_hosts_do_not_wait():
+    throttle = HostThrottle(min_interval=10.0)
+    with throttle.slot("https://www.stepstone.de/a") as w1:
+        pass
+    with throttle.slot("https://www.linkedin.com/jobs/view/1") as w2:
+        pass
+    assert w1 < 0.05 and w2 < 0.05
+
+
+def test_max_concurrent_limits_parallel_holders():
+    throttle = HostThrottle(min_interval=0, max_concurrent=1)
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def worker():
+        with throttle.slot("https://example.com/x"):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert active["max"] == 1
+
+
+def test_rate_limiter_allows_burst_then_smooths():
+    limiter = RateLimiter({"stepstone.de": (10.0, 2)})
+    waits = [limiter._reserve("https://www.stepstone.de/job") for _ in range(4)]
+    assert waits[0] == 0 and waits[1] == 0
+    # Third and fourth requests queue up at 1/rate spacing
+    assert 0.08 < waits[2] <= 0.1
+    assert 0.18 < waits[3] <= 0.2
+
+
+def test_rate_limiter_subdomains_share_parent_limit_and_others_are_free():
+    limiter = RateLimiter({"linkedin.com": (1.0, 1)})
+    assert limiter._reserve("https://de.linkedin.com/jobs/1") == 0
+    assert limiter._reserve("https://www.linkedin.com/jobs/2") > 0.9
+    assert limiter._reserve("https://example.com/") == 0
+
+
+def test_rate_limiter_configure_keeps_token_state():
+    limiter = RateLimiter({"duckduckgo.com": (1.0, 1)})
+    limiter._reserve("https://duckduckgo.com/")
+    limiter.configure("duckduckgo.com", rate=2.0, burst=1)
+    assert 0.4 < limiter._reserve("https://duckduckgo.com/") <= 0.5
+
+
+def test_rate_limiter_defer_blocks_unlimited_host():
+    limiter = RateLimiter()
+    limiter.defer("https://api.example.com/x", 5)
+    assert limiter._reserve("https://api.example.com/y") > 4.9
+    assert limiter.stats()["api.example.com"]["deferrals"] == 1
+
+
+def test_parse_rate_limits_and_retry_after():
+    assert parse_rate_limits("api.trello.com=5:10, stepstone.de=0.5,bad") == {
+        "api.trello.com": (5.0, 10),
+        "stepstone.de": (0.5, 1),
+    }
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    when = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < parse_retry_after(when) <= 30
+
+
+def test_web_searcher_does_not_reconfigure_shared_limit():
+    web_search = pytest.importorskip("src.utils.web_search")
+    limiter = web_search.get_rate_limiter()
+    before = dict(limiter.limits)
+    with pytest.warns(DeprecationWarning):
+        web_search.WebSearcher(max_results=3, rate_limit_delay=0.5)
+    web_search.WebSearcher(max_results=3)
+    assert limiter.limits == before
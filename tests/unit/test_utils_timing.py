@@ -0,0 +1,64 @@
+import contextvars
+import threading
+
+import pytest
+
+from src.utils.timing import JobTimer, current_timer, percentile, span, use_timer
+
+
+def test_span_without_timer_is_noop():
+    assert current_timer() is None
+    with span("anything", a=1) as attrs:
+        attrs["b"] = 2  # Must not fail
+
+
+def test_span_records_duration_and_attributes():
+    timer = JobTimer()
+    with use_timer(timer):
+        with span("http.example.com", method="GET") as attrs:
+            attrs["status"] = 200
+        with span("http.example.com"):
+            pass
+    assert current_timer() is None
+
+    summary = timer.summary()
+    first = summary["spans"][0]
+    assert first["name"] == "http.example.com"
+    assert first["method"] == "GET" and first["status"] == 200
+    assert first["duration_ms"] >= 0
+    assert list(summary["breakdown"]) == ["http.example.com"]
+    assert summary["total_ms"] >= summary["breakdown"]["http.example.com"]
+
+
+def test_span_is_recorded_when_block_raises():
+    timer = JobTimer()
+    with use_timer(timer):
+        with pytest.raises(ValueError):
+            with span("docx.render"):
+                raise ValueError("boom")
+    assert [s["name"] for s in timer.spans] == ["docx.render"]
+
+
+def test_timer_visible_in_copied_context_threads():
+    timer = JobTimer()
+
+    def work():
+        with span("branch"):
+            pass
+
+    with use_timer(timer):
+        threads = [threading.Thread(target=contextvars.copy_context().run, args=(work,)) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert len(timer.spans) == 3
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile([7.0], 95) == 7.0
+    assert percentile([], 50) is None
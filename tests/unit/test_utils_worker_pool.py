@@ -0,0 +1,80 @@
+import threading
+import time
+
+from src.utils.worker_pool import FairWorkerPool
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_concurrency_is_bounded():
+    pool = FairWorkerPool(max_workers=2)
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+    done = []
+
+    def job(n):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+        done.append(n)
+
+    for n in range(6):
+        pool.submit(f"job{n}", job, n)
+
+    assert _wait_for(lambda: len(done) == 6)
+    assert active["max"] == 2
+
+
+def test_batches_are_served_round_robin_with_positions():
+    pool = FairWorkerPool(max_workers=1)
+    gate = threading.Event()
+    order = []
+
+    pool.submit("blocker", gate.wait)
+    assert _wait_for(lambda: pool.stats()["running"] == 1)
+
+    for n in range(3):
+        pool.submit(f"a{n}", order.append, f"a{n}", batch_id="A")
+    pool.submit("b0", order.append, "b0", batch_id="B")
+    pool.submit("single", order.append, "single")
+
+    assert pool.position("a0") == 1
+    assert pool.position("b0") == 2
+    assert pool.position("single") == 3
+    assert pool.position("a1") == 4
+    assert pool.position("blocker") is None
+
+    gate.set()
+    assert _wait_for(lambda: len(order) == 5)
+    assert order == ["a0", "b0", "single", "a1", "a2"]
+
+
+def test_cancel_removes_queued_job_and_failures_do_not_kill_workers():
+    pool = FairWorkerPool(max_workers=1)
+    gate = threading.Event()
+    ran = []
+
+    def boom():
+        raise RuntimeError("boom")
+
+    pool.submit("blocker", gate.wait)
+    pool.submit("boom", boom)
+    pool.submit("dropped", ran.append, "dropped")
+    pool.submit("kept", ran.append, "kept")
+
+    assert pool.cancel("dropped") is True
+    assert pool.cancel("dropped") is False
+
+    gate.set()
+    assert _wait_for(lambda: ran == ["kept"])
+    assert pool.stats()["queued"] == 0